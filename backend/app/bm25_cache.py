@@ -1,30 +1,81 @@
 """VERO BM25 Cache: Thread-safe singleton for per-project keyword search indices.
 
 Eliminates the O(n) per-query cost of rebuilding BM25 indices from scratch.
-The cache auto-invalidates when the chunk count for a project changes, or
-when explicitly invalidated after new documents are ingested.
+Each cached index is stamped with the project's `index_version`. Ingestion and
+deletion apply their changes incrementally via add_document()/remove_document(),
+advancing the stamp by one; any other version mismatch forces a rebuild.
+
+Indexes are also persisted under data/bm25/ (see bm25_store) and memory-mapped
+back on a cache miss, so a restart does not force every project to rebuild.
+Built and compacted indexes are written immediately; incremental updates are
+written by flush() at shutdown or when the entry is evicted.
+
+The cache holds at most VERO_BM25_CACHE_MB of index memory; the least recently
+used projects are evicted first.
 """
 
 from __future__ import annotations
 
 import logging
+import os
+import sys
 import threading
-from dataclasses import dataclass, field
-from typing import Optional
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, Sequence
 
-from rank_bm25 import BM25Okapi
+from app import bm25_store
+from app.bm25_index import BM25Index, _LayeredVocab
 
 logger = logging.getLogger(__name__)
 
+# Compact (merge segments + drop tombstones) once this fraction of indexed chunks is deleted
+TOMBSTONE_RATIO = float(os.environ.get("VERO_BM25_TOMBSTONE_RATIO", "0.25"))
+# Compact once incremental adds have produced this many postings segments
+MAX_SEGMENTS = 16
+# Persist indexes to data/bm25/ and map them back after restarts
+PERSIST = os.environ.get("VERO_BM25_PERSIST", "true").lower() == "true"
+# Memory budget across all cached projects (LRU eviction beyond it)
+CACHE_BYTES = int(float(os.environ.get("VERO_BM25_CACHE_MB", "512")) * 1024 * 1024)
+
+_INT_SIZE = sys.getsizeof(10**6)
+
 
 @dataclass
 class _CachedIndex:
-    """A cached BM25 index for a single project."""
-    index: BM25Okapi
-    chunk_ids: list[str]
-    chunk_count: int
-    last_indexed_at: Optional[str]
-    corpus: list[list[str]] = field(repr=False)
+    """A cached BM25 index for a single project.
+
+    chunk_ids[i] is the chunk behind document i of the index (tombstones included);
+    doc_rows maps each source document to the index positions of its chunks.
+    """
+    index: BM25Index
+    chunk_ids: Sequence[str]
+    doc_rows: dict[str, list[int]]
+    version: int
+    nbytes: int = 0
+
+
+def _entry_nbytes(cached: _CachedIndex) -> int:
+    """Heap bytes held by an entry: index arrays plus the Python-side tables.
+
+    Vocab terms and chunk ids that are mapped from disk cost nothing here.
+    """
+    total = cached.index.nbytes
+
+    vocab = cached.index.vocab
+    if isinstance(vocab, _LayeredVocab):
+        vocab = vocab.extra
+    if isinstance(vocab, dict):
+        total += sys.getsizeof(vocab) + sum(sys.getsizeof(term) for term in vocab) + _INT_SIZE * len(vocab)
+
+    if isinstance(cached.chunk_ids, list):
+        total += sys.getsizeof(cached.chunk_ids) + sum(sys.getsizeof(c) for c in cached.chunk_ids)
+
+    total += sys.getsizeof(cached.doc_rows)
+    for doc_id, positions in cached.doc_rows.items():
+        total += sys.getsizeof(doc_id) + sys.getsizeof(positions) + _INT_SIZE * len(positions)
+    return total
 
 
 class BM25Manager:
@@ -32,103 +83,360 @@ class BM25Manager:
 
     Usage:
         manager = get_bm25_manager()
-        index, chunk_ids = manager.get_or_build(project_id, chunks, tokenizer)
+        cached = manager.get(project_id, version) or manager.load(project_id, version)
+        if cached is None:
+            cached = manager.build(project_id, version, rows, tokenizer)
 
-    The index is cached in memory and reused across queries. It auto-rebuilds
-    when the chunk count changes or when invalidate() is called.
+    The index is cached in memory and reused across queries. Callers only
+    need to load chunk texts when get() misses, so the hot path never
+    touches the chunks table. Entries are replaced, never mutated, so a
+    query holding an entry keeps a consistent view during updates.
+
+    Builds, loads and incremental updates hold a per-project lock, so a large
+    project's rebuild never blocks queries or builds for other projects, and
+    concurrent builds of the same project run once (single-flight): later
+    callers wait and reuse the first caller's index. The shared lock only
+    guards the LRU bookkeeping.
     """
 
-    def __init__(self):
+    def __init__(self, max_bytes: int = CACHE_BYTES):
+        self.max_bytes = max_bytes
         self._lock = threading.Lock()
-        self._cache: dict[str, _CachedIndex] = {}
+        self._cache: OrderedDict[str, _CachedIndex] = OrderedDict()
+        self._project_locks: dict[str, threading.Lock] = {}
+        # Projects whose cached entry is newer than their file on disk
+        self._dirty: set[str] = set()
+
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._builds = 0
+        self._build_seconds = 0.0
+        self._disk_loads = 0
+
+    def get(self, project_id: str, version: int) -> Optional[_CachedIndex]:
+        """Return the cached index if it matches the project's index version."""
+        with self._lock:
+            cached = self._cache.get(project_id)
+            if cached is not None and cached.version == version:
+                self._cache.move_to_end(project_id)
+                self._hits += 1
+                return cached
+            self._misses += 1
+            return None
+
+    def load(self, project_id: str, version: int) -> Optional[_CachedIndex]:
+        """Map the project's persisted index if it matches `version` (None otherwise)."""
+        if not PERSIST:
+            return None
+        with self._project_lock(project_id):
+            cached = self._peek(project_id, version)
+            if cached is not None:
+                return cached
+            loaded = bm25_store.load_index(project_id, version)
+            if loaded is None:
+                return None
+            index, chunk_ids, doc_rows = loaded
+            cached = _CachedIndex(index=index, chunk_ids=chunk_ids, doc_rows=doc_rows, version=version)
+            self._insert(project_id, cached, dirty=False)
+            with self._lock:
+                self._disk_loads += 1
+            return cached
 
-    def get_or_build(
+    def build(
         self,
         project_id: str,
-        chunks: list,
-        tokenizer,
-        last_indexed_at: Optional[str] = None,
-    ) -> tuple[BM25Okapi, list[str]]:
-        """Get the cached BM25 index or build a new one.
+        version: int,
+        rows: Iterable[tuple[str, str, str]],
+        tokenizer: Callable[[str], list[str]],
+    ) -> _CachedIndex:
+        """Build (or reuse) the index for a project at the given version.
 
         Args:
-            project_id: Project to get index for.
-            chunks: List of ChunkModel objects (must have .id and .text).
+            project_id: Project to build the index for.
+            version: The project's current index_version.
+            rows: (chunk_id, doc_id, text) tuples in corpus order.
             tokenizer: A callable that takes a string and returns list[str].
-            last_indexed_at: Optional timestamp string from the project.
 
         Returns:
-            Tuple of (BM25Okapi index, list of chunk_ids in corpus order).
+            The cached index entry.
         """
-        chunk_count = len(chunks)
-
-        # Helper to check if cache is valid
-        def _is_valid(c: Optional[_CachedIndex]) -> bool:
-            if c is None:
-                return False
-            if c.chunk_count != chunk_count:
-                return False
-            # Check timestamp if provided (handles re-embedding without chunk count change)
-            if last_indexed_at is not None and c.last_indexed_at != last_indexed_at:
-                return False
-            return True
-
-        # Fast path: check cache without lock
-        cached = self._cache.get(project_id)
-        if _is_valid(cached):
-            return cached.index, cached.chunk_ids
-
-        # Slow path: rebuild under lock
-        with self._lock:
-            # Double-check after acquiring lock
-            cached = self._cache.get(project_id)
-            if _is_valid(cached):
-                return cached.index, cached.chunk_ids
-
-            if not chunks:
-                # Empty project — return a dummy index
-                dummy = BM25Okapi([[""]])
-                self._cache[project_id] = _CachedIndex(
-                    index=dummy,
-                    chunk_ids=[],
-                    chunk_count=0,
-                    last_indexed_at=last_indexed_at,
-                    corpus=[[""]],
-                )
-                return dummy, []
-
-            # Build the index
-            chunk_ids = [c.id for c in chunks]
-            corpus = [tokenizer(c.text) for c in chunks]
-            index = BM25Okapi(corpus)
-
-            self._cache[project_id] = _CachedIndex(
-                index=index,
-                chunk_ids=chunk_ids,
-                chunk_count=chunk_count,
-                last_indexed_at=last_indexed_at,
-                corpus=corpus,
+        with self._project_lock(project_id):
+            # Double-check after acquiring lock: a concurrent query may have built it
+            cached = self._peek(project_id, version)
+            if cached is not None:
+                return cached
+
+            started = time.perf_counter()
+            chunk_ids: list[str] = []
+            doc_rows: dict[str, list[int]] = {}
+
+            def _corpus():
+                # Stream tokens straight into the index; no tokenized corpus copy is kept
+                for chunk_id, doc_id, text in rows:
+                    doc_rows.setdefault(doc_id, []).append(len(chunk_ids))
+                    chunk_ids.append(chunk_id)
+                    yield tokenizer(text)
+
+            index = BM25Index.from_corpus(_corpus())
+            cached = _CachedIndex(index=index, chunk_ids=chunk_ids, doc_rows=doc_rows, version=version)
+            elapsed = time.perf_counter() - started
+            self._insert(project_id, cached, dirty=True)
+            self._persist(project_id, cached)
+            with self._lock:
+                self._builds += 1
+                self._build_seconds += elapsed
+
+            logger.info(
+                "BM25 index built for project %s (version %d): %d chunks indexed in %.2fs.",
+                project_id, version, len(chunk_ids), elapsed,
             )
+            return cached
 
+    def add_document(
+        self,
+        project_id: str,
+        version: int,
+        doc_id: str,
+        chunks: list,
+        tokenizer: Callable[[str], list[str]],
+    ) -> None:
+        """Apply a document's (re-)indexed chunks to the cached index.
+
+        Chunks previously indexed for the same document are tombstoned first,
+        so this also covers re-chunking.
+
+        Args:
+            project_id: Project the chunks belong to.
+            version: The project's index_version after this change.
+            doc_id: The document whose chunks are being indexed.
+            chunks: Objects with .id and .text (ChunkModel rows or similar).
+            tokenizer: A callable that takes a string and returns list[str].
+        """
+        with self._project_lock(project_id):
+            cached = self._claim_next_version(project_id, version)
+            if cached is None:
+                return
+
+            stale = cached.doc_rows.get(doc_id, [])
+            index = cached.index.without_documents(stale)
+            index, positions = index.with_documents(tokenizer(c.text) for c in chunks)
+
+            doc_rows = dict(cached.doc_rows)
+            doc_rows[doc_id] = positions.tolist()
+            self._store(project_id, version, index, [*cached.chunk_ids, *(c.id for c in chunks)], doc_rows)
             logger.info(
-                "BM25 index built for project %s: %d chunks indexed.",
-                project_id, chunk_count,
+                "BM25 index for project %s updated incrementally (version %d): +%d chunks, -%d stale.",
+                project_id, version, len(chunks), len(stale),
             )
-            return index, chunk_ids
 
-    def invalidate(self, project_id: str) -> None:
-        """Remove the cached index for a project, forcing a rebuild on next query."""
+    def remove_document(self, project_id: str, version: int, doc_id: str) -> None:
+        """Tombstone every chunk of a deleted document in the cached index.
+
+        Args:
+            project_id: Project the document belonged to.
+            version: The project's index_version after the deletion.
+            doc_id: The deleted document.
+        """
+        with self._project_lock(project_id):
+            cached = self._claim_next_version(project_id, version)
+            if cached is None:
+                return
+
+            doc_rows = {k: v for k, v in cached.doc_rows.items() if k != doc_id}
+            index = cached.index.without_documents(cached.doc_rows.get(doc_id, []))
+            self._store(project_id, version, index, cached.chunk_ids, doc_rows)
+            logger.info(
+                "BM25 index for project %s updated incrementally (version %d): document %s removed.",
+                project_id, version, doc_id,
+            )
+
+    def _project_lock(self, project_id: str) -> threading.Lock:
+        with self._lock:
+            lock = self._project_locks.get(project_id)
+            if lock is None:
+                lock = self._project_locks[project_id] = threading.Lock()
+            return lock
+
+    def _peek(self, project_id: str, version: int) -> Optional[_CachedIndex]:
+        """Like get(), without touching the LRU order or the hit/miss counters."""
+        with self._lock:
+            cached = self._cache.get(project_id)
+        if cached is not None and cached.version == version:
+            return cached
+        return None
+
+    def _claim_next_version(self, project_id: str, version: int) -> Optional[_CachedIndex]:
+        """Return the entry an incremental update at `version` can apply to (project lock held).
+
+        The update applies only on top of version - 1. If a query already rebuilt
+        the index at `version` there is nothing to do; any other gap means
+        updates were missed, so the entry is dropped and rebuilt lazily.
+        """
+        with self._lock:
+            cached = self._cache.get(project_id)
+        if cached is None and PERSIST:
+            # After a restart (or an eviction) the previous version may still be on disk
+            loaded = bm25_store.load_index(project_id, version - 1)
+            if loaded is not None:
+                index, chunk_ids, doc_rows = loaded
+                cached = _CachedIndex(index=index, chunk_ids=chunk_ids, doc_rows=doc_rows, version=version - 1)
+        if cached is None or cached.version == version:
+            return None
+        if cached.version != version - 1:
+            self._drop(project_id)
+            logger.info("BM25 cache for project %s is behind (version %d -> %d); dropping it.",
+                        project_id, cached.version, version)
+            return None
+        return cached
+
+    def _store(
+        self,
+        project_id: str,
+        version: int,
+        index: BM25Index,
+        chunk_ids: Sequence[str],
+        doc_rows: dict[str, list[int]],
+    ) -> None:
+        """Swap in an updated entry, compacting first when tombstones or segments pile up (project lock held)."""
+        cached = _CachedIndex(index=index, chunk_ids=chunk_ids, doc_rows=doc_rows, version=version)
+        if index.tombstone_ratio > TOMBSTONE_RATIO or len(index.segments) > MAX_SEGMENTS:
+            cached = _compact(cached)
+            logger.info("BM25 index for project %s compacted: %d live chunks.", project_id, cached.index.live_count)
+            self._insert(project_id, cached, dirty=True)
+            self._persist(project_id, cached)
+        else:
+            self._insert(project_id, cached, dirty=True)
+
+    def _insert(self, project_id: str, cached: _CachedIndex, dirty: bool) -> None:
+        """Add or replace an entry as most recently used, evicting others over budget."""
+        cached.nbytes = _entry_nbytes(cached)
+        evicted: list[tuple[str, _CachedIndex, bool]] = []
+        with self._lock:
+            old = self._cache.pop(project_id, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._cache[project_id] = cached
+            self._bytes += cached.nbytes
+            if dirty:
+                self._dirty.add(project_id)
+            else:
+                self._dirty.discard(project_id)
+
+            # Never evict the entry just inserted, even if it alone exceeds the budget
+            while self._bytes > self.max_bytes and len(self._cache) > 1:
+                victim_id, victim = self._cache.popitem(last=False)
+                self._bytes -= victim.nbytes
+                self._evictions += 1
+                was_dirty = victim_id in self._dirty
+                self._dirty.discard(victim_id)
+                evicted.append((victim_id, victim, was_dirty))
+
+        for victim_id, victim, was_dirty in evicted:
+            logger.info("BM25 index for project %s evicted (%.1f MB).", victim_id, victim.nbytes / 1e6)
+            if was_dirty:
+                self._persist_evicted(victim_id, victim)
+
+    def _persist_evicted(self, project_id: str, cached: _CachedIndex) -> None:
+        """Write an evicted entry's unsaved updates, unless its project is busy.
+
+        A busy project is mid-update and will insert a newer entry itself; waiting
+        for its lock here could deadlock with that thread's own evictions.
+        """
+        lock = self._project_lock(project_id)
+        if not lock.acquire(blocking=False):
+            return
+        try:
+            self._persist(project_id, _compact(cached))
+        finally:
+            lock.release()
+
+    def _persist(self, project_id: str, cached: _CachedIndex) -> None:
+        """Write a compacted entry to disk (project lock held). Failures only cost a rebuild later."""
+        if not PERSIST:
+            return
+        try:
+            bm25_store.save_index(project_id, cached.version, cached.index, cached.chunk_ids, cached.doc_rows)
+        except OSError as exc:
+            logger.warning("Failed to persist BM25 index for project %s: %s", project_id, exc)
+            return
+        with self._lock:
+            current = self._cache.get(project_id)
+            if current is not None and current.version == cached.version:
+                self._dirty.discard(project_id)
+
+    def _drop(self, project_id: str) -> Optional[_CachedIndex]:
         with self._lock:
             removed = self._cache.pop(project_id, None)
-            if removed:
-                logger.info("BM25 cache invalidated for project %s.", project_id)
+            if removed is not None:
+                self._bytes -= removed.nbytes
+            self._dirty.discard(project_id)
+            return removed
+
+    def flush(self) -> None:
+        """Persist every entry changed incrementally since it was last written."""
+        with self._lock:
+            dirty = list(self._dirty)
+        for project_id in dirty:
+            with self._project_lock(project_id):
+                with self._lock:
+                    cached = self._cache.get(project_id)
+                if cached is None:
+                    continue
+                self._persist(project_id, _compact(cached))
+
+    def invalidate(self, project_id: str) -> None:
+        """Remove the cached (and persisted) index for a project, e.g. when it is deleted."""
+        with self._project_lock(project_id):
+            removed = self._drop(project_id)
+            if PERSIST:
+                bm25_store.delete_index(project_id)
+        with self._lock:
+            self._project_locks.pop(project_id, None)
+        if removed:
+            logger.info("BM25 cache invalidated for project %s.", project_id)
 
     def invalidate_all(self) -> None:
         """Clear the entire cache (useful for testing or model changes)."""
         with self._lock:
             self._cache.clear()
+            self._dirty.clear()
+            self._bytes = 0
             logger.info("BM25 cache fully cleared.")
 
+    def stats(self) -> dict:
+        """Cache counters since startup."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._cache),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "builds": self._builds,
+                "build_seconds": round(self._build_seconds, 4),
+                "disk_loads": self._disk_loads,
+            }
+
+
+def _compact(cached: _CachedIndex) -> _CachedIndex:
+    """Return the entry with segments merged and tombstones dropped (itself if already compact)."""
+    index = cached.index
+    if index.live_count == index.corpus_size and len(index.segments) <= 1:
+        return cached
+    index, remap = index.compacted()
+    remap_list = remap.tolist()
+    chunk_ids = [cached.chunk_ids[old] for old, new in enumerate(remap_list) if new >= 0]
+    doc_rows = {
+        doc_id: [remap_list[pos] for pos in positions]
+        for doc_id, positions in cached.doc_rows.items()
+    }
+    return _CachedIndex(index=index, chunk_ids=chunk_ids, doc_rows=doc_rows, version=cached.version)
+
 
 # Module-level singleton
 _manager: Optional[BM25Manager] = None
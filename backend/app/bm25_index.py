@@ -0,0 +1,404 @@
+"""VERO BM25 Index: Sparse inverted-index Okapi BM25 scorer.
+
+Postings are stored in CSR form (term -> [doc_idx, tf] slices) alongside
+precomputed IDF values and per-document length norms. A query only touches
+the postings of its own terms, so scoring cost scales with the number of
+matching documents instead of the corpus size, and top-k selection uses
+`argpartition` instead of a full sort.
+
+The index is incremental: new documents are appended as extra postings
+segments and removed documents become tombstones, with document frequencies
+and length statistics kept in step so scores always equal those of a fresh
+build over the live documents. `compacted()` merges segments and drops
+tombstones. Every mutation returns a new BM25Index that shares the existing
+segments, so readers on other threads never observe a half-applied update.
+
+Scores match `rank_bm25.BM25Okapi` (k1=1.5, b=0.75, epsilon=0.25) within
+float tolerance, including its epsilon floor for negative IDF values.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+K1 = 1.5
+B = 0.75
+EPSILON = 0.25
+
+
+@dataclass(frozen=True)
+class _Segment:
+    """An immutable CSR block of postings for a contiguous range of documents."""
+    indptr: np.ndarray        # Postings of term t are indptr[t]:indptr[t+1]
+    postings_doc: np.ndarray  # Global document index of each posting (ascending within a term)
+    postings_tf: np.ndarray   # Term frequency of each posting
+
+    @property
+    def n_terms(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.postings_doc.nbytes + self.postings_tf.nbytes
+
+    def posting_terms(self) -> np.ndarray:
+        """Term id of each posting (the CSR row index, expanded)."""
+        return np.repeat(np.arange(self.n_terms, dtype=np.int64), np.diff(self.indptr))
+
+
+def _is_mapped(arr: np.ndarray) -> bool:
+    """True if the array is a view over a foreign buffer (e.g. an mmap'd file)."""
+    base = arr.base
+    while isinstance(base, np.ndarray):
+        base = base.base
+    return isinstance(base, memoryview)
+
+
+def _build_segment(
+    corpus: Iterable[list[str]],
+    vocab: dict[str, int],
+    doc_offset: int,
+) -> tuple[_Segment, list[int]]:
+    """Tokenized documents -> (segment, doc lengths). Adds unseen terms to `vocab` in place."""
+    term_ids: list[int] = []
+    doc_ids: list[int] = []
+    tfs: list[int] = []
+    doc_len: list[int] = []
+
+    for doc_idx, tokens in enumerate(corpus, start=doc_offset):
+        doc_len.append(len(tokens))
+        for term, tf in Counter(tokens).items():
+            term_ids.append(vocab.setdefault(term, len(vocab)))
+            doc_ids.append(doc_idx)
+            tfs.append(tf)
+
+    term_arr = np.asarray(term_ids, dtype=np.int64)
+    # Stable sort keeps documents ascending inside each term's postings
+    order = np.argsort(term_arr, kind="stable")
+    counts = np.bincount(term_arr, minlength=len(vocab))
+    indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+
+    segment = _Segment(
+        indptr=indptr,
+        postings_doc=np.asarray(doc_ids, dtype=np.int32)[order],
+        postings_tf=np.asarray(tfs, dtype=np.float32)[order],
+    )
+    return segment, doc_len
+
+
+class _LayeredVocab:
+    """A read-only base vocabulary (e.g. memory-mapped from disk) plus in-memory additions."""
+
+    def __init__(self, base):
+        self.base = base
+        self.extra: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.extra)
+
+    def get(self, term: str, default=None):
+        term_id = self.base.get(term)
+        if term_id is None:
+            return self.extra.get(term, default)
+        return term_id
+
+    def setdefault(self, term: str, default: int) -> int:
+        term_id = self.get(term)
+        if term_id is None:
+            self.extra[term] = term_id = default
+        return term_id
+
+    def items(self):
+        yield from self.base.items()
+        yield from self.extra.items()
+
+
+class BM25Index:
+    """Okapi BM25 index over a tokenized corpus (copy-on-write).
+
+    Attributes:
+        vocab: term -> term id (shared across versions, only ever grows). Anything
+            with get()/items()/len() works, e.g. a memory-mapped term table.
+        segments: Postings blocks, in ascending document order.
+        doc_len: Token count per document.
+        live: False for tombstoned documents.
+        df: Live document frequency per term.
+        idf: Per-term IDF over live documents (epsilon-floored like BM25Okapi).
+        norms: Per-document `k1 * (1 - b + b * dl / avgdl)` length norm.
+    """
+
+    def __init__(
+        self,
+        vocab: dict[str, int],
+        segments: list[_Segment],
+        doc_len: np.ndarray,
+        live: np.ndarray,
+        df: np.ndarray,
+        k1: float = K1,
+        b: float = B,
+        epsilon: float = EPSILON,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        self.vocab = vocab
+        self.segments = segments
+        self.doc_len = doc_len
+        self.live = live
+        self.df = df
+        self.live_count = int(live.sum())
+        self.idf = self._compute_idf()
+        self.norms = self._compute_norms()
+
+    @classmethod
+    def from_corpus(
+        cls,
+        corpus: Iterable[list[str]],
+        k1: float = K1,
+        b: float = B,
+        epsilon: float = EPSILON,
+    ) -> "BM25Index":
+        """Build an index from tokenized documents (one token list per document)."""
+        vocab: dict[str, int] = {}
+        segment, doc_len = _build_segment(corpus, vocab, doc_offset=0)
+        return cls(
+            vocab=vocab,
+            segments=[segment] if doc_len else [],
+            doc_len=np.asarray(doc_len, dtype=np.int32),
+            live=np.ones(len(doc_len), dtype=bool),
+            df=np.diff(segment.indptr),
+            k1=k1,
+            b=b,
+            epsilon=epsilon,
+        )
+
+    @property
+    def corpus_size(self) -> int:
+        """Number of document slots, tombstones included."""
+        return len(self.doc_len)
+
+    @property
+    def tombstone_ratio(self) -> float:
+        if not self.corpus_size:
+            return 0.0
+        return 1.0 - self.live_count / self.corpus_size
+
+    @property
+    def nbytes(self) -> int:
+        """Heap memory held by the index arrays (excludes the vocab).
+
+        Arrays mapped from a file are not counted: they live in the shared page cache.
+        """
+        arrays = [self.doc_len, self.live, self.df, self.idf, self.norms]
+        for seg in self.segments:
+            arrays += [seg.indptr, seg.postings_doc, seg.postings_tf]
+        return sum(arr.nbytes for arr in arrays if not _is_mapped(arr))
+
+    def _derive(self, segments, doc_len, live, df, vocab=None) -> "BM25Index":
+        return BM25Index(
+            vocab=self.vocab if vocab is None else vocab,
+            segments=segments,
+            doc_len=doc_len,
+            live=live,
+            df=df,
+            k1=self.k1,
+            b=self.b,
+            epsilon=self.epsilon,
+        )
+
+    def with_documents(self, corpus: Iterable[list[str]]) -> tuple["BM25Index", np.ndarray]:
+        """Return (new index with the documents appended, their document indices)."""
+        offset = self.corpus_size
+        # The vocab is shared: appending terms is invisible to older versions,
+        # whose arrays simply do not reach the new term ids. A read-only
+        # (memory-mapped) vocab gets an in-memory layer for the new terms.
+        vocab = self.vocab if hasattr(self.vocab, "setdefault") else _LayeredVocab(self.vocab)
+        segment, doc_len = _build_segment(corpus, vocab, doc_offset=offset)
+        new_indices = np.arange(offset, offset + len(doc_len), dtype=np.int64)
+        if not doc_len:
+            return self, new_indices
+
+        df = np.zeros(len(vocab), dtype=np.int64)
+        df[: len(self.df)] = self.df
+        df[: segment.n_terms] += np.diff(segment.indptr)
+        return (
+            self._derive(
+                segments=[*self.segments, segment],
+                doc_len=np.concatenate([self.doc_len, np.asarray(doc_len, dtype=np.int32)]),
+                live=np.concatenate([self.live, np.ones(len(doc_len), dtype=bool)]),
+                df=df,
+                vocab=vocab,
+            ),
+            new_indices,
+        )
+
+    def without_documents(self, doc_indices: Iterable[int]) -> "BM25Index":
+        """Return a new index with the given documents tombstoned."""
+        removed = np.asarray(list(doc_indices), dtype=np.int64)
+        removed = removed[self.live[removed]] if removed.size else removed
+        if not removed.size:
+            return self
+
+        live = self.live.copy()
+        live[removed] = False
+        df = self.df.copy()
+        for seg in self.segments:
+            hit = self.live[seg.postings_doc] & ~live[seg.postings_doc]
+            if hit.any():
+                df[: seg.n_terms] -= np.bincount(seg.posting_terms()[hit], minlength=seg.n_terms)
+        return self._derive(segments=self.segments, doc_len=self.doc_len, live=live, df=df)
+
+    def compacted(self) -> tuple["BM25Index", np.ndarray]:
+        """Merge all segments and drop tombstones (and terms left without postings).
+
+        Returns:
+            (new index, old->new document index map with -1 for dropped documents).
+        """
+        remap = np.full(self.corpus_size, -1, dtype=np.int64)
+        remap[self.live] = np.arange(self.live_count)
+
+        keep_terms = np.flatnonzero(self.df > 0)
+        term_remap = np.full(len(self.df), -1, dtype=np.int64)
+        term_remap[keep_terms] = np.arange(len(keep_terms))
+        id_to_term = {term_id: term for term, term_id in self.vocab.items()}
+        vocab = {id_to_term[old]: new for new, old in enumerate(keep_terms.tolist())}
+
+        terms = [np.empty(0, dtype=np.int64)]
+        docs = [np.empty(0, dtype=np.int64)]
+        tfs = [np.empty(0, dtype=np.float32)]
+        for seg in self.segments:
+            alive = self.live[seg.postings_doc]
+            terms.append(term_remap[seg.posting_terms()[alive]])
+            docs.append(remap[seg.postings_doc[alive]])
+            tfs.append(seg.postings_tf[alive])
+        term_arr, doc_arr, tf_arr = np.concatenate(terms), np.concatenate(docs), np.concatenate(tfs)
+
+        # Segments are in document order, so a stable sort by term keeps docs ascending
+        order = np.argsort(term_arr, kind="stable")
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_arr, minlength=len(vocab)), out=indptr[1:])
+        segment = _Segment(
+            indptr=indptr,
+            postings_doc=doc_arr[order].astype(np.int32),
+            postings_tf=tf_arr[order].astype(np.float32),
+        )
+        index = BM25Index(
+            vocab=vocab,
+            segments=[segment] if self.live_count else [],
+            doc_len=self.doc_len[self.live],
+            live=np.ones(self.live_count, dtype=bool),
+            df=np.diff(indptr),
+            k1=self.k1,
+            b=self.b,
+            epsilon=self.epsilon,
+        )
+        return index, remap
+
+    def _compute_idf(self) -> np.ndarray:
+        n = self.live_count
+        df = self.df.astype(np.float64)
+        idf = np.zeros(len(df))
+        present = df > 0
+        if not present.any():
+            return idf
+        idf[present] = np.log(n - df[present] + 0.5) - np.log(df[present] + 0.5)
+        # BM25Okapi floors negative IDFs (terms in > half the docs) at epsilon * mean idf,
+        # where the mean runs over terms that occur in the (live) corpus
+        eps = self.epsilon * (float(idf[present].sum()) / int(present.sum()))
+        idf[present & (idf < 0)] = eps
+        return idf
+
+    def _compute_norms(self) -> np.ndarray:
+        doc_len = self.doc_len.astype(np.float64)
+        avgdl = float(doc_len[self.live].sum()) / self.live_count if self.live_count else 0.0
+        if avgdl == 0:
+            return np.full(len(doc_len), self.k1 * (1 - self.b))
+        return self.k1 * (1 - self.b + self.b * doc_len / avgdl)
+
+    def _postings(self, query_tokens: list[str]) -> tuple[np.ndarray, np.ndarray, int]:
+        """Return (doc indices, score contributions, matched terms) for the query's postings."""
+        has_tombstones = self.live_count < self.corpus_size
+        docs: list[np.ndarray] = []
+        contribs: list[np.ndarray] = []
+        matched = 0
+        for token in query_tokens:
+            term_id = self.vocab.get(token)
+            # Term ids past our arrays were added by a newer version sharing the vocab
+            if term_id is None or term_id >= len(self.df) or not self.df[term_id]:
+                continue
+            matched += 1
+            for seg in self.segments:
+                if term_id >= seg.n_terms:
+                    continue
+                start, end = seg.indptr[term_id], seg.indptr[term_id + 1]
+                d = seg.postings_doc[start:end]
+                tf = seg.postings_tf[start:end].astype(np.float64)
+                if has_tombstones:
+                    alive = self.live[d]
+                    d, tf = d[alive], tf[alive]
+                docs.append(d)
+                contribs.append(self.idf[term_id] * (tf * (self.k1 + 1) / (tf + self.norms[d])))
+        if not docs:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64), 0
+        return np.concatenate(docs), np.concatenate(contribs), matched
+
+    def score(self, query_tokens: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Score every live document containing at least one query token.
+
+        Returns:
+            (doc indices ascending, scores) for matching documents only.
+            Documents absent from the result score exactly 0.
+        """
+        docs, contribs, n_terms = self._postings(query_tokens)
+        if n_terms <= 1:
+            # A single term's postings are already unique and ascending across segments
+            return docs, contribs
+
+        # bincount accumulates in array (= query-token) order, like BM25Okapi.
+        # Few hits: aggregate sparsely. Many hits: a dense accumulator is cheaper than sorting.
+        if docs.size * 8 < self.corpus_size:
+            unique_docs, inverse = np.unique(docs, return_inverse=True)
+            return unique_docs, np.bincount(inverse, weights=contribs, minlength=len(unique_docs))
+
+        dense = np.bincount(docs, weights=contribs, minlength=self.corpus_size)
+        hit = np.zeros(self.corpus_size, dtype=bool)
+        hit[docs] = True
+        unique_docs = np.flatnonzero(hit)
+        return unique_docs, dense[unique_docs]
+
+    def get_scores(self, query_tokens: list[str]) -> np.ndarray:
+        """Dense score vector over the whole corpus (BM25Okapi-compatible)."""
+        dense = np.zeros(self.corpus_size)
+        docs, scores = self.score(query_tokens)
+        dense[docs] = scores
+        return dense
+
+    def top_k(self, query_tokens: list[str], k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the k best positive-scoring documents, sorted by score descending.
+
+        Ties are broken by document index so the ordering is identical to a
+        stable descending sort over the full score list.
+        """
+        docs, scores = self.score(query_tokens)
+        positive = scores > 0
+        docs, scores = docs[positive], scores[positive]
+        if k <= 0 or docs.size == 0:
+            return docs[:0], scores[:0]
+
+        if docs.size > k:
+            part = np.argpartition(-scores, k - 1)[:k]
+            kth = scores[part].min()
+            # Keep everything strictly above the k-th score, then fill with the
+            # lowest-index ties (docs is ascending, so flatnonzero preserves that)
+            above = np.flatnonzero(scores > kth)
+            ties = np.flatnonzero(scores == kth)[: k - len(above)]
+            keep = np.concatenate([above, ties])
+            docs, scores = docs[keep], scores[keep]
+
+        order = np.lexsort((docs, -scores))
+        return docs[order], scores[order]
@@ -0,0 +1,290 @@
+"""VERO BM25 Store: Persistent, memory-mapped keyword indexes.
+
+Each project's compacted BM25 index is written to backend/data/bm25/ as one
+binary file and loaded lazily with `mmap`, so a restart does not pay a full
+tokenize-and-build, and worker processes share the same page-cache pages.
+
+File layout (little-endian, every section 8-byte aligned):
+
+    header      magic "VRBM25", format version, index_version stamp,
+                section counts, k1/b/epsilon
+    indptr      int64[n_terms + 1]   CSR row pointers (term id = sorted rank)
+    post_doc    int32[nnz]           posting document indices
+    post_tf     float32[nnz]         posting term frequencies
+    doc_len     int32[n_docs]        tokens per document (chunk)
+    chunk_doc   int32[n_docs]        row in the doc-id table for each chunk
+    terms       offsets + UTF-8 blob, sorted bytewise (binary-searched, never loaded)
+    chunk_ids   offsets + UTF-8 blob
+    doc_ids     offsets + UTF-8 blob
+
+The header stamp is the project's `index_version`; a file whose stamp does not
+match the requested version is stale and ignored (the caller rebuilds it).
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+from app.bm25_index import BM25Index, _Segment
+
+logger = logging.getLogger(__name__)
+
+# Persistent storage directory
+_BM25_DIR = Path(__file__).resolve().parent.parent / "data" / "bm25"
+
+_MAGIC = b"VRBM25"
+_FORMAT_VERSION = 1
+# magic, format, stamp, n_terms, nnz, n_docs, n_doc_ids, terms_blob, chunks_blob, docs_blob, k1, b, epsilon
+_HEADER = struct.Struct("<6sHqqqqqqqqddd")
+
+
+def index_path(project_id: str) -> Path:
+    return _BM25_DIR / f"{project_id}.bm25"
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+class MappedStrings(Sequence[str]):
+    """Read-only sequence of strings backed by an offsets array and a UTF-8 blob."""
+
+    def __init__(self, offsets: np.ndarray, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def raw(self, i: int) -> bytes:
+        return bytes(self._blob[int(self._offsets[i]):int(self._offsets[i + 1])])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return self.raw(i).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self.raw(i).decode("utf-8")
+
+
+class MappedVocab:
+    """Read-only term -> id lookup over a bytewise-sorted term table (id = sorted rank)."""
+
+    def __init__(self, terms: MappedStrings):
+        self._terms = terms
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def get(self, term: str, default=None):
+        key = term.encode("utf-8")
+        lo, hi = 0, len(self._terms)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._terms.raw(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._terms) and self._terms.raw(lo) == key:
+            return lo
+        return default
+
+    def __contains__(self, term: str) -> bool:
+        return self.get(term) is not None
+
+    def items(self) -> Iterator[tuple[str, int]]:
+        for term_id, term in enumerate(self._terms):
+            yield term, term_id
+
+
+def _pack_strings(values: list[bytes]) -> tuple[np.ndarray, bytes]:
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum([len(v) for v in values], out=offsets[1:])
+    return offsets, b"".join(values)
+
+
+def save_index(
+    project_id: str,
+    version: int,
+    index: BM25Index,
+    chunk_ids: Sequence[str],
+    doc_rows: dict[str, list[int]],
+) -> None:
+    """Write a compacted index to disk atomically (temp file + rename).
+
+    The index must have a single segment and no tombstones (see BM25Index.compacted()).
+    """
+    assert index.live_count == index.corpus_size and len(index.segments) <= 1
+
+    # Renumber terms by their sorted UTF-8 bytes so lookups can binary-search the file
+    terms = [None] * len(index.df)
+    for term, term_id in index.vocab.items():
+        if term_id < len(terms):
+            terms[term_id] = term.encode("utf-8")
+    order = sorted(range(len(terms)), key=terms.__getitem__)
+    rank = np.empty(len(terms), dtype=np.int64)
+    rank[order] = np.arange(len(terms))
+
+    if index.segments:
+        seg = index.segments[0]
+        new_terms = rank[seg.posting_terms()]
+        perm = np.argsort(new_terms, kind="stable")
+        post_doc = seg.postings_doc[perm].astype(np.int32)
+        post_tf = seg.postings_tf[perm].astype(np.float32)
+        indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(new_terms, minlength=len(terms)), out=indptr[1:])
+    else:
+        post_doc = np.empty(0, dtype=np.int32)
+        post_tf = np.empty(0, dtype=np.float32)
+        indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+
+    doc_table = list(doc_rows)
+    chunk_doc = np.zeros(index.corpus_size, dtype=np.int32)
+    for row, doc_id in enumerate(doc_table):
+        chunk_doc[doc_rows[doc_id]] = row
+
+    term_offsets, term_blob = _pack_strings([terms[i] for i in order])
+    chunk_offsets, chunk_blob = _pack_strings([c.encode("utf-8") for c in chunk_ids])
+    doc_offsets, doc_blob = _pack_strings([d.encode("utf-8") for d in doc_table])
+
+    header = _HEADER.pack(
+        _MAGIC, _FORMAT_VERSION, version,
+        len(terms), len(post_doc), index.corpus_size, len(doc_table),
+        len(term_blob), len(chunk_blob), len(doc_blob),
+        index.k1, index.b, index.epsilon,
+    )
+    sections = [
+        indptr, post_doc, post_tf, index.doc_len.astype(np.int32), chunk_doc,
+        term_offsets, term_blob, chunk_offsets, chunk_blob, doc_offsets, doc_blob,
+    ]
+
+    path = index_path(project_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".tmp{os.getpid()}")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(b"\0" * (_align(len(header)) - len(header)))
+        for section in sections:
+            data = section.tobytes() if isinstance(section, np.ndarray) else section
+            f.write(data)
+            f.write(b"\0" * (_align(len(data)) - len(data)))
+    try:
+        # Processes that still map the old file keep reading the old inode
+        os.replace(tmp, path)
+    except OSError as exc:
+        # Windows refuses to replace a file another process has mapped; keep the old one
+        tmp.unlink(missing_ok=True)
+        logger.warning("BM25 index for project %s not saved: %s", project_id, exc)
+        return
+    logger.info("BM25 index for project %s saved (version %d, %d chunks).", project_id, version, index.corpus_size)
+
+
+def _map_sections(mm: mmap.mmap, n_terms: int, nnz: int, n_docs: int, n_doc_ids: int,
+                  terms_blob: int, chunks_blob: int, docs_blob: int) -> tuple:
+    """Zero-copy views of the index sections that follow the header."""
+    buf = memoryview(mm)
+    pos = _align(_HEADER.size)
+
+    def take_array(dtype, count):
+        nonlocal pos
+        arr = np.frombuffer(buf, dtype=dtype, count=count, offset=pos)
+        pos += _align(arr.nbytes)
+        return arr
+
+    def take_blob(size):
+        nonlocal pos
+        blob = buf[pos:pos + size]
+        pos += _align(size)
+        return blob
+
+    indptr = take_array(np.int64, n_terms + 1)
+    post_doc = take_array(np.int32, nnz)
+    post_tf = take_array(np.float32, nnz)
+    doc_len = take_array(np.int32, n_docs)
+    chunk_doc = take_array(np.int32, n_docs)
+    terms = MappedStrings(take_array(np.int64, n_terms + 1), take_blob(terms_blob))
+    chunk_ids = MappedStrings(take_array(np.int64, n_docs + 1), take_blob(chunks_blob))
+    doc_ids = MappedStrings(take_array(np.int64, n_doc_ids + 1), take_blob(docs_blob))
+    return indptr, post_doc, post_tf, doc_len, chunk_doc, terms, chunk_ids, doc_ids
+
+
+def _close_map(mm: mmap.mmap) -> None:
+    """Unmap a file that will not be used, unless views of it are still alive (then the GC does it)."""
+    try:
+        mm.close()
+    except BufferError:
+        pass
+
+
+def load_index(
+    project_id: str,
+    version: int,
+) -> Optional[tuple[BM25Index, MappedStrings, dict[str, list[int]]]]:
+    """Map a project's index file if its stamp matches `version`.
+
+    The mapping is closed again on every path that returns None.
+
+    Returns:
+        (index, chunk_ids, doc_rows) or None when the file is missing, stale or unreadable.
+    """
+    path = index_path(project_id)
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    sections = None
+    try:
+        (magic, fmt, stamp, n_terms, nnz, n_docs, n_doc_ids,
+         terms_blob, chunks_blob, docs_blob, k1, b, epsilon) = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC or fmt != _FORMAT_VERSION:
+            logger.warning("BM25 index file %s has an unknown format; ignoring it.", path)
+        elif stamp != version:
+            logger.info("BM25 index file for project %s is stale (version %d != %d).", project_id, stamp, version)
+        else:
+            sections = _map_sections(mm, n_terms, nnz, n_docs, n_doc_ids, terms_blob, chunks_blob, docs_blob)
+    except (struct.error, ValueError) as exc:
+        logger.warning("BM25 index file %s is unreadable (%s); ignoring it.", path, exc)
+    # Outside the except block, so views made before a failure are already released
+    if sections is None:
+        _close_map(mm)
+        return None
+    indptr, post_doc, post_tf, doc_len, chunk_doc, terms, chunk_ids, doc_ids = sections
+
+    index = BM25Index(
+        vocab=MappedVocab(terms),
+        segments=[_Segment(indptr=indptr, postings_doc=post_doc, postings_tf=post_tf)] if n_docs else [],
+        doc_len=doc_len,
+        live=np.ones(n_docs, dtype=bool),
+        df=np.diff(indptr),
+        k1=k1,
+        b=b,
+        epsilon=epsilon,
+    )
+
+    doc_rows: dict[str, list[int]] = {}
+    if n_docs:
+        order = np.argsort(chunk_doc, kind="stable")
+        bounds = np.searchsorted(chunk_doc[order], np.arange(n_doc_ids + 1))
+        for row, doc_id in enumerate(doc_ids):
+            doc_rows[doc_id] = order[bounds[row]:bounds[row + 1]].tolist()
+
+    logger.info("BM25 index for project %s mapped from disk (version %d, %d chunks).", project_id, version, n_docs)
+    return index, chunk_ids, doc_rows
+
+
+def delete_index(project_id: str) -> None:
+    """Remove a project's index file, if any."""
+    index_path(project_id).unlink(missing_ok=True)
@@ -0,0 +1,84 @@
+"""VERO Chunk Store: Set-based persistence of a document's chunk set.
+
+Chunk rows are written with one Core executemany instead of one ORM object
+per chunk, so a large document skips identity-map bookkeeping and per-object
+flush work. Replacing a chunk set selects the old ids, deletes their embedding
+records and rows with two set-based statements, and hands the old ids back so
+the caller can drop their vectors from Chroma in a single call once the
+transaction has committed. Streamed chunking clears the old set the same way
+and then appends each batch of new chunks as the chunker produces it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Sequence
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.embedding_store import delete_embedding_records
+from app.models import ChunkModel
+from app.schema import ChunkResponse
+
+logger = logging.getLogger(__name__)
+
+
+def chunk_rows(chunks: Sequence[ChunkResponse]) -> list[dict]:
+    """Column dicts for a Core insert; metadata is serialized in one pass."""
+    created_at = datetime.now(timezone.utc)
+    metadata = [json.dumps(c.metadata) for c in chunks]
+    return [
+        {
+            "id": c.id,
+            "doc_id": c.doc_id,
+            "project_id": c.project_id,
+            "text": c.text,
+            "start_char": c.start_char,
+            "end_char": c.end_char,
+            "token_count": c.token_count,
+            "strategy": c.strategy,
+            "metadata_json": meta,
+            "created_at": created_at,
+        }
+        for c, meta in zip(chunks, metadata)
+    ]
+
+
+async def replace_chunks(db: AsyncSession, doc_id: str, chunks: Sequence[ChunkResponse]) -> list[str]:
+    """Replace a document's chunks (and drop their embedding records) in the current transaction.
+
+    Returns:
+        Ids of the removed chunks, for remove_chunk_vectors() after commit.
+    """
+    old_ids = list((await db.execute(select(ChunkModel.id).where(ChunkModel.doc_id == doc_id))).scalars())
+    if old_ids:
+        await delete_embedding_records(db, doc_id)
+        await db.execute(delete(ChunkModel).where(ChunkModel.doc_id == doc_id))
+    if chunks:
+        await db.execute(insert(ChunkModel.__table__), chunk_rows(chunks))
+    return old_ids
+
+
+async def append_chunks(db: AsyncSession, chunks: Sequence[ChunkResponse]) -> None:
+    """Insert more chunks for a document in the current transaction (streamed chunking)."""
+    if chunks:
+        await db.execute(insert(ChunkModel.__table__), chunk_rows(chunks))
+
+
+async def remove_chunk_vectors(project_id: str, chunk_ids: list[str]) -> None:
+    """Delete replaced chunks' vectors from the project's collection in one call.
+
+    Failures are logged, not raised: retrieval drops hits whose chunk row is gone.
+    """
+    if not chunk_ids:
+        return
+    from app import vectorstore
+
+    try:
+        await run_in_threadpool(vectorstore.delete_chunk_vectors, project_id, chunk_ids)
+    except Exception as exc:
+        logger.warning("Could not delete %d stale vectors for project %s: %s", len(chunk_ids), project_id, exc)
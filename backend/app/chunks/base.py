@@ -1,5 +1,7 @@
 """VERO Chunking Base: Abstract class for token-aware chunking strategies."""
 
+import os
+
 import tiktoken
 from app.schema import ChunkResponse
 
@@ -7,6 +9,11 @@ from app.schema import ChunkResponse
 # This ensures our chunks precisely map to token windows for embedding generation in Layer 3.
 _TOKENIZER = tiktoken.get_encoding("cl100k_base")
 
+# Streaming chunkers cut their buffer at a section boundary once it holds this many characters
+STREAM_FLUSH_CHARS = int(os.environ.get("VERO_CHUNK_STREAM_CHARS", "65536"))
+# ...and at a line break (or anywhere) past this many, when no section boundary came
+STREAM_MAX_CHARS = int(os.environ.get("VERO_CHUNK_STREAM_MAX_CHARS", str(4 * STREAM_FLUSH_CHARS)))
+
 
 class BaseChunker:
     """Abstract base class for chunking strategies."""
@@ -27,3 +34,31 @@ class BaseChunker:
             doc_title: Document title for contextual chunk headers.
         """
         raise NotImplementedError("Subclasses must implement chunk()")
+
+    def stream(self, doc_id: str, project_id: str, doc_title: str = "") -> "ChunkStream":
+        """Incremental counterpart of chunk() for text that arrives in pieces."""
+        return ChunkStream(self, doc_id, project_id, doc_title)
+
+
+class ChunkStream:
+    """Incremental chunking: feed() text in document order, then close().
+
+    Both return the chunks completed by that call, so the caller can store them
+    before reading on. This base version buffers everything and chunks on
+    close(); strategies override it to cut the buffer at safe boundaries.
+    """
+
+    def __init__(self, chunker: BaseChunker, doc_id: str, project_id: str, doc_title: str = ""):
+        self.chunker = chunker
+        self.doc_id = doc_id
+        self.project_id = project_id
+        self.doc_title = doc_title
+        self._parts: list[str] = []
+
+    def feed(self, text: str) -> list[ChunkResponse]:
+        self._parts.append(text)
+        return []
+
+    def close(self) -> list[ChunkResponse]:
+        text, self._parts = "".join(self._parts), []
+        return self.chunker.chunk(text, doc_id=self.doc_id, project_id=self.project_id, doc_title=self.doc_title)
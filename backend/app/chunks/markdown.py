@@ -5,7 +5,7 @@ import re
 import uuid
 from langchain_text_splitters import MarkdownHeaderTextSplitter, RecursiveCharacterTextSplitter
 from app.schema import ChunkResponse
-from .base import BaseChunker
+from .base import STREAM_FLUSH_CHARS, STREAM_MAX_CHARS, BaseChunker, ChunkStream
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +54,15 @@ def _restore_tables(text: str, table_map: dict[str, str]) -> str:
     return text
 
 
+def _heading(line: str, headers_to_split_on: list[tuple[str, str]]) -> tuple[str, str] | None:
+    """(metadata key, title) if the line is a heading MarkdownHeaderTextSplitter splits on."""
+    stripped = "".join(filter(str.isprintable, line.strip()))
+    for sep, name in sorted(headers_to_split_on, key=lambda h: len(h[0]), reverse=True):
+        if stripped.startswith(sep) and (len(stripped) == len(sep) or stripped[len(sep)] == " "):
+            return name, stripped[len(sep):].strip()
+    return None
+
+
 def _build_breadcrumbs(metadata: dict) -> str:
     """Build breadcrumb string from heading metadata in explicit key order.
     
@@ -94,23 +103,44 @@ class MarkdownChunker(BaseChunker):
             ("###", "Header 3"),
         ]
 
+    def _fallback_splitter(self) -> RecursiveCharacterTextSplitter:
+        # Note (Gap 5): "gpt-3.5-turbo" maps to cl100k_base tokenizer.
+        # This is an approximation — see class docstring for rationale.
+        return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+            model_name="gpt-3.5-turbo",
+            chunk_size=self.token_limit,
+            chunk_overlap=self.overlap,
+        )
+
     def chunk(self, text: str, doc_id: str, project_id: str, doc_title: str = "") -> list[ChunkResponse]:
+        return self._chunk_text(text, doc_id, project_id, doc_title, self._fallback_splitter())
+
+    def stream(self, doc_id: str, project_id: str, doc_title: str = "") -> "MarkdownChunkStream":
+        return MarkdownChunkStream(self, doc_id, project_id, doc_title)
+
+    def _chunk_text(
+        self, text: str, doc_id: str, project_id: str, doc_title: str,
+        fallback_splitter: RecursiveCharacterTextSplitter,
+        headings: dict[str, str] | None = None, base_offset: int = 0,
+    ) -> list[ChunkResponse]:
+        """Chunk `text`, which may be one piece of a longer document.
+
+        `headings` are the headings in force where the piece starts (a streamed
+        piece always begins at a heading or at the document start), and
+        `base_offset` is where it starts in the whole document.
+        """
         # Step 1: Protect tables from being split
         protected_text, table_map = _protect_tables(text)
+        if headings:
+            # Re-open the enclosing sections so breadcrumbs match a whole-document split
+            prefix = "".join(f"{sep} {headings[name]}\n" for sep, name in self.headers_to_split_on if name in headings)
+            protected_text = prefix + protected_text
         
         # Step 2: Split by headers
         md_splitter = MarkdownHeaderTextSplitter(headers_to_split_on=self.headers_to_split_on)
         splits = md_splitter.split_text(protected_text)
         
         # Step 3: Sub-split oversized sections (token-aware)
-        # Note (Gap 5): "gpt-3.5-turbo" maps to cl100k_base tokenizer.
-        # This is an approximation — see class docstring for rationale.
-        fallback_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-            model_name="gpt-3.5-turbo",
-            chunk_size=self.token_limit,
-            chunk_overlap=self.overlap,
-        )
-        
         final_chunks = fallback_splitter.split_documents(splits)
 
         # Step 4: Build response chunks with restored tables and breadcrumbs
@@ -167,11 +197,106 @@ class MarkdownChunker(BaseChunker):
                 doc_id=doc_id,
                 project_id=project_id,
                 text=contextualized_text,
-                start_char=start_idx,
-                end_char=end_idx,
+                start_char=start_idx + base_offset if end_idx else 0,
+                end_char=end_idx + base_offset if end_idx else 0,
                 token_count=token_count,
                 strategy="markdown",
                 metadata={"breadcrumbs": breadcrumbs}
             ))
 
         return response_chunks
+
+
+class MarkdownChunkStream(ChunkStream):
+    """Streams Markdown through MarkdownChunker, cutting only at heading lines.
+
+    MarkdownHeaderTextSplitter never lets a section cross a heading, so pieces
+    cut there (outside code fences) chunk exactly like the whole document once
+    the enclosing headings are carried over. A section longer than
+    STREAM_MAX_CHARS (text without headings, such as a plain extracted PDF) is
+    cut at its last line break outside a code fence instead, or anywhere when
+    it has none; chunks never span those cuts, so boundaries there can differ
+    from chunking the whole document. The buffer holds at most about
+    STREAM_MAX_CHARS plus one fed block.
+    """
+
+    def __init__(self, chunker: MarkdownChunker, doc_id: str, project_id: str, doc_title: str = ""):
+        super().__init__(chunker, doc_id, project_id, doc_title)
+        self._splitter = chunker._fallback_splitter()
+        self._size = 0                          # Characters in _parts
+        self._buffer = ""                       # _parts joined, while a cut is looked for
+        self._scanned = 0                       # Buffer offset up to which complete lines were scanned
+        self._fence = ""                        # Open code fence at the scan position
+        self._headings: dict[str, str] = {}     # In force at the start of the buffer
+        self._running: dict[str, str] = {}      # In force at the scan position
+        self._cut: tuple[int, dict] | None = None  # Last heading line start > 0, headings before it
+        self._line_end: int | None = None       # End of the last scanned line outside a code fence
+        self._offset = 0                        # Normalized characters already chunked
+
+    def feed(self, text: str) -> list[ChunkResponse]:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size < STREAM_FLUSH_CHARS:
+            return []
+        self._buffer = "".join(self._parts)
+        self._parts = [self._buffer]
+        self._scan()
+        if self._cut is not None:
+            cut, headings = self._cut
+        elif self._size >= STREAM_MAX_CHARS:
+            # No heading to cut at: any heading in the buffer sits at its start,
+            # so the headings in force at the line break are the running ones
+            cut = self._line_end or len(self._buffer)
+            headings = dict(self._running)
+        else:
+            self._buffer = ""
+            return []
+        piece, rest = self._buffer[:cut], self._buffer[cut:]
+        self._buffer = ""
+        self._parts = [rest] if rest else []
+        self._size = len(rest)
+        self._scanned = max(self._scanned - cut, 0)
+        self._cut = self._line_end = None
+        chunks = self._chunk(piece)
+        self._headings = headings
+        return chunks
+
+    def close(self) -> list[ChunkResponse]:
+        piece, self._parts, self._size = "".join(self._parts), [], 0
+        return self._chunk(piece) if piece else []
+
+    def _chunk(self, piece: str) -> list[ChunkResponse]:
+        chunks = self.chunker._chunk_text(
+            piece, self.doc_id, self.project_id, self.doc_title, self._splitter,
+            headings=self._headings, base_offset=self._offset,
+        )
+        self._offset += len(piece.replace("\r\n", "\n"))
+        return chunks
+
+    def _scan(self) -> None:
+        """Track code fences and headings over newly completed lines, mirroring MarkdownHeaderTextSplitter."""
+        headers = self.chunker.headers_to_split_on
+        levels = [name for _, name in sorted(headers, key=lambda h: len(h[0]))]
+        while (end := self._buffer.find("\n", self._scanned)) != -1:
+            start, self._scanned = self._scanned, end + 1
+            stripped = "".join(filter(str.isprintable, self._buffer[start:end].strip()))
+            if not self._fence:
+                if stripped.startswith("```") and stripped.count("```") == 1:
+                    self._fence = "```"
+                elif stripped.startswith("~~~"):
+                    self._fence = "~~~"
+            elif stripped.startswith(self._fence):
+                self._fence = ""
+            if self._fence:
+                continue
+            self._line_end = self._scanned
+            heading = _heading(stripped, headers)
+            if heading is None:
+                continue
+            name, title = heading
+            if start > 0:
+                self._cut = (start, dict(self._running))
+            # A heading closes every section at its level or deeper
+            for deeper in levels[levels.index(name):]:
+                self._running.pop(deeper, None)
+            self._running[name] = title
@@ -3,7 +3,7 @@
 import uuid
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from app.schema import ChunkResponse
-from .base import BaseChunker
+from .base import STREAM_FLUSH_CHARS, STREAM_MAX_CHARS, BaseChunker, ChunkStream
 
 
 class RecursiveChunker(BaseChunker):
@@ -21,7 +21,7 @@ class RecursiveChunker(BaseChunker):
             chunk_overlap=self.overlap,
         )
 
-    def chunk(self, text: str, doc_id: str, project_id: str, doc_title: str = "") -> list[ChunkResponse]:
+    def chunk(self, text: str, doc_id: str, project_id: str, doc_title: str = "", base_offset: int = 0) -> list[ChunkResponse]:
         texts = self.splitter.split_text(text)
 
         response_chunks = []
@@ -37,11 +37,59 @@ class RecursiveChunker(BaseChunker):
                 doc_id=doc_id,
                 project_id=project_id,
                 text=contextualized_text,
-                start_char=max(0, start_idx),
-                end_char=max(0, end_idx),
+                start_char=max(0, start_idx) + base_offset,
+                end_char=max(0, end_idx) + base_offset,
                 token_count=self.count_tokens(contextualized_text),
                 strategy="recursive",
                 metadata={"doc_title": doc_title} if doc_title else {}
             ))
 
         return response_chunks
+
+    def stream(self, doc_id: str, project_id: str, doc_title: str = "") -> "RecursiveChunkStream":
+        return RecursiveChunkStream(self, doc_id, project_id, doc_title)
+
+
+class RecursiveChunkStream(ChunkStream):
+    """Streams plain text through RecursiveChunker, cutting at paragraph breaks.
+
+    Once the buffer holds STREAM_FLUSH_CHARS characters, everything up to its
+    last blank line is chunked; text without blank lines is cut at its last
+    line break (else its last space) once it reaches STREAM_MAX_CHARS. Chunks
+    never span those cuts, so boundaries can differ slightly from chunking the
+    whole text at once.
+    """
+
+    def __init__(self, chunker: RecursiveChunker, doc_id: str, project_id: str, doc_title: str = ""):
+        super().__init__(chunker, doc_id, project_id, doc_title)
+        self._size = 0
+        self._offset = 0
+
+    def feed(self, text: str) -> list[ChunkResponse]:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size < STREAM_FLUSH_CHARS:
+            return []
+        buffer = "".join(self._parts)
+        self._parts = [buffer]
+        cut = buffer.rfind("\n\n")
+        if cut > 0:
+            return self._chunk(buffer, cut + 2)
+        if self._size < STREAM_MAX_CHARS:
+            return []
+        return self._chunk(buffer, buffer.rfind("\n") + 1 or buffer.rfind(" ") + 1 or len(buffer))
+
+    def close(self) -> list[ChunkResponse]:
+        buffer = "".join(self._parts)
+        return self._chunk(buffer, len(buffer)) if buffer.strip() else []
+
+    def _chunk(self, buffer: str, cut: int) -> list[ChunkResponse]:
+        piece, rest = buffer[:cut], buffer[cut:]
+        self._parts = [rest] if rest else []
+        self._size = len(rest)
+        chunks = self.chunker.chunk(
+            piece, doc_id=self.doc_id, project_id=self.project_id, doc_title=self.doc_title,
+            base_offset=self._offset,
+        )
+        self._offset += len(piece)
+        return chunks
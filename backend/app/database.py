@@ -54,9 +54,11 @@ async def init_db():
             ChunkModel,
             DocumentModel,
             EmbeddingModel,
+            JobModel,
             ProjectModel,
             SessionMessageModel,
             SessionModel,
+            VectorModel,
         )
 
         await conn.run_sync(Base.metadata.create_all)
@@ -83,12 +85,24 @@ async def init_db():
         if "last_indexed_at" not in columns_projs:
             await conn.execute(sa.text("ALTER TABLE projects ADD COLUMN last_indexed_at DATETIME"))
 
+        # Add index_version to projects if missing (added for candidate-only retrieval)
+        if "index_version" not in columns_projs:
+            await conn.execute(sa.text("ALTER TABLE projects ADD COLUMN index_version INTEGER NOT NULL DEFAULT 0"))
+
+        # Index chunks by project so retrieval can count and hydrate without a table scan
+        await conn.execute(sa.text("CREATE INDEX IF NOT EXISTS ix_chunks_project_id ON chunks (project_id)"))
+
         # Add summary to documents if missing (added in Search Upgrade Phase 2)
         result_docs = await conn.execute(sa.text("PRAGMA table_info(documents)"))
         columns_docs = [row[1] for row in result_docs.fetchall()]
         if "summary" not in columns_docs:
             await conn.execute(sa.text("ALTER TABLE documents ADD COLUMN summary TEXT"))
 
+        # Add source_hash to documents if missing (added for pre-parse deduplication)
+        if "source_hash" not in columns_docs:
+            await conn.execute(sa.text("ALTER TABLE documents ADD COLUMN source_hash VARCHAR(64)"))
+        await conn.execute(sa.text("CREATE INDEX IF NOT EXISTS ix_documents_source_hash ON documents (source_hash)"))
+
 
 async def get_db():
     """FastAPI dependency — yields an async session."""
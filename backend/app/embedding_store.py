@@ -0,0 +1,162 @@
+"""VERO Embedding Store: Content-addressed vector reuse.
+
+Every vector the pipeline computes is also kept in the `embedding_vectors`
+table, keyed by (model_name, content_hash) with the float32 vector as a BLOB.
+Before calling the model, chunk hashes are looked up there, so identical
+chunks (a re-uploaded document, repeated boilerplate, the same paper in two
+projects) are copied into the target Chroma collection instead of being
+re-embedded. Identical chunks within one batch are embedded once.
+
+The key is the embedder's own model name, so vectors from different inference
+backends (e.g. the int8 ONNX variant) never mix.
+
+The per-chunk `embeddings` bookkeeping rows are handled set-wise here as well:
+one query loads a document's records, one executemany upsert writes them and
+one statement deletes them, instead of a round trip per chunk.
+"""
+
+from __future__ import annotations
+
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.models import ChunkModel, EmbeddingModel, VectorModel
+
+# VERO_EMBED_REUSE=false always runs the model (vectors are still recorded)
+REUSE_ENABLED = os.environ.get("VERO_EMBED_REUSE", "true").lower() == "true"
+
+# Rows per statement, well under SQLite's bound-parameter limit
+_BATCH = 500
+
+
+@dataclass
+class EmbedOutcome:
+    """Vectors for a batch of texts, and which of them came without a model call."""
+
+    vectors: np.ndarray  # (n, dimension) float32, in input order
+    reused: np.ndarray   # (n,) bool
+
+    @property
+    def reuse_ratio(self) -> float:
+        return float(self.reused.mean()) if len(self.reused) else 0.0
+
+
+async def lookup_vectors(db: AsyncSession, model_name: str, hashes: list[str]) -> dict[str, np.ndarray]:
+    """Fetch stored vectors for the given content hashes (missing hashes are absent)."""
+    found: dict[str, np.ndarray] = {}
+    for start in range(0, len(hashes), _BATCH):
+        result = await db.execute(
+            select(VectorModel.content_hash, VectorModel.vector).where(
+                VectorModel.model_name == model_name,
+                VectorModel.content_hash.in_(hashes[start:start + _BATCH]),
+            )
+        )
+        for content_hash, blob in result.all():
+            found[content_hash] = np.frombuffer(blob, dtype=np.float32)
+    return found
+
+
+async def store_vectors(db: AsyncSession, model_name: str, vectors: dict[str, np.ndarray]) -> None:
+    """Record vectors by content hash; hashes already stored are left untouched."""
+    rows = [
+        {
+            "model_name": model_name,
+            "content_hash": content_hash,
+            "dimension": int(vector.shape[0]),
+            "vector": np.ascontiguousarray(vector, dtype=np.float32).tobytes(),
+        }
+        for content_hash, vector in vectors.items()
+    ]
+    for start in range(0, len(rows), _BATCH):
+        await db.execute(insert(VectorModel).values(rows[start:start + _BATCH]).on_conflict_do_nothing())
+
+
+async def embed_with_reuse(db: AsyncSession, embedder, texts: list[str], hashes: list[str]) -> EmbedOutcome:
+    """Embed `texts`, reusing stored vectors for known content hashes.
+
+    Args:
+        db: Session the new vectors are written into (the caller commits).
+        embedder: Embedding provider; its `model_name` keys the store.
+        texts: Texts to embed.
+        hashes: compute_content_hash() of each text.
+
+    Returns:
+        EmbedOutcome with the vectors in input order.
+    """
+    if not texts:
+        return EmbedOutcome(vectors=np.empty((0, 0), dtype=np.float32), reused=np.zeros(0, dtype=bool))
+
+    model_name = embedder.model_name
+    first: dict[str, int] = {}
+    for i, content_hash in enumerate(hashes):
+        first.setdefault(content_hash, i)
+
+    known = await lookup_vectors(db, model_name, list(first)) if REUSE_ENABLED else {}
+    missing = [h for h in first if h not in known]
+    if missing:
+        computed = await run_in_threadpool(embedder.embed_array, [texts[first[h]] for h in missing])
+        fresh = dict(zip(missing, computed))
+        await store_vectors(db, model_name, fresh)
+        known.update(fresh)
+
+    vectors = np.stack([known[content_hash] for content_hash in hashes]).astype(np.float32, copy=False)
+    # Only the first occurrence of a missing hash went through the model
+    computed_rows = {first[h] for h in missing}
+    reused = np.array([i not in computed_rows for i in range(len(texts))], dtype=bool)
+    return EmbedOutcome(vectors=vectors, reused=reused)
+
+
+async def load_embedding_records(db: AsyncSession, doc_id: str, model_name: str) -> dict[str, EmbeddingModel]:
+    """All of a document's embedding records for one model, by chunk id (one query)."""
+    result = await db.execute(
+        select(EmbeddingModel)
+        .join(ChunkModel, ChunkModel.id == EmbeddingModel.chunk_id)
+        .where(ChunkModel.doc_id == doc_id, EmbeddingModel.model_name == model_name)
+    )
+    return {emb.chunk_id: emb for emb in result.scalars()}
+
+
+def embedding_record(chunk_id: str, model_name: str, dimension: int, content_hash: str, record_id: str | None = None) -> dict:
+    """Row for upsert_embedding_records(); pass `record_id` to keep an existing record's id."""
+    return {
+        "id": record_id or uuid.uuid4().hex[:12],
+        "chunk_id": chunk_id,
+        "model_name": model_name,
+        "dimension": dimension,
+        "content_hash": content_hash,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+async def upsert_embedding_records(db: AsyncSession, rows: list[dict]) -> None:
+    """INSERT ... ON CONFLICT(chunk_id, model_name) DO UPDATE, as one executemany."""
+    if not rows:
+        return
+    stmt = insert(EmbeddingModel)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EmbeddingModel.chunk_id, EmbeddingModel.model_name],
+        set_={
+            "id": stmt.excluded.id,
+            "dimension": stmt.excluded.dimension,
+            "content_hash": stmt.excluded.content_hash,
+            "created_at": stmt.excluded.created_at,
+        },
+    )
+    await db.execute(stmt, rows)
+
+
+async def delete_embedding_records(db: AsyncSession, doc_id: str) -> None:
+    """Drop every embedding record of a document's chunks (one set-based delete)."""
+    await db.execute(
+        delete(EmbeddingModel).where(
+            EmbeddingModel.chunk_id.in_(select(ChunkModel.id).where(ChunkModel.doc_id == doc_id))
+        )
+    )
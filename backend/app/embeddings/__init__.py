@@ -1,6 +1,8 @@
 """VERO Embedding Provider Registry: Resolve an embedder by model name."""
 
+from app.embeddings.cache import get_query_cache
 from app.embeddings.local import LocalEmbedder
+from app.embeddings.onnx_backend import INFERENCE_BACKEND, ONNX_SUFFIX, OnnxEmbedder
 
 # Default model for VERO
 DEFAULT_MODEL = "all-MiniLM-L6-v2"
@@ -8,14 +10,18 @@ DEFAULT_MODEL = "all-MiniLM-L6-v2"
 # Registry of available embedding providers
 _REGISTRY = {
     "all-MiniLM-L6-v2": LocalEmbedder,
+    "all-MiniLM-L6-v2" + ONNX_SUFFIX: OnnxEmbedder,
 }
 
 
 def get_embedder(model_name: str = DEFAULT_MODEL):
     """Return an embedder instance for the given model name.
 
-    Raises KeyError if the model is not registered.
+    With VERO_INFERENCE_BACKEND=onnx, a model that has an int8 ONNX variant
+    resolves to it. Raises KeyError if the model is not registered.
     """
+    if INFERENCE_BACKEND == "onnx" and model_name + ONNX_SUFFIX in _REGISTRY:
+        model_name += ONNX_SUFFIX
     cls = _REGISTRY.get(model_name)
     if cls is None:
         raise KeyError(
@@ -2,6 +2,10 @@
 
 from abc import ABC, abstractmethod
 
+import numpy as np
+
+from app.embeddings.cache import get_query_cache
+
 
 class BaseEmbedder(ABC):
     """Abstract base class that all embedding providers must implement."""
@@ -34,3 +38,22 @@ class BaseEmbedder(ABC):
     def embed_single(self, text: str) -> list[float]:
         """Convenience method to embed a single text."""
         return self.embed([text])[0]
+
+    def embed_array(self, texts: list[str], interactive: bool = False) -> np.ndarray:
+        """Embed a batch of texts into a (len(texts), dimension) float32 array.
+
+        `interactive` marks latency-sensitive calls (search queries) for
+        providers that schedule work; the default implementation ignores it.
+        """
+        return np.asarray(self.embed(texts), dtype=np.float32)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """Embed a search query, memoized process-wide by (model_name, text hash).
+
+        Returns a read-only float32 vector shared with other callers.
+        """
+        cache = get_query_cache()
+        vector = cache.get(self.model_name, text)
+        if vector is None:
+            vector = cache.put(self.model_name, text, self.embed_array([text], interactive=True)[0])
+        return vector
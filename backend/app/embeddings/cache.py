@@ -0,0 +1,83 @@
+"""VERO Query Vector Cache: Process-wide LRU of query embeddings.
+
+Searches embed the query on every call, and chat follow-ups rewritten by the
+query rewriter often produce identical strings across sessions. Vectors are
+kept as read-only float32 arrays keyed by (model_name, text hash), so a repeat
+costs a dict lookup instead of a transformer forward pass.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+# Number of query vectors kept (384-d float32 = 1.5 KB each)
+QUERY_CACHE_SIZE = int(os.environ.get("VERO_QUERY_EMBED_CACHE_SIZE", "4096"))
+
+
+class QueryVectorCache:
+    """Thread-safe LRU of query vectors shared by every embedder instance."""
+
+    def __init__(self, max_entries: int = QUERY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._vectors: OrderedDict[tuple[str, bytes], np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(model_name: str, text: str) -> tuple[str, bytes]:
+        return model_name, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, model_name: str, text: str) -> Optional[np.ndarray]:
+        key = self._key(model_name, text)
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._vectors.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, model_name: str, text: str, vector: np.ndarray) -> np.ndarray:
+        """Store a vector (as a read-only float32 copy) and return the stored array."""
+        if self.max_entries <= 0:
+            return vector
+        stored = np.array(vector, dtype=np.float32)
+        stored.setflags(write=False)
+        key = self._key(model_name, text)
+        with self._lock:
+            self._vectors[key] = stored
+            self._vectors.move_to_end(key)
+            while len(self._vectors) > self.max_entries:
+                self._vectors.popitem(last=False)
+        return stored
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._vectors),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_query_cache = QueryVectorCache()
+
+
+def get_query_cache() -> QueryVectorCache:
+    """Return the process-wide query vector cache."""
+    return _query_cache
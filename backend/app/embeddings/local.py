@@ -8,8 +8,12 @@ from __future__ import annotations
 
 import logging
 import threading
+from typing import Callable
+
+import numpy as np
 
 from app.embeddings.base import BaseEmbedder
+from app.embeddings.scheduler import BATCHING_ENABLED, EmbeddingScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -35,10 +39,44 @@ def _get_model(model_name: str):
     return _model_cache[model_name]
 
 
+def _encode(model_name: str, texts: list[str]) -> np.ndarray:
+    """Run one forward pass over `texts` (float32, no Python lists)."""
+    model = _get_model(model_name)
+    embeddings = model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+# One micro-batching scheduler per model, shared by every LocalEmbedder
+_schedulers: dict[str, EmbeddingScheduler] = {}
+_scheduler_lock = threading.Lock()
+
+
+def _get_scheduler(model_name: str, encode: Callable[[list[str]], np.ndarray]) -> EmbeddingScheduler:
+    scheduler = _schedulers.get(model_name)
+    if scheduler is None:
+        with _scheduler_lock:
+            scheduler = _schedulers.get(model_name)
+            if scheduler is None:
+                scheduler = EmbeddingScheduler(encode=encode, name=model_name)
+                _schedulers[model_name] = scheduler
+    return scheduler
+
+
+def shutdown_embedding_schedulers() -> None:
+    """Stop the batching workers (called on application shutdown)."""
+    with _scheduler_lock:
+        schedulers = list(_schedulers.values())
+        _schedulers.clear()
+    for scheduler in schedulers:
+        scheduler.shutdown()
+
+
 class LocalEmbedder(BaseEmbedder):
     """Local embedding provider using sentence-transformers.
 
     Lazy-loads the model on first use. Thread-safe via singleton pattern.
+    Calls are coalesced by a per-model EmbeddingScheduler, with search queries
+    served ahead of ingestion batches.
     """
 
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
@@ -64,13 +102,29 @@ class LocalEmbedder(BaseEmbedder):
         if not texts:
             return []
 
-        model = _get_model(self._model_name)
-        embeddings = model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
+        return self.embed_array(texts).tolist()
+
+    def embed_array(self, texts: list[str], interactive: bool = False) -> np.ndarray:
+        """Embed a batch of texts straight into a float32 array (no Python lists).
+
+        Args:
+            texts: List of text strings to embed.
+            interactive: True for search queries, which jump ahead of ingestion work.
+        """
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        if not BATCHING_ENABLED:
+            return self._encode_batch(texts)
+        return _get_scheduler(self._model_name, self._encode_batch).embed(texts, interactive=interactive)
 
-        return [vec.tolist() for vec in embeddings]
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
+        """One forward pass; subclasses swap the inference backend here."""
+        return _encode(self._model_name, texts)
 
 
 def warmup_embedding_model(model_name: str = "all-MiniLM-L6-v2") -> None:
     """Fully warm the default embedding model, including a dummy encode pass."""
-    embedder = LocalEmbedder(model_name=model_name)
+    from app.embeddings import get_embedder
+
+    embedder = get_embedder(model_name)
     embedder.embed(["warmup"])
@@ -0,0 +1,215 @@
+"""VERO ONNX Runtime Backend: int8-quantized embedder and cross-encoder.
+
+An alternative to the PyTorch path for CPU-only hosts. Each model is exported
+once to ONNX, dynamically quantized to int8 weights, and cached under
+backend/data/onnx/. At runtime only onnxruntime, tokenizers and numpy are
+needed; the export step itself needs torch and transformers (already pulled in
+by sentence-transformers).
+
+Select it with VERO_INFERENCE_BACKEND=onnx (default: torch). int8 vectors are
+close to the fp32 ones but not identical, so they are stored and recorded
+under their own name (ONNX_SUFFIX); a project embedded with one backend must be
+re-embedded after switching, or its index mixes vectors from both models.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from app.embeddings.local import LocalEmbedder
+
+logger = logging.getLogger(__name__)
+
+# "torch" (sentence-transformers) or "onnx" (this module)
+INFERENCE_BACKEND = os.environ.get("VERO_INFERENCE_BACKEND", "torch").lower()
+# intra-op threads per session (0 = onnxruntime default, one per core)
+ONNX_THREADS = int(os.environ.get("VERO_ONNX_THREADS", "0"))
+
+# Registry suffix of the quantized variants
+ONNX_SUFFIX = "-onnx-int8"
+
+# Exported models directory
+_ONNX_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "onnx"
+
+# HuggingFace id and max sequence length (the sentence-transformers defaults)
+_MODELS = {
+    "all-MiniLM-L6-v2": ("sentence-transformers/all-MiniLM-L6-v2", 256),
+    "cross-encoder/ms-marco-MiniLM-L-6-v2": ("cross-encoder/ms-marco-MiniLM-L-6-v2", 512),
+}
+
+_MODEL_FILE = "model_quantized.onnx"
+_TOKENIZER_FILE = "tokenizer.json"
+
+
+def model_dir(model_name: str) -> Path:
+    return _ONNX_DIR / model_name.replace("/", "__")
+
+
+def export_quantized(model_name: str, cross_encoder: bool = False) -> Path:
+    """Export a model to ONNX and quantize its weights to int8 (dynamic quantization).
+
+    Returns the directory holding the quantized model and its tokenizer.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoModelForSequenceClassification, AutoTokenizer
+
+    hf_id, _ = _MODELS[model_name]
+    out = model_dir(model_name)
+    work = out.with_name(out.name + ".export")
+    shutil.rmtree(work, ignore_errors=True)
+    work.mkdir(parents=True)
+
+    logger.info("Exporting '%s' to ONNX (int8)...", model_name)
+    tokenizer = AutoTokenizer.from_pretrained(hf_id)
+    if cross_encoder:
+        model = AutoModelForSequenceClassification.from_pretrained(hf_id)
+        sample = tokenizer(["warmup query"], ["warmup document"], return_tensors="pt")
+        output_name = "logits"
+    else:
+        model = AutoModel.from_pretrained(hf_id)
+        sample = tokenizer(["warmup"], return_tensors="pt")
+        output_name = "last_hidden_state"
+    model.eval()
+
+    input_names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in sample]
+
+    class _Wrapper(torch.nn.Module):
+        """Positional inputs in, the single tensor we use out."""
+
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, *args):
+            return self.inner(**dict(zip(input_names, args)))[output_name]
+
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes[output_name] = {0: "batch"} if cross_encoder else {0: "batch", 1: "sequence"}
+    fp32_path = work / "model.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            _Wrapper(model),
+            tuple(sample[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=[output_name],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+    quantize_dynamic(str(fp32_path), str(work / _MODEL_FILE), weight_type=QuantType.QInt8)
+    tokenizer.save_pretrained(str(work))
+
+    out.mkdir(parents=True, exist_ok=True)
+    for name in (_TOKENIZER_FILE, _MODEL_FILE):  # Model last: its presence marks a complete export
+        os.replace(work / name, out / name)
+    shutil.rmtree(work, ignore_errors=True)
+    logger.info("ONNX model for '%s' written to %s.", model_name, out)
+    return out
+
+
+class OnnxModel:
+    """One quantized ONNX session plus its fast tokenizer (thread-safe to run)."""
+
+    def __init__(self, model_name: str, cross_encoder: bool = False):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        path = model_dir(model_name)
+        if not (path / _MODEL_FILE).exists():
+            export_quantized(model_name, cross_encoder=cross_encoder)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if ONNX_THREADS > 0:
+            options.intra_op_num_threads = ONNX_THREADS
+        self.session = ort.InferenceSession(
+            str(path / _MODEL_FILE), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+        self.tokenizer = Tokenizer.from_file(str(path / _TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=_MODELS[model_name][1])
+        pad_id = self.tokenizer.token_to_id("[PAD]") or 0
+        self.tokenizer.enable_padding(pad_id=pad_id, pad_token="[PAD]")
+
+    def run(self, inputs: list) -> tuple[np.ndarray, np.ndarray]:
+        """Tokenize texts (or (query, text) pairs) and run the session.
+
+        Returns:
+            (model output, attention mask).
+        """
+        encodings = self.tokenizer.encode_batch(inputs)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        output = self.session.run(None, {name: feeds[name] for name in self.input_names})[0]
+        return output, feeds["attention_mask"]
+
+
+_sessions: dict[str, OnnxModel] = {}
+_lock = threading.Lock()
+
+
+def get_onnx_model(model_name: str, cross_encoder: bool = False) -> OnnxModel:
+    """Load (exporting on first use) a quantized model, cached across calls."""
+    if model_name not in _sessions:
+        with _lock:
+            if model_name not in _sessions:
+                logger.info("Loading ONNX int8 model '%s'...", model_name)
+                _sessions[model_name] = OnnxModel(model_name, cross_encoder=cross_encoder)
+                logger.info("ONNX model '%s' loaded.", model_name)
+    return _sessions[model_name]
+
+
+def _encode_onnx(model_name: str, texts: list[str]) -> np.ndarray:
+    """Mean-pooled, L2-normalized sentence vectors (matches the sentence-transformers pipeline)."""
+    hidden, mask = get_onnx_model(model_name).run(texts)
+    weights = mask[..., None].astype(np.float32)
+    pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+    return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+
+class OnnxEmbedder(LocalEmbedder):
+    """int8 ONNX Runtime variant of a local embedding model.
+
+    Registered as "<model>-onnx-int8"; batching and query priority work exactly
+    as for LocalEmbedder.
+    """
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2" + ONNX_SUFFIX):
+        super().__init__(model_name=model_name)
+        self._base_model = model_name.removesuffix(ONNX_SUFFIX)
+
+    @property
+    def dimension(self) -> int:
+        if self._dimension is None:
+            self._dimension = int(self._encode_batch(["dimension"]).shape[1])
+        return self._dimension
+
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
+        return _encode_onnx(self._base_model, texts)
+
+
+class OnnxCrossEncoder:
+    """int8 ONNX Runtime cross-encoder with the `predict` surface the reranker uses."""
+
+    def __init__(self, model_name: str):
+        self._model = get_onnx_model(model_name, cross_encoder=True)
+
+    def predict(self, pairs: list[tuple[str, str]], batch_size: int = 32) -> np.ndarray:
+        """Raw relevance logits, one per (query, text) pair."""
+        scores = np.empty(len(pairs), dtype=np.float32)
+        for start in range(0, len(pairs), batch_size):
+            logits, _ = self._model.run([tuple(pair) for pair in pairs[start:start + batch_size]])
+            scores[start:start + batch_size] = logits[:, 0]
+        return scores
@@ -0,0 +1,247 @@
+"""VERO Embedding Scheduler: Dynamic micro-batching in front of a model.
+
+Concurrent searches would otherwise each run a batch-of-1 forward pass while
+ingestion runs large batches on the same model. The scheduler queues requests,
+coalesces whatever arrives within a short window into one `encode` call (up to
+a maximum batch size), and hands every caller its own future. The window only
+stays open while more callers are expected (as many as joined the previous
+batch), so an isolated request is encoded immediately.
+
+Interactive (query) requests are always taken before ingestion work, and
+large ingestion requests are split into max-batch slices, so a query never
+waits behind more than one slice of document embedding.
+
+Ingestion slices are length buckets: texts are sorted by approximate token
+length, cut into batches whose padded size (count x longest) stays within a
+token budget, and scattered back to their original positions, so a batch of
+short fragments is not padded out to the length of one long table.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Coalescing knobs (VERO_EMBED_BATCHING=false encodes every call directly)
+BATCHING_ENABLED = os.environ.get("VERO_EMBED_BATCHING", "true").lower() == "true"
+MAX_BATCH = int(os.environ.get("VERO_EMBED_MAX_BATCH", "64"))
+MAX_WAIT_MS = float(os.environ.get("VERO_EMBED_MAX_WAIT_MS", "5"))
+# Length bucketing of ingestion requests (padded tokens per batch)
+LENGTH_BUCKETING = os.environ.get("VERO_EMBED_LENGTH_BUCKETING", "true").lower() == "true"
+MAX_BATCH_TOKENS = int(os.environ.get("VERO_EMBED_BATCH_TOKENS", "8192"))
+
+# Longest input the models accept; longer texts are truncated to this anyway
+_MAX_SEQ_TOKENS = 512
+
+
+def approx_tokens(text: str) -> int:
+    """Cheap WordPiece length estimate (~4 characters per token, plus [CLS]/[SEP])."""
+    return min(_MAX_SEQ_TOKENS, len(text) // 4 + 2)
+
+
+def length_buckets(lengths: list[int], max_batch: int, max_tokens: int) -> list[np.ndarray]:
+    """Group item indices into batches of similar length.
+
+    Items are sorted by length, then cut greedily so that each batch holds at
+    most `max_batch` items and its padded size (items x longest) stays within
+    `max_tokens` (a single over-long item still gets its own batch).
+
+    Returns:
+        Index arrays into `lengths`, shortest batch first.
+    """
+    order = np.argsort(np.asarray(lengths), kind="stable")
+    buckets: list[np.ndarray] = []
+    start = 0
+    for i in range(1, len(order) + 1):
+        if i == len(order):
+            buckets.append(order[start:i])
+            break
+        count = i - start + 1
+        if count > max_batch or count * lengths[order[i]] > max_tokens:
+            buckets.append(order[start:i])
+            start = i
+    return buckets
+
+
+class _Request:
+    """One caller's texts; completed once every slice has been encoded."""
+
+    def __init__(self, n_texts: int):
+        self.n_texts = n_texts
+        self.future: Future = Future()
+        self.vectors: Optional[np.ndarray] = None
+        self.pending = 0
+        self.failed = False
+
+
+class _Slice:
+    """Up to MAX_BATCH texts of a request, and the rows they fill in its result."""
+
+    __slots__ = ("request", "rows", "texts", "longest")
+
+    def __init__(self, request: _Request, rows: slice | np.ndarray, texts: list[str]):
+        self.request = request
+        self.rows = rows
+        self.texts = texts
+        self.longest = max(approx_tokens(t) for t in texts)
+
+
+class EmbeddingScheduler:
+    """Coalesces concurrent embedding requests into batched encode calls.
+
+    Args:
+        encode: Callable mapping list[str] -> (n, dim) array, run on the worker thread.
+        max_batch: Maximum texts per encode call.
+        max_wait_ms: How long a partial batch waits for more requests.
+        name: Worker thread name suffix (the model name).
+        max_batch_tokens: Padded-token budget of an ingestion bucket (0 disables bucketing).
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[list[str]], np.ndarray],
+        max_batch: int = MAX_BATCH,
+        max_wait_ms: float = MAX_WAIT_MS,
+        name: str = "default",
+        max_batch_tokens: int = MAX_BATCH_TOKENS if LENGTH_BUCKETING else 0,
+    ):
+        self._encode = encode
+        self.max_batch = max(1, max_batch)
+        self.max_batch_tokens = max_batch_tokens
+        self.max_wait = max_wait_ms / 1000.0
+        self._cond = threading.Condition()
+        self._queries: deque[_Slice] = deque()
+        self._ingest: deque[_Slice] = deque()
+        self._closed = False
+
+        self.batches = 0
+        self.texts = 0
+        self._last_batch_callers = 1
+
+        self._worker = threading.Thread(target=self._run, name=f"vero-embed-{name}", daemon=True)
+        self._worker.start()
+
+    def submit(self, texts: list[str], interactive: bool = False) -> Future:
+        """Queue texts for embedding; the future resolves to a (len(texts), dim) float32 array."""
+        request = _Request(len(texts))
+        if not texts:
+            request.future.set_result(np.empty((0, 0), dtype=np.float32))
+            return request.future
+
+        if interactive or self.max_batch_tokens <= 0 or len(texts) == 1:
+            slices = [
+                _Slice(request, slice(start, start + self.max_batch), texts[start:start + self.max_batch])
+                for start in range(0, len(texts), self.max_batch)
+            ]
+        else:
+            buckets = length_buckets([approx_tokens(t) for t in texts], self.max_batch, self.max_batch_tokens)
+            slices = [_Slice(request, rows, [texts[i] for i in rows]) for rows in buckets]
+        request.pending = len(slices)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Embedding scheduler is shut down")
+            (self._queries if interactive else self._ingest).extend(slices)
+            self._cond.notify()
+        return request.future
+
+    def embed(self, texts: list[str], interactive: bool = False) -> np.ndarray:
+        """Blocking convenience wrapper around submit()."""
+        return self.submit(texts, interactive=interactive).result()
+
+    def shutdown(self) -> None:
+        """Stop the worker after it drains the queue."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._worker.join(timeout=5)
+
+    def _next_slice(self, size: int, longest: int) -> Optional[_Slice]:
+        """Pop the next slice that fits next to `size` texts of up to `longest` tokens,
+        queries first (lock held)."""
+        for queue in (self._queries, self._ingest):
+            if not queue:
+                continue
+            piece = queue[0]
+            count = size + len(piece.texts)
+            if count > self.max_batch:
+                continue
+            if self.max_batch_tokens > 0 and count * max(longest, piece.longest) > self.max_batch_tokens:
+                continue
+            return queue.popleft()
+        return None
+
+    def _collect(self) -> Optional[list[_Slice]]:
+        """Block until work is available, then gather one batch."""
+        with self._cond:
+            while not (self._queries or self._ingest):
+                if self._closed:
+                    return None
+                self._cond.wait()
+
+            batch = [(self._queries or self._ingest).popleft()]
+            size = len(batch[0].texts)
+            longest = batch[0].longest
+            # Hold a partial batch open only until it has as many callers as the
+            # previous one (the observed concurrency), at most max_wait: a lone
+            # caller is never delayed, concurrent callers are gathered up.
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                piece = self._next_slice(size, longest)
+                if piece is not None:
+                    batch.append(piece)
+                    size += len(piece.texts)
+                    longest = max(longest, piece.longest)
+                    continue
+                if self._queries or self._ingest:
+                    break  # The next slice does not fit: run this batch now
+                if len(batch) >= self._last_batch_callers:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._closed:
+                    break
+                self._cond.wait(remaining)
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+
+            texts = [text for piece in batch for text in piece.texts]
+            try:
+                vectors = np.asarray(self._encode(texts), dtype=np.float32)
+            except Exception as exc:
+                # Every caller in the batch gets the error on its own future
+                logger.warning("Embedding batch of %d texts failed: %s", len(texts), exc)
+                for piece in batch:
+                    request = piece.request
+                    if not request.failed:
+                        request.failed = True
+                        request.future.set_exception(exc)
+                continue
+
+            self._last_batch_callers = len({id(piece.request) for piece in batch})
+            self.batches += 1
+            self.texts += len(texts)
+            offset = 0
+            for piece in batch:
+                request = piece.request
+                n = len(piece.texts)
+                if not request.failed:
+                    if request.vectors is None:
+                        request.vectors = np.empty((request.n_texts, vectors.shape[1]), dtype=np.float32)
+                    request.vectors[piece.rows] = vectors[offset:offset + n]
+                    request.pending -= 1
+                    if request.pending == 0:
+                        request.future.set_result(request.vectors)
+                offset += n
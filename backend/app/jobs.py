@@ -0,0 +1,409 @@
+"""VERO Job Queue: Durable, SQLite-backed ingestion jobs.
+
+The ingest endpoints write the document and its job row in one transaction
+and return immediately; a JobWorker running inside the API process claims
+queued jobs and drives them through app.pipeline's resumable stages
+(parse → summary → chunk → embed), overlapped across documents by app.stages.
+
+Claiming is a conditional UPDATE (state='queued' → 'running'), so two slots
+never take the same job. A running job holds a lease that a heartbeat task
+renews; when a worker dies its leases expire and the periodic sweep puts the
+jobs back in the queue. A failed attempt is retried with exponential backoff
+until max_attempts, then the document is marked failed. At startup, expired
+jobs are recovered and documents left mid-pipeline without a job are adopted.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session
+from app.models import DocumentModel, JobModel
+
+logger = logging.getLogger(__name__)
+
+# Jobs in flight at once in this process; enough to keep every pipeline stage busy
+JOB_CONCURRENCY = int(os.environ.get("VERO_JOB_CONCURRENCY", "8"))
+# A running job whose lease is not renewed within this window is considered orphaned
+LEASE_SECONDS = float(os.environ.get("VERO_JOB_LEASE_SECONDS", "60"))
+# Idle slots re-check the queue this often (new jobs also wake them directly)
+POLL_SECONDS = float(os.environ.get("VERO_JOB_POLL_SECONDS", "2"))
+MAX_ATTEMPTS = int(os.environ.get("VERO_JOB_MAX_ATTEMPTS", "3"))
+# Backoff before retry n is RETRY_SECONDS * 2**(n-1)
+RETRY_SECONDS = float(os.environ.get("VERO_JOB_RETRY_SECONDS", "10"))
+
+# Statuses a document passes through while the pipeline still owes it work
+_IN_FLIGHT = ("parsing", "chunking", "embedding")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def enqueue_job(
+    db: AsyncSession,
+    doc: DocumentModel,
+    ingest_type: str,
+    filepath: str | None = None,
+    url: str | None = None,
+) -> JobModel:
+    """Add a queued job for `doc` to the current transaction (the caller commits)."""
+    if doc.id is None:
+        await db.flush()
+    job = JobModel(
+        doc_id=doc.id,
+        ingest_type=ingest_type,
+        filepath=filepath,
+        url=url,
+        state="queued",
+        max_attempts=MAX_ATTEMPTS,
+        available_at=_utcnow(),
+    )
+    db.add(job)
+    return job
+
+
+async def claim_job(owner: str, lease_seconds: float = LEASE_SECONDS) -> JobModel | None:
+    """Take the oldest claimable job and lease it to `owner`; None when the queue is empty."""
+    async with async_session() as db:
+        while True:
+            now = _utcnow()
+            job_id = await db.scalar(
+                select(JobModel.id)
+                .where(JobModel.state == "queued", JobModel.available_at <= now)
+                .order_by(JobModel.available_at, JobModel.created_at)
+                .limit(1)
+            )
+            if job_id is None:
+                return None
+            result = await db.execute(
+                update(JobModel)
+                .where(JobModel.id == job_id, JobModel.state == "queued")
+                .values(
+                    state="running",
+                    attempts=JobModel.attempts + 1,
+                    lease_owner=owner,
+                    lease_expires_at=now + timedelta(seconds=lease_seconds),
+                    heartbeat_at=now,
+                    updated_at=now,
+                )
+            )
+            await db.commit()
+            if result.rowcount == 1:
+                return await db.get(JobModel, job_id)
+            # Another slot claimed it first; try the next one
+
+
+async def heartbeat(job_id: str, owner: str, lease_seconds: float = LEASE_SECONDS) -> bool:
+    """Renew a job's lease. False means the lease was lost (the job was recovered elsewhere)."""
+    now = _utcnow()
+    async with async_session() as db:
+        result = await db.execute(
+            update(JobModel)
+            .where(JobModel.id == job_id, JobModel.state == "running", JobModel.lease_owner == owner)
+            .values(lease_expires_at=now + timedelta(seconds=lease_seconds), heartbeat_at=now)
+        )
+        await db.commit()
+    return result.rowcount == 1
+
+
+async def finish_job(job: JobModel, owner: str) -> None:
+    """Mark a job done and drop its upload file if the pipeline left it behind."""
+    async with async_session() as db:
+        await db.execute(
+            update(JobModel)
+            .where(JobModel.id == job.id, JobModel.lease_owner == owner)
+            .values(state="done", lease_owner=None, lease_expires_at=None, last_error=None, updated_at=_utcnow())
+        )
+        await db.commit()
+    _remove_upload(job)
+
+
+async def fail_job(job: JobModel, owner: str, error: BaseException | str) -> bool:
+    """Record a failed attempt: requeue with backoff, or fail for good when attempts run out.
+
+    Returns:
+        True when the failure is final (the document is marked failed).
+    """
+    now = _utcnow()
+    final = job.attempts >= job.max_attempts
+    values = {"lease_owner": None, "lease_expires_at": None, "last_error": str(error)[:2000], "updated_at": now}
+    if final:
+        values["state"] = "failed"
+    else:
+        values["state"] = "queued"
+        values["available_at"] = now + timedelta(seconds=RETRY_SECONDS * 2 ** max(job.attempts - 1, 0))
+    async with async_session() as db:
+        result = await db.execute(
+            update(JobModel).where(JobModel.id == job.id, JobModel.lease_owner == owner).values(**values)
+        )
+        await db.commit()
+    if result.rowcount != 1:
+        return False  # Lease already lost; whoever recovered the job owns it now
+    if final:
+        from app.pipeline import mark_failed
+
+        await mark_failed(job.doc_id)
+        _remove_upload(job)
+    return final
+
+
+async def release_job(job_id: str, owner: str) -> None:
+    """Put an interrupted job back in the queue without charging it an attempt."""
+    async with async_session() as db:
+        await db.execute(
+            update(JobModel)
+            .where(JobModel.id == job_id, JobModel.state == "running", JobModel.lease_owner == owner)
+            .values(
+                state="queued",
+                attempts=JobModel.attempts - 1,
+                lease_owner=None,
+                lease_expires_at=None,
+                available_at=_utcnow(),
+                updated_at=_utcnow(),
+            )
+        )
+        await db.commit()
+
+
+async def requeue_expired() -> int:
+    """Return running jobs with expired leases to the queue (or fail them if out of attempts)."""
+    now = _utcnow()
+    exhausted: list[JobModel] = []
+    async with async_session() as db:
+        expired = (await db.execute(
+            select(JobModel).where(
+                JobModel.state == "running",
+                or_(JobModel.lease_expires_at.is_(None), JobModel.lease_expires_at < now),
+            )
+        )).scalars().all()
+        for job in expired:
+            job.lease_owner = None
+            job.lease_expires_at = None
+            job.last_error = "Lease expired (worker stopped or crashed)"
+            if job.attempts >= job.max_attempts:
+                job.state = "failed"
+                exhausted.append(job)
+            else:
+                job.state = "queued"
+                job.available_at = now
+        await db.commit()
+
+    if exhausted:
+        from app.pipeline import mark_failed
+
+        for job in exhausted:
+            await mark_failed(job.doc_id)
+            _remove_upload(job)
+    if expired:
+        logger.warning("Job queue: recovered %d orphaned job(s), %d out of attempts", len(expired), len(exhausted))
+    return len(expired)
+
+
+async def adopt_stranded_documents() -> int:
+    """Queue jobs for documents left mid-pipeline with no live job.
+
+    Web and repository documents are re-fetched from their source_url; documents
+    already past parsing resume from their stored text. An upload that never got
+    parsed has no file to go back to and is marked failed.
+    """
+    from app.schema import SourceType
+
+    adopted = 0
+    async with async_session() as db:
+        live = select(JobModel.doc_id).where(JobModel.state.in_(("queued", "running")))
+        docs = (await db.execute(
+            select(DocumentModel).where(
+                DocumentModel.processing_status.in_(_IN_FLIGHT),
+                DocumentModel.id.not_in(live),
+            )
+        )).scalars().all()
+        for doc in docs:
+            if doc.source_type == SourceType.WEB.value:
+                ingest_type = "url"
+            elif doc.source_type == SourceType.REPO.value:
+                ingest_type = "repo"
+            else:
+                ingest_type = "file"
+            if doc.processing_status == "parsing" and ingest_type == "file":
+                doc.processing_status = "failed"
+                continue
+            await enqueue_job(db, doc, ingest_type, url=doc.source_url if ingest_type != "file" else None)
+            adopted += 1
+        await db.commit()
+
+    if docs:
+        logger.warning("Job queue: adopted %d stranded document(s), failed %d unrecoverable upload(s)",
+                       adopted, len(docs) - adopted)
+    return adopted
+
+
+async def recover_orphans() -> None:
+    """Startup recovery: requeue expired jobs, then adopt documents that have none."""
+    await requeue_expired()
+    await adopt_stranded_documents()
+
+
+async def job_counts(db: AsyncSession) -> dict[str, int]:
+    """Number of jobs in each state."""
+    result = await db.execute(select(JobModel.state, func.count()).group_by(JobModel.state))
+    return {state: count for state, count in result.all()}
+
+
+def _remove_upload(job: JobModel) -> None:
+    if job.ingest_type == "file" and job.filepath:
+        Path(job.filepath).unlink(missing_ok=True)
+
+
+async def _run_pipeline(job: JobModel) -> None:
+    from app.stages import run_staged
+
+    await run_staged(job.doc_id, filepath=job.filepath, url=job.url, ingest_type=job.ingest_type)
+
+
+class JobWorker:
+    """Claims jobs and runs them, `concurrency` at a time, with lease heartbeats."""
+
+    def __init__(
+        self,
+        concurrency: int = JOB_CONCURRENCY,
+        lease_seconds: float = LEASE_SECONDS,
+        poll_seconds: float = POLL_SECONDS,
+        runner: Callable[[JobModel], Awaitable[None]] = _run_pipeline,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._runner = runner
+        self._wake = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = False
+
+    async def start(self) -> None:
+        """Recover orphaned work, then start the worker slots and the lease sweeper."""
+        self._stopping = False
+        await recover_orphans()
+        self._tasks = [
+            asyncio.create_task(self._slot(), name=f"vero-job-worker-{i}") for i in range(self.concurrency)
+        ]
+        self._tasks.append(asyncio.create_task(self._sweep(), name="vero-job-sweeper"))
+        logger.info("Job worker %s started with %d slot(s)", self.owner, self.concurrency)
+
+    async def stop(self) -> None:
+        """Stop claiming; interrupted jobs go back to the queue for the next start."""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self) -> None:
+        """Tell idle slots new work is queued (skips the poll wait)."""
+        self._wake.set()
+
+    async def _slot(self) -> None:
+        while not self._stopping:
+            try:
+                job = await claim_job(self.owner, self.lease_seconds)
+            except Exception:
+                logger.exception("Job worker: claim failed")
+                job = None
+            if job is None:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+                self._wake.clear()
+                continue
+            await self._process(job)
+
+    async def _process(self, job: JobModel) -> None:
+        logger.info("Job %s: doc %s attempt %d/%d", job.id, job.doc_id, job.attempts, job.max_attempts)
+        work = asyncio.create_task(self._runner(job), name=f"vero-job-{job.id}")
+        beat = asyncio.create_task(self._heartbeat(job, work))
+        try:
+            await asyncio.wait({work})
+        except asyncio.CancelledError:
+            # Worker shutdown: abandon this attempt and hand the job back
+            work.cancel()
+            with contextlib.suppress(BaseException):
+                await work
+            await release_job(job.id, self.owner)
+            raise
+        finally:
+            beat.cancel()
+
+        if work.cancelled():
+            logger.warning("Job %s: lease lost, abandoning this attempt", job.id)
+            return
+        error = work.exception()
+        try:
+            if error is None:
+                await finish_job(job, self.owner)
+            elif await fail_job(job, self.owner, error):
+                logger.error("Job %s failed for good after %d attempt(s): %s", job.id, job.attempts, error,
+                             exc_info=error)
+            else:
+                logger.warning("Job %s attempt %d failed, will retry: %s", job.id, job.attempts, error)
+        except Exception:
+            logger.exception("Job %s: could not record the outcome", job.id)
+
+    async def _heartbeat(self, job: JobModel, work: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                alive = await heartbeat(job.id, self.owner, self.lease_seconds)
+            except Exception:
+                logger.exception("Job %s: heartbeat failed", job.id)
+                continue
+            if not alive:
+                work.cancel()
+                return
+
+    async def _sweep(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(self.lease_seconds)
+            try:
+                if await requeue_expired():
+                    self.wake()
+            except Exception:
+                logger.exception("Job worker: lease sweep failed")
+
+
+_worker: JobWorker | None = None
+
+
+async def start_job_worker() -> JobWorker:
+    """Start the process-wide job worker (once)."""
+    global _worker
+    if _worker is None:
+        _worker = JobWorker()
+        await _worker.start()
+    return _worker
+
+
+async def stop_job_worker() -> None:
+    """Stop the process-wide job worker, requeueing whatever it was running."""
+    global _worker
+    if _worker is not None:
+        await _worker.stop()
+        _worker = None
+    from app.stages import stop_ingest_engine
+
+    await stop_ingest_engine()
+
+
+def wake_job_worker() -> None:
+    """Nudge the running worker after enqueueing (no-op when none is running)."""
+    if _worker is not None:
+        _worker.wake()
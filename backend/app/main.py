@@ -10,7 +10,12 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from app.bm25_cache import get_bm25_manager
 from app.database import init_db
+from app.embeddings.local import shutdown_embedding_schedulers
+from app.jobs import start_job_worker, stop_job_worker
+from app.parsers.fetch import close_clients
+from app.retrieval import shutdown_executors
 from app.routers import activity, chat, documents, projects, search
 from app.warmup import get_warmup_status, models_ready, start_model_warmup, stop_model_warmup
 
@@ -32,14 +37,22 @@ logging.getLogger("tf_keras").setLevel(logging.FATAL)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Startup: create DB tables, then warm heavy ML models in the background."""
+    """Startup: create DB tables, recover and resume ingestion jobs, warm ML models in the background."""
     await init_db()
+    await start_job_worker()
     app.state.model_warmup_task = start_model_warmup()
     logger.info("API startup complete. Model warmup continues in the background.")
 
     yield
 
+    # Interrupted ingestion jobs go back to the queue and resume on the next start
+    await stop_job_worker()
     await stop_model_warmup()
+    shutdown_executors()
+    shutdown_embedding_schedulers()
+    await close_clients()
+    # Write incrementally updated keyword indexes so the next start can map them
+    get_bm25_manager().flush()
 
 
 app = FastAPI(
@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -26,6 +26,7 @@ class ProjectModel(Base):
     created_at = Column(DateTime, default=_utcnow)
     updated_at = Column(DateTime, default=_utcnow, onupdate=_utcnow)
     last_indexed_at = Column(DateTime, nullable=True)
+    index_version = Column(Integer, nullable=False, default=0)  # Bumped whenever the project's chunk set changes
 
     documents = relationship("DocumentModel", back_populates="project", cascade="all, delete-orphan")
 
@@ -42,6 +43,7 @@ class DocumentModel(Base):
     title = Column(String, nullable=False)
     raw_text = Column(Text, nullable=False, default="")
     content_hash = Column(String(64), nullable=False, index=True)
+    source_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of the raw upload / fetched body
     confidence_level = Column(Integer, nullable=False, default=3)
     source_url = Column(String, nullable=True)
     metadata_json = Column(Text, default="{}")
@@ -66,7 +68,7 @@ class ChunkModel(Base):
 
     id = Column(String, primary_key=True, default=_new_id)
     doc_id = Column(String, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
-    project_id = Column(String, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(String, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
     text = Column(Text, nullable=False)
     start_char = Column(Integer, nullable=False)
     end_char = Column(Integer, nullable=False)
@@ -101,6 +103,55 @@ class EmbeddingModel(Base):
         return f"<Embedding chunk={self.chunk_id} model={self.model_name}>"
 
 
+class VectorModel(Base):
+    """Content-addressed embedding vectors, shared across documents and projects."""
+
+    __tablename__ = "embedding_vectors"
+
+    model_name = Column(String, primary_key=True)
+    content_hash = Column(String(64), primary_key=True)
+    dimension = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # float32, little-endian
+    created_at = Column(DateTime, default=_utcnow)
+
+    def __repr__(self):
+        return f"<Vector {self.content_hash[:12]} model={self.model_name}>"
+
+
+class JobModel(Base):
+    """Durable ingestion job: one document's trip through the pipeline.
+
+    queued → running → done | failed. A running job holds a lease that its
+    worker renews via heartbeats; a job whose lease expires (worker crash,
+    restart) is put back in the queue by recover_orphans().
+    """
+
+    __tablename__ = "ingest_jobs"
+
+    id = Column(String, primary_key=True, default=_new_id)
+    doc_id = Column(String, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True)
+    ingest_type = Column(String, nullable=False)  # file | url | repo
+    filepath = Column(String, nullable=True)
+    url = Column(String, nullable=True)
+    state = Column(String, nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    available_at = Column(DateTime, default=_utcnow)  # Retry backoff: not claimable before this
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=_utcnow)
+    updated_at = Column(DateTime, default=_utcnow, onupdate=_utcnow)
+
+    __table_args__ = (
+        Index("ix_ingest_jobs_claim", "state", "available_at"),
+    )
+
+    def __repr__(self):
+        return f"<Job {self.id} doc={self.doc_id} state={self.state}>"
+
+
 class SessionModel(Base):
     __tablename__ = "sessions"
 
@@ -0,0 +1,179 @@
+"""VERO Parse Cache: Content-addressed parser output shared across projects.
+
+Parsing is the most expensive ingest step (PyMuPDF + pdfplumber on PDFs,
+network fetches for web pages and repositories), and the same sources are
+ingested into several projects. The pipeline looks the source's fingerprint up
+here before dispatching to the process pool:
+
+    file   source type + SHA-256 of the uploaded bytes
+    url    URL + HTTP validator (ETag / Last-Modified, else the body's SHA-256)
+    repo   owner/repo + resolved commit SHA
+
+Each entry is the parser's text and metadata as zlib-compressed JSON in
+backend/data/parse_cache/<sha256(key)>.json.z. Hits refresh the file's mtime;
+once the directory grows past VERO_PARSE_CACHE_MB the least recently used
+entries are deleted. Keys carry PARSER_VERSION, so bumping it invalidates
+output produced by older parsers.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# VERO_PARSE_CACHE=false always runs the parser
+ENABLED = os.environ.get("VERO_PARSE_CACHE", "true").lower() == "true"
+# Disk budget for compressed entries (LRU eviction beyond it)
+CACHE_BYTES = int(float(os.environ.get("VERO_PARSE_CACHE_MB", "512")) * 1024 * 1024)
+# Bump when parser output changes shape or content
+PARSER_VERSION = 1
+
+_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "parse_cache"
+_SUFFIX = ".json.z"
+
+
+def file_key(source_type: str, source_hash: str) -> str:
+    return f"file:{source_type}:{source_hash}"
+
+
+def url_key(url: str, validator: str) -> str:
+    return f"url:{url}:{validator}"
+
+
+def repo_key(owner: str, repo: str, commit: str) -> str:
+    return f"repo:{owner.lower()}/{repo.lower()}@{commit}"
+
+
+class ParseCache:
+    """Size-bounded on-disk LRU of parser results. Thread-safe; call from a worker thread."""
+
+    def __init__(self, directory: Path = _CACHE_DIR, max_bytes: int = CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes: int | None = None  # Lazily summed from disk
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(f"v{PARSER_VERSION}|{key}".encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}{_SUFFIX}"
+
+    def get(self, key: str) -> dict | None:
+        """Cached {"text", "metadata"} for `key`, or None."""
+        path = self._path(key)
+        try:
+            payload = json.loads(zlib.decompress(path.read_bytes()))
+        except FileNotFoundError:
+            payload = None
+        except (OSError, zlib.error, ValueError) as exc:
+            logger.warning("Parse cache: dropping unreadable entry %s: %s", path.name, exc)
+            self._discard(path)
+            payload = None
+
+        with self._lock:
+            if payload is None or payload.get("key") != key:
+                self._misses += 1
+                return None
+            self._hits += 1
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return {"text": payload["text"], "metadata": payload.get("metadata", {})}
+
+    def put(self, key: str, result: dict) -> None:
+        """Store a parser result ({"text", "metadata", ...}); other fields are dropped."""
+        blob = zlib.compress(
+            json.dumps({"key": key, "text": result["text"], "metadata": result.get("metadata", {})},
+                       ensure_ascii=False).encode("utf-8"),
+            6,
+        )
+        if len(blob) > self.max_bytes:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(blob)
+        with self._lock:
+            total = self._total_bytes()
+            old = path.stat().st_size if path.exists() else 0
+            os.replace(tmp, path)
+            self._bytes = total - old + len(blob)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def stats(self) -> dict:
+        """Counters since startup plus the current disk footprint."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": sum(1 for _ in self.directory.glob(f"*{_SUFFIX}")) if self.directory.exists() else 0,
+                "bytes": self._total_bytes(),
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+            }
+
+    def _total_bytes(self) -> int:
+        if self._bytes is None:
+            self._bytes = sum(p.stat().st_size for p in self._entries())
+        return self._bytes
+
+    def _entries(self) -> list[Path]:
+        if not self.directory.exists():
+            return []
+        return list(self.directory.glob(f"*{_SUFFIX}"))
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits its budget (lock held)."""
+        entries = []
+        for path in self._entries():
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self._evictions += 1
+        self._bytes = total
+
+    def _discard(self, path: Path) -> None:
+        with self._lock:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except OSError:
+                return
+            if self._bytes is not None:
+                self._bytes -= size
+
+
+_cache: ParseCache | None = None
+_init_lock = threading.Lock()
+
+
+def get_parse_cache() -> ParseCache:
+    """Return the global ParseCache singleton."""
+    global _cache
+    if _cache is None:
+        with _init_lock:
+            if _cache is None:
+                _cache = ParseCache()
+    return _cache
@@ -3,10 +3,11 @@
 from pathlib import Path
 from app.schema import SourceType
 
-from app.parsers.pdf import parse_pdf
+from app.parsers.contracts import StreamedDocument, stream_parsed
+from app.parsers.pdf import parse_pdf, stream_pdf
 from app.parsers.docx import parse_docx
 from app.parsers.pptx import parse_pptx
-from app.parsers.text import parse_text
+from app.parsers.text import parse_text, stream_text
 from app.parsers.web import parse_web
 
 
@@ -41,3 +42,21 @@ async def parse_file(filepath: str, source_type: SourceType) -> dict:
     if parser is None:
         raise ValueError(f"No parser for source type: {source_type}")
     return await parser(filepath)
+
+
+async def stream_file(filepath: str, source_type: SourceType) -> StreamedDocument:
+    """
+    Parse a file as a stream of segments (see contracts.StreamedDocument).
+    PDF, Markdown and plain text stream natively; other types are parsed whole
+    and wrapped as a single segment.
+    """
+    streamers = {
+        SourceType.PDF: stream_pdf,
+        SourceType.MARKDOWN: stream_text,
+        SourceType.TEXT: stream_text,
+    }
+    streamer = streamers.get(source_type)
+    if streamer is not None:
+        return streamer(filepath)
+    result = await parse_file(filepath, source_type)
+    return stream_parsed(result, source_type.value, Path(filepath).name)
@@ -1,6 +1,7 @@
 """VERO Parser Contracts: Shared data structures and helpers for all parsers."""
 
 from dataclasses import dataclass, field
+from typing import Iterator
 
 
 @dataclass
@@ -25,6 +26,41 @@ class ParsedDocument:
     metadata: dict = field(default_factory=dict)             # Extra metadata (url, title, etc.)
 
 
+@dataclass
+class ParsedSegment:
+    """One piece of a streamed parse: a page, a section or a block of lines."""
+
+    text: str
+    label: str = ""             # "page 12", "tables", ... (logging only)
+
+
+@dataclass
+class StreamedDocument:
+    """Streaming counterpart of ParsedDocument for documents too large to hold in memory.
+
+    Iterating `segments` yields the document's Markdown in order; joining every
+    segment's text gives exactly the `markdown_text` the regular parser builds.
+    Segments are joined with "", so separators travel inside them. `metadata`
+    is the regular parser's metadata dict and is complete once `segments` is
+    exhausted.
+    """
+
+    source_type: str
+    filename: str
+    segments: Iterator[ParsedSegment]
+    metadata: dict = field(default_factory=dict)
+
+
+def stream_parsed(result: dict, source_type: str, filename: str) -> StreamedDocument:
+    """Wrap a regular parser result ({"text", "metadata", ...}) as a single-segment stream."""
+    return StreamedDocument(
+        source_type=source_type,
+        filename=filename,
+        segments=iter([ParsedSegment(text=result["text"])]),
+        metadata=result.get("metadata", {}),
+    )
+
+
 # Shared helpers.
 
 MATH_SYMBOLS = set("∫∑∏√∂∇∆λμσπαβγδεζηθ²³°±×÷≤≥≠∈⊂∞")
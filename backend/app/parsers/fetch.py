@@ -0,0 +1,328 @@
+"""VERO Fetch: Pooled HTTP client with an on-disk conditional-GET cache for URL and repository ingestion.
+
+Every fetch in a process goes through one httpx client per event loop, so
+connections (DNS, TLS) are reused across documents. At most
+VERO_HTTP_PER_HOST requests run against one host at a time, within
+VERO_HTTP_MAX_CONNECTIONS overall. The pipeline fetches web pages and resolves
+repository commits in the API process, on its one long-lived loop, and hands
+the results to the parse workers; a worker's own fetches (file-by-file
+repository reads) use a client that is closed when its parse ends
+(close_loop_client).
+
+Responses that carry an ETag or Last-Modified validator are kept under
+backend/data/http_cache/ (zlib-compressed, least recently used entries evicted
+beyond VERO_HTTP_CACHE_MB). The next fetch of the same URL sends
+If-None-Match / If-Modified-Since; a 304 answer is served from disk with
+`not_modified` set. The pipeline does not branch on that flag: the body is the
+same bytes as before, so the source-hash check finds the earlier document, and
+failing that the unchanged validator is a parse cache hit. Skipping the parse
+therefore depends on one of the two (with VERO_PARSE_CACHE=false and the
+earlier document deleted, an unchanged page is parsed again). Responses marked
+Cache-Control: no-store are never kept.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, NamedTuple
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Connection pool: total connections, and concurrent requests per host
+MAX_CONNECTIONS = int(os.environ.get("VERO_HTTP_MAX_CONNECTIONS", "32"))
+PER_HOST = int(os.environ.get("VERO_HTTP_PER_HOST", "4"))
+TIMEOUT_SECONDS = float(os.environ.get("VERO_HTTP_TIMEOUT_SECONDS", "30"))
+# VERO_HTTP_CACHE=false always downloads the full body
+CACHE_ENABLED = os.environ.get("VERO_HTTP_CACHE", "true").lower() == "true"
+# Disk budget for compressed responses (LRU eviction beyond it)
+CACHE_BYTES = int(float(os.environ.get("VERO_HTTP_CACHE_MB", "256")) * 1024 * 1024)
+
+_CACHE_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "http_cache"
+_SUFFIX = ".http.z"
+
+
+class FetchedPage(NamedTuple):
+    """A fetched response body with its encoding and HTTP validators."""
+    body: bytes
+    encoding: str | None
+    etag: str | None = None
+    last_modified: str | None = None
+    status: int = 200
+    not_modified: bool = False  # True when the server answered 304 and the body came from the cache
+
+    @property
+    def validator(self) -> str | None:
+        """Strongest available validator (ETag first), or None if the server sent neither."""
+        if self.etag:
+            return f"etag:{self.etag}"
+        if self.last_modified:
+            return f"modified:{self.last_modified}"
+        return None
+
+
+class HttpCache:
+    """Size-bounded on-disk LRU of validated responses. Thread-safe; call from a worker thread."""
+
+    def __init__(self, directory: Path = _CACHE_DIR, max_bytes: int = CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes: int | None = None  # Lazily summed from disk
+        self._revalidated = 0
+        self._downloads = 0
+        self._evictions = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}{_SUFFIX}"
+
+    def get(self, key: str) -> FetchedPage | None:
+        """The stored response for `key`, or None."""
+        path = self._path(key)
+        try:
+            header, _, body = zlib.decompress(path.read_bytes()).partition(b"\n")
+            entry = json.loads(header)
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, ValueError) as exc:
+            logger.warning("HTTP cache: dropping unreadable entry %s: %s", path.name, exc)
+            self._discard(path)
+            return None
+        if entry.get("key") != key:
+            return None
+        return FetchedPage(body, entry.get("encoding"), entry.get("etag"), entry.get("last_modified"))
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as recently used after a successful revalidation."""
+        with self._lock:
+            self._revalidated += 1
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def put(self, key: str, page: FetchedPage) -> None:
+        """Store a response with its validators."""
+        header = json.dumps({
+            "key": key, "encoding": page.encoding, "etag": page.etag, "last_modified": page.last_modified,
+        }).encode("utf-8")
+        blob = zlib.compress(header + b"\n" + page.body, 6)
+        if len(blob) > self.max_bytes:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(blob)
+        with self._lock:
+            total = self._total_bytes()
+            old = path.stat().st_size if path.exists() else 0
+            os.replace(tmp, path)
+            self._bytes = total - old + len(blob)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def record_download(self) -> None:
+        with self._lock:
+            self._downloads += 1
+
+    def stats(self) -> dict:
+        """Counters since startup plus the current disk footprint."""
+        with self._lock:
+            fetches = self._revalidated + self._downloads
+            return {
+                "entries": len(self._entries()),
+                "bytes": self._total_bytes(),
+                "max_bytes": self.max_bytes,
+                "revalidated": self._revalidated,
+                "downloads": self._downloads,
+                "revalidated_ratio": self._revalidated / fetches if fetches else 0.0,
+                "evictions": self._evictions,
+            }
+
+    def _total_bytes(self) -> int:
+        if self._bytes is None:
+            self._bytes = sum(p.stat().st_size for p in self._entries())
+        return self._bytes
+
+    def _entries(self) -> list[Path]:
+        if not self.directory.exists():
+            return []
+        return list(self.directory.glob(f"*{_SUFFIX}"))
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits its budget (lock held)."""
+        entries = []
+        for path in self._entries():
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self._evictions += 1
+        self._bytes = total
+
+    def _discard(self, path: Path) -> None:
+        with self._lock:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except OSError:
+                return
+            if self._bytes is not None:
+                self._bytes -= size
+
+
+_cache: HttpCache | None = None
+_init_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """Return the global HttpCache singleton."""
+    global _cache
+    if _cache is None:
+        with _init_lock:
+            if _cache is None:
+                _cache = HttpCache()
+    return _cache
+
+
+# Pooled clients.
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+
+
+class _LoopClient:
+    """The async client and per-host semaphores of one event loop (httpx clients cannot cross loops)."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.client = httpx.AsyncClient(follow_redirects=True, timeout=TIMEOUT_SECONDS, limits=_limits())
+        self.hosts: dict[str, asyncio.Semaphore] = {}
+
+    def host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self.hosts:
+            self.hosts[host] = asyncio.Semaphore(PER_HOST)
+        return self.hosts[host]
+
+
+_async: _LoopClient | None = None
+_sync: httpx.Client | None = None
+_sync_pid = 0
+_sync_hosts: dict[str, threading.BoundedSemaphore] = {}
+_sync_lock = threading.Lock()
+
+
+def _loop_client() -> _LoopClient:
+    global _async
+    loop = asyncio.get_running_loop()
+    if _async is None or _async.loop is not loop:
+        stale = _async
+        if stale is not None and stale.loop.is_running():
+            # Still serving another thread: close the client on its own loop
+            asyncio.run_coroutine_threadsafe(stale.client.aclose(), stale.loop)
+        _async = _LoopClient(loop)
+    return _async
+
+
+async def fetch(url: str, headers: dict | None = None, use_cache: bool = True) -> FetchedPage:
+    """GET a URL through the pooled client, revalidating a cached copy when there is one.
+
+    Never raises on HTTP error statuses; check `status` (fetch_web does).
+    """
+    headers = dict(headers or {})
+    key = f"{url} {headers.get('Accept', '')}"
+    cache = get_http_cache() if use_cache and CACHE_ENABLED else None
+    cached = await asyncio.to_thread(cache.get, key) if cache else None
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    state = _loop_client()
+    async with state.host_slot(url):
+        response = await state.client.get(url, headers=headers)
+
+    if cached is not None and response.status_code == 304:
+        await asyncio.to_thread(cache.touch, key)
+        return cached._replace(
+            etag=response.headers.get("etag", cached.etag),
+            last_modified=response.headers.get("last-modified", cached.last_modified),
+            not_modified=True,
+        )
+
+    page = FetchedPage(
+        body=response.content,
+        encoding=response.encoding,
+        etag=response.headers.get("etag"),
+        last_modified=response.headers.get("last-modified"),
+        status=response.status_code,
+    )
+    if cache is not None:
+        cache.record_download()
+        no_store = "no-store" in response.headers.get("cache-control", "").lower()
+        if response.status_code == 200 and page.validator and not no_store:
+            try:
+                await asyncio.to_thread(cache.put, key, page)
+            except OSError as exc:
+                logger.warning("HTTP cache: could not store %s: %s", url[:80], exc)
+    return page
+
+
+@contextmanager
+def stream_sync(url: str) -> Iterator[httpx.Response]:
+    """Streaming GET through the process-wide blocking client, for readers running in a thread.
+
+    Bodies streamed this way (repository archives) are not cached.
+    """
+    global _sync, _sync_pid
+    with _sync_lock:
+        if _sync is None or _sync_pid != os.getpid():
+            # A client inherited through fork() shares its sockets with the parent
+            _sync = httpx.Client(follow_redirects=True, timeout=TIMEOUT_SECONDS, limits=_limits())
+            _sync_pid = os.getpid()
+            _sync_hosts.clear()
+        host = urlsplit(url).netloc
+        slot = _sync_hosts.setdefault(host, threading.BoundedSemaphore(PER_HOST))
+        client = _sync
+    with slot, client.stream("GET", url) as response:
+        yield response
+
+
+async def close_loop_client() -> None:
+    """Close the async client of the running loop, before an asyncio.run() in a parse worker returns."""
+    global _async
+    state = _async
+    if state is not None and state.loop is asyncio.get_running_loop():
+        _async = None
+        await state.client.aclose()
+
+
+async def close_clients() -> None:
+    """Close the pooled clients (application shutdown)."""
+    global _async, _sync
+    await close_loop_client()
+    _async = None
+    with _sync_lock:
+        if _sync is not None:
+            _sync.close()
+        _sync = None
@@ -1,52 +1,186 @@
 """VERO Parser — PDF: Structure-aware parsing with table extraction and image captioning.
 
 Uses a 3-tool approach:
-  1. pymupdf4llm  — converts PDF to structured Markdown (headings, bold, lists, code)
+  1. PyMuPDF      — one pass over the pages for text, word counts, image info and table hints
   2. pdfplumber   — precise table extraction → Markdown tables
   3. Gemini Vision — image captioning for figures/diagrams (optional, graceful fallback)
 
 Documents are routed by complexity:
-  - text_only:     Simple text PDFs → pymupdf4llm only
+  - text_only:     Simple text PDFs → page text
   - slide_mode:    Slide-like PDFs (<120 words/page avg) → per-page extraction
   - full_pipeline: Complex docs with images/tables → all 3 tools
+
+Every page is visited once by PyMuPDF. Long documents are split into page
+ranges that the long-lived PDF worker pool (see pool.py) walks in parallel, and
+the results are merged back in page order. The walk keeps per-page features (words, images, table hints,
+ruling lines), so pdfplumber only visits pages that can hold a table.
+
+stream_pdf() produces the same output as a stream of page segments for
+documents too large to hold in memory (see contracts.StreamedDocument).
 """
 
 import logging
 import os
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import fitz  # PyMuPDF
 
-from app.parsers.contracts import ParsedDocument, table_to_markdown, has_math_symbols
+from app.parsers.contracts import (
+    ParsedDocument, ParsedSegment, StreamedDocument, table_to_markdown, has_math_symbols,
+)
 
 logger = logging.getLogger(__name__)
 
+# Documents longer than this many pages are split across worker processes
+PAGES_PER_WORKER = int(os.environ.get("VERO_PDF_PAGES_PER_WORKER", "64"))
+PDF_WORKERS = int(os.environ.get("VERO_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+# VERO_PDF_TABLE_FILTER=false runs pdfplumber on every page instead of table candidates
+TABLE_FILTER = os.environ.get("VERO_PDF_TABLE_FILTER", "true").lower() == "true"
+
+# Gemini Vision captioning. Temporarily disabled to save API resources and speed up ingestion
+_CAPTIONING_ENABLED = False
+
+# Images smaller than this (icons, decorations, bullets) are not reported as figures
+_MIN_FIGURE_PX = 100
+
+# pdfplumber ignores edges shorter than this (edge_min_length); 1pt slack on axis alignment
+_MIN_RULING_PT = 3
+_AXIS_SLACK_PT = 1
+
+# Joins page sections, tables and figures in the Markdown output
+_SEPARATOR = "\n\n---\n\n"
+
+
+# Phase 1: Single-pass page walk.
+
+@dataclass
+class PageInfo:
+    """Everything the parser needs from one page, gathered in a single visit."""
+    number: int                 # 0-based page index
+    text: str                   # Stripped page text
+    words: int
+    image_count: int            # Every image reference on the page
+    figures: list = field(default_factory=list)  # (width, height, (bytes, ext) | None) per figure-sized image
+    table_hint: bool = False
+    has_math: bool = False
+    rulings: tuple[int, int] = (0, 0)  # Horizontal and vertical ruling edges
+
+    @property
+    def table_candidate(self) -> bool:
+        """Whether pdfplumber could find a table here.
+
+        Its default "lines" strategy builds cells from ruling edges, so a table
+        needs at least two horizontal and two vertical ones. Text hints are
+        kept as candidates too.
+        """
+        h, v = self.rulings
+        return self.table_hint or (h >= 2 and v >= 2)
+
+
+def _count_rulings(page) -> tuple[int, int]:
+    """Count horizontal and vertical edges in the page's vector drawings (lines, rectangles, straight curves)."""
+    h = v = 0
+
+    def edge(p, q):
+        nonlocal h, v
+        if abs(p.y - q.y) <= _AXIS_SLACK_PT and abs(p.x - q.x) >= _MIN_RULING_PT:
+            h += 1
+        elif abs(p.x - q.x) <= _AXIS_SLACK_PT and abs(p.y - q.y) >= _MIN_RULING_PT:
+            v += 1
+
+    for path in page.get_drawings():
+        for item in path["items"]:
+            op = item[0]
+            if op == "l":
+                edge(item[1], item[2])
+            elif op in ("re", "qu"):
+                rect = item[1] if op == "re" else item[1].rect
+                if rect.width >= _MIN_RULING_PT:
+                    h += 2
+                if rect.height >= _MIN_RULING_PT:
+                    v += 2
+            elif op == "c":
+                for p, q in zip(item[1:4], item[2:5]):
+                    edge(p, q)
+    return h, v
+
+
+def _walk_pages(path: str, start: int, stop: int, keep_text: bool = True) -> list[PageInfo]:
+    """Open the PDF once and collect text, word count, image info and table hints for pages [start, stop).
+
+    With keep_text=False the text is only measured, not kept (PageInfo.text is empty).
+    """
+    doc = fitz.open(path)
+    pages = []
+    try:
+        for number in range(start, min(stop, doc.page_count)):
+            page = doc[number]
+            text = page.get_text("text")
+            images = page.get_images()
+
+            figures = []
+            for img_info in images:
+                # (xref, smask, width, height, ...): dimensions without decoding the image
+                xref, w, h = img_info[0], img_info[2], img_info[3]
+                if w < _MIN_FIGURE_PX or h < _MIN_FIGURE_PX:
+                    continue
+                data = None
+                if _CAPTIONING_ENABLED:
+                    try:
+                        base = doc.extract_image(xref)
+                        data = (base["image"], base.get("ext", "png"))
+                    except Exception as e:
+                        logger.warning("Failed to extract image xref=%d on page %d: %s", xref, number + 1, e)
+                        continue
+                figures.append((w, h, data))
+
+            pages.append(PageInfo(
+                number=number,
+                text=text.strip() if keep_text else "",
+                words=len(text.split()),
+                image_count=len(images),
+                figures=figures,
+                # Table heuristic: lots of tabs or aligned whitespace
+                table_hint=text.count("\t") > 4 or text.count("   ") > 15,
+                has_math=has_math_symbols(text),
+                rulings=_count_rulings(page) if TABLE_FILTER else (0, 0),
+            ))
+    finally:
+        doc.close()
+    return pages
 
-# Phase 1: Scan.
 
-def _scan_pdf(path: str) -> dict:
-    """Quick scan to determine document complexity and characteristics."""
-    doc = fitz.open(path)
-    total_images = 0
-    table_hints = 0
-    words_per_page = []
-    has_equations = False
+def _page_ranges(page_count: int, workers: int | None = None, per_worker: int | None = None) -> list[tuple[int, int]]:
+    """Split [0, page_count) into balanced contiguous ranges: one per `per_worker` pages, at most `workers`."""
+    workers = PDF_WORKERS if workers is None else workers
+    per_worker = PAGES_PER_WORKER if per_worker is None else per_worker
+    if workers <= 1 or page_count <= per_worker:
+        return [(0, page_count)]
+    n = min(workers, -(-page_count // per_worker))
+    size = -(-page_count // n)
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
 
-    for page in doc:
-        text = page.get_text("text")
-        words_per_page.append(len(text.split()))
-        total_images += len(page.get_images())
 
-        # Table heuristic: lots of tabs or aligned whitespace
-        if text.count("\t") > 4 or text.count("   ") > 15:
-            table_hints += 1
+def _map_ranges(fn, path: str, ranges: list[tuple]) -> list:
+    """Run fn(path, *args) for each argument tuple, on the long-lived PDF pool when there is more than one.
+
+    Results come back in input order, so concatenating them keeps page order.
+    """
+    if len(ranges) <= 1:
+        return [fn(path, *r) for r in ranges]
+    from app.parsers.pool import get_pool
 
-        if has_math_symbols(text):
-            has_equations = True
+    pool = get_pool("pdf", max(PDF_WORKERS, 1))
+    futures = [pool.submit(fn, path, *args) for args in ranges]
+    return [f.result() for f in futures]
 
-    doc.close()
 
-    avg_words = sum(words_per_page) / len(words_per_page) if words_per_page else 0
+def _scan(pages: list[PageInfo]) -> dict:
+    """Determine document complexity and characteristics from the walked pages."""
+    total_images = sum(p.image_count for p in pages)
+    table_hints = sum(1 for p in pages if p.table_hint)
+    avg_words = sum(p.words for p in pages) / len(pages) if pages else 0
     is_slide = avg_words < 120
 
     complexity = (
@@ -56,11 +190,11 @@ def _scan_pdf(path: str) -> dict:
     )
 
     return {
-        "page_count": len(words_per_page),
+        "page_count": len(pages),
         "has_images": total_images > 0,
         "image_count": total_images,
         "has_tables_hint": table_hints > 0,
-        "has_equations": has_equations,
+        "has_equations": any(p.has_math for p in pages),
         "is_slide": is_slide,
         "avg_words": round(avg_words),
         "complexity": complexity,
@@ -71,9 +205,9 @@ def _scan_pdf(path: str) -> dict:
 
 def _caption_image(image_bytes: bytes, mime_type: str, page_num: int) -> str | None:
     """Send an image to Gemini Vision for captioning. Returns description or None."""
-    # Temporarily disabled to save API resources and speed up ingestion
-    return None
-    
+    if not _CAPTIONING_ENABLED:
+        return None
+
     api_key = os.environ.get("GEMINI_API_KEY")
     if not api_key:
         return None
@@ -100,17 +234,13 @@ def _caption_image(image_bytes: bytes, mime_type: str, page_num: int) -> str | N
     return None
 
 
-def _extract_and_caption_images(path: str) -> tuple[list[str], int]:
-    """Extract images from PDF and caption them via Gemini Vision.
+def _describe_figures(pages: list[PageInfo]) -> tuple[list[str], int]:
+    """Describe the figures found during the page walk, captioning them when enabled.
 
     Returns:
         (image_descriptions, total_image_count)
         Each description is a formatted string ready to inject into markdown.
     """
-    doc = fitz.open(path)
-    descriptions = []
-    total = 0
-
     # Map image extensions to MIME types
     ext_to_mime = {
         "png": "image/png",
@@ -122,132 +252,141 @@ def _extract_and_caption_images(path: str) -> tuple[list[str], int]:
         "tiff": "image/tiff",
     }
 
-    for page_num, page in enumerate(doc):
-        for img_info in page.get_images():
-            xref = img_info[0]
-            try:
-                base = doc.extract_image(xref)
-                w, h = base["width"], base["height"]
-
-                # Skip tiny images (icons, decorations, bullets)
-                if w < 100 or h < 100:
-                    continue
-
-                total += 1
-                ext = base.get("ext", "png")
-                mime = ext_to_mime.get(ext, f"image/{ext}")
-
-                caption = _caption_image(base["image"], mime, page_num + 1)
-                if caption:
-                    descriptions.append(
-                        f'\n> **[Figure, page {page_num + 1}]:** {caption}\n'
-                    )
-                else:
-                    descriptions.append(
-                        f"\n> **[Figure, page {page_num + 1}]:** "
-                        f"Visual content ({w}×{h}px) — not captioned.\n"
-                    )
-            except Exception as e:
-                logger.warning("Failed to extract image xref=%d on page %d: %s", xref, page_num + 1, e)
-
-    doc.close()
+    descriptions = []
+    total = 0
+    for page in pages:
+        for w, h, data in page.figures:
+            total += 1
+            caption = None
+            if data is not None:
+                image_bytes, ext = data
+                caption = _caption_image(image_bytes, ext_to_mime.get(ext, f"image/{ext}"), page.number + 1)
+            if caption:
+                descriptions.append(
+                    f'\n> **[Figure, page {page.number + 1}]:** {caption}\n'
+                )
+            else:
+                descriptions.append(
+                    f"\n> **[Figure, page {page.number + 1}]:** "
+                    f"Visual content ({w}×{h}px) — not captioned.\n"
+                )
     return descriptions, total
 
 
 # Phase 3: Table extraction.
 
-def _extract_tables(path: str) -> tuple[str, list]:
-    """Extract tables using pdfplumber and convert to Markdown.
+def _extract_tables(path: str, page_numbers: list[int]) -> list[tuple[int, list]]:
+    """Extract tables from the given pages (0-based, ascending) using pdfplumber.
 
     Returns:
-        (markdown_tables_text, raw_tables_list)
+        [(page_index, table_rows), ...] in page order
     """
     import pdfplumber
 
-    tables_md_parts = []
-    tables_raw = []
-
+    tables = []
     try:
         with pdfplumber.open(path) as pdf:
-            for page_num, page in enumerate(pdf.pages):
-                page_tables = page.extract_tables()
-                for table in page_tables:
+            for page_num in page_numbers:
+                if page_num >= len(pdf.pages):
+                    break
+                page = pdf.pages[page_num]
+                for table in page.extract_tables():
                     if not table or len(table) < 2:
                         continue
-
-                    tables_raw.append(table)
-                    md = table_to_markdown(table)
-                    if md:
-                        tables_md_parts.append(
-                            f"\n**Table (page {page_num + 1}):**\n\n{md}\n"
-                        )
+                    tables.append((page_num, table))
+                page.close()  # Drop the page's cached layout objects
     except Exception as e:
         logger.warning("pdfplumber table extraction failed: %s", e)
+    return tables
 
-    return "\n".join(tables_md_parts), tables_raw
 
+def _tables_to_markdown(tables: list[tuple[int, list]]) -> tuple[str, list]:
+    """Convert extracted tables to Markdown.
+
+    Returns:
+        (markdown_tables_text, raw_tables_list)
+    """
+    tables_md_parts = []
+    tables_raw = []
+    for page_num, table in tables:
+        tables_raw.append(table)
+        md = table_to_markdown(table)
+        if md:
+            tables_md_parts.append(
+                f"\n**Table (page {page_num + 1}):**\n\n{md}\n"
+            )
+    return "\n".join(tables_md_parts), tables_raw
 
-# Fast text extraction.
 
-def _fast_extract_text(filepath: str) -> str:
-    """Extract text page-by-page using PyMuPDF (instant, no ONNX model).
+def _candidate_tables(path: str, pages: list[PageInfo]) -> tuple[str, list, int]:
+    """Extract tables via pdfplumber (precise, slow) on candidate pages only, split across workers.
 
-    Returns clean text with page markers for structure.
+    Returns:
+        (markdown_tables_text, raw_tables_list, pages_scanned)
     """
-    doc = fitz.open(filepath)
-    pages = []
-    for i, page in enumerate(doc):
-        text = page.get_text("text").strip()
-        if text:
-            pages.append(f"## Page {i + 1}\n\n{text}")
-    doc.close()
-    return "\n\n---\n\n".join(pages)
+    candidates = [p.number for p in pages if not TABLE_FILTER or p.table_candidate]
+    batches = [(candidates[a:b],) for a, b in _page_ranges(len(candidates)) if b > a]
+    tables = [t for chunk in _map_ranges(_extract_tables, path, batches) for t in chunk]
+    logger.info("PDF tables [%s]: %d of %d pages scanned", Path(path).name, len(candidates), len(pages))
+    tables_text, tables_raw = _tables_to_markdown(tables)
+    return tables_text, tables_raw, len(candidates)
+
+
+def _result_metadata(scan: dict, tables_raw: list, image_descriptions: list) -> dict:
+    return {
+        "page_count": scan["page_count"],
+        "complexity": scan["complexity"],
+        "has_tables": len(tables_raw) > 0 or scan["has_tables_hint"],
+        "has_images": scan["has_images"],
+        "has_equations": scan["has_equations"],
+        "tables_extracted": len(tables_raw),
+        "images_captioned": len(image_descriptions),
+    }
 
 
 # Main parser.
 
 async def parse_pdf(filepath: str) -> dict:
-    """Parse a PDF using fast extraction + pdfplumber tables.
+    """Parse a PDF using a single-pass page walk + pdfplumber tables.
 
     Returns {"text": str, "metadata": dict, "parsed_doc": ParsedDocument}
     """
     filename = Path(filepath).name
-    scan = _scan_pdf(filepath)
+    with fitz.open(filepath) as doc:
+        ranges = _page_ranges(doc.page_count)
+
+    pages = [page for chunk in _map_ranges(_walk_pages, filepath, ranges) for page in chunk]
+    scan = _scan(pages)
 
     logger.info(
-        "PDF scan [%s]: %s, %d pages, avg %d words/page, images=%s, tables=%s, equations=%s",
-        filename, scan["complexity"], scan["page_count"], scan["avg_words"],
+        "PDF scan [%s]: %s, %d pages in %d range(s), avg %d words/page, images=%s, tables=%s, equations=%s",
+        filename, scan["complexity"], scan["page_count"], len(ranges), scan["avg_words"],
         scan["has_images"], scan["has_tables_hint"], scan["has_equations"],
     )
 
     tables_raw = []
+    tables_scanned = 0
     image_descriptions = []
     image_count = 0
 
     if scan["complexity"] == "slide_mode":
-        # Slide-like PDF: extract per-page with slide markers
-        doc = fitz.open(filepath)
-        pages_md = []
-        for i, page in enumerate(doc):
-            text = page.get_text("text").strip()
-            if text:
-                pages_md.append(f"## Slide {i + 1}\n\n{text}")
-        doc.close()
-        markdown_text = "\n\n---\n\n".join(pages_md)
+        # Slide-like PDF: per-page text with slide markers
+        pages_md = [f"## Slide {p.number + 1}\n\n{p.text}" for p in pages if p.text]
+        markdown_text = _SEPARATOR.join(pages_md)
 
     else:
-        # Fast text extraction (no ONNX model, works in seconds not minutes)
-        markdown_text = _fast_extract_text(filepath)
+        # Page text with page markers for structure
+        pages_md = [f"## Page {p.number + 1}\n\n{p.text}" for p in pages if p.text]
+        markdown_text = _SEPARATOR.join(pages_md)
 
-        # Extract tables via pdfplumber (precise, fast)
-        tables_text, tables_raw = _extract_tables(filepath)
+        tables_text, tables_raw, tables_scanned = _candidate_tables(filepath, pages)
         if tables_text:
-            markdown_text += f"\n\n---\n\n## Extracted Tables\n{tables_text}"
+            markdown_text += f"{_SEPARATOR}## Extracted Tables\n{tables_text}"
 
         # Caption images via Gemini Vision (currently disabled)
-        image_descriptions, image_count = _extract_and_caption_images(filepath)
+        image_descriptions, image_count = _describe_figures(pages)
         if image_descriptions:
-            markdown_text += "\n\n---\n\n## Figures\n" + "\n".join(image_descriptions)
+            markdown_text += f"{_SEPARATOR}## Figures\n" + "\n".join(image_descriptions)
 
     parsed_doc = ParsedDocument(
         source_type="pdf",
@@ -265,6 +404,7 @@ async def parse_pdf(filepath: str) -> dict:
             "avg_words_per_page": scan["avg_words"],
             "image_count": image_count,
             "tables_extracted": len(tables_raw),
+            "table_pages_scanned": tables_scanned,
         },
     )
 
@@ -275,14 +415,56 @@ async def parse_pdf(filepath: str) -> dict:
 
     return {
         "text": markdown_text,
-        "metadata": {
-            "page_count": scan["page_count"],
-            "complexity": scan["complexity"],
-            "has_tables": parsed_doc.has_tables,
-            "has_images": parsed_doc.has_images,
-            "has_equations": parsed_doc.has_equations,
-            "tables_extracted": len(tables_raw),
-            "images_captioned": len(image_descriptions),
-        },
+        "metadata": _result_metadata(scan, tables_raw, image_descriptions),
         "parsed_doc": parsed_doc,
     }
+
+
+def _page_texts(path: str, start: int, stop: int):
+    """Yield (page_index, stripped_text) for pages [start, stop)."""
+    with fitz.open(path) as doc:
+        for number in range(start, min(stop, doc.page_count)):
+            yield number, doc[number].get_text("text").strip()
+
+
+def stream_pdf(filepath: str) -> StreamedDocument:
+    """Parse a PDF as a stream of page segments, same text and metadata as parse_pdf.
+
+    Page features are walked first without keeping text (in parallel ranges)
+    to choose slide or page markers; the text is then read one block of
+    PAGES_PER_WORKER pages at a time as the segments are consumed.
+    """
+    filename = Path(filepath).name
+    with fitz.open(filepath) as doc:
+        page_count = doc.page_count
+    ranges = [(start, stop, False) for start, stop in _page_ranges(page_count)]
+    pages = [page for chunk in _map_ranges(_walk_pages, filepath, ranges) for page in chunk]
+    scan = _scan(pages)
+    metadata = {}
+
+    logger.info(
+        "PDF scan [%s]: %s, %d pages, streaming in blocks of %d",
+        filename, scan["complexity"], scan["page_count"], PAGES_PER_WORKER,
+    )
+
+    def segments():
+        marker = "Slide" if scan["complexity"] == "slide_mode" else "Page"
+        separator = ""
+        block = max(1, PAGES_PER_WORKER)
+        for start in range(0, page_count, block):
+            for number, text in _page_texts(filepath, start, start + block):
+                if text:
+                    yield ParsedSegment(f"{separator}## {marker} {number + 1}\n\n{text}", f"page {number + 1}")
+                    separator = _SEPARATOR
+
+        tables_raw, image_descriptions = [], []
+        if scan["complexity"] != "slide_mode":
+            tables_text, tables_raw, _ = _candidate_tables(filepath, pages)
+            if tables_text:
+                yield ParsedSegment(f"{_SEPARATOR}## Extracted Tables\n{tables_text}", "tables")
+            image_descriptions, _ = _describe_figures(pages)
+            if image_descriptions:
+                yield ParsedSegment(f"{_SEPARATOR}## Figures\n" + "\n".join(image_descriptions), "figures")
+        metadata.update(_result_metadata(scan, tables_raw, image_descriptions))
+
+    return StreamedDocument(source_type="pdf", filename=filename, segments=segments(), metadata=metadata)
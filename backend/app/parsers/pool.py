@@ -0,0 +1,50 @@
+"""VERO Parsers — Worker pools: long-lived process pools for CPU-bound work inside a parser.
+
+Parsers fan work out (PDF page ranges, repository docstrings) to one pool per
+kind of work that lives as long as the process. Nothing is started per
+document, and the process count is fixed: at most `workers` per pool in each
+process that parses (with the ingestion pipeline, VERO_STAGE_PARSE_WORKERS
+parse processes). Pools start their workers through a fork server where the
+platform has one, so they are never forked from a multithreaded parent.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import util
+
+_pools: dict[str, tuple[int, int, ProcessPoolExecutor]] = {}  # name -> (pid, workers, pool)
+_lock = threading.Lock()
+
+
+def _context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def get_pool(name: str, workers: int) -> ProcessPoolExecutor:
+    """The process-wide pool `name` with `workers` processes, created on first use."""
+    with _lock:
+        entry = _pools.get(name)
+        if entry is not None and entry[0] == os.getpid() and entry[1] == workers:
+            return entry[2]
+        if entry is not None and entry[0] == os.getpid():
+            # Resized (settings changed at runtime): let the old pool finish its work
+            entry[2].shutdown(wait=False)
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=_context())
+        _pools[name] = (os.getpid(), workers, pool)
+        # A parse worker joins its child processes on exit, before atexit would
+        # run: stop the pool from multiprocessing's exit hook instead, ahead of
+        # the call queue's own finalizer (priority 10) so the stop reaches it
+        util.Finalize(pool, pool.shutdown, kwargs={"cancel_futures": True}, exitpriority=20)
+        return pool
+
+
+def shutdown_pools() -> None:
+    """Stop every pool this process started."""
+    with _lock:
+        for pid, _, pool in _pools.values():
+            if pid == os.getpid():
+                pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
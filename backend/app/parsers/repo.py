@@ -1,11 +1,62 @@
-"""VERO Parser — GitHub Repository: Fetches README and Python docstrings from GitHub."""
+"""VERO Parser — GitHub Repository: Fetches README and Python docstrings from GitHub.
 
+Repositories are read one of three ways:
+  archive  (default) the tarball of the resolved HEAD commit is downloaded in
+           a single request and read member by member while it streams,
+           never touching disk
+  local    a local clone under VERO_REPO_LOCAL_ROOT is walked instead
+  api      the previous path: README candidates and Python files fetched one
+           request at a time (VERO_REPO_MODE=api)
+
+Every mode keeps Python files of at most VERO_REPO_MAX_FILE_KB each: up to
+VERO_REPO_MAX_FILES of them, or VERO_REPO_API_MAX_FILES (default 50, to stay
+within rate limits) in API mode. Archive and local reads extract their docstrings
+in batches on the long-lived repository worker pool (see pool.py) while the
+rest of the tree is still being read.
+
+Requests go through the pooled client in fetch.py; API answers (the HEAD
+commit, file-by-file fetches) are revalidated against its HTTP cache.
+"""
+
+import asyncio
+import io
+import json
+import os
 import re
+import tarfile
+from collections import deque
+from pathlib import Path
+from typing import Iterator
+
 import httpx
 
+from app.parsers.fetch import fetch, stream_sync
+
 # GitHub raw content base
 _RAW_BASE = "https://raw.githubusercontent.com"
 _API_BASE = "https://api.github.com"
+_ARCHIVE_BASE = "https://codeload.github.com"
+
+# "archive" (one tarball request) or "api" (file-by-file requests)
+REPO_MODE = os.environ.get("VERO_REPO_MODE", "archive").lower()
+# Python files kept per repository, and the largest file read
+MAX_FILES = int(os.environ.get("VERO_REPO_MAX_FILES", "2000"))
+# API mode pays one request per file against GitHub's rate limit, so it reads fewer
+API_MAX_FILES = int(os.environ.get("VERO_REPO_API_MAX_FILES", "50"))
+MAX_FILE_BYTES = int(float(os.environ.get("VERO_REPO_MAX_FILE_KB", "100")) * 1024)
+# Downloads stop (and the parse fails) past this many compressed bytes
+MAX_ARCHIVE_BYTES = int(float(os.environ.get("VERO_REPO_MAX_ARCHIVE_MB", "256")) * 1024 * 1024)
+REPO_WORKERS = int(os.environ.get("VERO_REPO_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Local clones are only read below this directory; unset disables local paths
+LOCAL_ROOT = os.environ.get("VERO_REPO_LOCAL_ROOT", "")
+
+_README_NAMES = ["README.md", "readme.md", "README.rst", "README.txt", "README"]
+
+# Python files handed to a worker process at a time
+_BATCH_FILES = 64
+
+# Directories of a local clone that never hold the project's own sources
+_SKIP_DIRS = {"__pycache__", "node_modules", "site-packages", "venv"}
 
 
 def _parse_github_url(url: str) -> tuple[str, str]:
@@ -23,35 +74,62 @@ def _parse_github_url(url: str) -> tuple[str, str]:
     return match.group(1), match.group(2)
 
 
-async def _fetch_readme(client: httpx.AsyncClient, owner: str, repo: str) -> str:
+_API_HEADERS = {"Accept": "application/vnd.github.v3+json"}
+
+
+def _decode(body: bytes) -> str:
+    return body.decode("utf-8", errors="replace")
+
+
+async def _fetch_readme(owner: str, repo: str) -> str:
     """Try to fetch README content. Returns empty string if not found."""
-    for name in ["README.md", "readme.md", "README.rst", "README.txt", "README"]:
-        url = f"{_RAW_BASE}/{owner}/{repo}/HEAD/{name}"
-        r = await client.get(url)
-        if r.status_code == 200:
-            return r.text
+    for name in _README_NAMES:
+        r = await fetch(f"{_RAW_BASE}/{owner}/{repo}/HEAD/{name}", headers=_API_HEADERS)
+        if r.status == 200:
+            return _decode(r.body)
     return ""
 
 
-async def _fetch_tree(client: httpx.AsyncClient, owner: str, repo: str) -> list[dict]:
+async def _fetch_tree(owner: str, repo: str) -> list[dict]:
     """Fetch the full file tree using the Git Trees API (recursive)."""
-    url = f"{_API_BASE}/repos/{owner}/{repo}/git/trees/HEAD?recursive=1"
-    r = await client.get(url)
-    if r.status_code != 200:
+    r = await fetch(f"{_API_BASE}/repos/{owner}/{repo}/git/trees/HEAD?recursive=1", headers=_API_HEADERS)
+    if r.status != 200:
         return []
-    data = r.json()
+    data = json.loads(r.body)
     return data.get("tree", [])
 
 
-async def _fetch_file(client: httpx.AsyncClient, owner: str, repo: str, path: str) -> str:
+async def _fetch_file(owner: str, repo: str, path: str) -> str:
     """Fetch a single file's raw content."""
-    url = f"{_RAW_BASE}/{owner}/{repo}/HEAD/{path}"
-    r = await client.get(url)
-    if r.status_code == 200:
-        return r.text
+    r = await fetch(f"{_RAW_BASE}/{owner}/{repo}/HEAD/{path}", headers=_API_HEADERS)
+    if r.status == 200:
+        return _decode(r.body)
     return ""
 
 
+async def resolve_commit(repo_url: str) -> str | None:
+    """SHA of the repository's HEAD commit, or None if it cannot be resolved.
+
+    Revalidated through the HTTP cache, and GitHub does not count 304 answers
+    against the API rate limit. Sources that are not GitHub URLs give None.
+    """
+    try:
+        owner, repo = _parse_github_url(repo_url)
+    except ValueError:
+        return None
+    try:
+        r = await fetch(
+            f"{_API_BASE}/repos/{owner}/{repo}/commits/HEAD",
+            headers={"Accept": "application/vnd.github.sha"},
+        )
+    except httpx.HTTPError:
+        return None
+    sha = r.body.decode("ascii", errors="replace").strip()
+    if r.status != 200 or not re.fullmatch(r"[0-9a-f]{40}", sha):
+        return None
+    return sha
+
+
 def _extract_docstrings(source: str, filepath: str) -> str:
     """Extract module-level and class/function docstrings from Python source.
 
@@ -80,43 +158,225 @@ def _extract_docstrings(source: str, filepath: str) -> str:
     return "\n\n".join(parts)
 
 
-async def parse_repo(repo_url: str) -> dict:
-    """Fetch README and Python docstrings from a public GitHub repository.
+def _extract_batch(files: list[tuple[str, bytes]]) -> list[str]:
+    """Docstrings of a batch of (path, source) files, in order; runs in a worker process."""
+    out = []
+    for path, source in files:
+        extracted = _extract_docstrings(source.decode("utf-8", errors="replace"), path)
+        if extracted:
+            out.append(extracted)
+    return out
 
-    Returns {"text": str, "metadata": dict}.
+
+# Archive and local clone reads.
+
+class _ByteStreamReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks, for tarfile's streaming mode."""
+
+    def __init__(self, chunks: Iterator[bytes], limit: int):
+        self._chunks = chunks
+        self._chunk = memoryview(b"")
+        self._limit = limit
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._chunk:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self.bytes_read += len(chunk)
+            if self.bytes_read > self._limit:
+                raise ValueError(f"Repository archive exceeds {self._limit // (1024 * 1024)} MB")
+            self._chunk = memoryview(chunk)
+        n = min(len(b), len(self._chunk))
+        b[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+
+def _classify(path: str, size: int, stats: dict, max_files: int | None = None) -> str | None:
+    """Whether to read a repository file: "readme", "python" or None; counts files over the limits."""
+    if path in _README_NAMES:
+        return "readme"
+    if not path.endswith(".py"):
+        return None
+    if size > MAX_FILE_BYTES or stats["python_files_scanned"] >= (MAX_FILES if max_files is None else max_files):
+        stats["python_files_skipped"] += 1
+        return None
+    stats["python_files_scanned"] += 1
+    return "python"
+
+
+def _iter_archive(url: str, stats: dict) -> Iterator[tuple[str, str, bytes]]:
+    """Yield (kind, path, content) for the README and Python files of a gzipped tarball as it downloads."""
+    with stream_sync(url) as r:
+        if r.status_code != 200:
+            raise ValueError(f"Cannot download repository archive ({r.status_code}): {url}")
+        reader = _ByteStreamReader(r.iter_bytes(), MAX_ARCHIVE_BYTES)
+        try:
+            with tarfile.open(fileobj=reader, mode="r|gz") as tar:
+                for member in tar:
+                    # Members sit under a single "<owner>-<repo>-<sha>/" directory
+                    path = member.name.partition("/")[2]
+                    if not member.isfile() or not path:
+                        continue
+                    kind = _classify(path, member.size, stats)
+                    if kind:
+                        yield kind, path, tar.extractfile(member).read()
+                commit = tar.pax_headers.get("comment", "")
+        except tarfile.TarError as e:
+            raise ValueError(f"Unreadable repository archive {url}: {e}")
+        stats["archive_bytes"] = reader.bytes_read
+        if re.fullmatch(r"[0-9a-f]{40}", commit):
+            stats["commit"] = commit
+
+
+def _iter_local(root: Path, stats: dict) -> Iterator[tuple[str, str, bytes]]:
+    """Yield (kind, path, content) for the README and Python files of a local clone, in path order."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in _SKIP_DIRS)
+        for name in sorted(filenames):
+            full = Path(dirpath) / name
+            if full.is_symlink() or not full.is_file():
+                continue
+            path = full.relative_to(root).as_posix()
+            kind = _classify(path, full.stat().st_size, stats)
+            if kind:
+                yield kind, path, full.read_bytes()
+
+
+def _collect(entries: Iterator[tuple[str, str, bytes]]) -> tuple[str, list[str]]:
+    """Read entries into (README text, docstring sections in file order).
+
+    Python files are batched to the repository worker pool as they arrive,
+    with at most two batches per worker outstanding, so extraction overlaps
+    the read.
     """
-    owner, repo = _parse_github_url(repo_url)
+    readmes = {}
+    parts = []
+    batch = []
+    pending = deque()
+    pool = None
+    if REPO_WORKERS > 1:
+        from app.parsers.pool import get_pool
+        pool = get_pool("repo", REPO_WORKERS)
+
+    def flush():
+        if not batch:
+            return
+        files = batch.copy()
+        batch.clear()
+        if pool is None:
+            parts.extend(_extract_batch(files))
+            return
+        pending.append(pool.submit(_extract_batch, files))
+        while len(pending) > 2 * REPO_WORKERS:
+            parts.extend(pending.popleft().result())
+
+    try:
+        for kind, path, content in entries:
+            if kind == "readme":
+                readmes[path] = content.decode("utf-8", errors="replace")
+                continue
+            batch.append((path, content))
+            if len(batch) >= _BATCH_FILES:
+                flush()
+        flush()
+        while pending:
+            parts.extend(pending.popleft().result())
+    finally:
+        # The pool outlives this read: drop what a failed read left queued
+        for future in pending:
+            future.cancel()
+
+    readme = next((readmes[name] for name in _README_NAMES if name in readmes), "")
+    return readme, parts
+
+
+def _local_clone(source: str) -> Path | None:
+    """The directory a repository source names when it is a local clone path, else None."""
+    if not LOCAL_ROOT or "://" in source or "github.com" in source:
+        return None
+    root = Path(LOCAL_ROOT).expanduser().resolve()
+    path = Path(source).expanduser().resolve()
+    if not path.is_relative_to(root) or not path.is_dir():
+        raise ValueError(f"Local repositories must be directories under {root}: {source}")
+    return path
+
+
+def _read_tree(entries: Iterator[tuple[str, str, bytes]]) -> list[str]:
+    """README and docstring sections of an archive or local clone."""
+    readme, docstring_parts = _collect(entries)
+    sections = []
+    if readme:
+        sections.append(f"# README\n\n{readme}")
+    if docstring_parts:
+        sections.append("# Python Docstrings\n\n" + "\n\n".join(docstring_parts))
+    return sections
+
+
+async def _parse_repo_api(owner: str, repo: str) -> tuple[list[str], dict]:
+    """README and docstrings fetched file by file through the raw and Trees APIs."""
     sections = []
 
-    async with httpx.AsyncClient(
-        follow_redirects=True,
-        timeout=30,
-        headers={"Accept": "application/vnd.github.v3+json"},
-    ) as client:
-        # 1. Fetch README
-        readme = await _fetch_readme(client, owner, repo)
-        if readme:
-            sections.append(f"# README\n\n{readme}")
-
-        # 2. Fetch file tree and extract docstrings from Python files
-        tree = await _fetch_tree(client, owner, repo)
-        py_files = [
-            f["path"] for f in tree
-            if f["type"] == "blob"
-            and f["path"].endswith(".py")
-            and f.get("size", 0) < 100_000  # skip huge files
-        ]
-
-        docstring_parts = []
-        for path in py_files[:50]:  # cap at 50 files to avoid rate limits
-            source = await _fetch_file(client, owner, repo, path)
-            if source:
-                extracted = _extract_docstrings(source, path)
-                if extracted:
-                    docstring_parts.append(extracted)
-
-        if docstring_parts:
-            sections.append("# Python Docstrings\n\n" + "\n\n".join(docstring_parts))
+    # 1. Fetch README
+    readme = await _fetch_readme(owner, repo)
+    if readme:
+        sections.append(f"# README\n\n{readme}")
+
+    # 2. Fetch file tree and extract docstrings from Python files, one request
+    # each, so at most API_MAX_FILES of them to avoid rate limits
+    tree = await _fetch_tree(owner, repo)
+    stats = {"python_files_scanned": 0, "python_files_skipped": 0}
+    api_max_files = min(API_MAX_FILES, MAX_FILES)
+    py_files = [
+        f["path"] for f in tree
+        if f["type"] == "blob" and _classify(f["path"], f.get("size", 0), stats, api_max_files) == "python"
+    ]
+
+    docstring_parts = []
+    for path in py_files:
+        source = await _fetch_file(owner, repo, path)
+        if source:
+            extracted = _extract_docstrings(source, path)
+            if extracted:
+                docstring_parts.append(extracted)
+
+    if docstring_parts:
+        sections.append("# Python Docstrings\n\n" + "\n\n".join(docstring_parts))
+
+    return sections, stats
+
+
+async def parse_repo(repo_url: str, commit: str | None = None) -> dict:
+    """Fetch README and Python docstrings from a public GitHub repository or a local clone.
+
+    Args:
+        repo_url: GitHub URL, or a local clone path under VERO_REPO_LOCAL_ROOT.
+        commit: HEAD commit from resolve_commit(), when the caller already has
+            it; archives are downloaded by this SHA so the text matches the
+            commit the parse cache keys it by.
+
+    Returns {"text": str, "metadata": dict}.
+    """
+    stats = {"python_files_scanned": 0, "python_files_skipped": 0}
+    local = _local_clone(repo_url)
+    if local is not None:
+        owner, repo = None, local.name
+        mode = "local"
+        sections = await asyncio.to_thread(_read_tree, _iter_local(local, stats))
+    else:
+        owner, repo = _parse_github_url(repo_url)
+        mode = "api" if REPO_MODE == "api" else "archive"
+        if mode == "api":
+            sections, stats = await _parse_repo_api(owner, repo)
+        else:
+            commit = commit or await resolve_commit(repo_url)
+            url = f"{_ARCHIVE_BASE}/{owner}/{repo}/tar.gz/{commit or 'HEAD'}"
+            sections = await asyncio.to_thread(_read_tree, _iter_archive(url, stats))
 
     text = "\n\n---\n\n".join(sections)
     if not text.strip():
@@ -128,6 +388,7 @@ async def parse_repo(repo_url: str) -> dict:
             "repo_url": repo_url,
             "owner": owner,
             "repo_name": repo,
-            "python_files_scanned": len(py_files) if tree else 0,
+            "repo_mode": mode,
+            **stats,
         },
     }
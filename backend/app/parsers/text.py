@@ -1,12 +1,19 @@
 """VERO Parser — Plain Text & Markdown: Simple text extraction."""
 
 import logging
+import re
 from pathlib import Path
 
-from app.parsers.contracts import ParsedDocument, has_math_symbols
+from app.parsers.contracts import ParsedDocument, ParsedSegment, StreamedDocument, has_math_symbols
 
 logger = logging.getLogger(__name__)
 
+# Characters read per streamed block
+_STREAM_BLOCK = 1024 * 1024
+
+# Line boundaries str.splitlines() recognizes once universal newlines turned \r and \r\n into \n
+_LINE_BREAKS = re.compile("[\n\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
 
 def _extract_md_tables(text: str) -> list:
     """Extract Markdown tables from text as a list of 2D lists."""
@@ -77,3 +84,46 @@ async def parse_text(filepath: str) -> dict:
         "metadata": parsed_doc.metadata,
         "parsed_doc": parsed_doc,
     }
+
+
+def stream_text(filepath: str) -> StreamedDocument:
+    """Stream a plain text or Markdown file in blocks, same text and metadata as parse_text.
+
+    Markdown passes through unchanged; plain text is re-joined paragraph by
+    paragraph, holding back the unfinished paragraph at the end of each block.
+    """
+    path = Path(filepath)
+    is_markdown = path.suffix.lower() in (".md", ".markdown")
+    metadata = {}
+
+    def segments():
+        breaks = 0
+        last = ""
+        separator = ""
+        pending = ""
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            while block := f.read(_STREAM_BLOCK):
+                breaks += len(_LINE_BREAKS.findall(block))
+                last = block[-1]
+                if is_markdown:
+                    yield ParsedSegment(block)
+                    continue
+                parts = (pending + block).split("\n\n")
+                pending = parts.pop()
+                paragraphs = [p.strip() for p in parts if p.strip()]
+                if paragraphs:
+                    yield ParsedSegment(separator + "\n\n".join(paragraphs))
+                    separator = "\n\n"
+        if pending.strip():
+            yield ParsedSegment(separator + pending.strip())
+
+        line_count = breaks + (1 if last and not _LINE_BREAKS.match(last) else 0)
+        metadata.update({"line_count": line_count, "is_markdown": is_markdown})
+        logger.info("Text streamed [%s]: %d lines", path.name, line_count)
+
+    return StreamedDocument(
+        source_type="markdown" if is_markdown else "text",
+        filename=path.name,
+        segments=segments(),
+        metadata=metadata,
+    )
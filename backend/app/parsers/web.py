@@ -13,6 +13,7 @@ import httpx
 from bs4 import BeautifulSoup
 
 from app.parsers.contracts import ParsedDocument, table_to_markdown
+from app.parsers.fetch import FetchedPage, fetch
 
 logger = logging.getLogger(__name__)
 
@@ -80,16 +81,34 @@ def _element_to_markdown(element) -> str | None:
     return text
 
 
-async def parse_web(url: str) -> dict:
+async def fetch_web(url: str) -> FetchedPage:
+    """Fetch a URL's response body, declared text encoding and validators.
+
+    Goes through the pooled client and HTTP cache (see fetch.py): an unchanged
+    page comes back from disk with `not_modified` set.
+    """
+    page = await fetch(url)
+    if page.status >= 400:
+        raise httpx.HTTPStatusError(
+            f"HTTP {page.status} for {url}",
+            request=httpx.Request("GET", url),
+            response=httpx.Response(page.status),
+        )
+    return page
+
+
+async def parse_web(url: str, body: bytes | None = None, encoding: str | None = None) -> dict:
     """Fetch a URL and extract structured content preserving headings, tables, and code.
 
+    Pass `body` (and its `encoding`) to parse an already fetched response instead.
+
     Returns {"text": str, "metadata": dict, "parsed_doc": ParsedDocument}
     """
-    async with httpx.AsyncClient(follow_redirects=True, timeout=30) as client:
-        response = await client.get(url)
-        response.raise_for_status()
+    if body is None:
+        page = await fetch_web(url)
+        body, encoding = page.body, page.encoding
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = BeautifulSoup(body.decode(encoding or "utf-8", errors="replace"), "html.parser")
 
     # Remove non-content elements
     for tag in soup(["script", "style", "nav", "footer", "header", "aside", "form", "iframe"]):
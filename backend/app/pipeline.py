@@ -1,203 +1,495 @@
-"""VERO Auto-Pipeline: Background task that chunks + embeds documents on ingest."""
+"""VERO Auto-Pipeline: Resumable parse → chunk → embed steps, driven by the ingestion job queue."""
 
 import json
 import logging
 import asyncio
+import os
 from concurrent.futures import ProcessPoolExecutor
 
-from sqlalchemy import select
+from pathlib import Path
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import defer
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.concurrency import run_in_threadpool
 
-from app.database import async_session
-from app.models import DocumentModel, ChunkModel, EmbeddingModel
+from app.database import DATA_DIR, async_session
+from app.models import DocumentModel, ChunkModel
 
 logger = logging.getLogger(__name__)
 
+# Parse-stage concurrency; also sizes the process pool parses run in
+PARSE_WORKERS = int(os.environ.get("VERO_STAGE_PARSE_WORKERS", "2"))
+
 # Native multiprocess pool to isolate CPU-bound tasks completely from the ASGI event loop
-_process_pool = ProcessPoolExecutor(max_workers=2)
+_process_pool = ProcessPoolExecutor(max_workers=max(1, PARSE_WORKERS))
+
+# Uploads at least this large are parsed as a segment stream spooled to disk (0 disables)
+STREAM_MIN_BYTES = int(float(os.environ.get("VERO_STREAM_PARSE_MB", "16")) * 1024 * 1024)
+# Characters per round trip when raw_text is written to or read back from the database
+TEXT_BLOCK_CHARS = 1024 * 1024
+# Chunks loaded and embedded per batch in the embed stage
+EMBED_PAGE_CHUNKS = int(os.environ.get("VERO_EMBED_PAGE_CHUNKS", "1024"))
+
+_SPOOL_DIR = DATA_DIR / "spool"
 
-def _parse_sync_wrapper(filepath: str | None, url: str | None, ingest_type: str, source_type_val: str) -> dict:
+
+def _parse_sync_wrapper(
+    filepath: str | None, url: str | None, ingest_type: str, source_type_val: str,
+    body: bytes | None = None, encoding: str | None = None, commit: str | None = None,
+) -> dict:
     """Runs the asynchronous parse dispatch completely isolated in a worker process."""
     async def _inner():
+        from app.parsers.fetch import close_loop_client
+        try:
+            return await _dispatch()
+        finally:
+            # This loop ends with the parse; don't leave its HTTP client open
+            await close_loop_client()
+
+    async def _dispatch():
         from app.schema import SourceType
         if ingest_type == "file" and filepath:
             from app.parsers import parse_file
             return await parse_file(filepath, SourceType(source_type_val))
         elif ingest_type == "url" and url:
             from app.parsers.web import parse_web
-            return await parse_web(url)
+            return await parse_web(url, body=body, encoding=encoding)
         elif ingest_type == "repo" and url:
             from app.parsers.repo import parse_repo
-            return await parse_repo(url)
+            return await parse_repo(url, commit=commit)
         else:
             raise ValueError(f"Invalid ingest context for type: {ingest_type}")
     return asyncio.run(_inner())
 
+
+def _stream_sync_wrapper(filepath: str, source_type_val: str, spool_path: str) -> dict:
+    """Stream-parse a file in a worker process, writing the Markdown to a spool file.
+
+    Only the metadata and the content hash travel back to the event loop, and
+    the worker holds one segment at a time.
+    """
+    async def _inner():
+        from app.parsers import stream_file
+        from app.schema import SourceType
+        return await stream_file(filepath, SourceType(source_type_val))
+
+    from app.utils import ContentHasher
+
+    stream = asyncio.run(_inner())
+    hasher = ContentHasher()
+    chars = segments = 0
+    with open(spool_path, "w", encoding="utf-8", newline="") as spool:
+        for segment in stream.segments:
+            spool.write(segment.text)
+            hasher.update(segment.text)
+            chars += len(segment.text)
+            segments += 1
+    return {"metadata": stream.metadata, "content_hash": hasher.hexdigest(), "chars": chars, "segments": segments}
+
 DEFAULT_EMBED_MODEL = "all-MiniLM-L6-v2"
 
 
 async def auto_pipeline(doc_id: str, filepath: str | None = None, url: str | None = None, ingest_type: str = "file"):
-    """Run parse → chunk → embed pipeline on a document in the background.
+    """Run parse → chunk → embed once, in-process, without retries.
 
-    Updates processing_status: parsing → chunking → embedding → ready (or failed/duplicate).
+    The ingestion endpoints go through the durable job queue (app.jobs), which
+    calls run_pipeline() with retries. This wrapper keeps the one-shot
+    behaviour for scripts: any failure marks the document failed.
     """
-    from pathlib import Path
-    from app.schema import SourceType
-    from app.utils import compute_content_hash
 
+    try:
+        await run_pipeline(doc_id, filepath=filepath, url=url, ingest_type=ingest_type)
+    except Exception as e:
+        logger.error("Auto-pipeline failed for %s: %s", doc_id, e, exc_info=True)
+        await mark_failed(doc_id)
+    finally:
+        if filepath:
+            Path(filepath).unlink(missing_ok=True)
+
+
+# Pipeline stages in order; each is one resumable step (see run_stage)
+PIPELINE_STAGES = ("parse", "summary", "chunk", "embed")
+
+# Statuses after which no stage has work left
+_DONE_STATUSES = ("ready", "duplicate", "failed")
+
+
+async def run_pipeline(doc_id: str, filepath: str | None = None, url: str | None = None, ingest_type: str = "file"):
+    """Run the pipeline stages a document still needs, one after another.
+
+    Every stage commits its result before the status advances, so a rerun after a
+    crash starts at the first unfinished stage:
+        parsing → chunking (summary, then chunks) → embedding → ready (or duplicate)
+
+    Raises on failure; the caller decides whether to retry or mark the document failed.
+    The job queue runs the same stages overlapped across documents (app.stages).
+    """
+    for stage in PIPELINE_STAGES:
+        if not await run_stage(stage, doc_id, filepath=filepath, url=url, ingest_type=ingest_type):
+            return
+
+
+async def run_stage(
+    stage: str, doc_id: str, filepath: str | None = None, url: str | None = None, ingest_type: str = "file"
+) -> bool:
+    """Run one pipeline stage for a document, if its processing_status still needs it.
+
+    Returns:
+        False when the document needs no further stages (ready, duplicate, deleted).
+    """
     async with async_session() as db:
-        try:
-            doc = await _get_doc(db, doc_id)
-            if doc is None:
-                logger.error("Auto-pipeline: document %s not found", doc_id)
-                # Cleanup if orphaned
-                if filepath: Path(filepath).unlink(missing_ok=True)
-                return
-            
-            # --- STAGE 0: Parsing ---
-            if doc.processing_status == "parsing":
-                logger.info("Auto-pipeline: parsing document %s (type: %s) in ProcessPool", doc_id, ingest_type)
-                try:
-                    loop = asyncio.get_running_loop()
-                    result = await loop.run_in_executor(
-                        _process_pool,
-                        _parse_sync_wrapper,
-                        filepath, url, ingest_type, doc.source_type
-                    )
-                    if ingest_type == "file" and filepath:
-                        Path(filepath).unlink(missing_ok=True)
-                except Exception as e:
-                    logger.error("Auto-pipeline: Parsing failed for %s: %s", doc_id, e)
-                    doc.processing_status = "failed"
-                    await db.commit()
-                    if filepath: Path(filepath).unlink(missing_ok=True)
-                    return
-
-                raw_text = result["text"]
-                content_hash = compute_content_hash(raw_text)
-
-                # Deduplication post-parsing
-                existing = await db.execute(
-                    select(DocumentModel).where(
-                        DocumentModel.project_id == doc.project_id,
-                        DocumentModel.content_hash == content_hash,
-                        DocumentModel.id != doc.id
-                    )
-                )
-                if existing.scalar_one_or_none():
-                    logger.info("Auto-pipeline: Duplicate detected for %s. Halting.", doc_id)
-                    doc.processing_status = "duplicate"
-                    await db.commit()
-                    return
-
-                doc.raw_text = raw_text
-                doc.content_hash = content_hash
-                doc.metadata_json = json.dumps(result.get("metadata", {}))
-                
-                # Improve titles parsed from URLs/Repos if generic
-                if ingest_type == "url":
-                    new_title = result.get("metadata", {}).get("title")
-                    if new_title and doc.title == url: doc.title = new_title
-                elif ingest_type == "repo":
-                    new_title = result.get("metadata", {}).get("repo_name")
-                    if new_title and doc.title == url: doc.title = new_title
+        doc = await _get_doc(db, doc_id)
+        if doc is None:
+            logger.error("Auto-pipeline: document %s not found", doc_id)
+            return False
 
+        if stage == "parse":
+            if doc.processing_status == "parsing":
+                await _parse_document(db, doc, filepath, url, ingest_type)
+            elif doc.processing_status == "pending":
                 doc.processing_status = "chunking"
                 await db.commit()
-            
-            # For robustness, if it wasn't 'parsing' or it successfully finished 'parsing'
-            doc.processing_status = "chunking"
-            await db.commit()
-            
-            # Step 1: Generate LLM Summary for Contextual Chunks
-            if not doc.summary:
-                try:
-                    from app.llm import get_llm
-                    logger.info("Auto-pipeline: generating LLM summary for %s", doc_id)
-                    llm = get_llm()
-                    system_prompt = (
-                        "You are an expert technical summarizer. Provide a highly accurate "
-                        "1-2 sentence summary of this document. "
-                        "RULE: MAXIMUM 30 WORDS. NO LISTS. NO ENUMERATIONS. "
-                        "If you output more than 2 sentences or include bullet points, you fail."
-                    )
-                    # Use the first 10,000 characters to get the gist without blowing up token limits
-                    user_prompt = f"Title: {doc.title}\n\nContent:\n{doc.raw_text[:10000]}"
-                    
-                    response = await llm.generate_response(system_prompt, user_prompt)
-                    
-                    # Programmatic safety net: absolutely refuse oversized contexts
-                    clean_summary = response.replace("\n", " ").strip()
-                    if len(clean_summary) > 200:
-                        clean_summary = clean_summary[:197] + "..."
-                        
-                    doc.summary = clean_summary
-                    await db.commit()
-                    logger.info("Auto-pipeline: generated strict summary -> %s", doc.summary)
-                except Exception as e:
-                    logger.warning("Auto-pipeline: Failed to generate summary for %s: %s", doc_id, e)
-                    doc.summary = "No summary available."
-                    await db.commit()
-
-            # Step 2: Chunk
-            logger.info("Auto-pipeline: chunking document %s (%s)", doc_id, doc.title)
-            await _chunk_document(db, doc)
-            
-            # Mark as embedding
-            doc = await _get_doc(db, doc_id)
-            if doc:
+
+        elif stage == "summary":
+            if doc.processing_status == "chunking":
+                await _summarize_document(db, doc)
+
+        elif stage == "chunk":
+            if doc.processing_status == "chunking":
+                logger.info("Auto-pipeline: chunking document %s (%s)", doc_id, doc.title)
+                await _chunk_document(db, doc)
                 doc.processing_status = "embedding"
                 await db.commit()
-                
-                # Step 2: Embed
+
+        elif stage == "embed":
+            if doc.processing_status == "embedding":
                 logger.info("Auto-pipeline: embedding document %s", doc_id)
                 await _embed_document(db, doc)
-            
-            # Mark as ready
+                await _finish_document(db, doc)
+
+        else:
+            raise ValueError(f"Unknown pipeline stage: {stage}")
+
+        return doc.processing_status not in _DONE_STATUSES
+
+
+async def mark_failed(doc_id: str) -> None:
+    """Set a document's processing_status to failed (best effort)."""
+    try:
+        async with async_session() as db:
             doc = await _get_doc(db, doc_id)
             if doc:
-                doc.processing_status = "ready"
-                
-                # Fetch project and set last_indexed_at
-                from app.models import ProjectModel
-                project = await db.scalar(select(ProjectModel).where(ProjectModel.id == doc.project_id))
-                if project:
-                    from app.models import _utcnow
-                    project.last_indexed_at = _utcnow()
-                
+                doc.processing_status = "failed"
                 await db.commit()
-                logger.info("Auto-pipeline: document %s is ready for search", doc_id)
-
-                # Invalidate BM25 cache so next search picks up new chunks
-                from app.bm25_cache import get_bm25_manager
-                get_bm25_manager().invalidate(doc.project_id)
-            
-        except Exception as e:
-            logger.error("Auto-pipeline failed for %s: %s", doc_id, e, exc_info=True)
-            try:
-                doc = await _get_doc(db, doc_id)
-                if doc:
-                    doc.processing_status = "failed"
-                    await db.commit()
-            except Exception:
-                pass
+    except Exception:
+        logger.exception("Auto-pipeline: could not mark %s as failed", doc_id)
+
+
+async def _parse_document(
+    db: AsyncSession, doc: DocumentModel, filepath: str | None, url: str | None, ingest_type: str
+) -> bool:
+    """Parse the source into raw_text and move the document to chunking.
+
+    Identical source bytes are caught before any parser runs: when the raw-byte
+    hash (taken while the upload streamed to disk, or here from the fetched page
+    body) matches a document that is already parsed, this is a duplicate if that
+    document is in the same project, otherwise its parse output is reused.
+
+    Returns False when the content duplicates another document in the project.
+    """
+    from app.utils import compute_content_hash, compute_source_hash
+
+    page = None
+    if ingest_type == "url" and url:
+        from app.parsers.web import fetch_web
+        page = await fetch_web(url)
+        if page.not_modified:
+            # Same bytes as last time: the source-hash check or the parse cache skips the parse
+            logger.info("Auto-pipeline: %s unchanged since it was last fetched (HTTP 304)", url[:80])
+        doc.source_hash = compute_source_hash(page.body)
+        await db.commit()
+
+    source = await _find_parsed_source(db, doc) if doc.source_hash else None
+    if source is not None and source.project_id == doc.project_id:
+        logger.info("Auto-pipeline: %s has the same source bytes as %s. Halting before parse.", doc.id, source.id)
+        doc.processing_status = "duplicate"
+        await db.commit()
+        if ingest_type == "file" and filepath:
+            Path(filepath).unlink(missing_ok=True)
+        return False
+    raw_text = spool = None
+    if source is not None:
+        logger.info("Auto-pipeline: reusing parse output of %s for %s", source.id, doc.id)
+        metadata = json.loads(source.metadata_json or "{}")
+        metadata.pop("embedding_reuse", None)
+        content_hash = source.content_hash
+        if source.summary and not doc.summary:
+            doc.summary = source.summary
+    elif _should_stream(filepath, ingest_type):
+        spool, content_hash, metadata = await _stream_source(doc, filepath)
+    else:
+        result = await _parse_source(doc, filepath, url, ingest_type, page)
+        raw_text, metadata = result["text"], result.get("metadata", {})
+        content_hash = compute_content_hash(raw_text)
+
+    try:
+        # Deduplication post-parsing
+        existing = await db.execute(
+            select(DocumentModel.id).where(
+                DocumentModel.project_id == doc.project_id,
+                DocumentModel.content_hash == content_hash,
+                DocumentModel.id != doc.id
+            )
+        )
+        if existing.first():
+            logger.info("Auto-pipeline: Duplicate detected for %s. Halting.", doc.id)
+            doc.processing_status = "duplicate"
+            await db.commit()
+            if ingest_type == "file" and filepath:
+                Path(filepath).unlink(missing_ok=True)
+            return False
+
+        # Large texts go to the database in blocks instead of one in-memory string
+        if raw_text is not None:
+            doc.raw_text = raw_text
+        elif spool is not None:
+            await _store_spooled_text(db, doc.id, spool)
+        else:
+            await _copy_raw_text(db, source.id, doc.id)
+    finally:
+        if spool is not None:
+            spool.unlink(missing_ok=True)
+
+    doc.content_hash = content_hash
+    doc.metadata_json = json.dumps(metadata)
+
+    # Improve titles parsed from URLs/Repos if generic
+    if ingest_type == "url":
+        new_title = metadata.get("title")
+        if new_title and doc.title == url: doc.title = new_title
+    elif ingest_type == "repo":
+        new_title = metadata.get("repo_name")
+        if new_title and doc.title == url: doc.title = new_title
+
+    doc.processing_status = "chunking"
+    await db.commit()
+    # The upload is no longer needed once its text is stored
+    if ingest_type == "file" and filepath:
+        Path(filepath).unlink(missing_ok=True)
+    return True
+
+
+async def _parse_source(doc: DocumentModel, filepath: str | None, url: str | None, ingest_type: str, page) -> dict:
+    """Parser output for the document's source: from the parse cache, else the process pool."""
+    from app import parse_cache
+
+    commit = None
+    if ingest_type == "repo" and url:
+        # Resolved once here: it keys the cache and pins the archive the worker downloads
+        from app.parsers.repo import resolve_commit
+        commit = await resolve_commit(url)
+    key = await _parse_cache_key(doc, url, ingest_type, page, commit) if parse_cache.ENABLED else None
+    cache = parse_cache.get_parse_cache()
+    if key:
+        cached = await run_in_threadpool(cache.get, key)
+        if cached is not None:
+            logger.info("Auto-pipeline: parse cache hit for %s (%s)", doc.id, key.split(":", 1)[0])
+            return cached
+
+    logger.info("Auto-pipeline: parsing document %s (type: %s) in ProcessPool", doc.id, ingest_type)
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(
+        _process_pool,
+        _parse_sync_wrapper,
+        filepath, url, ingest_type, doc.source_type,
+        page.body if page else None, page.encoding if page else None, commit
+    )
+    if key:
+        try:
+            await run_in_threadpool(cache.put, key, result)
+        except Exception as exc:
+            logger.warning("Auto-pipeline: could not cache parse output for %s: %s", doc.id, exc)
+    return result
+
+
+def _should_stream(filepath: str | None, ingest_type: str) -> bool:
+    """Whether an upload is large enough for the streaming parse (see STREAM_MIN_BYTES)."""
+    if ingest_type != "file" or not filepath or STREAM_MIN_BYTES <= 0:
+        return False
+    try:
+        return os.path.getsize(filepath) >= STREAM_MIN_BYTES
+    except OSError:
+        return False
+
+
+async def _stream_source(doc: DocumentModel, filepath: str) -> tuple[Path, str, dict]:
+    """Stream-parse a large upload into a spool file in the process pool.
+
+    The parse cache is skipped: its entries hold the whole text in memory.
+
+    Returns:
+        (spool_path, content_hash, metadata)
+    """
+    _SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+    spool = _SPOOL_DIR / f"{doc.id}.md"
+    logger.info("Auto-pipeline: stream-parsing document %s (%s) in ProcessPool", doc.id, doc.source_type)
+    loop = asyncio.get_running_loop()
+    try:
+        result = await loop.run_in_executor(
+            _process_pool, _stream_sync_wrapper, filepath, doc.source_type, str(spool)
+        )
+    except BaseException:
+        spool.unlink(missing_ok=True)
+        raise
+    logger.info(
+        "Auto-pipeline: streamed %d chars in %d segments for %s", result["chars"], result["segments"], doc.id
+    )
+    # Chunking streams this text back too (see _chunk_document)
+    return spool, result["content_hash"], {**result["metadata"], "streamed": True}
+
+
+async def _store_spooled_text(db: AsyncSession, doc_id: str, spool: Path) -> None:
+    """Write a spool file into documents.raw_text block by block, in the current transaction."""
+    table = DocumentModel.__table__
+    await db.execute(update(table).where(table.c.id == doc_id).values(raw_text=""))
+    with open(spool, encoding="utf-8", newline="") as f:
+        while block := await run_in_threadpool(f.read, TEXT_BLOCK_CHARS):
+            await db.execute(
+                update(table).where(table.c.id == doc_id).values(raw_text=table.c.raw_text + block)
+            )
+
+
+async def _copy_raw_text(db: AsyncSession, source_id: str, doc_id: str) -> None:
+    """Copy another document's raw_text inside the database, in the current transaction."""
+    table = DocumentModel.__table__
+    source = table.alias("source")
+    await db.execute(
+        update(table)
+        .where(table.c.id == doc_id)
+        .values(raw_text=select(source.c.raw_text).where(source.c.id == source_id).scalar_subquery())
+    )
+
+
+async def _iter_raw_text(db: AsyncSession, doc_id: str):
+    """Yield a document's raw_text in blocks of TEXT_BLOCK_CHARS characters."""
+    start = 1  # SQLite substr() is 1-based
+    while True:
+        block = await db.scalar(
+            select(func.substr(DocumentModel.raw_text, start, TEXT_BLOCK_CHARS)).where(DocumentModel.id == doc_id)
+        )
+        if block:
+            yield block
+        if not block or len(block) < TEXT_BLOCK_CHARS:
+            return
+        start += TEXT_BLOCK_CHARS
+
+
+async def _parse_cache_key(
+    doc: DocumentModel, url: str | None, ingest_type: str, page, commit: str | None = None
+) -> str | None:
+    """Fingerprint of the source for the parse cache, or None when it cannot be pinned down."""
+    from app import parse_cache
+
+    if ingest_type == "file" and doc.source_hash:
+        return parse_cache.file_key(doc.source_type, doc.source_hash)
+    if ingest_type == "url" and url and page is not None:
+        return parse_cache.url_key(url, page.validator or f"sha256:{doc.source_hash}")
+    if ingest_type == "repo" and url and commit:
+        from app.parsers.repo import _parse_github_url
+        owner, repo = _parse_github_url(url)
+        return parse_cache.repo_key(owner, repo, commit)
+    return None
+
+
+async def _find_parsed_source(db: AsyncSession, doc: DocumentModel) -> DocumentModel | None:
+    """An already parsed document with the same source bytes, preferring this project."""
+    result = await db.execute(
+        select(DocumentModel)
+        .options(defer(DocumentModel.raw_text))
+        .where(
+            DocumentModel.source_hash == doc.source_hash,
+            DocumentModel.id != doc.id,
+            DocumentModel.processing_status.in_(("chunking", "embedding", "ready")),
+        )
+        .order_by((DocumentModel.project_id == doc.project_id).desc(), DocumentModel.created_at)
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def _summarize_document(db: AsyncSession, doc: DocumentModel):
+    """Generate the LLM summary used in contextual chunk headers (once per document)."""
+    if doc.summary:
+        return
+    try:
+        from app.llm import get_llm
+        logger.info("Auto-pipeline: generating LLM summary for %s", doc.id)
+        llm = get_llm()
+        system_prompt = (
+            "You are an expert technical summarizer. Provide a highly accurate "
+            "1-2 sentence summary of this document. "
+            "RULE: MAXIMUM 30 WORDS. NO LISTS. NO ENUMERATIONS. "
+            "If you output more than 2 sentences or include bullet points, you fail."
+        )
+        # Use the first 10,000 characters to get the gist without blowing up token limits
+        head = await db.scalar(
+            select(func.substr(DocumentModel.raw_text, 1, 10000)).where(DocumentModel.id == doc.id)
+        )
+        user_prompt = f"Title: {doc.title}\n\nContent:\n{head or ''}"
+
+        response = await llm.generate_response(system_prompt, user_prompt)
+
+        # Programmatic safety net: absolutely refuse oversized contexts
+        clean_summary = response.replace("\n", " ").strip()
+        if len(clean_summary) > 200:
+            clean_summary = clean_summary[:197] + "..."
+
+        doc.summary = clean_summary
+        await db.commit()
+        logger.info("Auto-pipeline: generated strict summary -> %s", doc.summary)
+    except Exception as e:
+        logger.warning("Auto-pipeline: Failed to generate summary for %s: %s", doc.id, e)
+        doc.summary = "No summary available."
+        await db.commit()
+
+
+async def _finish_document(db: AsyncSession, doc: DocumentModel):
+    """Mark the document ready and fold its chunks into the keyword index."""
+    from app.retrieval import bump_index_version, index_document
+
+    doc.processing_status = "ready"
+
+    # Bump the project's index version so search caches pick up new chunks
+    version = await bump_index_version(db, doc.project_id)
+
+    await db.commit()
+    logger.info("Auto-pipeline: document %s is ready for search", doc.id)
+
+    # Fold the new chunks into the keyword index instead of rebuilding it
+    await index_document(db, doc.project_id, doc.id, version)
 
 
 async def _get_doc(db: AsyncSession, doc_id: str) -> DocumentModel | None:
+    # raw_text can be huge; stages read it in blocks (see _iter_raw_text)
     result = await db.execute(
-        select(DocumentModel).where(DocumentModel.id == doc_id)
+        select(DocumentModel).options(defer(DocumentModel.raw_text)).where(DocumentModel.id == doc_id)
     )
     return result.scalar_one_or_none()
 
 
 async def _chunk_document(db: AsyncSession, doc: DocumentModel):
-    """Generate chunks for the document, replacing any existing ones."""
+    """Generate chunks for the document, replacing any existing ones.
+
+    Documents that were stream-parsed are chunked the same way: raw_text is
+    read back in blocks and fed to the chunker's stream, and each batch of
+    finished chunks is inserted as it comes, so memory follows the block and
+    section size rather than the document size. Everything else is chunked
+    whole, keeping the chunk boundaries of the regular chunker.
+    """
+    from app.chunk_store import append_chunks, remove_chunk_vectors, replace_chunks
     from app.chunks import get_chunker_for_source
 
-    # Delete existing chunks
-    await db.execute(ChunkModel.__table__.delete().where(ChunkModel.doc_id == doc.id))
-    
     # Generate new chunks (CPU-bound)
     chunker = get_chunker_for_source(doc.source_type)
     # Prepare the context header for Metadata-Augmented Ingestion
@@ -205,100 +497,111 @@ async def _chunk_document(db: AsyncSession, doc: DocumentModel):
     if doc.summary and doc.summary != "No summary available.":
         context_header += f" - {doc.summary}"
 
-    chunk_responses = await run_in_threadpool(
-        chunker.chunk, text=doc.raw_text, doc_id=doc.id, project_id=doc.project_id, doc_title=context_header
-    )
-    
-    for cr in chunk_responses:
-        db.add(ChunkModel(
-            id=cr.id,
-            doc_id=cr.doc_id,
-            project_id=cr.project_id,
-            text=cr.text,
-            start_char=cr.start_char,
-            end_char=cr.end_char,
-            token_count=cr.token_count,
-            strategy=cr.strategy,
-            metadata_json=json.dumps(cr.metadata),
-        ))
-    
+    # Swap the chunk set in one transaction, then drop the old vectors in one call
+    if json.loads(doc.metadata_json or "{}").get("streamed"):
+        stream = chunker.stream(doc_id=doc.id, project_id=doc.project_id, doc_title=context_header)
+        old_ids = await replace_chunks(db, doc.id, [])
+        created = 0
+        async for block in _iter_raw_text(db, doc.id):
+            chunks = await run_in_threadpool(stream.feed, block)
+            await append_chunks(db, chunks)
+            created += len(chunks)
+        chunks = await run_in_threadpool(stream.close)
+        await append_chunks(db, chunks)
+        created += len(chunks)
+    else:
+        text = await db.scalar(select(DocumentModel.raw_text).where(DocumentModel.id == doc.id))
+        chunk_responses = await run_in_threadpool(
+            chunker.chunk, text=text or "", doc_id=doc.id, project_id=doc.project_id, doc_title=context_header
+        )
+        old_ids = await replace_chunks(db, doc.id, chunk_responses)
+        created = len(chunk_responses)
     await db.commit()
-    logger.info("Auto-pipeline: created %d chunks for %s", len(chunk_responses), doc.id)
+    await remove_chunk_vectors(doc.project_id, old_ids)
+    logger.info("Auto-pipeline: created %d chunks for %s", created, doc.id)
 
 
 async def _embed_document(db: AsyncSession, doc: DocumentModel):
-    """Embed all chunks of a document into the vector store."""
+    """Embed all chunks of a document into the vector store, EMBED_PAGE_CHUNKS at a time."""
     from app.embeddings import get_embedder
-    from app.utils import compute_content_hash
-    from app import vectorstore
     from app.warmup import wait_for_model_warmup
 
     await wait_for_model_warmup()
 
-    # Fetch chunks
-    result = await db.execute(
-        select(ChunkModel).where(ChunkModel.doc_id == doc.id).order_by(ChunkModel.start_char)
-    )
-    chunks = result.scalars().all()
-    if not chunks:
-        return  # Nothing to embed
-
     # Get embedder
     embedder = get_embedder(DEFAULT_EMBED_MODEL)
 
-    # Compute embeddings (CPU-bound)
-    texts = [c.text for c in chunks]
-    vectors = await run_in_threadpool(embedder.embed, texts)
-
-    chunk_ids = []
-    vectors_for_store = []
-    documents_for_store = []
-    metadatas_for_store = []
-
-    import uuid
-    for chunk, vector in zip(chunks, vectors):
-        chunk_hash = compute_content_hash(chunk.text)
-        
-        # Check for existing embedding
-        existing = await db.execute(
-            select(EmbeddingModel).where(
-                EmbeddingModel.chunk_id == chunk.id,
-                EmbeddingModel.model_name == DEFAULT_EMBED_MODEL,
-            )
+    # Plain rows rather than ORM objects, so finished pages are not kept in the session
+    columns = (ChunkModel.id, ChunkModel.text, ChunkModel.strategy, ChunkModel.start_char, ChunkModel.end_char)
+    total = reused = 0
+    while True:
+        result = await db.execute(
+            select(*columns)
+            .where(ChunkModel.doc_id == doc.id)
+            .order_by(ChunkModel.start_char, ChunkModel.id)
+            .offset(total)
+            .limit(EMBED_PAGE_CHUNKS)
         )
-        old_emb = existing.scalar_one_or_none()
-        if old_emb:
-            await db.delete(old_emb)
-
-        # Create new embedding record
-        emb = EmbeddingModel(
-            id=uuid.uuid4().hex[:12],
-            chunk_id=chunk.id,
-            model_name=DEFAULT_EMBED_MODEL,
-            dimension=embedder.dimension,
-            content_hash=chunk_hash,
-        )
-        db.add(emb)
-        
-        chunk_ids.append(chunk.id)
-        vectors_for_store.append(vector)
-        documents_for_store.append(chunk.text)
-        metadatas_for_store.append({
-            "doc_id": doc.id,
-            "strategy": chunk.strategy,
-            "start_char": chunk.start_char,
-            "end_char": chunk.end_char,
-        })
+        chunks = result.all()
+        if not chunks:
+            break
+        reused += await _embed_page(db, doc, embedder, chunks)
+        total += len(chunks)
+    if not total:
+        return  # Nothing to embed
+
+    # Report how much of the document was served from the embedding store
+    ratio = reused / total
+    metadata = json.loads(doc.metadata_json) if doc.metadata_json else {}
+    metadata["embedding_reuse"] = {
+        "chunks": total,
+        "reused": reused,
+        "ratio": round(ratio, 4),
+    }
+    doc.metadata_json = json.dumps(metadata)
+
+    await db.commit()
+    logger.info(
+        "Auto-pipeline: embedded %d chunks for %s (%d reused, %.0f%%)",
+        total, doc.id, reused, ratio * 100,
+    )
+
+
+async def _embed_page(db: AsyncSession, doc: DocumentModel, embedder, chunks) -> int:
+    """Embed one page of chunk rows and upsert them; returns how many vectors were reused."""
+    from app.embedding_store import embed_with_reuse, embedding_record, upsert_embedding_records
+    from app.utils import compute_content_hash
+    from app import vectorstore
+
+    # Compute embeddings (CPU-bound), reusing stored vectors for known chunk content
+    texts = [c.text for c in chunks]
+    hashes = [compute_content_hash(t) for t in texts]
+    outcome = await embed_with_reuse(db, embedder, texts, hashes)
+    vectors = outcome.vectors.tolist()
+    dimension = outcome.vectors.shape[1]
+
+    # Bookkeeping rows for every chunk, written as one upsert, under the model
+    # that produced the vectors (the int8 variant with VERO_INFERENCE_BACKEND=onnx)
+    await upsert_embedding_records(db, [
+        embedding_record(chunk.id, embedder.model_name, dimension, chunk_hash)
+        for chunk, chunk_hash in zip(chunks, hashes)
+    ])
 
     # Upsert into vector store (IO-bound / Synchronous)
     await run_in_threadpool(
         vectorstore.upsert_embeddings,
         project_id=doc.project_id,
-        chunk_ids=chunk_ids,
-        vectors=vectors_for_store,
-        documents=documents_for_store,
-        metadatas=metadatas_for_store,
+        chunk_ids=[chunk.id for chunk in chunks],
+        vectors=vectors,
+        documents=texts,
+        metadatas=[
+            {
+                "doc_id": doc.id,
+                "strategy": chunk.strategy,
+                "start_char": chunk.start_char,
+                "end_char": chunk.end_char,
+            }
+            for chunk in chunks
+        ],
     )
-
-    await db.commit()
-    logger.info("Auto-pipeline: embedded %d chunks for %s", len(chunks), doc.id)
+    return int(outcome.reused.sum())
@@ -3,14 +3,29 @@
 Uses a cross-encoder model to rerank initial retrieval candidates by
 evaluating (query, chunk) pairs together, producing dramatically more
 accurate relevance scores than independent vector comparisons.
+
+Pair scores are memoized in a bounded LRU keyed by (model, query hash, chunk
+text hash), so repeated searches only send unseen pairs to the model.
+With VERO_INFERENCE_BACKEND=onnx the model runs as an int8 ONNX session.
+
+Unseen pairs are scored in length buckets (sorted by approximate token length,
+capped by a padded-token budget), so short chunks are not padded to the
+length of the longest candidate.
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import math
+import os
 import threading
-from typing import Optional
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from app.embeddings.onnx_backend import INFERENCE_BACKEND, ONNX_SUFFIX, OnnxCrossEncoder
+from app.embeddings.scheduler import approx_tokens, length_buckets
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +34,79 @@ _lock = threading.Lock()
 _model: Optional[object] = None
 
 RERANKER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+# int8 logits differ slightly from the fp32 ones, so each backend has its own cache entries
+_SCORE_MODEL_KEY = RERANKER_MODEL + ONNX_SUFFIX if INFERENCE_BACKEND == "onnx" else RERANKER_MODEL
+
+# Number of (query, chunk) scores kept; independent of the search result cache
+SCORE_CACHE_SIZE = int(os.environ.get("VERO_RERANK_CACHE_SIZE", "50000"))
+
+# Padded tokens per cross-encoder batch, and the most pairs in one batch
+BATCH_TOKENS = int(os.environ.get("VERO_RERANK_BATCH_TOKENS", "8192"))
+MAX_BATCH = int(os.environ.get("VERO_RERANK_MAX_BATCH", "32"))
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class _ScoreCache:
+    """Thread-safe LRU of raw cross-encoder logits per (model, query, chunk text)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._scores: OrderedDict[tuple[str, bytes, bytes], float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, keys: list[tuple]) -> list[Optional[float]]:
+        found: list[Optional[float]] = []
+        with self._lock:
+            for key in keys:
+                score = self._scores.get(key)
+                if score is not None:
+                    self._scores.move_to_end(key)
+                found.append(score)
+            hits = sum(score is not None for score in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return found
+
+    def put_many(self, items: list[tuple[tuple, float]]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            for key, score in items:
+                self._scores[key] = score
+                self._scores.move_to_end(key)
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scores.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._scores),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+_score_cache = _ScoreCache(SCORE_CACHE_SIZE)
+
+
+def get_rerank_cache_stats() -> dict:
+    """Pair-score cache counters since startup."""
+    return _score_cache.stats()
 
 
 def _get_model():
@@ -27,9 +115,12 @@ def _get_model():
     if _model is None:
         with _lock:
             if _model is None:
-                from sentence_transformers import CrossEncoder
-                logger.info("Loading cross-encoder model: %s", RERANKER_MODEL)
-                _model = CrossEncoder(RERANKER_MODEL)
+                logger.info("Loading cross-encoder model: %s (%s)", RERANKER_MODEL, INFERENCE_BACKEND)
+                if INFERENCE_BACKEND == "onnx":
+                    _model = OnnxCrossEncoder(RERANKER_MODEL)
+                else:
+                    from sentence_transformers import CrossEncoder
+                    _model = CrossEncoder(RERANKER_MODEL)
                 logger.info("Cross-encoder model loaded.")
     return _model
 
@@ -53,6 +144,7 @@ def rerank(
     query: str,
     chunks: list[dict],
     top_k: int | None = None,
+    observe: Callable[[int, float], None] | None = None,
 ) -> list[dict]:
     """Rerank candidate chunks using the cross-encoder.
 
@@ -62,6 +154,8 @@ def rerank(
                 other metadata to preserve.
         top_k: Optional hard cap on results. If None, returns ALL scored
                candidates (caller handles adaptive cutoff).
+        observe: Optional callback, given (pairs sent to the model, seconds
+                 spent in model.predict) when any pair missed the score cache.
 
     Returns:
         Chunks sorted by cross-encoder score (descending), with a
@@ -70,13 +164,28 @@ def rerank(
     if not chunks:
         return []
 
-    model = _get_model()
-
-    # Build (query, chunk_text) pairs for the cross-encoder
-    pairs = [(query, c["text"]) for c in chunks]
-
-    # Score all pairs at once (batch inference)
-    raw_scores = model.predict(pairs)
+    # Whitespace runs do not change the cross-encoder's tokens, so they share a key
+    query_key = _digest(" ".join(query.split()))
+    keys = [(_SCORE_MODEL_KEY, query_key, _digest(c["text"])) for c in chunks]
+    raw_scores = _score_cache.get_many(keys)
+
+    # Only score the pairs we have not seen, bucketed by length
+    missing = [i for i, score in enumerate(raw_scores) if score is None]
+    if missing:
+        model = _get_model()
+        query_tokens = approx_tokens(query)
+        lengths = [min(512, query_tokens + approx_tokens(chunks[i]["text"])) for i in missing]
+        model_seconds = 0.0
+        for bucket in length_buckets(lengths, MAX_BATCH, BATCH_TOKENS):
+            rows = [missing[j] for j in bucket]
+            predict_started = time.perf_counter()
+            predicted = model.predict([(query, chunks[i]["text"]) for i in rows], batch_size=len(rows))
+            model_seconds += time.perf_counter() - predict_started
+            for i, score in zip(rows, predicted):
+                raw_scores[i] = float(score)
+        _score_cache.put_many([(keys[i], raw_scores[i]) for i in missing])
+        if observe is not None:
+            observe(len(missing), model_seconds)
 
     # Sigmoid-normalize: converts raw logits to proper probabilities [0, 1]
     # This makes the min_score threshold meaningful (0.5 = neutral relevance)
@@ -6,18 +6,180 @@ using Reciprocal Rank Fusion (RRF) for maximum retrieval quality.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 import re
-
-from sqlalchemy import select
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import Optional
+
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.embeddings import get_embedder
-from app.models import ChunkModel, DocumentModel
+from app.models import ChunkModel, DocumentModel, ProjectModel, _utcnow
 from app.schema import SearchResultItem
 
 logger = logging.getLogger(__name__)
 
+# Bounded thread pools that keep model inference and BM25 scoring off the ASGI event loop.
+# Stage 1 runs the semantic and keyword legs concurrently; reranking gets its own pool
+# so a burst of cross-encoder work cannot starve candidate retrieval (or vice versa).
+RETRIEVAL_WORKERS = int(os.environ.get("VERO_RETRIEVAL_WORKERS", "4"))
+RERANK_WORKERS = int(os.environ.get("VERO_RERANK_WORKERS", "2"))
+
+_retrieval_pool = ThreadPoolExecutor(max_workers=RETRIEVAL_WORKERS, thread_name_prefix="vero-retrieval")
+_rerank_pool = ThreadPoolExecutor(max_workers=RERANK_WORKERS, thread_name_prefix="vero-rerank")
+
+
+@dataclass
+class SearchRun:
+    """The results of one search plus how deep stage 2 went."""
+    results: list[SearchResultItem] = field(default_factory=list)
+    candidates: int = 0     # Stage-1 candidates that reached stage 2
+    rerank_depth: int = 0   # How many of them the cross-encoder scored
+
+
+# Final-result cache: repeated searches (UI tab switches, /answer right after /search)
+# skip embedding, both stage-1 legs and reranking. Keys include the project's
+# index_version, so any ingest/delete makes older entries unreachable.
+RESULT_CACHE_SIZE = int(os.environ.get("VERO_SEARCH_CACHE_SIZE", "512"))
+RESULT_CACHE_TTL = float(os.environ.get("VERO_SEARCH_CACHE_TTL", "300"))
+
+
+def _copy_run(run: SearchRun) -> SearchRun:
+    """A copy whose result items can be mutated without touching the cached ones."""
+    return replace(run, results=[item.model_copy() for item in run.results])
+
+
+class _SearchResultCache:
+    """Thread-safe TTL + LRU cache of final search results."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[float, SearchRun]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: tuple) -> Optional[SearchRun]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _copy_run(entry[1])
+
+    def put(self, key: tuple, run: SearchRun) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), _copy_run(run))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_project(self, project_id: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == project_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+_result_cache = _SearchResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL)
+
+
+def invalidate_search_cache(project_id: str) -> None:
+    """Drop a project's cached search results (its chunk set changed or it was deleted)."""
+    _result_cache.invalidate_project(project_id)
+
+
+def get_search_cache_stats() -> dict:
+    """Counters of the final-result cache since startup."""
+    return _result_cache.stats()
+
+
+def _normalize_query(query: str) -> str:
+    """Collapse whitespace so trivially different spellings of a query share a cache entry."""
+    return " ".join(query.split())
+
+
+# Cascade reranking: with a per-request latency budget, only the stage-1 top slice
+# the remaining budget can afford is sent to the cross-encoder. The per-pair cost
+# starts at VERO_RERANK_PAIR_MS and then tracks the model time of pairs that
+# missed the pair-score cache.
+RERANK_PAIR_MS = float(os.environ.get("VERO_RERANK_PAIR_MS", "2.0"))
+# Candidates left unreranked are scored relative to the top stage-1 score (0-1)
+# and dropped below this fraction of it
+STAGE1_FLOOR = float(os.environ.get("VERO_STAGE1_FLOOR", "0.5"))
+
+
+class _RerankCost:
+    """Exponentially weighted average of cross-encoder model time per pair.
+
+    Fed by rerank() with the pairs it actually sent to the model and the time
+    spent in predict, so cached pairs and waits for a rerank thread do not
+    skew the estimate.
+    """
+
+    def __init__(self, initial_ms: float, alpha: float = 0.2):
+        self.per_pair_ms = initial_ms
+        self.alpha = alpha
+        self._lock = threading.Lock()
+
+    def observe(self, pairs: int, seconds: float) -> None:
+        if pairs <= 0:
+            return
+        sample = seconds * 1000.0 / pairs
+        with self._lock:
+            self.per_pair_ms += self.alpha * (sample - self.per_pair_ms)
+
+    def affordable_pairs(self, budget_ms: float) -> int:
+        if budget_ms <= 0:
+            return 0
+        return int(budget_ms / max(self.per_pair_ms, 1e-3))
+
+
+_rerank_cost = _RerankCost(RERANK_PAIR_MS)
+
+
+def shutdown_executors() -> None:
+    """Stop the retrieval and rerank pools (called on application shutdown)."""
+    _retrieval_pool.shutdown(wait=False, cancel_futures=True)
+    _rerank_pool.shutdown(wait=False, cancel_futures=True)
+
 
 def _strip_context_prefix(text: str) -> str:
     """Remove the [Source: ...] contextual header added during chunking.
@@ -46,28 +208,83 @@ def _tokenize(text: str) -> list[str]:
     return re.findall(r"\w+", text.lower())
 
 
-async def _fetch_project_chunks(
-    db: AsyncSession,
-    project_id: str,
-) -> list[ChunkModel]:
-    """Fetch all chunks belonging to a project."""
+async def _get_index_version(db: AsyncSession, project_id: str) -> int:
+    """Read the project's index version (a cheap single-column lookup)."""
+    version = await db.scalar(
+        select(ProjectModel.index_version).where(ProjectModel.id == project_id)
+    )
+    return version or 0
+
+
+async def _count_project_chunks(db: AsyncSession, project_id: str) -> int:
+    """Count a project's chunks without loading their text (served by ix_chunks_project_id)."""
+    count = await db.scalar(
+        select(func.count(ChunkModel.id)).where(ChunkModel.project_id == project_id)
+    )
+    return count or 0
+
+
+async def _load_keyword_index(db: AsyncSession, project_id: str, version: int):
+    """Return the project's cached BM25 index, loading chunk texts only on a cache miss."""
+    from app.bm25_cache import get_bm25_manager
+
+    manager = get_bm25_manager()
+    cached = manager.get(project_id, version)
+    if cached is not None:
+        return cached
+
+    # Mapping a persisted index from disk is far cheaper than a rebuild
+    loop = asyncio.get_running_loop()
+    cached = await loop.run_in_executor(_retrieval_pool, manager.load, project_id, version)
+    if cached is not None:
+        return cached
+
     result = await db.execute(
-        select(ChunkModel)
+        select(ChunkModel.id, ChunkModel.doc_id, ChunkModel.text)
         .where(ChunkModel.project_id == project_id)
         .order_by(ChunkModel.doc_id, ChunkModel.start_char)
     )
-    return list(result.scalars().all())
+    rows = result.all()
+
+    # Tokenizing and building the index is CPU-bound: keep it off the event loop
+    return await loop.run_in_executor(
+        _retrieval_pool, manager.build, project_id, version, rows, _tokenize
+    )
 
 
-async def _fetch_doc_map(
+async def _hydrate_candidates(
     db: AsyncSession,
     project_id: str,
-) -> dict[str, DocumentModel]:
-    """Build a doc_id -> DocumentModel lookup for a project."""
+    chunk_ids: list[str],
+) -> dict[str, dict]:
+    """Load chunk + document fields for the final candidates in a single IN query.
+
+    Only the columns needed to build reranker inputs are selected, so neither
+    the rest of the project's chunks nor any document raw_text is read.
+    """
+    if not chunk_ids:
+        return {}
+
     result = await db.execute(
-        select(DocumentModel).where(DocumentModel.project_id == project_id)
+        select(
+            ChunkModel.id,
+            ChunkModel.text,
+            ChunkModel.start_char,
+            ChunkModel.end_char,
+            ChunkModel.strategy,
+            DocumentModel.id.label("doc_id"),
+            DocumentModel.title,
+            DocumentModel.source_type,
+            DocumentModel.source_url,
+            DocumentModel.confidence_level,
+        )
+        .join(DocumentModel, ChunkModel.doc_id == DocumentModel.id)
+        .where(
+            ChunkModel.project_id == project_id,
+            ChunkModel.id.in_(chunk_ids),
+        )
     )
-    return {doc.id: doc for doc in result.scalars().all()}
+    return {row.id: row for row in result.all()}
 
 
 def _semantic_search(
@@ -79,7 +296,8 @@ def _semantic_search(
     from app import vectorstore
 
     embedder = get_embedder()
-    query_vector = embedder.embed_single(query)
+    # Memoized: repeated queries skip the transformer forward pass
+    query_vector = embedder.embed_query(query)
 
     results = vectorstore.query_similar(
         project_id=project_id,
@@ -100,45 +318,27 @@ def _semantic_search(
 
 
 def _keyword_search(
-    project_id: str,
-    chunks: list[ChunkModel],
+    keyword_index,
     query: str,
     top_k: int,
-    last_indexed_at: str | None = None,
 ) -> dict[str, float]:
-    """Run BM25 keyword search over chunk texts. Returns {chunk_id: score}.
-
-    Uses the BM25Manager cache to avoid rebuilding the index on every query.
-    """
-    if not chunks:
+    """Run BM25 keyword search over a cached project index. Returns {chunk_id: score}."""
+    bm25 = keyword_index.index
+    chunk_ids = keyword_index.chunk_ids
+    if not bm25.live_count:
         return {}
 
-    from app.bm25_cache import get_bm25_manager
-
-    manager = get_bm25_manager()
-    bm25, chunk_ids = manager.get_or_build(project_id, chunks, _tokenize, last_indexed_at)
-
-    if not chunk_ids:
+    # Sparse scoring over the query terms' postings + argpartition top-k
+    doc_indices, raw_scores = bm25.top_k(_tokenize(query), top_k)
+    if not len(doc_indices):
         return {}
 
-    query_tokens = _tokenize(query)
-    raw_scores = bm25.get_scores(query_tokens)
-
-    # Pair scores with chunk IDs and sort descending
-    scored = sorted(
-        zip(chunk_ids, raw_scores),
-        key=lambda x: x[1],
-        reverse=True,
-    )
-
-    # Normalize scores to [0, 1] range
-    max_score = float(scored[0][1]) if scored and scored[0][1] > 0 else 1.0
-    scores: dict[str, float] = {}
-    for chunk_id, score in scored[:top_k]:
-        if score > 0:
-            scores[chunk_id] = float(score) / max_score
-
-    return scores
+    # Normalize scores to [0, 1] range (results are sorted, first is the max)
+    max_score = float(raw_scores[0])
+    return {
+        chunk_ids[idx]: float(score) / max_score
+        for idx, score in zip(doc_indices.tolist(), raw_scores.tolist())
+    }
 
 
 def _reciprocal_rank_fusion(
@@ -169,7 +369,30 @@ async def search(
     mode: str = "hybrid",
     min_score: float = 0.01,
     context_budget: int = 10000,
+    latency_budget_ms: Optional[int] = None,
 ) -> list[SearchResultItem]:
+    """Execute a two-stage search and return the results (see run_search)."""
+    run = await run_search(
+        db, project_id, query,
+        top_k=top_k,
+        mode=mode,
+        min_score=min_score,
+        context_budget=context_budget,
+        latency_budget_ms=latency_budget_ms,
+    )
+    return run.results
+
+
+async def run_search(
+    db: AsyncSession,
+    project_id: str,
+    query: str,
+    top_k: int = 10,
+    mode: str = "hybrid",
+    min_score: float = 0.01,
+    context_budget: int = 10000,
+    latency_budget_ms: Optional[int] = None,
+) -> SearchRun:
     """Execute a two-stage search with cross-encoder reranking.
 
     Stage 1: Fast candidate retrieval (semantic, keyword, or hybrid).
@@ -190,42 +413,61 @@ async def search(
         mode: "semantic", "keyword", or "hybrid".
         min_score: Minimum sigmoid-normalized rerank score (0-1). 0.5 = neutral.
         context_budget: Maximum total characters across all returned chunks.
+        latency_budget_ms: Optional time budget for the whole search. Stage 2
+            then reranks only the stage-1 top slice the remaining budget can
+            afford at the measured per-pair cost; the rest keep their stage-1
+            order after the reranked slice, scored relative to the best stage-1
+            score, marked `reranked=False` and cut at STAGE1_FLOOR. With no
+            budget left, results are returned in stage-1 order. Such runs are
+            not cached.
 
     Returns:
-        List of SearchResultItem, sorted by cross-encoder relevance.
+        SearchRun with results sorted by cross-encoder relevance, the number
+        of stage-2 candidates and the rerank depth actually used.
     """
     from app.reranker import rerank
     from app.warmup import wait_for_model_warmup
 
+    # The index version keys the result and BM25 caches without reading any chunk rows
+    started = time.perf_counter()
+    index_version = await _get_index_version(db, project_id)
+    cache_key = (
+        project_id, _normalize_query(query), mode, top_k, min_score, context_budget,
+        latency_budget_ms, index_version,
+    )
+    cached_run = _result_cache.get(cache_key)
+    if cached_run is not None:
+        logger.info("Search [%s] in project %s served from the result cache: query='%s'.", mode, project_id, query[:50])
+        return cached_run
+
     await wait_for_model_warmup()
 
-    chunks = await _fetch_project_chunks(db, project_id)
-    if not chunks:
+    chunk_count = await _count_project_chunks(db, project_id)
+    if not chunk_count:
         logger.info("Search skipped: project %s has no chunks.", project_id)
-        return []
-
-    # Get project to read last_indexed_at timestamp for cache validation
-    from app.models import ProjectModel
-
-    project = await db.scalar(select(ProjectModel).where(ProjectModel.id == project_id))
-    last_indexed_at_str = project.last_indexed_at.isoformat() if project and project.last_indexed_at else None
-
-    doc_map = await _fetch_doc_map(db, project_id)
-
-    # Build chunk lookup
-    chunk_map = {c.id: c for c in chunks}
+        return SearchRun()
 
     # Stage 1: Over-fetch candidates (6x top_k for better reranking coverage)
-    candidate_k = min(top_k * 6, len(chunks))
+    candidate_k = min(top_k * 6, chunk_count)
+
+    loop = asyncio.get_running_loop()
 
     if mode == "semantic":
-        final_scores = _semantic_search(project_id, query, candidate_k)
+        final_scores = await loop.run_in_executor(
+            _retrieval_pool, _semantic_search, project_id, query, candidate_k
+        )
     elif mode == "keyword":
-        final_scores = _keyword_search(project_id, chunks, query, candidate_k, last_indexed_at_str)
+        keyword_index = await _load_keyword_index(db, project_id, index_version)
+        final_scores = await loop.run_in_executor(
+            _retrieval_pool, _keyword_search, keyword_index, query, candidate_k
+        )
     else:
-        # Hybrid: combine both using RRF
-        sem_scores = _semantic_search(project_id, query, candidate_k)
-        kw_scores = _keyword_search(project_id, chunks, query, candidate_k, last_indexed_at_str)
+        # Hybrid: run both legs concurrently, then combine using RRF
+        keyword_index = await _load_keyword_index(db, project_id, index_version)
+        sem_scores, kw_scores = await asyncio.gather(
+            loop.run_in_executor(_retrieval_pool, _semantic_search, project_id, query, candidate_k),
+            loop.run_in_executor(_retrieval_pool, _keyword_search, keyword_index, query, candidate_k),
+        )
         final_scores = _reciprocal_rank_fusion(sem_scores, kw_scores)
 
     if not final_scores:
@@ -234,38 +476,59 @@ async def search(
             mode,
             query[:50],
         )
-        return []
+        _result_cache.put(cache_key, SearchRun())
+        return SearchRun()
 
     # Sort by Stage 1 score and take candidates
     ranked_candidates = sorted(
         final_scores.items(), key=lambda x: x[1], reverse=True
     )[:candidate_k]
 
+    # Hydrate only the surviving candidates
+    rows = await _hydrate_candidates(db, project_id, [chunk_id for chunk_id, _ in ranked_candidates])
+
     # Build candidate dicts for the reranker
     candidate_dicts: list[dict] = []
     for chunk_id, stage1_score in ranked_candidates:
-        chunk = chunk_map.get(chunk_id)
-        if not chunk:
-            continue
-        doc = doc_map.get(chunk.doc_id)
-        if not doc:
+        row = rows.get(chunk_id)
+        if not row:
             continue
         candidate_dicts.append({
-            "chunk_id": chunk.id,
-            "doc_id": doc.id,
-            "text": _strip_context_prefix(chunk.text),
-            "start_char": chunk.start_char,
-            "end_char": chunk.end_char,
-            "strategy": chunk.strategy,
-            "doc_title": doc.title,
-            "source_type": doc.source_type,
-            "source_url": doc.source_url,
-            "confidence_level": doc.confidence_level,
+            "chunk_id": row.id,
+            "doc_id": row.doc_id,
+            "text": _strip_context_prefix(row.text),
+            "start_char": row.start_char,
+            "end_char": row.end_char,
+            "strategy": row.strategy,
+            "doc_title": row.title,
+            "source_type": row.source_type,
+            "source_url": row.source_url,
+            "confidence_level": row.confidence_level,
             "stage1_score": stage1_score,
         })
 
-    # Stage 2: Cross-encoder reranking (returns ALL scored, sorted descending)
-    reranked = rerank(query, candidate_dicts)
+    # Stage 2: Cross-encoder reranking (returns ALL scored, sorted descending).
+    # With a latency budget, the stage-1 score is the cheap pre-score: only the
+    # top slice the remaining budget affords is reranked (cascade).
+    depth = len(candidate_dicts)
+    if latency_budget_ms is not None:
+        remaining_ms = latency_budget_ms - (time.perf_counter() - started) * 1000.0
+        depth = min(depth, _rerank_cost.affordable_pairs(remaining_ms))
+        if depth < len(candidate_dicts):
+            logger.info(
+                "Cascade rerank: %.0fms of %dms budget left, reranking %d of %d candidates.",
+                max(remaining_ms, 0.0), latency_budget_ms, depth, len(candidate_dicts),
+            )
+
+    reranked: list[dict] = []
+    if depth:
+        reranked = await loop.run_in_executor(
+            _rerank_pool, partial(rerank, query, candidate_dicts[:depth], observe=_rerank_cost.observe)
+        )
+    # Candidates past the rerank depth follow in stage-1 order, scored as a
+    # fraction of the best stage-1 score (RRF and BM25 scores are unbounded)
+    top_stage1 = max((c["stage1_score"] for c in candidate_dicts), default=0.0)
+    reranked += candidate_dicts[depth:]
 
     # Adaptive result selection.
     # Instead of blindly taking top_k, we use the score distribution
@@ -277,10 +540,18 @@ async def search(
     seen_texts: list[set] = []  # Store word sets for near-duplicate detection
 
     for item in reranked:
-        score = round(item["rerank_score"], 6)
-
-        # ① Hard floor: skip anything below min_score
-        if score < min_score:
+        was_reranked = "rerank_score" in item
+        if was_reranked:
+            score = round(item["rerank_score"], 6)
+        else:
+            score = round(item["stage1_score"] / top_stage1, 6) if top_stage1 > 0 else 0.0
+
+        # ① Hard floor: skip anything below min_score. It is a rerank score
+        # threshold; candidates left in stage-1 order use STAGE1_FLOOR instead.
+        if not was_reranked and score < STAGE1_FLOOR and results:
+            logger.debug("Stage-1 cutoff: relative score %.4f < %.2f, stopping", score, STAGE1_FLOOR)
+            break
+        if was_reranked and score < min_score:
             # Fallback for vague conversational queries: if we found absolutely nothing above min_score,
             # we unconditionally keep the #1 ranked chunk. Cross-encoder scores for generic queries
             # collapse to near zero (<0.001), but keeping the top chunk ensures the LLM doesn't dead-end.
@@ -343,13 +614,67 @@ async def search(
             source_type=item["source_type"],
             source_url=item.get("source_url"),
             confidence_level=item["confidence_level"],
+            reranked=was_reranked,
         ))
 
     logger.info(
-        "Search [%s+rerank] in project %s: query='%s' → %d candidates → %d results (adaptive, budget %d/%d chars).",
-        mode, project_id, query[:50], len(candidate_dicts), len(results), total_chars, context_budget,
+        "Search [%s+rerank] in project %s: query='%s' → %d candidates (%d reranked) → %d results "
+        "(adaptive, budget %d/%d chars).",
+        mode, project_id, query[:50], len(candidate_dicts), depth, len(results), total_chars, context_budget,
+    )
+    run = SearchRun(results=results, candidates=len(candidate_dicts), rerank_depth=depth)
+    # A run cut short by the latency budget is not cached: the next identical
+    # search may have time to rerank everything
+    if depth == len(candidate_dicts):
+        _result_cache.put(cache_key, run)
+    return run
+
+
+async def bump_index_version(db: AsyncSession, project_id: str) -> int:
+    """Record that a project's chunk set changed. Returns the new index version.
+
+    Call after any chunk insert/replace/delete, then (after committing) apply
+    the change to the keyword index with index_document() or unindex_document().
+    """
+    return await db.scalar(
+        update(ProjectModel)
+        .where(ProjectModel.id == project_id)
+        .values(
+            index_version=ProjectModel.index_version + 1,
+            last_indexed_at=_utcnow(),
+        )
+        .returning(ProjectModel.index_version)
+    )
+
+
+async def index_document(db: AsyncSession, project_id: str, doc_id: str, version: int) -> None:
+    """Fold a document's current chunks into the project's cached keyword index."""
+    from app.bm25_cache import get_bm25_manager
+
+    result = await db.execute(
+        select(ChunkModel.id, ChunkModel.text)
+        .where(ChunkModel.doc_id == doc_id)
+        .order_by(ChunkModel.start_char)
+    )
+    rows = result.all()
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(
+        _retrieval_pool, get_bm25_manager().add_document, project_id, version, doc_id, rows, _tokenize
+    )
+    invalidate_search_cache(project_id)
+
+
+async def unindex_document(project_id: str, doc_id: str, version: int) -> None:
+    """Drop a deleted document's chunks from the project's cached keyword index."""
+    from app.bm25_cache import get_bm25_manager
+
+    # May load, compact and persist the index; keep it off the event loop
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(
+        _retrieval_pool, get_bm25_manager().remove_document, project_id, version, doc_id
     )
-    return results
+    invalidate_search_cache(project_id)
 
 
 def build_context_window(
@@ -2,19 +2,22 @@
 VERO Router — Documents / Ingestion
 ------------------------------------
 The core Layer 1 endpoint: upload a file or URL and turn it into stored text.
-Deduplication via SHA-256 hash on normalized text.
+Deduplication via SHA-256 hash of the raw upload bytes (before parsing)
+and of the normalized text (after parsing).
 """
 
+import hashlib
 import json
 import tempfile
-import shutil
 from pathlib import Path
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_db
+from app.jobs import enqueue_job, job_counts, wake_job_worker
 from app.models import ProjectModel, DocumentModel
 from app.parsers import detect_source_type, parse_file
 from app.parsers.web import parse_web
@@ -28,6 +31,7 @@ from app.schema import (
     EmbedRequest,
     EmbeddingResponse,
     IngestRepoRequest,
+    IngestStatsResponse,
     IngestURLRequest,
     SourceType,
     SOURCE_CONFIDENCE,
@@ -50,6 +54,18 @@ async def _verify_project(project_id: str, db: AsyncSession) -> ProjectModel:
     return project
 
 
+async def _check_source_duplicate(project_id: str, source_hash: str, db: AsyncSession) -> DocumentModel | None:
+    """Check if the project already holds a live document with these exact source bytes."""
+    result = await db.execute(
+        select(DocumentModel).where(
+            DocumentModel.project_id == project_id,
+            DocumentModel.source_hash == source_hash,
+            DocumentModel.processing_status.not_in(("failed", "duplicate")),
+        ).limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
 async def _check_duplicate(project_id: str, content_hash: str, db: AsyncSession) -> DocumentModel | None:
     """Check if a document with this hash already exists in the project."""
     result = await db.execute(
@@ -80,16 +96,28 @@ def _to_summary(doc: DocumentModel, is_duplicate: bool = False) -> DocumentSumma
 
 # File upload ingestion
 
+# Read size while streaming uploads to disk
+_UPLOAD_BLOCK = 1024 * 1024
+
+def _save_upload(source, path: Path) -> str:
+    """Stream an upload to disk, hashing the bytes on the way; returns the SHA-256 hex digest."""
+    digest = hashlib.sha256()
+    with open(path, "wb") as f:
+        while block := source.read(_UPLOAD_BLOCK):
+            digest.update(block)
+            f.write(block)
+    return digest.hexdigest()
+
+
 @router.post("/projects/{project_id}/ingest", status_code=201, response_model=DocumentSummary)
 async def ingest_file(
     project_id: str,
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Upload a document file (PDF, DOCX, MD, TXT) and ingest it.
-    Parsing and deduplication happen asynchronously in the background.
+    Parsing and deduplication run later on the ingestion job queue.
     """
     await _verify_project(project_id, db)
 
@@ -107,11 +135,13 @@ async def ingest_file(
     tmp_path = upload_dir / f"{temp_id}_{file.filename}"
     
     try:
-        with open(tmp_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
+        source_hash = await run_in_threadpool(_save_upload, file.file, tmp_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save file: {e}")
 
+    # Byte-identical re-upload: mark it duplicate before any parser runs
+    existing = await _check_source_duplicate(project_id, source_hash, db)
+
     # Store new document in "parsing" state instantly
     confidence = SOURCE_CONFIDENCE.get(source_type, 3).value
     doc = DocumentModel(
@@ -120,16 +150,20 @@ async def ingest_file(
         title=file.filename,
         raw_text="",
         content_hash=f"pending_{temp_id}",
-        processing_status="parsing",
+        source_hash=source_hash,
+        processing_status="duplicate" if existing else "parsing",
         confidence_level=confidence,
     )
     db.add(doc)
-    await db.commit()
-    await db.refresh(doc)
+    if existing:
+        await db.commit()
+        tmp_path.unlink(missing_ok=True)
+        return _to_summary(doc, is_duplicate=True)
 
-    # Auto-pipeline: parse + chunk + embed in background
-    from app.pipeline import auto_pipeline
-    background_tasks.add_task(auto_pipeline, doc.id, filepath=str(tmp_path), ingest_type="file")
+    # Auto-pipeline: parse + chunk + embed, queued in the same transaction as the document
+    await enqueue_job(db, doc, "file", filepath=str(tmp_path))
+    await db.commit()
+    wake_job_worker()
 
     return _to_summary(doc)
 
@@ -140,11 +174,10 @@ async def ingest_file(
 async def ingest_url(
     project_id: str,
     body: IngestURLRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Ingest a web page by URL. Parsing and deduplication happen asynchronously in the background.
+    Ingest a web page by URL. Parsing and deduplication run later on the ingestion job queue.
     """
     await _verify_project(project_id, db)
 
@@ -164,11 +197,9 @@ async def ingest_url(
         source_url=body.url,
     )
     db.add(doc)
+    await enqueue_job(db, doc, "url", url=body.url)
     await db.commit()
-    await db.refresh(doc)
-
-    from app.pipeline import auto_pipeline
-    background_tasks.add_task(auto_pipeline, doc.id, url=body.url, ingest_type="url")
+    wake_job_worker()
 
     return _to_summary(doc)
 
@@ -179,11 +210,10 @@ async def ingest_url(
 async def ingest_repo(
     project_id: str,
     body: IngestRepoRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Ingest a public GitHub repository. Parsing and deduplication happen asynchronously.
+    Ingest a public GitHub repository. Parsing and deduplication run later on the ingestion job queue.
     """
     await _verify_project(project_id, db)
 
@@ -203,15 +233,28 @@ async def ingest_repo(
         source_url=body.repo_url,
     )
     db.add(doc)
+    await enqueue_job(db, doc, "repo", url=body.repo_url)
     await db.commit()
-    await db.refresh(doc)
-
-    from app.pipeline import auto_pipeline
-    background_tasks.add_task(auto_pipeline, doc.id, url=body.repo_url, ingest_type="repo")
+    wake_job_worker()
 
     return _to_summary(doc)
 
 
+@router.get("/ingest/stats", response_model=IngestStatsResponse)
+async def ingest_stats(db: AsyncSession = Depends(get_db)):
+    """Per-stage queue depth and throughput of the ingestion pipeline, parse and HTTP caches, and job counts."""
+    from app.parse_cache import get_parse_cache
+    from app.parsers.fetch import get_http_cache
+    from app.stages import get_stage_stats
+
+    return IngestStatsResponse(
+        stages=get_stage_stats(),
+        parse_cache=await run_in_threadpool(get_parse_cache().stats),
+        http_cache=await run_in_threadpool(get_http_cache().stats),
+        jobs=await job_counts(db),
+    )
+
+
 # List and retrieve documents
 
 @router.get("/documents", response_model=list[GlobalDocumentSummary])
@@ -284,8 +327,13 @@ async def delete_document(doc_id: str, db: AsyncSession = Depends(get_db)):
     if doc is None:
         raise HTTPException(status_code=404, detail="Document not found")
 
+    from app.retrieval import bump_index_version, unindex_document
+    project_id = doc.project_id
     await db.delete(doc)
+    version = await bump_index_version(db, project_id)
     await db.commit()
+
+    await unindex_document(project_id, doc_id, version)
     return None
 
 
@@ -308,11 +356,7 @@ async def generate_chunks(
     if doc is None:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    # 2. Delete existing chunks for this document (Reversible Chunking)
-    from app.models import ChunkModel
-    await db.execute(ChunkModel.__table__.delete().where(ChunkModel.doc_id == doc_id))
-
-    # 3. Get the best chunker for this document type
+    # 2. Get the best chunker for this document type
     from app.chunks import get_chunker_for_source
     chunker = get_chunker_for_source(doc.source_type)
 
@@ -321,7 +365,7 @@ async def generate_chunks(
     if doc.summary and doc.summary != "No summary available.":
         context_header += f" - {doc.summary}"
 
-    # 4. Generate chunks
+    # 3. Generate chunks
     chunk_responses = chunker.chunk(
         text=doc.raw_text, 
         doc_id=doc.id, 
@@ -329,26 +373,17 @@ async def generate_chunks(
         doc_title=context_header
     )
     
-    # 5. Store them in the DB
-    new_chunks = []
-    for cr in chunk_responses:
-        c_model = ChunkModel(
-            id=cr.id,
-            doc_id=cr.doc_id,
-            project_id=cr.project_id,
-            text=cr.text,
-            start_char=cr.start_char,
-            end_char=cr.end_char,
-            token_count=cr.token_count,
-            strategy=cr.strategy,
-            metadata_json=json.dumps(cr.metadata)
-        )
-        new_chunks.append(c_model)
-        db.add(c_model)
+    # 4. Replace the stored chunk set (Reversible Chunking)
+    from app.chunk_store import remove_chunk_vectors, replace_chunks
+    old_ids = await replace_chunks(db, doc.id, chunk_responses)
 
+    from app.retrieval import bump_index_version, index_document
+    version = await bump_index_version(db, doc.project_id)
     await db.commit()
+    await remove_chunk_vectors(doc.project_id, old_ids)
+    await index_document(db, doc.project_id, doc.id, version)
 
-    # 6. Return response
+    # 5. Return response
     return chunk_responses
 
 
@@ -398,7 +433,13 @@ async def generate_embeddings(
     Generate vector embeddings for all chunks of a document.
     Uses smart versioning: only re-embeds chunks whose text has changed.
     """
-    from app.models import ChunkModel, EmbeddingModel
+    from app.models import ChunkModel
+    from app.embedding_store import (
+        embed_with_reuse,
+        embedding_record,
+        load_embedding_records,
+        upsert_embedding_records,
+    )
     from app.embeddings import get_embedder
     from app.utils import compute_content_hash
     from app import vectorstore
@@ -425,82 +466,61 @@ async def generate_embeddings(
     except KeyError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    # 4. Determine which chunks need (re-)embedding via content hash comparison
-    to_embed = []  # (chunk, content_hash)
+    # 4. Determine which chunks need (re-)embedding via content hash comparison.
+    # Records are kept under the embedder's own name, so vectors from the other
+    # inference backend never count as cached.
+    existing = await load_embedding_records(db, doc_id, embedder.model_name)
+    to_embed = []  # (chunk, content_hash, existing record or None)
     cached = []    # existing EmbeddingModel records that are still valid
 
     for chunk in chunks:
         chunk_hash = compute_content_hash(chunk.text)
-
-        # Check for existing embedding record
-        existing = await db.execute(
-            select(EmbeddingModel).where(
-                EmbeddingModel.chunk_id == chunk.id,
-                EmbeddingModel.model_name == body.model_name,
-            )
-        )
-        existing_emb = existing.scalar_one_or_none()
-
+        existing_emb = existing.get(chunk.id)
         if existing_emb and existing_emb.content_hash == chunk_hash:
             cached.append(existing_emb)
         else:
             to_embed.append((chunk, chunk_hash, existing_emb))
 
-    # 5. Batch-embed only new/changed chunks
+    # 5. Batch-embed only new/changed chunks, reusing stored vectors for known content
     responses = []
 
     if to_embed:
         texts = [t[0].text for t in to_embed]
-        vectors = embedder.embed(texts)
-
-        chunk_ids_for_chroma = []
-        vectors_for_chroma = []
-        documents_for_chroma = []
-        metadatas_for_chroma = []
-
-        for (chunk, chunk_hash, old_emb), vector in zip(to_embed, vectors):
-            # Remove old embedding record if it exists
-            if old_emb:
-                await db.delete(old_emb)
-
-            # Create new embedding record
-            import uuid
-            emb_id = uuid.uuid4().hex[:12]
-            emb = EmbeddingModel(
-                id=emb_id,
-                chunk_id=chunk.id,
-                model_name=body.model_name,
-                dimension=embedder.dimension,
-                content_hash=chunk_hash,
-            )
-            db.add(emb)
-
-            # Prepare for ChromaDB upsert
-            chunk_ids_for_chroma.append(chunk.id)
-            vectors_for_chroma.append(vector)
-            documents_for_chroma.append(chunk.text)
-            metadatas_for_chroma.append({
-                "doc_id": doc.id,
-                "strategy": chunk.strategy,
-                "start_char": chunk.start_char,
-                "end_char": chunk.end_char,
-            })
+        outcome = await embed_with_reuse(db, embedder, texts, [t[1] for t in to_embed])
+        dimension = outcome.vectors.shape[1]
+
+        # New or changed records replace the old ones in a single upsert (ids are kept)
+        rows = [
+            embedding_record(chunk.id, embedder.model_name, dimension, chunk_hash, old_emb.id if old_emb else None)
+            for chunk, chunk_hash, old_emb in to_embed
+        ]
+        await upsert_embedding_records(db, rows)
 
+        for row, reused in zip(rows, outcome.reused):
             responses.append(EmbeddingResponse(
-                id=emb.id,
-                chunk_id=chunk.id,
-                model_name=body.model_name,
-                dimension=embedder.dimension,
+                id=row["id"],
+                chunk_id=row["chunk_id"],
+                model_name=embedder.model_name,
+                dimension=dimension,
                 is_cached=False,
+                is_reused=bool(reused),
             ))
 
         # Upsert vectors into ChromaDB
         vectorstore.upsert_embeddings(
             project_id=doc.project_id,
-            chunk_ids=chunk_ids_for_chroma,
-            vectors=vectors_for_chroma,
-            documents=documents_for_chroma,
-            metadatas=metadatas_for_chroma,
+            chunk_ids=[chunk.id for chunk, _, _ in to_embed],
+            vectors=outcome.vectors.tolist(),
+            documents=texts,
+            metadatas=[
+                {
+                    "doc_id": doc.id,
+                    "strategy": chunk.strategy,
+                    "start_char": chunk.start_char,
+                    "end_char": chunk.end_char,
+                }
+                for chunk, _, _ in to_embed
+            ],
         )
 
     # 6. Add cached responses
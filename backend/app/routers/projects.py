@@ -149,5 +149,10 @@ async def delete_project(project_id: str, db: AsyncSession = Depends(get_db)):
 
     await db.delete(project)
     await db.commit()
+
+    from app.bm25_cache import get_bm25_manager
+    from app.retrieval import invalidate_search_cache
+    get_bm25_manager().invalidate(project_id)
+    invalidate_search_cache(project_id)
     return None
 
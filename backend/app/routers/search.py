@@ -6,7 +6,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.bm25_cache import get_bm25_manager
 from app.database import get_db
+from app.embeddings import get_query_cache
+from app.reranker import get_rerank_cache_stats
 from app.models import ProjectModel
 from app.schema import (
     SearchRequest,
@@ -14,8 +17,9 @@ from app.schema import (
     ContextWindowResponse,
     AnswerRequest,
     GroundedAnswer,
+    SearchStatsResponse,
 )
-from app.retrieval import search, build_context_window
+from app.retrieval import search, run_search, build_context_window, get_search_cache_stats
 from app.answering import generate_answer
 
 logger = logging.getLogger(__name__)
@@ -46,23 +50,29 @@ async def search_project(
     - **semantic**: Pure vector similarity search (best for conceptual queries).
     - **keyword**: BM25 keyword match (best for exact terms, function names, etc.).
     - **hybrid**: Combines both using Reciprocal Rank Fusion (recommended).
+
+    With `latency_budget_ms`, reranking is cascaded: only the stage-1 top slice
+    the budget affords goes through the cross-encoder (`rerank_depth`).
     """
     await _verify_project(project_id, db)
 
-    results = await search(
+    run = await run_search(
         db=db,
         project_id=project_id,
         query=body.query,
         top_k=body.top_k,
         mode=body.mode.value,
         min_score=body.min_score,
+        latency_budget_ms=body.latency_budget_ms,
     )
 
     return SearchResponse(
         query=body.query,
         mode=body.mode.value,
-        total_results=len(results),
-        results=results,
+        total_results=len(run.results),
+        results=run.results,
+        candidates=run.candidates,
+        rerank_depth=run.rerank_depth,
     )
 
 
@@ -86,6 +96,7 @@ async def search_context(
         top_k=body.top_k,
         mode=body.mode.value,
         min_score=body.min_score,
+        latency_budget_ms=body.latency_budget_ms,
     )
 
     context = build_context_window(body.query, results)
@@ -128,3 +139,13 @@ async def generate_grounded_answer(
     )
     return answer
 
+
+@router.get("/search/stats", response_model=SearchStatsResponse)
+async def search_stats():
+    """Retrieval cache statistics: BM25 index, final-result, query-vector and rerank-score caches."""
+    return SearchStatsResponse(
+        bm25=get_bm25_manager().stats(),
+        results=get_search_cache_stats(),
+        query_embeddings=get_query_cache().stats(),
+        rerank=get_rerank_cache_stats(),
+    )
@@ -178,6 +178,7 @@ class EmbeddingResponse(BaseModel):
     model_name: str
     dimension: int
     is_cached: bool = False
+    is_reused: bool = False  # Vector copied from the content-addressed store, not recomputed
 
     model_config = {"from_attributes": True}
 
@@ -198,6 +199,8 @@ class SearchRequest(BaseModel):
     mode: SearchMode = SearchMode.HYBRID
     min_score: float = Field(default=0.01, ge=0.0, le=1.0)
     context_budget: int = Field(default=10000, ge=1000, le=50000)
+    # Optional end-to-end budget: rerank only as many candidates as it affords
+    latency_budget_ms: Optional[int] = Field(default=None, ge=1, le=60000)
 
 
 class SearchResultItem(BaseModel):
@@ -213,6 +216,9 @@ class SearchResultItem(BaseModel):
     source_type: str
     source_url: Optional[str] = None
     confidence_level: int
+    # False when a latency budget left the chunk unreranked: `score` is then its
+    # stage-1 score relative to the best candidate, not a cross-encoder score
+    reranked: bool = True
 
 
 class SearchResponse(BaseModel):
@@ -221,6 +227,8 @@ class SearchResponse(BaseModel):
     mode: str
     total_results: int
     results: List[SearchResultItem]
+    candidates: int = 0     # Stage-1 candidates that reached reranking
+    rerank_depth: int = 0   # Candidates actually scored by the cross-encoder
 
 
 class ContextWindowResponse(BaseModel):
@@ -231,6 +239,102 @@ class ContextWindowResponse(BaseModel):
     context: str
 
 
+class BM25CacheStats(BaseModel):
+    """Keyword index cache counters since startup."""
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    builds: int
+    build_seconds: float
+    disk_loads: int
+
+
+class ResultCacheStats(BaseModel):
+    """Final search-result cache counters since startup."""
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    expirations: int
+
+
+class QueryEmbeddingCacheStats(BaseModel):
+    """Query vector cache counters since startup."""
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    hit_ratio: float
+
+
+class RerankCacheStats(BaseModel):
+    """Cross-encoder pair-score cache counters since startup."""
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+
+
+class SearchStatsResponse(BaseModel):
+    """Retrieval cache statistics."""
+    bm25: BM25CacheStats
+    results: ResultCacheStats
+    query_embeddings: QueryEmbeddingCacheStats
+    rerank: RerankCacheStats
+
+
+class IngestStageStats(BaseModel):
+    """One ingestion stage: queue depth, busy workers and throughput since startup."""
+    stage: str
+    workers: int
+    busy: int
+    queued: int
+    max_queued: int
+    processed: int
+    failed: int
+    avg_seconds: float
+    per_minute: float
+
+
+class ParseCacheStats(BaseModel):
+    """On-disk parse-result cache counters since startup."""
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+
+
+class HttpCacheStats(BaseModel):
+    """On-disk conditional-GET cache counters since startup."""
+    entries: int
+    bytes: int
+    max_bytes: int
+    revalidated: int
+    downloads: int
+    revalidated_ratio: float
+    evictions: int
+
+
+class IngestStatsResponse(BaseModel):
+    """Staged ingestion pipeline, parse and HTTP caches, and job queue counters."""
+    stages: List[IngestStageStats]
+    parse_cache: ParseCacheStats
+    http_cache: HttpCacheStats
+    jobs: Dict[str, int]
+
+
 class GroundedAnswer(BaseModel):
     answer: str
     citations: List[SearchResultItem]
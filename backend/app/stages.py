@@ -0,0 +1,209 @@
+"""VERO Staged Ingestion: Overlap parse, summary, chunk and embed across documents.
+
+Each pipeline stage (app.pipeline.PIPELINE_STAGES) has its own worker pool fed
+by a bounded queue. A document moves to the next stage's queue as soon as a
+stage finishes, so while one document waits on its LLM summary the next one is
+parsing in the process pool and an earlier one is embedding. A full queue
+blocks the stage in front of it, which keeps memory bounded when a burst of
+uploads outpaces the slowest stage.
+
+Stages are the same resumable steps run_pipeline() executes sequentially, so a
+failure in any stage surfaces to the job that submitted the document and its
+retry resumes from the first unfinished stage.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from app.pipeline import PARSE_WORKERS, PIPELINE_STAGES, run_stage
+
+logger = logging.getLogger(__name__)
+
+# VERO_INGEST_STAGED=false runs each job's stages back to back instead
+STAGED_ENABLED = os.environ.get("VERO_INGEST_STAGED", "true").lower() == "true"
+
+# Workers per stage. Parse is CPU-bound (process pool), summary waits on the LLM,
+# chunking runs in a thread, embedding goes through the batching scheduler.
+STAGE_WORKERS = {
+    "parse": PARSE_WORKERS,
+    "summary": int(os.environ.get("VERO_STAGE_SUMMARY_WORKERS", "4")),
+    "chunk": int(os.environ.get("VERO_STAGE_CHUNK_WORKERS", "2")),
+    "embed": int(os.environ.get("VERO_STAGE_EMBED_WORKERS", "2")),
+}
+# Documents waiting in front of each stage
+QUEUE_DEPTH = int(os.environ.get("VERO_STAGE_QUEUE_DEPTH", "16"))
+
+# Throughput is reported over this trailing window
+_WINDOW_SECONDS = 60.0
+
+
+@dataclass
+class _Item:
+    doc_id: str
+    filepath: str | None
+    url: str | None
+    ingest_type: str
+    future: asyncio.Future
+
+
+@dataclass
+class _StageStats:
+    processed: int = 0
+    failed: int = 0
+    busy: int = 0
+    seconds: float = 0.0
+    recent: deque = field(default_factory=deque)  # Completion times within the window
+
+    def record(self, elapsed: float, ok: bool) -> None:
+        now = time.monotonic()
+        self.seconds += elapsed
+        if ok:
+            self.processed += 1
+        else:
+            self.failed += 1
+        self.recent.append(now)
+        while self.recent and self.recent[0] < now - _WINDOW_SECONDS:
+            self.recent.popleft()
+
+
+class IngestEngine:
+    """Bounded queue + worker pool per pipeline stage."""
+
+    def __init__(
+        self,
+        stages: tuple[str, ...] = PIPELINE_STAGES,
+        workers: dict[str, int] | None = None,
+        queue_depth: int = QUEUE_DEPTH,
+        stage_fn=run_stage,
+    ):
+        self.stages = stages
+        self.workers = {s: max(1, (workers or STAGE_WORKERS).get(s, 1)) for s in stages}
+        self.queue_depth = max(1, queue_depth)
+        self._stage_fn = stage_fn
+        self._queues: dict[str, asyncio.Queue] = {}
+        self._stats = {s: _StageStats() for s in stages}
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._queues = {s: asyncio.Queue(maxsize=self.queue_depth) for s in self.stages}
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"vero-stage-{stage}-{n}")
+            for i, stage in enumerate(self.stages)
+            for n in range(self.workers[stage])
+        ]
+        logger.info("Staged ingestion started: %s",
+                    ", ".join(f"{s}={self.workers[s]}" for s in self.stages))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Whoever is still waiting gets cancelled; their jobs are requeued by the caller
+        for queue in self._queues.values():
+            while not queue.empty():
+                queue.get_nowait().future.cancel()
+
+    async def run(self, doc_id: str, filepath: str | None = None, url: str | None = None,
+                  ingest_type: str = "file") -> None:
+        """Send a document through the stages; returns when it leaves the last one.
+
+        Raises whatever the failing stage raised. Cancelling the caller drops the
+        document before its next stage (a stage already running finishes its commit).
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queues[self.stages[0]].put(_Item(doc_id, filepath, url, ingest_type, future))
+        await future
+
+    def stats(self) -> list[dict]:
+        """Per-stage queue depth, busy workers and throughput."""
+        out = []
+        now = time.monotonic()
+        for stage in self.stages:
+            st = self._stats[stage]
+            done = st.processed + st.failed
+            window = sum(1 for t in st.recent if t >= now - _WINDOW_SECONDS)
+            out.append({
+                "stage": stage,
+                "workers": self.workers[stage],
+                "busy": st.busy,
+                "queued": self._queues[stage].qsize() if self._queues else 0,
+                "max_queued": self.queue_depth,
+                "processed": st.processed,
+                "failed": st.failed,
+                "avg_seconds": round(st.seconds / done, 4) if done else 0.0,
+                "per_minute": round(window * 60.0 / _WINDOW_SECONDS, 2),
+            })
+        return out
+
+    async def _worker(self, index: int) -> None:
+        stage = self.stages[index]
+        queue = self._queues[stage]
+        stats = self._stats[stage]
+        while True:
+            item = await queue.get()
+            if item.future.done():
+                continue  # Submitter gave up (job cancelled or lease lost)
+
+            stats.busy += 1
+            started = time.perf_counter()
+            try:
+                more = await self._stage_fn(stage, item.doc_id, filepath=item.filepath, url=item.url,
+                                            ingest_type=item.ingest_type)
+            except asyncio.CancelledError:
+                if not item.future.done():
+                    item.future.cancel()
+                raise
+            except Exception as exc:
+                stats.record(time.perf_counter() - started, ok=False)
+                if not item.future.done():
+                    item.future.set_exception(exc)
+                continue
+            finally:
+                stats.busy -= 1
+            stats.record(time.perf_counter() - started, ok=True)
+
+            if not more or index == len(self.stages) - 1:
+                if not item.future.done():
+                    item.future.set_result(None)
+            else:
+                # Blocks while the next stage is backed up
+                await self._queues[self.stages[index + 1]].put(item)
+
+
+_engine: IngestEngine | None = None
+
+
+async def run_staged(doc_id: str, filepath: str | None = None, url: str | None = None,
+                     ingest_type: str = "file") -> None:
+    """Run a document through the shared staged engine (started on first use)."""
+    global _engine
+    if not STAGED_ENABLED:
+        from app.pipeline import run_pipeline
+
+        await run_pipeline(doc_id, filepath=filepath, url=url, ingest_type=ingest_type)
+        return
+    if _engine is None:
+        _engine = IngestEngine()
+        _engine.start()
+    await _engine.run(doc_id, filepath=filepath, url=url, ingest_type=ingest_type)
+
+
+def get_stage_stats() -> list[dict]:
+    """Stats of the shared engine (configured values and zeros before first use)."""
+    return (_engine or IngestEngine()).stats()
+
+
+async def stop_ingest_engine() -> None:
+    global _engine
+    if _engine is not None:
+        with contextlib.suppress(Exception):
+            await _engine.stop()
+        _engine = None
@@ -11,7 +11,10 @@ def normalize_text(text: str) -> str:
     - Collapse multiple whitespace into single spaces
     - Normalize line endings
     """
-    text = text.strip()
+    return _collapse_whitespace(text.strip())
+
+
+def _collapse_whitespace(text: str) -> str:
     text = re.sub(r"\r\n", "\n", text)
     text = re.sub(r"[ \t]+", " ", text)
     text = re.sub(r"\n{3,}", "\n\n", text)
@@ -25,3 +28,40 @@ def compute_content_hash(text: str) -> str:
     """
     normalized = normalize_text(text)
     return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class ContentHasher:
+    """Incremental compute_content_hash() for text that arrives in pieces.
+
+    Every normalization rule only touches whitespace, so text up to the last
+    non-whitespace character can be normalized and hashed immediately; the
+    trailing whitespace waits for the next piece (and is stripped at the end).
+    """
+
+    def __init__(self):
+        self._sha = hashlib.sha256()
+        self._pending = ""
+        self._started = False
+
+    def update(self, piece: str) -> None:
+        if not self._started:
+            piece = piece.lstrip()
+            if not piece:
+                return
+            self._started = True
+        text = self._pending + piece
+        cut = len(text.rstrip())
+        if cut:
+            self._sha.update(_collapse_whitespace(text[:cut]).encode("utf-8"))
+        self._pending = text[cut:]
+
+    def hexdigest(self) -> str:
+        return self._sha.hexdigest()
+
+
+def compute_source_hash(data: bytes) -> str:
+    """
+    Compute SHA-256 hash of raw source bytes (a fetched page body).
+    This is the pre-parse deduplication key; uploads are hashed the same way while streaming to disk.
+    """
+    return hashlib.sha256(data).hexdigest()
@@ -7,10 +7,12 @@ Stored in backend/data/chromadb/ for persistence across server restarts.
 from __future__ import annotations
 
 import logging
+import threading
 from pathlib import Path
 from typing import Optional
 
 import chromadb
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -18,16 +20,19 @@ logger = logging.getLogger(__name__)
 _CHROMA_DIR = Path(__file__).resolve().parent.parent / "data" / "chromadb"
 _CHROMA_DIR.mkdir(parents=True, exist_ok=True)
 
-# Singleton client
+# Singleton client (created under a lock: retrieval queries run on a thread pool)
 _client: Optional[chromadb.PersistentClient] = None
+_client_lock = threading.Lock()
 
 
 def _get_client() -> chromadb.PersistentClient:
     """Return the singleton ChromaDB client."""
     global _client
     if _client is None:
-        _client = chromadb.PersistentClient(path=str(_CHROMA_DIR))
-        logger.info("ChromaDB client initialized at %s", _CHROMA_DIR)
+        with _client_lock:
+            if _client is None:
+                _client = chromadb.PersistentClient(path=str(_CHROMA_DIR))
+                logger.info("ChromaDB client initialized at %s", _CHROMA_DIR)
     return _client
 
 
@@ -67,7 +72,7 @@ def upsert_embeddings(
 
 def query_similar(
     project_id: str,
-    query_vector: list[float],
+    query_vector: list[float] | np.ndarray,
     top_k: int = 5,
 ) -> dict:
     """Find the most similar chunks to a query vector.
@@ -0,0 +1,111 @@
+"""
+VERO Benchmark -- BM25 Keyword Leg
+==================================
+Measures build time and per-query latency of the sparse BM25 index on a
+synthetic corpus, optionally against rank_bm25.BM25Okapi (full scan + full
+sort, i.e. the previous keyword leg).
+
+Runs offline, no server required.
+
+Usage:
+    python benchmarks/bench_bm25.py --docs 500000
+    python benchmarks/bench_bm25.py --docs 50000 --compare
+"""
+
+import argparse
+import itertools
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from app.bm25_index import BM25Index  # noqa: E402
+
+BOLD = "\033[1m"
+CYAN = "\033[36m"
+DIM = "\033[2m"
+RESET = "\033[0m"
+
+
+def section(title: str):
+    print(f"\n{BOLD}{CYAN}{title}{RESET}")
+    print(f"{DIM}{'─' * 50}{RESET}")
+
+
+def synthetic_corpus(n_docs: int, vocab_size: int, doc_len: int, seed: int = 11) -> list[list[str]]:
+    """Zipf-distributed tokens, so a few terms are very common and most are rare."""
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(vocab_size)]
+    cum_weights = list(itertools.accumulate(1.0 / (i + 1) for i in range(vocab_size)))
+    return [rng.choices(vocab, cum_weights=cum_weights, k=doc_len) for _ in range(n_docs)]
+
+
+def make_queries(vocab_size: int, n: int, seed: int = 3) -> list[list[str]]:
+    """Mix of mid-frequency and rare terms, like real keyword queries."""
+    rng = random.Random(seed)
+    return [
+        [f"w{rng.randint(50, vocab_size - 1)}" for _ in range(rng.randint(2, 5))]
+        for _ in range(n)
+    ]
+
+
+def time_queries(fn, queries) -> list[float]:
+    samples = []
+    for q in queries:
+        started = time.perf_counter()
+        fn(q)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def report(label: str, samples: list[float]):
+    ordered = sorted(samples)
+    p = lambda pct: ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))] * 1000  # noqa: E731
+    print(
+        f"  {label:22s} p50={p(50):8.3f}ms  p95={p(95):8.3f}ms  "
+        f"p99={p(99):8.3f}ms  mean={statistics.mean(samples) * 1000:8.3f}ms"
+    )
+
+
+def main(n_docs: int, vocab_size: int, doc_len: int, n_queries: int, top_k: int, compare: bool):
+    section(f"Corpus: {n_docs:,} docs x {doc_len} tokens, vocab {vocab_size:,}")
+    started = time.perf_counter()
+    corpus = synthetic_corpus(n_docs, vocab_size, doc_len)
+    print(f"  generated in {time.perf_counter() - started:.1f}s")
+    queries = make_queries(vocab_size, n_queries)
+
+    section("Sparse BM25Index")
+    started = time.perf_counter()
+    index = BM25Index.from_corpus(corpus)
+    print(f"  build                  {time.perf_counter() - started:.2f}s  ({index.nbytes / 1e6:.1f} MB arrays)")
+    report(f"top_k({top_k})", time_queries(lambda q: index.top_k(q, top_k), queries))
+
+    if compare:
+        from rank_bm25 import BM25Okapi
+
+        section("rank_bm25.BM25Okapi (previous keyword leg)")
+        started = time.perf_counter()
+        okapi = BM25Okapi(corpus)
+        print(f"  build                  {time.perf_counter() - started:.2f}s")
+
+        def _legacy(q):
+            scores = okapi.get_scores(q)
+            return sorted(enumerate(scores), key=lambda x: x[1], reverse=True)[:top_k]
+
+        report("get_scores + sort", time_queries(_legacy, queries[: max(5, n_queries // 10)]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BM25 keyword leg benchmark")
+    parser.add_argument("--docs", type=int, default=500_000)
+    parser.add_argument("--vocab", type=int, default=50_000)
+    parser.add_argument("--doc-len", type=int, default=60)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=60)
+    parser.add_argument("--compare", action="store_true", help="Also time rank_bm25 (slow on large corpora)")
+    args = parser.parse_args()
+    main(args.docs, args.vocab, args.doc_len, args.queries, args.top_k, args.compare)
@@ -0,0 +1,135 @@
+"""
+VERO Benchmark -- Chunk Persistence
+===================================
+Measures rows/second for storing and replacing a document's chunk set on a
+throwaway SQLite database:
+
+  orm    one ChunkModel object + json.dumps per chunk, db.add, one commit
+         (the previous _chunk_document path)
+  core   app.chunk_store.replace_chunks: one executemany insert
+
+Each path stores the corpus once, then replaces it with a fresh chunk set
+(the re-chunk case). Chunks are synthetic, shaped like MarkdownChunker output.
+
+Runs offline, no server required.
+
+Usage:
+    python benchmarks/bench_chunk_insert.py
+    python benchmarks/bench_chunk_insert.py --chunks 50000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+# Point the app at a scratch database before it creates its engine
+_TMP = tempfile.mkdtemp(prefix="vero-bench-")
+os.environ["VERO_DATABASE_URL"] = f"sqlite+aiosqlite:///{_TMP}/bench.db"
+
+from sqlalchemy import delete, func, select  # noqa: E402
+
+from app.chunk_store import replace_chunks  # noqa: E402
+from app.database import async_session, init_db  # noqa: E402
+from app.models import ChunkModel, DocumentModel, ProjectModel  # noqa: E402
+from app.schema import ChunkResponse  # noqa: E402
+
+BOLD = "\033[1m"
+CYAN = "\033[36m"
+DIM = "\033[2m"
+RESET = "\033[0m"
+
+TITLE = "Attention Is All You Need - A transformer architecture based solely on attention mechanisms."
+
+
+def section(title: str):
+    print(f"\n{BOLD}{CYAN}{title}{RESET}")
+    print(f"{DIM}{'─' * 50}{RESET}")
+
+
+def synthetic_chunks(doc_id: str, project_id: str, n: int) -> list[ChunkResponse]:
+    body = "The encoder maps an input sequence of symbol representations to continuous vectors. " * 12
+    return [
+        ChunkResponse(
+            id=uuid.uuid4().hex[:12],
+            doc_id=doc_id,
+            project_id=project_id,
+            text=f"[Source: {TITLE}]\n[Section: Model > Encoder {i % 40}]\n{body}",
+            start_char=i * 1000,
+            end_char=i * 1000 + 990,
+            token_count=230,
+            strategy="markdown",
+            metadata={"doc_title": TITLE, "Header 1": "Model", "Header 2": f"Encoder {i % 40}"},
+        )
+        for i in range(n)
+    ]
+
+
+async def orm_replace(db, doc_id: str, chunks: list[ChunkResponse]) -> None:
+    await db.execute(ChunkModel.__table__.delete().where(ChunkModel.doc_id == doc_id))
+    for cr in chunks:
+        db.add(ChunkModel(
+            id=cr.id,
+            doc_id=cr.doc_id,
+            project_id=cr.project_id,
+            text=cr.text,
+            start_char=cr.start_char,
+            end_char=cr.end_char,
+            token_count=cr.token_count,
+            strategy=cr.strategy,
+            metadata_json=json.dumps(cr.metadata),
+        ))
+    await db.commit()
+
+
+async def core_replace(db, doc_id: str, chunks: list[ChunkResponse]) -> None:
+    await replace_chunks(db, doc_id, chunks)
+    await db.commit()
+
+
+async def main(n_chunks: int):
+    await init_db()
+    async with async_session() as db:
+        project = ProjectModel(name="bench")
+        db.add(project)
+        await db.flush()
+        doc = DocumentModel(project_id=project.id, source_type="pdf", title="bench",
+                            content_hash="bench", processing_status="ready")
+        db.add(doc)
+        await db.commit()
+        doc_id, project_id = doc.id, project.id
+
+    section(f"Storing and replacing {n_chunks} chunks")
+    results = {}
+    for label, replace in (("orm", orm_replace), ("core", core_replace)):
+        timings = []
+        for _ in ("store", "replace"):
+            chunks = synthetic_chunks(doc_id, project_id, n_chunks)
+            async with async_session() as db:
+                started = time.perf_counter()
+                await replace(db, doc_id, chunks)
+                timings.append(time.perf_counter() - started)
+        async with async_session() as db:
+            rows = await db.scalar(select(func.count()).select_from(ChunkModel))
+            await db.execute(delete(ChunkModel))
+            await db.commit()
+        results[label] = timings
+        print(f"  {label:5s} store={n_chunks / timings[0]:9.0f} rows/s ({timings[0]:6.2f}s)  "
+              f"replace={n_chunks / timings[1]:9.0f} rows/s ({timings[1]:6.2f}s)  rows={rows}")
+    for i, phase in enumerate(("store", "replace")):
+        print(f"  {DIM}{phase}: speedup x{results['orm'][i] / results['core'][i]:.1f}{RESET}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chunk persistence benchmark")
+    parser.add_argument("--chunks", type=int, default=50000)
+    args = parser.parse_args()
+    asyncio.run(main(args.chunks))
@@ -0,0 +1,115 @@
+"""
+VERO Benchmark -- Embedding Micro-Batching
+==========================================
+Compares query embedding throughput and latency with and without the
+coalescing scheduler at 1, 8 and 64 concurrent callers. "direct" is the
+previous behaviour: every caller runs its own batch-of-1 `model.encode`.
+
+Runs offline against the local sentence-transformers model (downloaded on
+first use), no server required.
+
+Usage:
+    python benchmarks/bench_embed_batching.py
+    python benchmarks/bench_embed_batching.py --callers 1 8 64 --requests 20 --max-wait-ms 5
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from app.embeddings import DEFAULT_MODEL  # noqa: E402
+from app.embeddings.local import _encode  # noqa: E402
+from app.embeddings.scheduler import EmbeddingScheduler  # noqa: E402
+
+BOLD = "\033[1m"
+CYAN = "\033[36m"
+DIM = "\033[2m"
+RESET = "\033[0m"
+
+QUERIES = [
+    "how does VERO handle document ingestion",
+    "deduplication and content hashing",
+    "FastAPI SQLAlchemy async sessions",
+    "what parsers does VERO support",
+    "hybrid search reciprocal rank fusion",
+    "cross-encoder reranking latency",
+    "project isolation in the vector store",
+    "chunking strategy for markdown headings",
+]
+
+
+def section(title: str):
+    print(f"\n{BOLD}{CYAN}{title}{RESET}")
+    print(f"{DIM}{'─' * 50}{RESET}")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))] * 1000
+
+
+def run(embed_one, callers: int, requests: int) -> tuple[float, list[float]]:
+    """Each caller embeds `requests` queries back to back. Returns (texts/s, latencies)."""
+    latencies: list[float] = []
+
+    def caller(worker: int):
+        for i in range(requests):
+            # Unique text per request so nothing could be served from a cache
+            text = f"{QUERIES[(worker + i) % len(QUERIES)]} #{worker}-{i}"
+            started = time.perf_counter()
+            embed_one(text)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        list(pool.map(caller, range(callers)))
+    wall = time.perf_counter() - started
+    return callers * requests / wall, latencies
+
+
+def main(callers_list: list[int], requests: int, max_batch: int, max_wait_ms: float):
+    section(f"Model: {DEFAULT_MODEL}")
+    _encode(DEFAULT_MODEL, ["warmup"] * 8)  # Load weights before timing
+
+    scheduler = EmbeddingScheduler(
+        encode=lambda texts: _encode(DEFAULT_MODEL, texts),
+        max_batch=max_batch,
+        max_wait_ms=max_wait_ms,
+        name="bench",
+    )
+    modes = {
+        "direct": lambda text: _encode(DEFAULT_MODEL, [text]),
+        "coalesced": lambda text: scheduler.embed([text], interactive=True),
+    }
+
+    for callers in callers_list:
+        section(f"{callers} concurrent caller(s) x {requests} requests")
+        for label, embed_one in modes.items():
+            batches_before = scheduler.batches
+            throughput, latencies = run(embed_one, callers, requests)
+            extra = ""
+            if label == "coalesced":
+                batches = scheduler.batches - batches_before
+                extra = f"  avg batch={callers * requests / max(1, batches):5.1f}"
+            print(
+                f"  {label:10s} {throughput:8.1f} texts/s  "
+                f"p50={percentile(latencies, 50):7.1f}ms  p95={percentile(latencies, 95):7.1f}ms  "
+                f"mean={statistics.mean(latencies) * 1000:7.1f}ms{extra}"
+            )
+    scheduler.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embedding micro-batching benchmark")
+    parser.add_argument("--callers", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--requests", type=int, default=20, help="Requests per caller")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    main(args.callers, args.requests, args.max_batch, args.max_wait_ms)
@@ -0,0 +1,140 @@
+"""
+VERO Benchmark -- Embedding Bookkeeping
+=======================================
+Times the `embeddings` table bookkeeping for one synthetic document, on a
+throwaway SQLite database:
+
+  per-row   one SELECT per chunk, then db.delete / db.add per record
+            (the previous pipeline and /embed code path)
+  bulk      one query for the document's records + one executemany
+            INSERT ... ON CONFLICT DO UPDATE
+
+Each path runs twice: a first embed (no records yet) and a re-embed (every
+chunk already has a record). No model is involved, only the database work.
+
+Runs offline, no server required.
+
+Usage:
+    python benchmarks/bench_embedding_bookkeeping.py
+    python benchmarks/bench_embedding_bookkeeping.py --chunks 10000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+# Point the app at a scratch database before it creates its engine
+_TMP = tempfile.mkdtemp(prefix="vero-bench-")
+os.environ["VERO_DATABASE_URL"] = f"sqlite+aiosqlite:///{_TMP}/bench.db"
+
+from sqlalchemy import delete, func, select  # noqa: E402
+
+from app.database import async_session, init_db  # noqa: E402
+from app.embedding_store import (  # noqa: E402
+    embedding_record,
+    load_embedding_records,
+    upsert_embedding_records,
+)
+from app.models import ChunkModel, DocumentModel, EmbeddingModel, ProjectModel  # noqa: E402
+
+BOLD = "\033[1m"
+CYAN = "\033[36m"
+DIM = "\033[2m"
+RESET = "\033[0m"
+
+MODEL = "all-MiniLM-L6-v2"
+DIMENSION = 384
+
+
+def section(title: str):
+    print(f"\n{BOLD}{CYAN}{title}{RESET}")
+    print(f"{DIM}{'─' * 50}{RESET}")
+
+
+async def per_row(db, chunks: list[ChunkModel], hashes: list[str]) -> None:
+    for chunk, chunk_hash in zip(chunks, hashes):
+        existing = await db.execute(
+            select(EmbeddingModel).where(
+                EmbeddingModel.chunk_id == chunk.id,
+                EmbeddingModel.model_name == MODEL,
+            )
+        )
+        old_emb = existing.scalar_one_or_none()
+        if old_emb:
+            await db.delete(old_emb)
+            await db.flush()
+        db.add(EmbeddingModel(
+            id=uuid.uuid4().hex[:12],
+            chunk_id=chunk.id,
+            model_name=MODEL,
+            dimension=DIMENSION,
+            content_hash=chunk_hash,
+        ))
+    await db.commit()
+
+
+async def bulk(db, doc_id: str, chunks: list[ChunkModel], hashes: list[str]) -> None:
+    existing = await load_embedding_records(db, doc_id, MODEL)
+    await upsert_embedding_records(db, [
+        embedding_record(chunk.id, MODEL, DIMENSION, chunk_hash,
+                         existing[chunk.id].id if chunk.id in existing else None)
+        for chunk, chunk_hash in zip(chunks, hashes)
+    ])
+    await db.commit()
+
+
+async def main(n_chunks: int):
+    await init_db()
+    async with async_session() as db:
+        project = ProjectModel(name="bench")
+        db.add(project)
+        await db.flush()
+        doc = DocumentModel(project_id=project.id, source_type="text", title="bench",
+                            content_hash="bench", processing_status="ready")
+        db.add(doc)
+        await db.flush()
+        db.add_all([
+            ChunkModel(doc_id=doc.id, project_id=project.id, text=f"chunk {i}", start_char=i,
+                       end_char=i + 1, token_count=2, strategy="bench")
+            for i in range(n_chunks)
+        ])
+        await db.commit()
+        doc_id = doc.id
+
+    section(f"Bookkeeping for one {n_chunks}-chunk document")
+    results = {}
+    for label in ("per-row", "bulk"):
+        async with async_session() as db:
+            await db.execute(delete(EmbeddingModel))
+            await db.commit()
+            chunks = (await db.execute(select(ChunkModel).where(ChunkModel.doc_id == doc_id))).scalars().all()
+            hashes = [f"{i:064x}" for i in range(len(chunks))]
+            timings = []
+            for _ in ("first embed", "re-embed"):
+                started = time.perf_counter()
+                if label == "per-row":
+                    await per_row(db, chunks, hashes)
+                else:
+                    await bulk(db, doc_id, chunks, hashes)
+                timings.append(time.perf_counter() - started)
+            rows = await db.scalar(select(func.count()).select_from(EmbeddingModel))
+        results[label] = timings
+        print(f"  {label:8s} first={timings[0]:7.2f}s ({n_chunks / timings[0]:8.0f} rows/s)  "
+              f"re-embed={timings[1]:7.2f}s ({n_chunks / timings[1]:8.0f} rows/s)  rows={rows}")
+    for i, phase in enumerate(("first embed", "re-embed")):
+        print(f"  {DIM}{phase}: speedup x{results['per-row'][i] / results['bulk'][i]:.1f}{RESET}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embedding bookkeeping benchmark")
+    parser.add_argument("--chunks", type=int, default=10000)
+    args = parser.parse_args()
+    asyncio.run(main(args.chunks))
@@ -0,0 +1,141 @@
+"""
+VERO Benchmark -- Length-Bucketed Batching
+==========================================
+Parses and chunks real PDFs exactly like ingestion does, then embeds every
+document's chunks two ways through the embedding scheduler:
+
+  original   max-batch slices in chunk order (the previous behaviour)
+  bucketed   slices sorted by token length under a padded-token budget
+
+and scores cross-encoder pairs for one query the same two ways. Reports
+wall time and padding efficiency (real tokens / padded tokens, estimated).
+
+Runs offline against the local models, no server required.
+
+Usage:
+    python benchmarks/bench_length_buckets.py paper1.pdf paper2.pdf
+    python benchmarks/bench_length_buckets.py docs/*.pdf --batch-tokens 8192 --rounds 3
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from app.chunks import get_chunker_for_source  # noqa: E402
+from app.embeddings import DEFAULT_MODEL  # noqa: E402
+from app.embeddings.local import _encode  # noqa: E402
+from app.embeddings.scheduler import EmbeddingScheduler, approx_tokens, length_buckets  # noqa: E402
+from app.parsers.pdf import parse_pdf  # noqa: E402
+from app.reranker import _get_model  # noqa: E402
+from app.schema import SourceType  # noqa: E402
+
+BOLD = "\033[1m"
+CYAN = "\033[36m"
+DIM = "\033[2m"
+RESET = "\033[0m"
+
+QUERY = "what method does the paper propose and how is it evaluated"
+
+
+def section(title: str):
+    print(f"\n{BOLD}{CYAN}{title}{RESET}")
+    print(f"{DIM}{'─' * 50}{RESET}")
+
+
+def load_chunks(path: Path) -> list[str]:
+    parsed = asyncio.run(parse_pdf(str(path)))
+    chunker = get_chunker_for_source(SourceType.PDF)
+    return [c.text for c in chunker.chunk(text=parsed["text"], doc_id="bench", project_id="bench", doc_title=path.stem)]
+
+
+def padding_efficiency(batches: list[list[int]]) -> float:
+    real = sum(sum(b) for b in batches)
+    padded = sum(len(b) * max(b) for b in batches if b)
+    return real / padded if padded else 1.0
+
+
+def time_embedding(scheduler: EmbeddingScheduler, docs: list[list[str]], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for texts in docs:
+            scheduler.embed(texts)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(paths: list[Path], max_batch: int, batch_tokens: int, rounds: int, pairs: int):
+    section("Parsing and chunking")
+    docs = []
+    for path in paths:
+        texts = load_chunks(path)
+        lengths = [approx_tokens(t) for t in texts]
+        print(f"  {path.name:40s} {len(texts):5d} chunks  tokens min={min(lengths)} max={max(lengths)}")
+        docs.append(texts)
+    total = sum(len(d) for d in docs)
+
+    _encode(DEFAULT_MODEL, ["warmup"] * 8)  # Load weights before timing
+    original = EmbeddingScheduler(lambda t: _encode(DEFAULT_MODEL, t), max_batch=max_batch,
+                                  name="original", max_batch_tokens=0)
+    bucketed = EmbeddingScheduler(lambda t: _encode(DEFAULT_MODEL, t), max_batch=max_batch,
+                                  name="bucketed", max_batch_tokens=batch_tokens)
+
+    section(f"Embedding {total} chunks ({DEFAULT_MODEL}, best of {rounds})")
+    timings = {}
+    for label, scheduler, batches in (
+        ("original", original, [[approx_tokens(t) for t in d[i:i + max_batch]]
+                                for d in docs for i in range(0, len(d), max_batch)]),
+        ("bucketed", bucketed, [[approx_tokens(d[j]) for j in b]
+                                for d in docs for b in length_buckets([approx_tokens(t) for t in d],
+                                                                      max_batch, batch_tokens)]),
+    ):
+        timings[label] = time_embedding(scheduler, docs, rounds)
+        print(f"  {label:9s} {total / timings[label]:8.1f} chunks/s  "
+              f"wall={timings[label]:6.2f}s  padding efficiency={padding_efficiency(batches):5.1%}")
+    print(f"  {DIM}speedup x{timings['original'] / timings['bucketed']:.2f}{RESET}")
+    original.shutdown()
+    bucketed.shutdown()
+
+    section(f"Cross-encoder, {pairs} pairs per document")
+    model = _get_model()
+    query_tokens = approx_tokens(QUERY)
+    cases = [[(QUERY, t) for t in d[:pairs]] for d in docs]
+    model.predict(cases[0][:4])  # Warm up
+
+    def score_original():
+        for case in cases:
+            model.predict(case, batch_size=32)
+
+    def score_bucketed():
+        for case in cases:
+            lengths = [min(512, query_tokens + approx_tokens(t)) for _, t in case]
+            for bucket in length_buckets(lengths, 32, batch_tokens):
+                model.predict([case[i] for i in bucket], batch_size=len(bucket))
+
+    timings = {}
+    for label, fn in (("original", score_original), ("bucketed", score_bucketed)):
+        best = float("inf")
+        for _ in range(rounds):
+            started = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - started)
+        timings[label] = best
+        n = sum(len(c) for c in cases)
+        print(f"  {label:9s} {n / best:8.1f} pairs/s  wall={best:6.2f}s")
+    print(f"  {DIM}speedup x{timings['original'] / timings['bucketed']:.2f}{RESET}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Length-bucketed batching benchmark")
+    parser.add_argument("pdfs", type=Path, nargs="+", help="PDF files to parse, chunk and embed")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--batch-tokens", type=int, default=8192)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--pairs", type=int, default=50, help="Cross-encoder pairs per document")
+    args = parser.parse_args()
+    main(args.pdfs, args.max_batch, args.batch_tokens, args.rounds, args.pairs)
@@ -0,0 +1,108 @@
+"""
+VERO Benchmark -- ONNX int8 vs PyTorch Inference
+================================================
+Compares throughput of the embedder (all-MiniLM-L6-v2) and the cross-encoder
+(ms-marco-MiniLM-L-6-v2) on the PyTorch path and on the int8 ONNX Runtime
+path, at query-sized (1 text) and ingestion-sized batches.
+
+Runs offline, no server required. Needs sentence-transformers and the `onnx`
+extra (pip install -e .[onnx]); models are exported to data/onnx/ on first run.
+
+Usage:
+    python benchmarks/bench_onnx.py
+    python benchmarks/bench_onnx.py --batch-sizes 1 32 128 --pairs 50 --rounds 10
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from app.embeddings.onnx_backend import OnnxCrossEncoder, _encode_onnx, model_dir  # noqa: E402
+from app.reranker import RERANKER_MODEL  # noqa: E402
+
+BOLD = "\033[1m"
+CYAN = "\033[36m"
+DIM = "\033[2m"
+RESET = "\033[0m"
+
+EMBED_MODEL = "all-MiniLM-L6-v2"
+
+SENTENCES = [
+    "VERO ingests PDFs, Word documents, slides, web pages and code repositories.",
+    "Chunks are deduplicated by SHA-256 content hash before embedding.",
+    "Hybrid search fuses dense vector similarity with BM25 keyword scores.",
+    "The cross-encoder reranks the fused candidates for precision.",
+]
+
+
+def section(title: str):
+    print(f"\n{BOLD}{CYAN}{title}{RESET}")
+    print(f"{DIM}{'─' * 50}{RESET}")
+
+
+def chunk_like(i: int) -> str:
+    """Roughly chunk-sized text (~120 words), unique per index."""
+    return f"Passage {i}. " + " ".join(SENTENCES[(i + k) % len(SENTENCES)] for k in range(8))
+
+
+def measure(fn, items: int, rounds: int) -> tuple[float, float]:
+    """Returns (items/s, median ms per call)."""
+    fn()  # Warm up (graph optimization, allocator)
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    median = statistics.median(timings)
+    return items / median, median * 1000
+
+
+def report(label: str, items: int, rounds: int, fn):
+    throughput, median_ms = measure(fn, items, rounds)
+    print(f"  {label:8s} {throughput:9.1f} items/s  median={median_ms:8.1f}ms")
+    return throughput
+
+
+def directory_mb(path: Path) -> float:
+    return sum(f.stat().st_size for f in path.glob("*") if f.is_file()) / 1e6
+
+
+def main(batch_sizes: list[int], pairs: int, rounds: int):
+    from sentence_transformers import CrossEncoder, SentenceTransformer
+
+    torch_embedder = SentenceTransformer(EMBED_MODEL)
+    torch_ce = CrossEncoder(RERANKER_MODEL)
+    onnx_ce = OnnxCrossEncoder(RERANKER_MODEL)
+    _encode_onnx(EMBED_MODEL, ["export"])
+
+    section("Model files")
+    print(f"  onnx int8 embedder       {directory_mb(model_dir(EMBED_MODEL)):6.1f} MB")
+    print(f"  onnx int8 cross-encoder  {directory_mb(model_dir(RERANKER_MODEL)):6.1f} MB")
+
+    for batch in batch_sizes:
+        texts = [chunk_like(i) for i in range(batch)]
+        section(f"Embedder, batch of {batch}")
+        torch_rate = report("torch", batch, rounds,
+                            lambda: torch_embedder.encode(texts, show_progress_bar=False, convert_to_numpy=True))
+        onnx_rate = report("onnx", batch, rounds, lambda: _encode_onnx(EMBED_MODEL, texts))
+        print(f"  {DIM}speedup x{onnx_rate / torch_rate:.2f}{RESET}")
+
+    section(f"Cross-encoder, {pairs} pairs")
+    pair_list = [("how are duplicate chunks detected", chunk_like(i)) for i in range(pairs)]
+    torch_rate = report("torch", pairs, rounds, lambda: torch_ce.predict(pair_list))
+    onnx_rate = report("onnx", pairs, rounds, lambda: onnx_ce.predict(pair_list))
+    print(f"  {DIM}speedup x{onnx_rate / torch_rate:.2f}{RESET}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ONNX int8 vs PyTorch inference benchmark")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 128])
+    parser.add_argument("--pairs", type=int, default=50, help="Cross-encoder pairs per call")
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    main(args.batch_sizes, args.pairs, args.rounds)
@@ -0,0 +1,227 @@
+"""
+VERO Benchmark -- PDF Engine
+============================
+Parses large PDFs three ways and checks that all produce the same Markdown:
+
+  legacy       the previous parser: a scan pass, a text pass and an image pass,
+               each reopening the document, then pdfplumber over every page
+  all pages    app.parsers.pdf.parse_pdf with VERO_PDF_TABLE_FILTER=false:
+               every page walked once, long documents split into page ranges
+               that worker processes handle in parallel, pdfplumber everywhere
+  engine       parse_pdf as shipped: pdfplumber only on pages whose scan
+               features (ruling lines, table hints) can hold a table
+
+Identical output across the three means the table filter lost no tables.
+
+Without arguments a synthetic 600-page PDF (body text, ruled tables and
+figures) is generated in a temp directory, so the run is offline. Pass real
+PDFs to measure those instead.
+
+Usage:
+    python benchmarks/bench_pdf_engine.py
+    python benchmarks/bench_pdf_engine.py --pages 1200 --workers 8
+    python benchmarks/bench_pdf_engine.py path/to/book.pdf path/to/thesis.pdf
+    python benchmarks/bench_pdf_engine.py --no-tables   # page walk only
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+import fitz  # noqa: E402
+
+from app.parsers import pdf as pdf_engine  # noqa: E402
+from app.parsers.contracts import has_math_symbols, table_to_markdown  # noqa: E402
+
+BOLD = "\033[1m"
+CYAN = "\033[36m"
+DIM = "\033[2m"
+RESET = "\033[0m"
+
+WORDS = ("retrieval augmented generation embeds passages into vectors and ranks them by cosine "
+         "similarity before the language model composes an answer grounded in cited sources").split()
+
+
+def section(title: str):
+    print(f"\n{BOLD}{CYAN}{title}{RESET}")
+    print(f"{DIM}{'─' * 50}{RESET}")
+
+
+def make_pdf(path: Path, pages: int) -> None:
+    """Body text on every page, a ruled table every 10th page, a figure every 25th, a header rule everywhere."""
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 160, 120), False)
+    pix.set_rect(pix.irect, (40, 110, 200))
+    png = pix.tobytes("png")
+
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        words = [WORDS[(i * 7 + j) % len(WORDS)] for j in range(260)]
+        body = "\n".join(" ".join(words[k:k + 13]) for k in range(0, len(words), 13))
+        page.insert_text((50, 60), f"Section {i + 1}\n{body}", fontsize=9)
+        page.draw_line((50, 40), (560, 40), color=(0.5, 0.5, 0.5), width=0.5)
+        if i % 10 == 0:
+            x0, y0, cw, rh = 50, 560, 120, 18
+            for r in range(5):
+                for c in range(3):
+                    rect = fitz.Rect(x0 + c * cw, y0 + r * rh, x0 + (c + 1) * cw, y0 + (r + 1) * rh)
+                    page.draw_rect(rect, color=(0, 0, 0), width=0.7)
+                    page.insert_text((rect.x0 + 4, rect.y1 - 5), f"r{r}c{c}" if r else f"col{c}", fontsize=8)
+        if i % 25 == 0:
+            page.insert_image(fitz.Rect(400, 680, 560, 800), stream=png)
+    doc.save(path)
+    doc.close()
+
+
+# The previous parser, kept here for comparison.
+
+def legacy_scan(path: str) -> dict:
+    doc = fitz.open(path)
+    total_images = table_hints = 0
+    words_per_page = []
+    has_equations = False
+    for page in doc:
+        text = page.get_text("text")
+        words_per_page.append(len(text.split()))
+        total_images += len(page.get_images())
+        if text.count("\t") > 4 or text.count("   ") > 15:
+            table_hints += 1
+        if has_math_symbols(text):
+            has_equations = True
+    doc.close()
+    avg_words = sum(words_per_page) / len(words_per_page) if words_per_page else 0
+    is_slide = avg_words < 120
+    complexity = ("slide_mode" if is_slide
+                  else "text_only" if not (total_images > 0 or table_hints > 0)
+                  else "full_pipeline")
+    return {"page_count": len(words_per_page), "complexity": complexity}
+
+
+def legacy_text(path: str, marker: str) -> str:
+    doc = fitz.open(path)
+    pages = []
+    for i, page in enumerate(doc):
+        text = page.get_text("text").strip()
+        if text:
+            pages.append(f"## {marker} {i + 1}\n\n{text}")
+    doc.close()
+    return "\n\n---\n\n".join(pages)
+
+
+def legacy_images(path: str) -> list[str]:
+    doc = fitz.open(path)
+    descriptions = []
+    for page_num, page in enumerate(doc):
+        for img_info in page.get_images():
+            base = doc.extract_image(img_info[0])
+            w, h = base["width"], base["height"]
+            if w < 100 or h < 100:
+                continue
+            descriptions.append(f"\n> **[Figure, page {page_num + 1}]:** "
+                                f"Visual content ({w}×{h}px) — not captioned.\n")
+    doc.close()
+    return descriptions
+
+
+def legacy_tables(path: str) -> str:
+    import pdfplumber
+
+    parts = []
+    with pdfplumber.open(path) as pdf:
+        for page_num, page in enumerate(pdf.pages):
+            for table in page.extract_tables():
+                if not table or len(table) < 2:
+                    continue
+                md = table_to_markdown(table)
+                if md:
+                    parts.append(f"\n**Table (page {page_num + 1}):**\n\n{md}\n")
+    return "\n".join(parts)
+
+
+def legacy_parse(path: str, with_tables: bool) -> str:
+    scan = legacy_scan(path)
+    if scan["complexity"] == "slide_mode":
+        return legacy_text(path, "Slide")
+    text = legacy_text(path, "Page")
+    if with_tables:
+        tables = legacy_tables(path)
+        if tables:
+            text += f"\n\n---\n\n## Extracted Tables\n{tables}"
+    figures = legacy_images(path)
+    if figures:
+        text += "\n\n---\n\n## Figures\n" + "\n".join(figures)
+    return text
+
+
+def engine_parse(path: str, with_tables: bool, table_filter: bool = True) -> str:
+    # Mirror --no-tables: skip the pdfplumber phase on both sides
+    original = pdf_engine._extract_tables, pdf_engine.TABLE_FILTER
+    if not with_tables:
+        pdf_engine._extract_tables = _no_tables
+    pdf_engine.TABLE_FILTER = table_filter
+    try:
+        return asyncio.run(pdf_engine.parse_pdf(path))["text"]
+    finally:
+        pdf_engine._extract_tables, pdf_engine.TABLE_FILTER = original
+
+
+def _no_tables(path: str, page_numbers: list[int]) -> list:
+    return []
+
+
+def timed(fn, *args) -> tuple[float, str]:
+    started = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - started, out
+
+
+def main(args):
+    if args.workers:
+        pdf_engine.PDF_WORKERS = args.workers
+    if args.pages_per_worker:
+        pdf_engine.PAGES_PER_WORKER = args.pages_per_worker
+    paths = args.paths
+    if not paths:
+        path = Path(tempfile.mkdtemp(prefix="vero-pdf-bench-")) / f"synthetic-{args.pages}.pdf"
+        section(f"Generating a {args.pages}-page PDF")
+        started = time.perf_counter()
+        make_pdf(path, args.pages)
+        print(f"  {DIM}{path} ({os.path.getsize(path) / 1e6:.1f} MB) in {time.perf_counter() - started:.1f}s{RESET}")
+        paths = [str(path)]
+
+    with_tables = not args.no_tables
+    for path in paths:
+        with fitz.open(path) as doc:
+            page_count = doc.page_count
+        ranges = pdf_engine._page_ranges(page_count)
+        section(f"{Path(path).name}: {page_count} pages, {len(ranges)} range(s)"
+                f"{'' if with_tables else ', tables skipped'}")
+        legacy_s, legacy_out = timed(legacy_parse, path, with_tables)
+        print(f"  legacy     {page_count / legacy_s:8.1f} pages/s  wall={legacy_s:6.2f}s")
+        if with_tables:
+            all_s, all_out = timed(engine_parse, path, with_tables, False)
+            print(f"  all pages  {page_count / all_s:8.1f} pages/s  wall={all_s:6.2f}s  "
+                  f"{DIM}identical: {all_out == legacy_out}{RESET}")
+        engine_s, engine_out = timed(engine_parse, path, with_tables)
+        candidates = sum(p.table_candidate for r in ranges for p in pdf_engine._walk_pages(path, *r))
+        print(f"  engine     {page_count / engine_s:8.1f} pages/s  wall={engine_s:6.2f}s  "
+              f"{DIM}identical: {engine_out == legacy_out}, "
+              f"{candidates if with_tables else 0}/{page_count} pages through pdfplumber{RESET}")
+        print(f"  {DIM}speedup x{legacy_s / engine_s:.2f}{RESET}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PDF engine benchmark")
+    parser.add_argument("paths", nargs="*", help="PDFs to parse (default: generate one)")
+    parser.add_argument("--pages", type=int, default=600, help="Pages in the generated PDF")
+    parser.add_argument("--workers", type=int, default=0, help="Override VERO_PDF_WORKERS")
+    parser.add_argument("--pages-per-worker", type=int, default=0, help="Override VERO_PDF_PAGES_PER_WORKER")
+    parser.add_argument("--no-tables", action="store_true", help="Skip the pdfplumber phase")
+    main(parser.parse_args())
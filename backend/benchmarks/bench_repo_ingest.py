@@ -0,0 +1,135 @@
+"""
+VERO Benchmark -- Repository Ingestion
+======================================
+Parses one generated repository through a local GitHub stand-in that adds a
+fixed latency to every request, two ways:
+
+  api       the previous path: README candidates, the Trees API, then up to
+            VERO_REPO_API_MAX_FILES (50) Python files fetched one at a time
+  archive   the HEAD commit, then its tarball in one request, read as it
+            streams, docstrings extracted across VERO_REPO_WORKERS processes
+
+Offline; the latency stands in for the round trip to GitHub.
+
+Usage:
+    python benchmarks/bench_repo_ingest.py
+    python benchmarks/bench_repo_ingest.py --modules 2000 --latency-ms 80 --workers 4
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import sys
+import tarfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from app.parsers import repo  # noqa: E402
+
+BOLD = "\033[1m"
+CYAN = "\033[36m"
+DIM = "\033[2m"
+RESET = "\033[0m"
+
+
+def section(title: str):
+    print(f"\n{BOLD}{CYAN}{title}{RESET}")
+    print(f"{DIM}{'─' * 50}{RESET}")
+
+
+def make_files(modules: int) -> dict[str, bytes]:
+    files = {"README.md": b"# Bench\n\nA generated repository."}
+    for i in range(modules):
+        body = [f'"""Module {i} of the generated package."""\n']
+        for j in range(12):
+            body.append(f'\ndef handler_{j}(request):\n    """Handle request kind {j} for module {i}."""\n'
+                        f'    return request\n')
+        files[f"pkg/sub{i % 20:02d}/mod{i:05d}.py"] = "".join(body).encode()
+    return dict(sorted(files.items()))
+
+
+def make_tarball(files: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for path, data in files.items():
+            info = tarfile.TarInfo(f"acme-bench-0000000/{path}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+class StandIn(BaseHTTPRequestHandler):
+    files: dict[str, bytes] = {}
+    tarball = b""
+    latency = 0.0
+    requests = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        StandIn.requests += 1
+        time.sleep(self.latency)
+        if self.path == "/repos/acme/bench/commits/HEAD":
+            return self._send(b"0" * 40)
+        if self.path == f"/acme/bench/tar.gz/{'0' * 40}":
+            return self._send(self.tarball)
+        if self.path.startswith("/repos/acme/bench/git/trees/HEAD"):
+            tree = [{"path": p, "type": "blob", "size": len(d)} for p, d in self.files.items()]
+            return self._send(json.dumps({"tree": tree}).encode())
+        path = self.path.removeprefix("/acme/bench/HEAD/")
+        if path in self.files:
+            return self._send(self.files[path])
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send(self, body: bytes):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def timed(mode: str) -> tuple[float, dict, int]:
+    repo.REPO_MODE = mode
+    StandIn.requests = 0
+    started = time.perf_counter()
+    result = asyncio.run(repo.parse_repo("https://github.com/acme/bench"))
+    return time.perf_counter() - started, result, StandIn.requests
+
+
+def main(args):
+    if args.workers:
+        repo.REPO_WORKERS = args.workers
+    StandIn.files = make_files(args.modules)
+    StandIn.tarball = make_tarball(StandIn.files)
+    StandIn.latency = args.latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    repo._ARCHIVE_BASE = repo._RAW_BASE = repo._API_BASE = f"http://127.0.0.1:{server.server_port}"
+
+    section(f"{args.modules} modules, {len(StandIn.tarball) / 1e3:.0f} kB tarball, "
+            f"{args.latency_ms:g} ms per request, {repo.REPO_WORKERS} worker(s)")
+    try:
+        for mode in ("api", "archive"):
+            elapsed, result, requests = timed(mode)
+            modules = result["text"].count("Module: Module")
+            print(f"  {mode:8}  wall={elapsed:6.2f}s  requests={requests:5}  "
+                  f"modules={modules:5}  {DIM}{modules / elapsed:8.1f} modules/s{RESET}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Repository ingestion benchmark")
+    parser.add_argument("--modules", type=int, default=500, help="Python modules in the generated repository")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Latency added to every request")
+    parser.add_argument("--workers", type=int, default=0, help="Override VERO_REPO_WORKERS")
+    main(parser.parse_args())
@@ -0,0 +1,163 @@
+"""
+VERO Benchmark -- Concurrent Search Latency
+===========================================
+Fires N concurrent POST /projects/{id}/search calls (default 32) against a
+running server while polling GET /health, then reports p50/p95/p99 latency
+for both. With stage 1 and reranking on their own thread pools, /health
+should stay in the low-millisecond range even while searches are queued.
+
+Usage:
+    1. Start the server:  uvicorn app.main:app --port 8000
+    2. Run this script:   python benchmarks/bench_search_concurrency.py [--concurrency 32] [--rounds 3]
+
+Tune the pools with VERO_RETRIEVAL_WORKERS / VERO_RERANK_WORKERS on the server.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+BASE = "http://localhost:8000"
+HTTP_TIMEOUT = 300.0
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+CORPUS = [REPO_ROOT / "README.md", REPO_ROOT / "Framework.md"]
+
+QUERIES = [
+    "how does VERO handle document ingestion",
+    "deduplication and content hashing",
+    "FastAPI SQLAlchemy",
+    "what parsers does VERO support",
+    "hybrid search reciprocal rank fusion",
+    "cross-encoder reranking",
+    "project isolation",
+    "chunking strategy for markdown",
+]
+
+# Professional Logging Utilities
+BOLD = "\033[1m"
+CYAN = "\033[36m"
+DIM = "\033[2m"
+RESET = "\033[0m"
+
+
+def section(title: str):
+    print(f"\n{BOLD}{CYAN}{title}{RESET}")
+    print(f"{DIM}{'─' * 50}{RESET}")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile (samples in seconds, result in ms)."""
+    ordered = sorted(samples)
+    idx = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[idx] * 1000
+
+
+def report(label: str, samples: list[float]):
+    if not samples:
+        print(f"  {label:10s} no samples")
+        return
+    print(
+        f"  {label:10s} n={len(samples):4d}  "
+        f"p50={percentile(samples, 50):8.1f}ms  "
+        f"p95={percentile(samples, 95):8.1f}ms  "
+        f"p99={percentile(samples, 99):8.1f}ms  "
+        f"mean={statistics.mean(samples) * 1000:8.1f}ms"
+    )
+
+
+async def setup_project(client: httpx.AsyncClient) -> str:
+    """Create a project, ingest the repo docs, and wait until they are searchable."""
+    r = await client.post("/projects", json={"name": f"Bench Search {uuid.uuid4().hex[:6]}"})
+    r.raise_for_status()
+    pid = r.json()["id"]
+
+    doc_ids = []
+    for path in CORPUS:
+        with open(path, "rb") as f:
+            r = await client.post(f"/projects/{pid}/ingest", files={"file": (path.name, f)})
+        r.raise_for_status()
+        doc_ids.append(r.json()["id"])
+
+    for doc_id in doc_ids:
+        for _ in range(90):
+            status = (await client.get(f"/documents/{doc_id}")).json().get("processing_status")
+            if status in ("ready", "failed", "duplicate"):
+                break
+            await asyncio.sleep(2)
+    return pid
+
+
+async def run_round(client: httpx.AsyncClient, pid: str, concurrency: int, mode: str):
+    search_latencies: list[float] = []
+    health_latencies: list[float] = []
+    done = asyncio.Event()
+
+    async def one_search(i: int):
+        started = time.perf_counter()
+        r = await client.post(
+            f"/projects/{pid}/search",
+            json={"query": QUERIES[i % len(QUERIES)], "top_k": 10, "mode": mode},
+        )
+        r.raise_for_status()
+        search_latencies.append(time.perf_counter() - started)
+
+    async def poll_health():
+        while not done.is_set():
+            started = time.perf_counter()
+            (await client.get("/health")).raise_for_status()
+            health_latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0.05)
+
+    poller = asyncio.create_task(poll_health())
+    await asyncio.gather(*(one_search(i) for i in range(concurrency)))
+    done.set()
+    await poller
+    return search_latencies, health_latencies
+
+
+async def main(concurrency: int, rounds: int, mode: str, project_id: str | None):
+    limits = httpx.Limits(max_connections=concurrency + 4)
+    async with httpx.AsyncClient(base_url=BASE, timeout=HTTP_TIMEOUT, limits=limits) as client:
+        section("Setup")
+        pid = project_id or await setup_project(client)
+        print(f"  project={pid}")
+
+        # One warm request so model loading is not counted
+        await client.post(f"/projects/{pid}/search", json={"query": "warmup", "mode": mode})
+
+        all_search: list[float] = []
+        all_health: list[float] = []
+        for n in range(1, rounds + 1):
+            section(f"Round {n}: {concurrency} concurrent /search ({mode})")
+            wall = time.perf_counter()
+            s, h = await run_round(client, pid, concurrency, mode)
+            print(f"  wall time  {time.perf_counter() - wall:.2f}s")
+            report("/search", s)
+            report("/health", h)
+            all_search.extend(s)
+            all_health.extend(h)
+
+        section("Summary")
+        report("/search", all_search)
+        report("/health", all_health)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent /search latency benchmark")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--mode", default="hybrid", choices=["semantic", "keyword", "hybrid"])
+    parser.add_argument("--project-id", default=None, help="Reuse an existing project instead of ingesting")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.concurrency, args.rounds, args.mode, args.project_id))
+    except httpx.ConnectError:
+        print(f"Could not connect to {BASE}. Start the server first.")
+        sys.exit(1)
@@ -0,0 +1,117 @@
+"""
+VERO Benchmark -- Staged Ingestion
+==================================
+Pushes a batch of documents through the four ingestion stages two ways:
+
+  sequential   one document at a time, parse → summary → chunk → embed
+               (the previous auto_pipeline behaviour per upload)
+  staged       app.stages.IngestEngine: a bounded queue and worker pool per
+               stage, so documents overlap across stages
+
+Stage costs are simulated so the run is offline and repeatable: parse and
+chunk burn CPU in a thread, the summary waits like a network call, embedding
+holds a single "model" lock. Tune them to match what /ingest/stats reports on
+a real deployment.
+
+Usage:
+    python benchmarks/bench_staged_ingest.py
+    python benchmarks/bench_staged_ingest.py --docs 40 --summary-ms 800
+"""
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from app.pipeline import PIPELINE_STAGES  # noqa: E402
+from app.stages import STAGE_WORKERS, IngestEngine  # noqa: E402
+
+BOLD = "\033[1m"
+CYAN = "\033[36m"
+DIM = "\033[2m"
+RESET = "\033[0m"
+
+
+def section(title: str):
+    print(f"\n{BOLD}{CYAN}{title}{RESET}")
+    print(f"{DIM}{'─' * 50}{RESET}")
+
+
+def burn(ms: float) -> None:
+    deadline = time.perf_counter() + ms / 1000
+    while time.perf_counter() < deadline:
+        pass
+
+
+class SimulatedStages:
+    def __init__(self, costs: dict[str, float]):
+        self.costs = costs
+        self.model_lock = threading.Lock()
+
+    def _embed(self, ms: float) -> None:
+        with self.model_lock:
+            burn(ms)
+
+    async def __call__(self, stage, doc_id, filepath=None, url=None, ingest_type="file"):
+        ms = self.costs[stage]
+        if stage == "summary":
+            await asyncio.sleep(ms / 1000)
+        elif stage == "embed":
+            await asyncio.to_thread(self._embed, ms)
+        else:
+            await asyncio.to_thread(burn, ms)
+        return True
+
+
+async def run_sequential(stages: SimulatedStages, docs: list[str]) -> float:
+    started = time.perf_counter()
+    for doc_id in docs:
+        for stage in PIPELINE_STAGES:
+            await stages(stage, doc_id)
+    return time.perf_counter() - started
+
+
+async def run_staged(stages: SimulatedStages, docs: list[str], queue_depth: int) -> tuple[float, list[dict]]:
+    engine = IngestEngine(stage_fn=stages, queue_depth=queue_depth)
+    engine.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(engine.run(doc_id) for doc_id in docs))
+    elapsed = time.perf_counter() - started
+    stats = engine.stats()
+    await engine.stop()
+    return elapsed, stats
+
+
+async def main(args):
+    costs = {"parse": args.parse_ms, "summary": args.summary_ms, "chunk": args.chunk_ms, "embed": args.embed_ms}
+    stages = SimulatedStages(costs)
+    docs = [f"doc-{i}" for i in range(args.docs)]
+
+    section(f"{args.docs} documents, stage costs (ms): {costs}")
+    print(f"  {DIM}stage workers: {STAGE_WORKERS}{RESET}")
+    sequential = await run_sequential(stages, docs)
+    print(f"  sequential {args.docs / sequential:7.2f} docs/s  wall={sequential:6.2f}s")
+    staged, stats = await run_staged(stages, docs, args.queue_depth)
+    print(f"  staged     {args.docs / staged:7.2f} docs/s  wall={staged:6.2f}s")
+    print(f"  {DIM}speedup x{sequential / staged:.2f}{RESET}")
+
+    section("Per-stage stats (staged run)")
+    for s in stats:
+        print(f"  {s['stage']:8s} workers={s['workers']}  processed={s['processed']:4d}  "
+              f"avg={s['avg_seconds'] * 1000:7.1f} ms  {s['per_minute']:7.1f}/min")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Staged ingestion benchmark")
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--parse-ms", type=float, default=150)
+    parser.add_argument("--summary-ms", type=float, default=500)
+    parser.add_argument("--chunk-ms", type=float, default=40)
+    parser.add_argument("--embed-ms", type=float, default=200)
+    parser.add_argument("--queue-depth", type=int, default=16)
+    asyncio.run(main(parser.parse_args()))
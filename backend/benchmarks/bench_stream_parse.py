@@ -0,0 +1,137 @@
+"""
+VERO Benchmark -- Streaming Parse
+=================================
+Parses, hashes and chunks one large document two ways and reports the peak
+Python heap (tracemalloc) and wall time of each:
+
+  whole    the regular path: the parser builds the full Markdown string,
+           compute_content_hash() normalizes a copy, chunker.chunk() returns
+           every chunk at once
+  stream   the path uploads above VERO_STREAM_PARSE_MB take: parser segments
+           feed ContentHasher and the chunker's stream, and each batch of
+           chunks is dropped once produced (the pipeline inserts it)
+
+Without arguments a Markdown file of --mb megabytes is generated; --pdf-pages
+generates a PDF instead. Runs offline once tiktoken's cl100k_base encoding
+is cached.
+
+Usage:
+    python benchmarks/bench_stream_parse.py
+    python benchmarks/bench_stream_parse.py --mb 128
+    python benchmarks/bench_stream_parse.py --pdf-pages 2000
+    python benchmarks/bench_stream_parse.py path/to/book.pdf
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from app.chunks import get_chunker_for_source  # noqa: E402
+from app.parsers import detect_source_type, parse_file, stream_file  # noqa: E402
+from app.parsers import pdf as pdf_parser  # noqa: E402
+from app.utils import ContentHasher, compute_content_hash  # noqa: E402
+
+BOLD = "\033[1m"
+CYAN = "\033[36m"
+DIM = "\033[2m"
+RESET = "\033[0m"
+
+WORDS = ("retrieval augmented generation embeds passages into vectors and ranks them by cosine "
+         "similarity before the language model composes an answer grounded in cited sources").split()
+
+
+def section(title: str):
+    print(f"\n{BOLD}{CYAN}{title}{RESET}")
+    print(f"{DIM}{'─' * 50}{RESET}")
+
+
+def make_markdown(path: Path, mb: float) -> None:
+    rng = random.Random(0)
+    target = int(mb * 1024 * 1024)
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        i = 0
+        while written < target:
+            block = f"## Section {i}\n\n" + "\n\n".join(
+                " ".join(rng.choices(WORDS, k=120)) for _ in range(6)
+            ) + "\n\n"
+            if i % 25 == 0:
+                block += "| metric | value |\n|---|---|\n| recall | 0.91 |\n| mrr | 0.77 |\n\n"
+            f.write(block)
+            written += len(block)
+            i += 1
+
+
+def measure(fn) -> tuple[float, float, int]:
+    """(seconds, peak MiB, chunk count) for fn()."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    chunks = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), chunks
+
+
+def run_whole(path: str, source_type) -> int:
+    result = asyncio.run(parse_file(path, source_type))
+    text = result["text"]
+    compute_content_hash(text)
+    chunker = get_chunker_for_source(source_type)
+    return len(chunker.chunk(text, doc_id="bench", project_id="bench", doc_title="Bench"))
+
+
+def run_stream(path: str, source_type) -> int:
+    stream = asyncio.run(stream_file(path, source_type))
+    hasher = ContentHasher()
+    chunks = get_chunker_for_source(source_type).stream(doc_id="bench", project_id="bench", doc_title="Bench")
+    count = 0
+    for segment in stream.segments:
+        hasher.update(segment.text)
+        count += len(chunks.feed(segment.text))
+    return count + len(chunks.close())
+
+
+def main(args):
+    pdf_parser.PDF_WORKERS = 1  # Keep the page walk in this process so tracemalloc sees it
+    paths = args.paths
+    if not paths:
+        root = Path(tempfile.mkdtemp(prefix="vero-stream-bench-"))
+        if args.pdf_pages:
+            sys.path.insert(0, str(BACKEND / "benchmarks"))
+            from bench_pdf_engine import make_pdf
+
+            path = root / f"synthetic-{args.pdf_pages}.pdf"
+            make_pdf(path, args.pdf_pages)
+        else:
+            path = root / f"synthetic-{args.mb:g}mb.md"
+            make_markdown(path, args.mb)
+        paths = [str(path)]
+
+    for path in paths:
+        source_type = detect_source_type(path)
+        section(f"{Path(path).name}: {os.path.getsize(path) / 1e6:.1f} MB {source_type.value}")
+        # Warm up imports and the tokenizer outside the measured runs
+        get_chunker_for_source(source_type).chunk("warm up " * 20, doc_id="w", project_id="w")
+        whole_s, whole_mb, whole_n = measure(lambda: run_whole(path, source_type))
+        print(f"  whole   peak={whole_mb:8.1f} MiB  wall={whole_s:6.2f}s  chunks={whole_n}")
+        stream_s, stream_mb, stream_n = measure(lambda: run_stream(path, source_type))
+        print(f"  stream  peak={stream_mb:8.1f} MiB  wall={stream_s:6.2f}s  chunks={stream_n}")
+        print(f"  {DIM}peak heap x{whole_mb / stream_mb:.1f} smaller{RESET}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streaming parse benchmark")
+    parser.add_argument("paths", nargs="*", help="Files to parse (default: generate one)")
+    parser.add_argument("--mb", type=float, default=64, help="Size of the generated Markdown file")
+    parser.add_argument("--pdf-pages", type=int, default=0, help="Generate a PDF with this many pages instead")
+    main(parser.parse_args())
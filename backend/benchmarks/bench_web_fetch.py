@@ -0,0 +1,132 @@
+"""
+VERO Benchmark -- Web Fetch
+===========================
+Fetches the same set of pages twice (an ingest, then a refresh) from a local
+stand-in that adds a fixed latency to every new connection and serves bodies
+with an ETag, two ways:
+
+  legacy   a fresh httpx.AsyncClient per URL, full body every time
+  pooled   app.parsers.fetch: one kept-alive client, bodies revalidated into
+           304 answers from the on-disk cache on the refresh
+
+The connection latency stands in for DNS + TCP + TLS. Offline.
+
+Usage:
+    python benchmarks/bench_web_fetch.py
+    python benchmarks/bench_web_fetch.py --pages 200 --kb 400 --connect-ms 60
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+import httpx  # noqa: E402
+
+from app.parsers import fetch  # noqa: E402
+
+BOLD = "\033[1m"
+CYAN = "\033[36m"
+DIM = "\033[2m"
+RESET = "\033[0m"
+
+
+def section(title: str):
+    print(f"\n{BOLD}{CYAN}{title}{RESET}")
+    print(f"{DIM}{'─' * 50}{RESET}")
+
+
+class StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = b""
+    connect_delay = 0.0
+    sent = 0
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        time.sleep(self.connect_delay)
+
+    def do_GET(self):
+        etag = f'"{self.path}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+        StandIn.sent += len(self.body)
+
+
+async def legacy_fetch(url: str) -> bytes:
+    # The previous fetch_web: a client per URL
+    async with httpx.AsyncClient(follow_redirects=True, timeout=30) as client:
+        response = await client.get(url)
+        response.raise_for_status()
+    return response.content
+
+
+async def pooled_fetch(url: str) -> bytes:
+    return (await fetch.fetch(url)).body
+
+
+async def crawl(fn, urls: list[str], concurrency: int) -> None:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(url):
+        async with slots:
+            await fn(url)
+
+    await asyncio.gather(*(one(u) for u in urls))
+
+
+def main(args):
+    StandIn.body = (b"<p>" + b"lorem ipsum dolor sit amet " * 40 + b"</p>\n") * max(1, args.kb * 1024 // 1090)
+    StandIn.connect_delay = args.connect_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    fetch._cache = fetch.HttpCache(directory=Path(tempfile.mkdtemp(prefix="vero-fetch-bench-")))
+    urls = [f"http://127.0.0.1:{server.server_port}/page/{i}" for i in range(args.pages)]
+
+    section(f"{args.pages} pages of {len(StandIn.body) / 1024:.0f} kB, {args.connect_ms:g} ms per new connection, "
+            f"{args.concurrency} in flight")
+    try:
+        for name, fn in (("legacy", legacy_fetch), ("pooled", pooled_fetch)):
+
+            async def ingest_and_refresh():
+                timings = []
+                for _ in range(2):
+                    StandIn.sent = 0
+                    started = time.perf_counter()
+                    await crawl(fn, urls, args.concurrency)
+                    timings.append((time.perf_counter() - started, StandIn.sent))
+                return timings
+
+            (first_s, first_b), (again_s, again_b) = asyncio.run(ingest_and_refresh())
+            print(f"  {name:7} ingest={first_s:6.2f}s  refresh={again_s:6.2f}s  "
+                  f"{DIM}refresh transferred {again_b / 1e6:7.1f} MB{RESET}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Web fetch benchmark")
+    parser.add_argument("--pages", type=int, default=100, help="Distinct URLs")
+    parser.add_argument("--kb", type=int, default=200, help="Body size per page")
+    parser.add_argument("--connect-ms", type=float, default=40, help="Latency added to every new connection")
+    parser.add_argument("--concurrency", type=int, default=8, help="Fetches in flight")
+    main(parser.parse_args())
@@ -22,9 +22,11 @@ async def reset_database():
         ChunkModel,
         DocumentModel,
         EmbeddingModel,
+        JobModel,
         ProjectModel,
         SessionMessageModel,
         SessionModel,
+        VectorModel,
     )
 
     logger.warning("Dropping ALL tables and recreating with latest schema...")
@@ -59,6 +61,19 @@ async def reset_database():
     else:
         logger.info("No Chroma directory found at %s", chroma_dir)
 
+    # Persisted keyword indexes are stamped per project; drop them with the tables.
+    bm25_dir = Path(__file__).parent / "data" / "bm25"
+    if bm25_dir.exists():
+        shutil.rmtree(bm25_dir, ignore_errors=True)
+        logger.info("Deleted BM25 index directory: %s", bm25_dir)
+
+    # Cached parser output and HTTP validators would otherwise outlive the documents they came from.
+    for name in ("parse_cache", "http_cache"):
+        cache_dir = Path(__file__).parent / "data" / name
+        if cache_dir.exists():
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            logger.info("Deleted cache directory: %s", cache_dir)
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,295 @@
+"""
+VERO BM25 Index Verification
+============================
+Checks the native sparse BM25 index against rank_bm25.BM25Okapi:
+identical scores (within float tolerance) and identical top-k ordering.
+
+Runs offline, no server required.
+
+Usage:
+    python tests/test_bm25_index.py
+"""
+
+import mmap
+import random
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from rank_bm25 import BM25Okapi
+
+# Add backend to path
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from app import bm25_store  # noqa: E402
+from app.bm25_index import BM25Index  # noqa: E402
+from app.retrieval import _tokenize  # noqa: E402
+
+# Professional Logging Utilities
+GREEN = "\033[32m"
+RED = "\033[31m"
+RESET = "\033[0m"
+BOLD = "\033[1m"
+DIM = "\033[2m"
+
+PASS = 0
+FAIL = 0
+
+
+def check(name: str, condition: bool, detail: str = ""):
+    global PASS, FAIL
+    if condition:
+        PASS += 1
+        print(f"  {GREEN}✓{RESET} {name}")
+    else:
+        FAIL += 1
+        print(f"  {RED}✗{RESET} {name} {DIM}({detail}){RESET}")
+
+
+def section(title: str):
+    print(f"\n{BOLD}{title.upper()}{RESET}")
+    print(f"{DIM}{'─' * 40}{RESET}")
+
+
+def reference_top_k(okapi: BM25Okapi, tokens: list[str], k: int) -> list[tuple[int, float]]:
+    """The ranking the old _keyword_search produced: stable descending sort, positives only."""
+    scored = sorted(enumerate(okapi.get_scores(tokens)), key=lambda x: x[1], reverse=True)
+    return [(i, float(s)) for i, s in scored[:k] if s > 0]
+
+
+def synthetic_corpus(n_docs: int, vocab_size: int, seed: int = 7) -> list[list[str]]:
+    rng = random.Random(seed)
+    vocab = [f"term{i}" for i in range(vocab_size)]
+    # Zipf-ish weights so some terms appear in more than half the docs (negative IDF path)
+    weights = [1.0 / (i + 1) for i in range(vocab_size)]
+    return [rng.choices(vocab, weights=weights, k=rng.randint(0, 60)) for _ in range(n_docs)]
+
+
+def run_tests():
+    # Keep persisted indexes out of backend/data
+    bm25_store._BM25_DIR = Path(tempfile.mkdtemp(prefix="vero-bm25-"))
+
+    readme = (BACKEND.parent / "README.md").read_text(encoding="utf-8")
+    paragraphs = [p for p in readme.split("\n\n") if p.strip()]
+
+    corpora = {
+        "README paragraphs": [_tokenize(p) for p in paragraphs],
+        "synthetic zipf": synthetic_corpus(3000, 400),
+        "tiny (all IDFs negative)": [["alpha", "beta"], ["alpha"], ["alpha", "gamma", "gamma"]],
+    }
+    queries = [
+        "how does VERO handle document ingestion",
+        "FastAPI SQLAlchemy SQLAlchemy",
+        "term0 term1 term7",
+        "term3 term3 term250 unknownword",
+        "alpha gamma",
+        "nothing matches here zzz",
+        "",
+    ]
+
+    for name, corpus in corpora.items():
+        section(f"Parity: {name} ({len(corpus)} docs)")
+        okapi = BM25Okapi(corpus)
+        index = BM25Index.from_corpus(corpus)
+
+        for q in queries:
+            tokens = _tokenize(q)
+            expected = okapi.get_scores(tokens)
+            actual = index.get_scores(tokens)
+            check(
+                f"scores match for {q!r}",
+                np.allclose(expected, actual, rtol=1e-9, atol=1e-12),
+                f"max diff {np.abs(expected - actual).max() if len(expected) else 0}",
+            )
+
+            for k in (1, 5, 60):
+                ref = reference_top_k(okapi, tokens, k)
+                docs, scores = index.top_k(tokens, k)
+                got = list(zip(docs.tolist(), scores.tolist()))
+                same_order = [d for d, _ in ref] == [d for d, _ in got]
+                same_scores = np.allclose([s for _, s in ref], [s for _, s in got]) if ref else not got
+                check(f"top-{k} identical for {q!r}", same_order and same_scores, f"ref={ref[:3]} got={got[:3]}")
+
+    section("Incremental add / remove")
+    corpus = synthetic_corpus(1200, 300, seed=21)
+    index = BM25Index.from_corpus(corpus[:400])
+    live = list(range(400))
+    for start in range(400, 1200, 200):
+        index, positions = index.with_documents(corpus[start:start + 200])
+        live.extend(positions.tolist())
+    removed = set(range(0, 1200, 3))
+    index = index.without_documents(sorted(removed))
+    live = [i for i in live if i not in removed]
+
+    fresh = BM25Okapi([corpus[i] for i in live])
+    for q in queries[2:4]:
+        tokens = _tokenize(q)
+        expected = fresh.get_scores(tokens)
+        actual = index.get_scores(tokens)[live]
+        check(f"segmented + tombstoned index matches fresh build for {q!r}", np.allclose(expected, actual))
+
+    compacted, remap = index.compacted()
+    check("compaction drops every tombstone", compacted.corpus_size == len(live) and len(compacted.segments) == 1)
+    check("compaction remaps live docs in order", remap[live].tolist() == list(range(len(live))))
+    for q in queries[2:4]:
+        tokens = _tokenize(q)
+        check(f"compacted index matches fresh build for {q!r}",
+              np.allclose(fresh.get_scores(tokens), compacted.get_scores(tokens)))
+
+    section("BM25Manager incremental updates")
+    from app.bm25_cache import BM25Manager
+
+    class Chunk:
+        def __init__(self, id, text):
+            self.id, self.text = id, text
+
+    manager = BM25Manager()
+    filler = [(f"f{i}", "d0", f"filler text {i}") for i in range(8)]
+    manager.build("p", 1, [("c1", "d1", "alpha beta"), ("c2", "d2", "gamma delta"), *filler], _tokenize)
+    manager.add_document("p", 2, "d3", [Chunk("c3", "alpha epsilon"), Chunk("c4", "zeta")], _tokenize)
+    entry = manager.get("p", 2)
+    check("add_document advances the cached version", entry is not None)
+    docs, _ = entry.index.top_k(["alpha"], 10)
+    check("added chunks are searchable", sorted(entry.chunk_ids[i] for i in docs) == ["c1", "c3"])
+
+    manager.add_document("p", 3, "d3", [Chunk("c5", "alpha eta")], _tokenize)
+    entry = manager.get("p", 3)
+    docs, _ = entry.index.top_k(["alpha", "zeta"], 10)
+    check("re-adding a document replaces its old chunks", sorted(entry.chunk_ids[i] for i in docs) == ["c1", "c5"])
+
+    manager.remove_document("p", 4, "d1")
+    entry = manager.get("p", 4)
+    docs, _ = entry.index.top_k(["alpha"], 10)
+    check("remove_document tombstones its chunks", [entry.chunk_ids[i] for i in docs] == ["c5"])
+    manager.remove_document("p", 5, "d0")
+    entry = manager.get("p", 5)
+    check("heavy deletion triggers compaction", entry.index.corpus_size == entry.index.live_count == 2,
+          f"{entry.index.live_count}/{entry.index.corpus_size}")
+    check("compacted entry keeps chunk ids aligned", entry.chunk_ids == ["c2", "c5"], f"{entry.chunk_ids}")
+
+    manager.remove_document("p", 9, "d2")
+    check("a version gap drops the entry for a lazy rebuild", manager.get("p", 9) is None and manager.get("p", 4) is None)
+
+    section("Persistence (memory-mapped files)")
+    rows = [(f"c{i}", f"d{i % 7}", " ".join(doc)) for i, doc in enumerate(synthetic_corpus(500, 200, seed=5))]
+    built = BM25Manager().build("disk", 3, rows, _tokenize)
+    check("build writes the index file", bm25_store.index_path("disk").exists())
+
+    restarted = BM25Manager()
+    check("a stale stamp is ignored", restarted.load("disk", 4) is None)
+
+    opened = []
+
+    class TrackedMap(mmap.mmap):
+        def __init__(self, *args, **kwargs):
+            opened.append(self)
+
+    data = bm25_store.index_path("disk").read_bytes()
+    bm25_store.index_path("truncated").write_bytes(data[:len(data) // 2])
+    bm25_store.index_path("foreign").write_bytes(b"NOPE" + data[4:])
+    bm25_store.mmap = SimpleNamespace(mmap=TrackedMap, ACCESS_READ=mmap.ACCESS_READ)
+    try:
+        rejected = [bm25_store.load_index(*args) for args in (("disk", 4), ("truncated", 3), ("foreign", 3))]
+    finally:
+        bm25_store.mmap = mmap
+    check("stale, unreadable and foreign files are rejected", rejected == [None, None, None], str(rejected))
+    check("their mappings are closed", len(opened) == 3 and all(m.closed for m in opened),
+          str([m.closed for m in opened]))
+    mapped = restarted.load("disk", 3)
+    check("the matching stamp is mapped back", mapped is not None)
+    check("mapped chunk ids and doc rows round-trip",
+          list(mapped.chunk_ids) == built.chunk_ids and mapped.doc_rows == built.doc_rows)
+    for q in queries[2:4]:
+        tokens = _tokenize(q)
+        check(f"mapped index scores like the built one for {q!r}",
+              np.allclose(built.index.get_scores(tokens), mapped.index.get_scores(tokens)))
+        check(f"mapped index ranks like the built one for {q!r}",
+              built.index.top_k(tokens, 20)[0].tolist() == mapped.index.top_k(tokens, 20)[0].tolist())
+
+    restarted = BM25Manager()
+    restarted.add_document("disk", 4, "d1", [Chunk("new", "term3 brandnewterm")], _tokenize)
+    entry = restarted.get("disk", 4)
+    check("an update after restart applies on top of the file", entry is not None)
+    docs, _ = entry.index.top_k(["brandnewterm"], 5)
+    check("terms added on top of a mapped vocab are searchable", [entry.chunk_ids[i] for i in docs] == ["new"])
+    restarted.flush()
+    reloaded = BM25Manager().load("disk", 4)
+    check("flush persists incremental updates", reloaded is not None and "new" in list(reloaded.chunk_ids))
+    check("flushed file scores like the live entry",
+          np.allclose(sorted(entry.index.get_scores(["term3"])[entry.index.live]),
+                      sorted(reloaded.index.get_scores(["term3"]))))
+    restarted.invalidate("disk")
+    check("invalidate removes the file", not bm25_store.index_path("disk").exists())
+
+    section("BM25Manager memory budget and single-flight builds")
+    import threading
+    import time
+
+    def project_rows(n):
+        return [(f"c{i}", f"d{i % 5}", " ".join(doc)) for i, doc in enumerate(synthetic_corpus(n, 150, seed=n))]
+
+    probe = BM25Manager()
+    one_entry = probe.build("probe", 1, project_rows(300), _tokenize).nbytes
+    check("entries report their heap size", one_entry > 0 and probe.stats()["bytes"] == one_entry)
+
+    lru = BM25Manager(max_bytes=int(one_entry * 2.5))
+    for name in ("a", "b", "c"):
+        lru.build(name, 1, project_rows(300), _tokenize)
+    check("LRU keeps the cache within budget", lru.stats()["bytes"] <= lru.max_bytes, f"{lru.stats()}")
+    check("the least recently used project is evicted", lru.stats()["evictions"] == 1)
+    check("evicted project misses, recent ones hit",
+          lru.get("a", 1) is None and lru.get("c", 1) is not None and lru.get("b", 1) is not None)
+    lru.build("d", 1, project_rows(300), _tokenize)
+    check("a lookup refreshes recency", lru.get("b", 1) is not None and lru.get("c", 1) is None)
+    check("an evicted project maps back from disk", lru.load("a", 1) is not None)
+    stats = lru.stats()
+    check("stats count hits, misses, builds and disk loads",
+          stats["hits"] == 3 and stats["misses"] == 2 and stats["builds"] == 4 and stats["disk_loads"] == 1,
+          f"{stats}")
+
+    flight = BM25Manager()
+    slow_rows_started = threading.Event()
+
+    def slow_rows():
+        slow_rows_started.set()
+        time.sleep(0.2)
+        yield from project_rows(200)
+
+    results = []
+    builders = [threading.Thread(target=lambda: results.append(flight.build("big", 1, slow_rows(), _tokenize)))]
+    builders[0].start()
+    slow_rows_started.wait()
+    builders += [threading.Thread(target=lambda: results.append(flight.build("big", 1, slow_rows(), _tokenize)))
+                 for _ in range(3)]
+    small_started = time.perf_counter()
+    flight.build("small", 1, project_rows(20), _tokenize)
+    small_elapsed = time.perf_counter() - small_started
+    for t in builders[1:]:
+        t.start()
+    for t in builders:
+        t.join()
+    check("concurrent builds of one project run once", flight.stats()["builds"] == 2 and len(results) == 4)
+    check("waiters reuse the first build", all(r is results[0] for r in results))
+    check("another project's build is not blocked by a large rebuild", small_elapsed < 0.15, f"{small_elapsed:.3f}s")
+
+    section("Edge cases")
+    empty = BM25Index.from_corpus([])
+    check("empty corpus scores nothing", empty.top_k(["a"], 5)[0].size == 0)
+    blank = BM25Index.from_corpus([[], []])
+    check("corpus of empty docs scores nothing", blank.top_k(["a"], 5)[0].size == 0)
+    ties = BM25Index.from_corpus([["x", "y"], ["y", "w"], ["x", "y"], ["z", "w"], ["q", "r"], ["x", "y"], ["s", "t"]])
+    docs, _ = ties.top_k(["x"], 2)
+    check("ties at the k boundary keep the lowest doc indices", docs.tolist() == [0, 2], f"got {docs.tolist()}")
+
+    section("RESULTS")
+    total = PASS + FAIL
+    color = GREEN if FAIL == 0 else RED
+    print(f"\n  {color}Report: {PASS}/{total} assertions passed{RESET}\n")
+    sys.exit(0 if FAIL == 0 else 1)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,155 @@
+"""
+VERO Embedding Scheduler Verification
+=====================================
+Checks the micro-batching scheduler in front of the embedding model:
+per-caller results, coalescing, slicing of large requests, query priority
+and error delivery. Uses a deterministic encode function in place of the
+transformer, so it runs offline in well under a second.
+
+Usage:
+    python tests/test_embedding_scheduler.py
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from app.embeddings.scheduler import EmbeddingScheduler, approx_tokens, length_buckets  # noqa: E402
+
+# Professional Logging Utilities
+GREEN = "\033[32m"
+RED = "\033[31m"
+RESET = "\033[0m"
+BOLD = "\033[1m"
+DIM = "\033[2m"
+
+PASS = 0
+FAIL = 0
+
+
+def check(name: str, condition: bool, detail: str = ""):
+    global PASS, FAIL
+    if condition:
+        PASS += 1
+        print(f"  {GREEN}✓{RESET} {name}")
+    else:
+        FAIL += 1
+        print(f"  {RED}✗{RESET} {name} {DIM}({detail}){RESET}")
+
+
+def section(title: str):
+    print(f"\n{BOLD}{title.upper()}{RESET}")
+    print(f"{DIM}{'─' * 40}{RESET}")
+
+
+def vector_for(text: str) -> np.ndarray:
+    """Deterministic 4-d vector per text, so results can be checked per caller."""
+    return np.array([len(text), sum(map(ord, text)) % 997, text.count("a"), 1.0], dtype=np.float32)
+
+
+class RecordingEncoder:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches: list[list[str]] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        with self.lock:
+            self.batches.append(list(texts))
+        time.sleep(self.delay)
+        return np.stack([vector_for(t) for t in texts])
+
+
+def run_tests():
+    section("Per-caller results and coalescing")
+    encoder = RecordingEncoder(delay=0.005)
+    scheduler = EmbeddingScheduler(encoder, max_batch=32, max_wait_ms=5, name="test")
+    texts = [f"query number {i} about a topic" for i in range(64)]
+    with ThreadPoolExecutor(max_workers=64) as pool:
+        results = list(pool.map(lambda t: scheduler.embed([t], interactive=True), texts))
+    check("every caller gets its own vector",
+          all(np.array_equal(r[0], vector_for(t)) for r, t in zip(results, texts)))
+    check("64 concurrent calls are coalesced into fewer encode calls",
+          len(encoder.batches) < 64, f"{len(encoder.batches)} batches")
+    check("no batch exceeds max_batch", max(len(b) for b in encoder.batches) <= 32)
+    check("results are float32 arrays", all(r.dtype == np.float32 and r.shape == (1, 4) for r in results))
+
+    section("Large requests are sliced")
+    encoder.batches.clear()
+    doc = [f"chunk {i}" for i in range(100)]
+    vectors = scheduler.embed(doc)
+    check("100 texts come back in order", np.array_equal(vectors, np.stack([vector_for(t) for t in doc])))
+    check("the request is split into max_batch slices", [len(b) for b in encoder.batches] == [32, 32, 32, 4],
+          f"{[len(b) for b in encoder.batches]}")
+    check("empty request resolves immediately", scheduler.embed([]).shape[0] == 0)
+
+    section("Ingestion is length-bucketed")
+    buckets = length_buckets([5, 100, 6, 90, 7, 95], max_batch=4, max_tokens=200)
+    check("buckets group similar lengths", [sorted(b.tolist()) for b in buckets] == [[0, 2, 4], [3, 5], [1]],
+          f"{[b.tolist() for b in buckets]}")
+    mixed = [("word " * (400 if i % 3 == 0 else 10)) + str(i) for i in range(60)]
+    budget = 2048
+    bucketed = EmbeddingScheduler(RecordingEncoder(), max_batch=32, max_wait_ms=1, name="buckets",
+                                  max_batch_tokens=budget)
+    vectors = bucketed.embed(mixed)
+    check("bucketed results come back in the original order",
+          np.array_equal(vectors, np.stack([vector_for(t) for t in mixed])))
+    batches = bucketed._encode.batches
+    padded = [len(b) * max(approx_tokens(t) for t in b) for b in batches]
+    check("every batch stays within the padded-token budget",
+          all(p <= budget or len(b) == 1 for p, b in zip(padded, batches)), f"{padded}")
+    check("no batch mixes short fragments with long chunks",
+          all(len({approx_tokens(t) > 100 for t in b}) == 1 for b in batches))
+    bucketed.embed(["a longer query", "q"], interactive=True)
+    check("queries are encoded as given", list(batches[-1]) == ["a longer query", "q"], f"{batches[-1]}")
+    bucketed.shutdown()
+
+    section("Queries jump ahead of ingestion")
+    slow = RecordingEncoder(delay=0.02)
+    prio = EmbeddingScheduler(slow, max_batch=8, max_wait_ms=1, name="prio")
+    ingest = prio.submit([f"doc chunk {i}" for i in range(80)])
+    time.sleep(0.03)  # Let the first ingestion slice start
+    query = prio.submit(["what is vero"], interactive=True)
+    query.result(timeout=5)
+    ingest.result(timeout=5)
+    position = next(i for i, b in enumerate(slow.batches) if "what is vero" in b)
+    check("the query is encoded before the remaining ingestion slices",
+          position < len(slow.batches) - 2, f"query in batch {position} of {len(slow.batches)}")
+
+    section("Errors reach every caller")
+
+    def broken(texts):
+        raise ValueError("model exploded")
+
+    failing = EmbeddingScheduler(broken, max_batch=8, max_wait_ms=5, name="broken")
+    futures = [failing.submit([f"t{i}"], interactive=True) for i in range(4)]
+    errors = [f.exception(timeout=5) for f in futures]
+    check("each future carries the encode error", all(isinstance(e, ValueError) for e in errors))
+
+    section("Shutdown")
+    for s in (scheduler, prio, failing):
+        s.shutdown()
+    check("workers exit", not any(s._worker.is_alive() for s in (scheduler, prio, failing)))
+    try:
+        scheduler.submit(["late"])
+        check("submit after shutdown is rejected", False)
+    except RuntimeError:
+        check("submit after shutdown is rejected", True)
+
+    section("RESULTS")
+    total = PASS + FAIL
+    color = GREEN if FAIL == 0 else RED
+    print(f"\n  {color}Report: {PASS}/{total} assertions passed{RESET}\n")
+    sys.exit(0 if FAIL == 0 else 1)
+
+
+if __name__ == "__main__":
+    run_tests()
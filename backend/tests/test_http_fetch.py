@@ -0,0 +1,253 @@
+"""
+VERO HTTP Fetch Verification
+============================
+Checks the pooled fetch layer against a local HTTP/1.1 stand-in server: one
+kept-alive connection serves repeated fetches, concurrent requests to a host
+stay within VERO_HTTP_PER_HOST, clients are closed with the parse or loop
+they belong to, ETag and Last-Modified responses are
+revalidated into 304s served from the on-disk cache with unchanged validators
+(so the parse cache skips re-parsing), changed pages are downloaded again,
+no-store and validator-less responses are never kept, the cache evicts least
+recently used entries, and the repository HEAD lookup is revalidated too.
+Runs offline in a throwaway cache directory.
+
+Usage:
+    python tests/test_http_fetch.py
+"""
+
+import asyncio
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add backend to path
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+import httpx  # noqa: E402
+
+from app.parsers import fetch, repo, web  # noqa: E402
+from app.parsers.fetch import FetchedPage, HttpCache  # noqa: E402
+
+# Professional Logging Utilities
+GREEN = "\033[32m"
+RED = "\033[31m"
+RESET = "\033[0m"
+BOLD = "\033[1m"
+DIM = "\033[2m"
+
+PASS = 0
+FAIL = 0
+
+COMMIT = "89abcdef0123456789abcdef0123456789abcdef"
+
+
+def check(name: str, condition: bool, detail: str = ""):
+    global PASS, FAIL
+    if condition:
+        PASS += 1
+        print(f"  {GREEN}✓{RESET} {name}")
+    else:
+        FAIL += 1
+        print(f"  {RED}✗{RESET} {name} {DIM}({detail}){RESET}")
+
+
+def section(title: str):
+    print(f"\n{BOLD}{title.upper()}{RESET}")
+    print(f"{DIM}{'─' * 40}{RESET}")
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """Pages with an ETag, a Last-Modified date, no-store, no validator; a slow path; the commits API."""
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse is visible
+    version = 1
+    connections = 0
+    log: list[tuple[str, int, dict]] = []
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with StandIn.lock:
+            StandIn.connections += 1
+
+    def do_GET(self):
+        conditional = {k: v for k, v in self.headers.items() if k.lower().startswith("if-")}
+        status, headers, body = self._route()
+        StandIn.log.append((self.path, status, conditional))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self) -> tuple[int, dict, bytes]:
+        html = f"<html><head><title>Doc v{StandIn.version}</title></head><body><p>Version {StandIn.version}</p></body></html>"
+        if self.path == "/etag":
+            etag = f'"v{StandIn.version}"'
+            if self.headers.get("If-None-Match") == etag:
+                return 304, {"ETag": etag}, b""
+            return 200, {"ETag": etag, "Content-Type": "text/html; charset=utf-8"}, html.encode()
+        if self.path == "/dated":
+            stamp = "Mon, 05 Oct 2026 10:00:00 GMT"
+            if self.headers.get("If-Modified-Since") == stamp:
+                return 304, {}, b""
+            return 200, {"Last-Modified": stamp}, html.encode()
+        if self.path == "/private":
+            return 200, {"ETag": '"p"', "Cache-Control": "private, no-store"}, html.encode()
+        if self.path == "/plain":
+            return 200, {}, html.encode()
+        if self.path.startswith("/slow"):
+            with StandIn.lock:
+                StandIn.active += 1
+                StandIn.max_active = max(StandIn.max_active, StandIn.active)
+            time.sleep(0.05)
+            with StandIn.lock:
+                StandIn.active -= 1
+            return 200, {}, b"slow"
+        if self.path == "/repos/acme/widgets/commits/HEAD":
+            if self.headers.get("If-None-Match") == '"c1"':
+                return 304, {"ETag": '"c1"'}, b""
+            return 200, {"ETag": '"c1"'}, COMMIT.encode()
+        return 404, {}, b""
+
+
+def conditional_for(path: str) -> list[dict]:
+    return [c for p, _, c in StandIn.log if p == path]
+
+
+def run_tests():
+    print(f"\n{BOLD}VERO HTTP FETCH VERIFICATION{RESET}")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    fetch._cache = HttpCache(directory=Path(tempfile.mkdtemp(prefix="vero-http-cache-")))
+
+    try:
+        section("Pooled client")
+
+        async def sequential():
+            return [await fetch.fetch(f"{base}/plain") for _ in range(10)]
+
+        StandIn.connections = 0
+        pages = asyncio.run(sequential())
+        check("repeated fetches share one connection", StandIn.connections == 1, str(StandIn.connections))
+        check("bodies are returned", all(p.status == 200 and b"Version 1" in p.body for p in pages))
+
+        async def concurrent():
+            return await asyncio.gather(*(fetch.fetch(f"{base}/slow/{i}") for i in range(12)))
+
+        original = fetch.PER_HOST
+        fetch.PER_HOST = 2
+        try:
+            asyncio.run(concurrent())
+        finally:
+            fetch.PER_HOST = original
+        check("concurrent requests per host stay within the limit", 1 <= StandIn.max_active <= 2,
+              str(StandIn.max_active))
+
+        async def one_parse():
+            await fetch.fetch(f"{base}/plain")
+            client = fetch._async.client
+            await fetch.close_loop_client()
+            return client
+
+        client = asyncio.run(one_parse())
+        check("a parse worker's client is closed with its loop", client.is_closed and fetch._async is None)
+
+        other = asyncio.new_event_loop()
+        serving = threading.Thread(target=other.run_forever, daemon=True)
+        serving.start()
+        try:
+            asyncio.run_coroutine_threadsafe(fetch.fetch(f"{base}/plain"), other).result(timeout=10)
+            stale = fetch._async.client
+            asyncio.run(fetch.fetch(f"{base}/plain"))
+            time.sleep(0.1)  # aclose() runs on the other loop
+            check("a client replaced by another loop's is closed", stale.is_closed)
+        finally:
+            other.call_soon_threadsafe(other.stop)
+            serving.join(timeout=5)
+            other.close()
+
+        section("ETag revalidation")
+        first = asyncio.run(web.fetch_web(f"{base}/etag"))
+        second = asyncio.run(web.fetch_web(f"{base}/etag"))
+        check("the first fetch downloads the page", not first.not_modified and first.etag == '"v1"')
+        check("the next fetch sends If-None-Match", conditional_for("/etag")[-1].get("If-None-Match") == '"v1"',
+              str(conditional_for("/etag")))
+        check("a 304 is served from the cache", second.not_modified and second.body == first.body
+              and StandIn.log[-1][1] == 304)
+        check("the validator is unchanged, so the parse cache key is too", second.validator == first.validator)
+        check("the encoding survives the cache", second.encoding == first.encoding, f"{second.encoding}")
+        StandIn.version = 2
+        changed = asyncio.run(web.fetch_web(f"{base}/etag"))
+        check("a changed page is downloaded again", not changed.not_modified and b"Version 2" in changed.body
+              and changed.etag == '"v2"')
+        again = asyncio.run(web.fetch_web(f"{base}/etag"))
+        check("the new version replaces the cached one", again.not_modified and b"Version 2" in again.body)
+
+        section("Last-Modified revalidation")
+        asyncio.run(fetch.fetch(f"{base}/dated"))
+        dated = asyncio.run(fetch.fetch(f"{base}/dated"))
+        check("If-Modified-Since earns a 304", dated.not_modified and b"Version 2" in dated.body
+              and "If-Modified-Since" in conditional_for("/dated")[-1], str(conditional_for("/dated")))
+
+        section("Uncacheable responses")
+        for _ in range(2):
+            asyncio.run(fetch.fetch(f"{base}/private"))
+            asyncio.run(fetch.fetch(f"{base}/plain"))
+        check("no-store responses are never revalidated", conditional_for("/private") == [{}, {}])
+        check("responses without validators are never revalidated", all(c == {} for c in conditional_for("/plain")))
+        bypass = asyncio.run(fetch.fetch(f"{base}/etag", use_cache=False))
+        check("use_cache=False downloads the full body", not bypass.not_modified and StandIn.log[-1][2] == {})
+        try:
+            asyncio.run(web.fetch_web(f"{base}/missing"))
+            check("fetch_web raises on error statuses", False, "no error")
+        except httpx.HTTPStatusError as e:
+            check("fetch_web raises on error statuses", "404" in str(e), str(e))
+
+        section("Repository HEAD lookup")
+        original = repo._API_BASE
+        repo._API_BASE = base
+        try:
+            commits = [asyncio.run(repo.resolve_commit("https://github.com/acme/widgets")) for _ in range(2)]
+        finally:
+            repo._API_BASE = original
+        check("the HEAD commit resolves", commits == [COMMIT, COMMIT], str(commits))
+        check("the second lookup is a 304", [s for p, s, _ in StandIn.log if "commits" in p] == [200, 304])
+
+        section("Disk budget")
+        stats = fetch.get_http_cache().stats()
+        check("revalidations and downloads are counted", stats["revalidated"] == 4 and stats["downloads"] >= 20,
+              str(stats))
+        small = HttpCache(directory=Path(tempfile.mkdtemp(prefix="vero-http-lru-")), max_bytes=3500)
+        page = FetchedPage(body=random.Random(0).randbytes(1000), encoding=None, etag='"x"')  # ~1.1 kB compressed
+        for i in range(3):
+            small.put(f"u{i}", page)
+            time.sleep(0.01)
+        small.touch("u0")  # u0 becomes most recently used
+        time.sleep(0.01)
+        small.put("u3", page)
+        present = [small.get(f"u{i}") is not None for i in range(4)]
+        check("least recently used entries are evicted", present == [True, False, True, True], str(present))
+    finally:
+        server.shutdown()
+
+    section("RESULTS")
+    total = PASS + FAIL
+    color = GREEN if FAIL == 0 else RED
+    print(f"\n  {color}Report: {PASS}/{total} assertions passed{RESET}\n")
+    sys.exit(0 if FAIL == 0 else 1)
+
+
+if __name__ == "__main__":
+    run_tests()
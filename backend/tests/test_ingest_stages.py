@@ -0,0 +1,159 @@
+"""
+VERO Staged Ingestion Verification
+==================================
+Checks the per-stage worker pools in front of the ingestion pipeline: every
+document visits the stages in order, stages overlap across documents, queues
+stay bounded, a finished document skips the remaining stages, stage errors
+reach the submitter, and per-stage stats add up. Stages are stubs with fixed
+delays, so no database, parser or model is involved.
+
+Usage:
+    python tests/test_ingest_stages.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from app.stages import IngestEngine  # noqa: E402
+
+# Professional Logging Utilities
+GREEN = "\033[32m"
+RED = "\033[31m"
+RESET = "\033[0m"
+BOLD = "\033[1m"
+DIM = "\033[2m"
+
+PASS = 0
+FAIL = 0
+
+STAGES = ("parse", "summary", "chunk", "embed")
+DELAY = 0.05
+
+
+def check(name: str, condition: bool, detail: str = ""):
+    global PASS, FAIL
+    if condition:
+        PASS += 1
+        print(f"  {GREEN}✓{RESET} {name}")
+    else:
+        FAIL += 1
+        print(f"  {RED}✗{RESET} {name} {DIM}({detail}){RESET}")
+
+
+def section(title: str):
+    print(f"\n{BOLD}{title.upper()}{RESET}")
+    print(f"{DIM}{'─' * 40}{RESET}")
+
+
+class StubStages:
+    """Records (stage, doc, start, end) for every call; can fail or stop a document early."""
+
+    def __init__(self, fail: dict | None = None, stop_after: dict | None = None):
+        self.calls: list[tuple[str, str, float, float]] = []
+        self.fail = fail or {}
+        self.stop_after = stop_after or {}
+
+    async def __call__(self, stage, doc_id, filepath=None, url=None, ingest_type="file"):
+        started = time.perf_counter()
+        await asyncio.sleep(DELAY)
+        self.calls.append((stage, doc_id, started, time.perf_counter()))
+        if self.fail.get(doc_id) == stage:
+            raise RuntimeError(f"{stage} failed for {doc_id}")
+        return self.stop_after.get(doc_id) != stage
+
+
+async def run_tests():
+    print(f"\n{BOLD}VERO STAGED INGESTION VERIFICATION{RESET}")
+    one_each = {s: 1 for s in STAGES}
+
+    section("Stage order and overlap")
+    stub = StubStages()
+    engine = IngestEngine(stages=STAGES, workers=one_each, queue_depth=4, stage_fn=stub)
+    engine.start()
+    docs = [f"d{i}" for i in range(6)]
+    started = time.perf_counter()
+    await asyncio.gather(*(engine.run(d) for d in docs))
+    elapsed = time.perf_counter() - started
+    per_doc = {d: [c[0] for c in stub.calls if c[1] == d] for d in docs}
+    check("every document visits every stage in order", all(v == list(STAGES) for v in per_doc.values()))
+    sequential = len(docs) * len(STAGES) * DELAY
+    check("stages overlap across documents", elapsed < sequential * 0.6,
+          f"{elapsed:.2f}s vs {sequential:.2f}s sequential")
+    overlapping = any(
+        a[0] != b[0] and a[1] != b[1] and a[2] < b[3] and b[2] < a[3]
+        for a in stub.calls for b in stub.calls
+    )
+    check("different stages run at the same time", overlapping)
+    await engine.stop()
+
+    section("Bounded queues")
+    stub = StubStages()
+    engine = IngestEngine(stages=STAGES, workers=one_each, queue_depth=2, stage_fn=stub)
+    engine.start()
+    peak = 0
+
+    async def watch():
+        nonlocal peak
+        while True:
+            peak = max(peak, max(s["queued"] for s in engine.stats()))
+            await asyncio.sleep(0.005)
+
+    watcher = asyncio.create_task(watch())
+    await asyncio.gather(*(engine.run(f"b{i}") for i in range(20)))
+    watcher.cancel()
+    check("no stage queue exceeds its depth", peak <= 2, f"peak={peak}")
+    await engine.stop()
+
+    section("Early exit and errors")
+    stub = StubStages(fail={"bad": "chunk"}, stop_after={"dup": "parse"})
+    engine = IngestEngine(stages=STAGES, workers={s: 2 for s in STAGES}, queue_depth=4, stage_fn=stub)
+    engine.start()
+    results = await asyncio.gather(engine.run("dup"), engine.run("bad"), engine.run("ok"),
+                                   return_exceptions=True)
+    check("a finished document skips the remaining stages",
+          [c[0] for c in stub.calls if c[1] == "dup"] == ["parse"])
+    check("a stage error reaches the submitter",
+          isinstance(results[1], RuntimeError) and "chunk failed" in str(results[1]))
+    check("a failed document stops at the failing stage",
+          [c[0] for c in stub.calls if c[1] == "bad"] == ["parse", "summary", "chunk"])
+    check("other documents are unaffected", results[2] is None and results[0] is None)
+
+    section("Stats")
+    stats = {s["stage"]: s for s in engine.stats()}
+    check("every stage is reported", list(stats) == list(STAGES))
+    check("processed and failed counts add up",
+          stats["parse"]["processed"] == 3 and stats["chunk"]["failed"] == 1
+          and stats["embed"]["processed"] == 1, str(stats))
+    check("workers and queue limits are reported",
+          all(s["workers"] == 2 and s["max_queued"] == 4 for s in stats.values()))
+    check("throughput and timings are measured",
+          stats["parse"]["per_minute"] > 0 and stats["parse"]["avg_seconds"] >= DELAY * 0.9)
+    check("nothing left queued or busy", all(s["queued"] == 0 and s["busy"] == 0 for s in stats.values()))
+
+    section("Cancellation")
+    stub = StubStages()
+    engine = IngestEngine(stages=STAGES, workers=one_each, queue_depth=4, stage_fn=stub)
+    engine.start()
+    task = asyncio.create_task(engine.run("gone"))
+    await asyncio.sleep(DELAY * 1.5)
+    task.cancel()
+    await asyncio.sleep(DELAY * 4)
+    visited = [c[0] for c in stub.calls if c[1] == "gone"]
+    check("a cancelled document stops after its current stage", len(visited) <= 2, str(visited))
+    await engine.stop()
+
+    section("RESULTS")
+    total = PASS + FAIL
+    color = GREEN if FAIL == 0 else RED
+    print(f"\n  {color}Report: {PASS}/{total} assertions passed{RESET}\n")
+    sys.exit(0 if FAIL == 0 else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
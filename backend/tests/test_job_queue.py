@@ -0,0 +1,248 @@
+"""
+VERO Ingestion Job Queue Verification
+=====================================
+Checks the durable job queue on a throwaway SQLite database: enqueue and
+claim, exactly-once claiming under contention, retries with backoff, final
+failure, lease heartbeats, recovery of orphaned jobs and stranded documents,
+and requeueing on worker shutdown. Jobs run a stub pipeline, so no models or
+parsers are needed.
+
+Usage:
+    python tests/test_job_queue.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+# Add backend to path
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+# Point the app at a scratch database before it creates its engine
+_TMP = tempfile.mkdtemp(prefix="vero-test-")
+os.environ["VERO_DATABASE_URL"] = f"sqlite+aiosqlite:///{_TMP}/jobs.db"
+os.environ["VERO_JOB_RETRY_SECONDS"] = "0"
+
+from sqlalchemy import delete, select, update  # noqa: E402
+
+from app import jobs  # noqa: E402
+from app.database import async_session, init_db  # noqa: E402
+from app.models import DocumentModel, JobModel, ProjectModel  # noqa: E402
+
+# Professional Logging Utilities
+GREEN = "\033[32m"
+RED = "\033[31m"
+RESET = "\033[0m"
+BOLD = "\033[1m"
+DIM = "\033[2m"
+
+PASS = 0
+FAIL = 0
+
+
+def check(name: str, condition: bool, detail: str = ""):
+    global PASS, FAIL
+    if condition:
+        PASS += 1
+        print(f"  {GREEN}✓{RESET} {name}")
+    else:
+        FAIL += 1
+        print(f"  {RED}✗{RESET} {name} {DIM}({detail}){RESET}")
+
+
+def section(title: str):
+    print(f"\n{BOLD}{title.upper()}{RESET}")
+    print(f"{DIM}{'─' * 40}{RESET}")
+
+
+async def reset() -> str:
+    async with async_session() as db:
+        await db.execute(delete(JobModel))
+        await db.execute(delete(DocumentModel))
+        await db.execute(delete(ProjectModel))
+        project = ProjectModel(name="jobs")
+        db.add(project)
+        await db.commit()
+        return project.id
+
+
+async def add_document(project_id: str, n: int, status: str = "parsing", source_type: str = "text",
+                       queue: bool = True, filepath: str | None = None) -> str:
+    async with async_session() as db:
+        doc = DocumentModel(project_id=project_id, source_type=source_type, title=f"doc {n}",
+                            content_hash=f"pending_{n}", processing_status=status,
+                            source_url="https://example.com" if source_type == "web" else None)
+        db.add(doc)
+        if queue:
+            await jobs.enqueue_job(db, doc, "file", filepath=filepath)
+        await db.commit()
+        return doc.id
+
+
+async def job_for(doc_id: str) -> JobModel:
+    async with async_session() as db:
+        return await db.scalar(select(JobModel).where(JobModel.doc_id == doc_id))
+
+
+async def doc_status(doc_id: str) -> str:
+    async with async_session() as db:
+        return (await db.get(DocumentModel, doc_id)).processing_status
+
+
+async def wait_until(predicate, timeout: float = 5.0) -> bool:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        if await predicate():
+            return True
+        await asyncio.sleep(0.02)
+    return False
+
+
+async def run_tests():
+    print(f"\n{BOLD}VERO INGESTION JOB QUEUE VERIFICATION{RESET}")
+    await init_db()
+
+    section("Enqueue and claim")
+    project_id = await reset()
+    doc_ids = [await add_document(project_id, i) for i in range(3)]
+    job = await jobs.claim_job("tester")
+    check("oldest job is claimed first", job is not None and job.doc_id == doc_ids[0])
+    check("claim starts an attempt and takes the lease",
+          job.state == "running" and job.attempts == 1 and job.lease_owner == "tester" and job.lease_expires_at)
+    check("heartbeat renews an owned lease", await jobs.heartbeat(job.id, "tester"))
+    check("heartbeat from another owner is refused", not await jobs.heartbeat(job.id, "intruder"))
+
+    section("Exactly-once claiming")
+    project_id = await reset()
+    for i in range(20):
+        await add_document(project_id, i)
+    claims = await asyncio.gather(*(jobs.claim_job(f"slot-{i}") for i in range(30)))
+    claimed = [c.id for c in claims if c is not None]
+    check("20 jobs claimed by 30 racing slots", len(claimed) == 20, f"{len(claimed)}")
+    check("no job claimed twice", len(set(claimed)) == len(claimed))
+
+    section("Worker runs jobs")
+    project_id = await reset()
+    seen: list[str] = []
+
+    async def ok_runner(job):
+        seen.append(job.doc_id)
+
+    doc_ids = [await add_document(project_id, i) for i in range(5)]
+    worker = jobs.JobWorker(concurrency=2, lease_seconds=5, poll_seconds=0.05, runner=ok_runner)
+    await worker.start()
+
+    async def all_done():
+        return all([(await job_for(d)).state == "done" for d in doc_ids])
+
+    check("every job reaches done", await wait_until(all_done))
+    check("each document ran exactly once", sorted(seen) == sorted(doc_ids))
+    await worker.stop()
+
+    section("Retries and final failure")
+    project_id = await reset()
+    calls: dict[str, int] = {}
+    upload = Path(_TMP) / "upload.txt"
+    upload.write_text("payload")
+
+    async def flaky_runner(job):
+        calls[job.doc_id] = calls.get(job.doc_id, 0) + 1
+        if job.doc_id == broken_id or calls[job.doc_id] < 2:
+            raise RuntimeError("parser crashed")
+
+    flaky_id = await add_document(project_id, 1)
+    broken_id = await add_document(project_id, 2, filepath=str(upload))
+    worker = jobs.JobWorker(concurrency=2, lease_seconds=5, poll_seconds=0.05, runner=flaky_runner)
+    await worker.start()
+
+    async def settled():
+        states = {(await job_for(d)).state for d in (flaky_id, broken_id)}
+        return states <= {"done", "failed"}
+
+    check("jobs settle", await wait_until(settled))
+    flaky, broken = await job_for(flaky_id), await job_for(broken_id)
+    check("a transient failure is retried to done", flaky.state == "done" and flaky.attempts == 2,
+          f"{flaky.state}/{flaky.attempts}")
+    check("a persistent failure stops at max_attempts", broken.state == "failed"
+          and calls[broken_id] == broken.max_attempts, f"{calls[broken_id]}")
+    check("the last error is recorded", "parser crashed" in (broken.last_error or ""))
+    check("the document is marked failed", await doc_status(broken_id) == "failed")
+    check("the upload is removed after the final failure", not upload.exists())
+    await worker.stop()
+
+    section("Orphan recovery")
+    project_id = await reset()
+    orphan_id = await add_document(project_id, 1)
+    spent_id = await add_document(project_id, 2)
+    for _ in (orphan_id, spent_id):
+        await jobs.claim_job("crashed-worker")
+    async with async_session() as db:
+        past = jobs._utcnow() - timedelta(minutes=5)
+        await db.execute(update(JobModel).values(lease_expires_at=past))
+        await db.execute(update(JobModel).where(JobModel.doc_id == spent_id).values(attempts=3))
+        await db.commit()
+    stranded_text = await add_document(project_id, 3, status="embedding", queue=False)
+    stranded_web = await add_document(project_id, 4, source_type="web", queue=False)
+    stranded_upload = await add_document(project_id, 5, queue=False)
+    await jobs.recover_orphans()
+
+    orphan, spent = await job_for(orphan_id), await job_for(spent_id)
+    check("an expired lease goes back to the queue", orphan.state == "queued" and orphan.lease_owner is None)
+    check("an expired job out of attempts fails", spent.state == "failed")
+    check("its document is marked failed", await doc_status(spent_id) == "failed")
+    check("a document stuck past parsing is adopted", (await job_for(stranded_text)).state == "queued")
+    web_job = await job_for(stranded_web)
+    check("a stranded web document is re-queued from its URL",
+          web_job.state == "queued" and web_job.ingest_type == "url" and web_job.url == "https://example.com")
+    check("an unparsed upload without its file is failed",
+          await job_for(stranded_upload) is None and await doc_status(stranded_upload) == "failed")
+
+    section("Lease loss and shutdown")
+    project_id = await reset()
+    started = asyncio.Event()
+    cancelled: list[str] = []
+
+    async def slow_runner(job):
+        started.set()
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(job.doc_id)
+            raise
+
+    slow_id = await add_document(project_id, 1)
+    worker = jobs.JobWorker(concurrency=1, lease_seconds=0.3, poll_seconds=0.05, runner=slow_runner)
+    await worker.start()
+    await asyncio.wait_for(started.wait(), 5)
+    async with async_session() as db:
+        await db.execute(update(JobModel).values(lease_owner="someone-else"))
+        await db.commit()
+
+    async def attempt_cancelled():
+        return bool(cancelled)
+
+    check("a lost lease cancels the running attempt", await wait_until(attempt_cancelled, 2))
+    async with async_session() as db:
+        await db.execute(update(JobModel).values(state="queued", lease_owner=None, attempts=0))
+        await db.commit()
+    started.clear()
+    worker.wake()
+    await asyncio.wait_for(started.wait(), 5)
+    await worker.stop()
+    job = await job_for(slow_id)
+    check("shutdown hands the running job back to the queue", job.state == "queued" and job.lease_owner is None)
+    check("the interrupted attempt is not charged", job.attempts == 0, f"{job.attempts}")
+
+    section("RESULTS")
+    total = PASS + FAIL
+    color = GREEN if FAIL == 0 else RED
+    print(f"\n  {color}Report: {PASS}/{total} assertions passed{RESET}\n")
+    sys.exit(0 if FAIL == 0 else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
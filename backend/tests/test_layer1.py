@@ -128,6 +128,7 @@ def run_tests():
         with open(README, "rb") as f:
             r_dup = httpx.post(f"{BASE}/projects/{pid}/ingest", files={"file": ("README.md", f)}, timeout=HTTP_TIMEOUT)
         check("Re-ingest README returns 201", r_dup.status_code == 201)
+        check("Byte-identical upload is flagged before parsing", r_dup.json().get("processing_status") == "duplicate")
         d_dup = wait_for_pipeline(r_dup.json()["id"]) or r_dup.json()
         check("is_duplicate is True", d_dup.get("processing_status") == "duplicate")
         check("Returns same content_hash", d_dup.get("content_hash") == d1.get("content_hash") or d_dup.get("content_hash", "").startswith("pending"))
@@ -218,11 +219,12 @@ def run_tests():
                 r_iso = httpx.post(f"{BASE}/projects/{pid2}/ingest", files={"file": ("README.md", f)}, timeout=HTTP_TIMEOUT)
             d_iso = wait_for_pipeline(r_iso.json()["id"]) or r_iso.json()
             check("Same file in different project is NOT duplicate", d_iso.get("processing_status") != "duplicate")
+            check("Same file in different project reuses the parsed text", d_iso.get("content_hash") == d1.get("content_hash"))
             
             r_cnt = httpx.get(f"{BASE}/projects/{pid2}/documents", timeout=HTTP_TIMEOUT)
             check("Second project has exactly 1 doc", len(r_cnt.json()) == 1)
         except Exception as e:
-            FAIL += 2
+            FAIL += 3
             print(f"  FAIL  Cross-project isolation tests failed: {e}")
 
         # 10. Resource Deletion
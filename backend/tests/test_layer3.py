@@ -95,6 +95,12 @@ def run_tests():
         check("All embeddings have correct dimension (384)", all(e["dimension"] == 384 for e in embeddings))
         check("All embeddings marked as not cached (first run)", all(e["is_cached"] is False for e in embeddings))
         check("Model name is all-MiniLM-L6-v2", all(e["model_name"] == "all-MiniLM-L6-v2" for e in embeddings))
+        # Re-chunking produced the same chunk texts the pipeline already embedded
+        check("Vectors reused from the content-addressed store", all(e["is_reused"] for e in embeddings),
+              f"{sum(e['is_reused'] for e in embeddings)}/{len(embeddings)} reused")
+        reuse = httpx.get(f"{BASE}/documents/{doc_id}").json().get("metadata", {}).get("embedding_reuse", {})
+        check("Pipeline reports the document's reuse ratio", "ratio" in reuse and reuse.get("chunks", 0) > 0,
+              f"got {reuse}")
 
         # ============================================================
         section("2. Versioning / Cache Verification")
@@ -132,6 +132,23 @@ def run_tests():
         check("Hybrid results are non-empty", len(data["results"]) > 0)
         check("Mode is 'hybrid'", data["mode"] == "hybrid")
         check("total_results matches results length", data["total_results"] == len(data["results"]))
+        check("Without a latency budget every candidate is reranked",
+              data["rerank_depth"] == data["candidates"] > 0, f"{data['rerank_depth']}/{data['candidates']}")
+
+        r = httpx.post(
+            f"{BASE}/projects/{pid}/search",
+            json={"query": "how does VERO handle document ingestion", "top_k": 5, "mode": "hybrid",
+                  "latency_budget_ms": 1},
+            timeout=HTTP_TIMEOUT,
+        )
+        data = r.json()
+        check("An exhausted latency budget falls back to stage-1 order",
+              r.status_code == 200 and data["rerank_depth"] < data["candidates"] and len(data["results"]) > 0,
+              f"{data.get('rerank_depth')}/{data.get('candidates')}")
+        tail = data["results"][data["rerank_depth"]:] if r.status_code == 200 else []
+        check("Unreranked results are marked and scored relative to stage 1",
+              all(not item["reranked"] and 0 < item["score"] <= 1 for item in tail),
+              str([(item.get("reranked"), item.get("score")) for item in tail]))
 
         # ============================================================
         section("4. Context Window Generation")
@@ -166,7 +183,39 @@ def run_tests():
         check("Empty project returns zero results", len(r.json()["results"]) == 0)
 
         # ============================================================
-        section("6. Error Handling")
+        section("6. Cache Statistics")
+        # ============================================================
+        before = httpx.get(f"{BASE}/search/stats", timeout=HTTP_TIMEOUT).json().get("results", {})
+        repeat = {"query": "  FastAPI   SQLAlchemy ", "mode": "keyword"}
+        first = httpx.post(f"{BASE}/projects/{pid}/search", json=repeat, timeout=HTTP_TIMEOUT).json()
+        second = httpx.post(f"{BASE}/projects/{pid}/search", json=repeat, timeout=HTTP_TIMEOUT).json()
+        check("Repeated search returns identical results", first["results"] == second["results"])
+
+        r = httpx.get(f"{BASE}/search/stats", timeout=HTTP_TIMEOUT)
+        check("GET /search/stats returns 200", r.status_code == 200, f"got {r.status_code}")
+        cache = r.json().get("results", {})
+        check("Repeated search is served from the result cache",
+              cache.get("hits", 0) > before.get("hits", 0), f"before={before} after={cache}")
+        embed_before = r.json().get("query_embeddings", {})
+        # A different top_k misses the result cache but reuses the memoized query vector
+        httpx.post(f"{BASE}/projects/{pid}/search",
+                   json={"query": "FastAPI SQLAlchemy", "mode": "semantic", "top_k": 3}, timeout=HTTP_TIMEOUT)
+        httpx.post(f"{BASE}/projects/{pid}/search",
+                   json={"query": "FastAPI SQLAlchemy", "mode": "semantic", "top_k": 4}, timeout=HTTP_TIMEOUT)
+        r = httpx.get(f"{BASE}/search/stats", timeout=HTTP_TIMEOUT)
+        embed_after = r.json().get("query_embeddings", {})
+        check("Repeated query embedding is memoized",
+              embed_after.get("hits", 0) > embed_before.get("hits", 0), f"{embed_before} -> {embed_after}")
+        rerank_stats = r.json().get("rerank", {})
+        check("Re-ranking the same candidates reuses cached pair scores",
+              rerank_stats.get("hits", 0) > 0, f"{rerank_stats}")
+        bm25 = r.json().get("bm25", {})
+        check("BM25 stats count the keyword lookups above", bm25.get("hits", 0) + bm25.get("misses", 0) > 0)
+        check("BM25 cache stays within its memory budget",
+              bm25.get("entries", 0) <= 1 or bm25.get("bytes", 0) <= bm25.get("max_bytes", 0))
+
+        # ============================================================
+        section("7. Error Handling")
         # ============================================================
         r = httpx.post(
             f"{BASE}/projects/nonexistent_id/search",
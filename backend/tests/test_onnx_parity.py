@@ -0,0 +1,130 @@
+"""
+VERO ONNX Backend Parity Verification
+=====================================
+Checks that the int8 ONNX Runtime models agree with the PyTorch ones closely
+enough to serve the same searches (stored documents are still re-embedded
+after a switch, see onnx_backend.py):
+  - sentence vectors: cosine(torch, onnx) per text
+  - cross-encoder: Spearman rank-correlation of the scores per query, and the
+    same top-1 candidate
+
+Runs offline but needs sentence-transformers and the `onnx` extra
+(pip install -e .[onnx]); models are exported to data/onnx/ on first run.
+
+Usage:
+    python tests/test_onnx_parity.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+# Professional Logging Utilities
+GREEN = "\033[32m"
+RED = "\033[31m"
+RESET = "\033[0m"
+BOLD = "\033[1m"
+DIM = "\033[2m"
+
+PASS = 0
+FAIL = 0
+
+# Agreement floors for int8 weights
+MIN_MEAN_COSINE = 0.99
+MIN_COSINE = 0.97
+MIN_SPEARMAN = 0.90
+
+TEXTS = [
+    "VERO ingests PDFs, Word documents, slides, web pages and code repositories.",
+    "Chunks are deduplicated by SHA-256 content hash before embedding.",
+    "Hybrid search fuses dense vector similarity with BM25 keyword scores.",
+    "The cross-encoder reranks the fused candidates for precision.",
+    "SQLite runs in WAL mode so readers never block the writer.",
+    "def chunk_text(text, size=512):\n    return [text[i:i + size] for i in range(0, len(text), size)]",
+    "Photosynthesis converts light energy into chemical energy stored in glucose.",
+    "The treaty was signed in 1648, ending the Thirty Years' War.",
+    "short",
+    "A much longer passage that keeps going " * 40,
+]
+
+RERANK_CASES = {
+    "how are duplicate chunks detected": TEXTS[:8],
+    "what does the reranker do": TEXTS[:8],
+    "when did the thirty years war end": TEXTS[:8],
+}
+
+
+def check(name: str, condition: bool, detail: str = ""):
+    global PASS, FAIL
+    if condition:
+        PASS += 1
+        print(f"  {GREEN}✓{RESET} {name}")
+    else:
+        FAIL += 1
+        print(f"  {RED}✗{RESET} {name} {DIM}({detail}){RESET}")
+
+
+def section(title: str):
+    print(f"\n{BOLD}{title.upper()}{RESET}")
+    print(f"{DIM}{'─' * 40}{RESET}")
+
+
+def spearman(a: np.ndarray, b: np.ndarray) -> float:
+    """Rank correlation (scores here have no exact ties)."""
+    ra = np.argsort(np.argsort(a)).astype(np.float64)
+    rb = np.argsort(np.argsort(b)).astype(np.float64)
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+def run_tests():
+    print(f"\n{BOLD}VERO ONNX BACKEND PARITY{RESET}")
+
+    try:
+        from sentence_transformers import CrossEncoder, SentenceTransformer
+
+        from app.embeddings.onnx_backend import OnnxCrossEncoder, _encode_onnx
+        from app.reranker import RERANKER_MODEL
+    except ImportError as exc:
+        print(f"  {RED}Missing dependency: {exc}. Install with: pip install -e .[onnx]{RESET}\n")
+        sys.exit(1)
+
+    section("Sentence embeddings")
+    torch_vectors = SentenceTransformer("all-MiniLM-L6-v2").encode(TEXTS, convert_to_numpy=True)
+    onnx_vectors = _encode_onnx("all-MiniLM-L6-v2", TEXTS)
+    check("same shape", torch_vectors.shape == onnx_vectors.shape,
+          f"{torch_vectors.shape} vs {onnx_vectors.shape}")
+    check("onnx vectors are unit length", np.allclose(np.linalg.norm(onnx_vectors, axis=1), 1.0, atol=1e-4))
+    torch_unit = torch_vectors / np.linalg.norm(torch_vectors, axis=1, keepdims=True)
+    cosines = np.sum(torch_unit * onnx_vectors, axis=1)
+    check(f"mean cosine >= {MIN_MEAN_COSINE}", cosines.mean() >= MIN_MEAN_COSINE, f"mean={cosines.mean():.4f}")
+    check(f"every cosine >= {MIN_COSINE}", cosines.min() >= MIN_COSINE, f"min={cosines.min():.4f}")
+    print(f"  {DIM}cosine mean={cosines.mean():.4f} min={cosines.min():.4f}{RESET}")
+
+    section("Cross-encoder ranking")
+    torch_ce = CrossEncoder(RERANKER_MODEL)
+    onnx_ce = OnnxCrossEncoder(RERANKER_MODEL)
+    for query, candidates in RERANK_CASES.items():
+        pairs = [(query, text) for text in candidates]
+        torch_scores = np.asarray(torch_ce.predict(pairs), dtype=np.float64)
+        onnx_scores = np.asarray(onnx_ce.predict(pairs), dtype=np.float64)
+        rho = spearman(torch_scores, onnx_scores)
+        check(f"'{query}': spearman >= {MIN_SPEARMAN}", rho >= MIN_SPEARMAN, f"rho={rho:.3f}")
+        check(f"'{query}': same top candidate",
+              int(np.argmax(torch_scores)) == int(np.argmax(onnx_scores)),
+              f"torch={int(np.argmax(torch_scores))} onnx={int(np.argmax(onnx_scores))}")
+        print(f"  {DIM}rho={rho:.3f} max |logit diff|={np.abs(torch_scores - onnx_scores).max():.3f}{RESET}")
+
+    section("RESULTS")
+    total = PASS + FAIL
+    color = GREEN if FAIL == 0 else RED
+    print(f"\n  {color}Report: {PASS}/{total} assertions passed{RESET}\n")
+    sys.exit(0 if FAIL == 0 else 1)
+
+
+if __name__ == "__main__":
+    run_tests()
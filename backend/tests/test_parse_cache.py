@@ -0,0 +1,128 @@
+"""
+VERO Parse Cache Verification
+=============================
+Checks the on-disk parse-result cache: round trips, key separation between
+source kinds, compression, least-recently-used eviction under a byte budget,
+recovery from corrupt entries and invalidation by parser version. Uses a
+throwaway directory, so it runs offline in well under a second.
+
+Usage:
+    python tests/test_parse_cache.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from app import parse_cache  # noqa: E402
+from app.parse_cache import ParseCache, file_key, repo_key, url_key  # noqa: E402
+
+# Professional Logging Utilities
+GREEN = "\033[32m"
+RED = "\033[31m"
+RESET = "\033[0m"
+BOLD = "\033[1m"
+DIM = "\033[2m"
+
+PASS = 0
+FAIL = 0
+
+
+def check(name: str, condition: bool, detail: str = ""):
+    global PASS, FAIL
+    if condition:
+        PASS += 1
+        print(f"  {GREEN}✓{RESET} {name}")
+    else:
+        FAIL += 1
+        print(f"  {RED}✗{RESET} {name} {DIM}({detail}){RESET}")
+
+
+def section(title: str):
+    print(f"\n{BOLD}{title.upper()}{RESET}")
+    print(f"{DIM}{'─' * 40}{RESET}")
+
+
+def result(i: int, size: int = 4000) -> dict:
+    text = f"# Document {i}\n\n" + " ".join(f"token{(i * 7 + j) % 997}" for j in range(size // 9))
+    return {"text": text, "metadata": {"page_count": i, "title": f"Doc {i}"}, "parsed_doc": object()}
+
+
+def run_tests():
+    print(f"\n{BOLD}VERO PARSE CACHE VERIFICATION{RESET}")
+    root = Path(tempfile.mkdtemp(prefix="vero-parse-cache-"))
+
+    section("Round trip")
+    cache = ParseCache(directory=root / "a", max_bytes=10 * 1024 * 1024)
+    key = file_key("pdf", "ab" * 32)
+    check("miss before put", cache.get(key) is None)
+    cache.put(key, result(1))
+    hit = cache.get(key)
+    check("hit returns the text", hit is not None and hit["text"] == result(1)["text"])
+    check("hit returns the metadata", hit is not None and hit["metadata"] == {"page_count": 1, "title": "Doc 1"})
+    check("non-JSON fields are not stored", hit is not None and set(hit) == {"text", "metadata"})
+    stats = cache.stats()
+    check("stats count hits and misses", stats["hits"] == 1 and stats["misses"] == 1 and stats["entries"] == 1)
+    check("entries are compressed", stats["bytes"] < len(result(1)["text"]) / 2,
+          f"{stats['bytes']} bytes for {len(result(1)['text'])} chars")
+
+    section("Key separation")
+    keys = [
+        file_key("pdf", "cd" * 32),
+        file_key("docx", "cd" * 32),
+        url_key("https://example.com/a", "etag:\"v1\""),
+        url_key("https://example.com/a", "etag:\"v2\""),
+        repo_key("Owner", "Repo", "1" * 40),
+        repo_key("owner", "repo", "2" * 40),
+    ]
+    for i, k in enumerate(keys):
+        cache.put(k, result(10 + i))
+    check("every key keeps its own entry",
+          all(cache.get(k)["metadata"]["page_count"] == 10 + i for i, k in enumerate(keys)))
+    check("repo keys ignore owner/repo case",
+          cache.get(repo_key("OWNER", "repo", "1" * 40)) is not None)
+
+    section("LRU eviction")
+    entry_size = cache._path(key).stat().st_size
+    small = ParseCache(directory=root / "b", max_bytes=int(entry_size * 3.5))
+    for i in range(3):
+        k = url_key(f"https://e.com/{i}", "v")
+        small.put(k, result(i))
+        t = time.time() - 100 + i  # Distinct, increasing use times
+        os.utime(small._path(k), (t, t))
+    small.get(url_key("https://e.com/0", "v"))  # 0 becomes most recently used
+    small.put(url_key("https://e.com/3", "v"), result(3))
+    present = [small.get(url_key(f"https://e.com/{i}", "v")) is not None for i in range(4)]
+    check("least recently used entry is evicted", present == [True, False, True, True], str(present))
+    stats = small.stats()
+    check("cache stays within its budget", stats["bytes"] <= small.max_bytes, f"{stats['bytes']}>{small.max_bytes}")
+    check("evictions are counted", stats["evictions"] == 1, str(stats["evictions"]))
+
+    section("Corruption and versioning")
+    cache._path(key).write_bytes(b"not zlib")
+    check("corrupt entry reads as a miss", cache.get(key) is None)
+    check("corrupt entry is removed", not cache._path(key).exists())
+    cache.put(key, result(1))
+    original = parse_cache.PARSER_VERSION
+    parse_cache.PARSER_VERSION = original + 1
+    try:
+        check("a new parser version misses old entries", cache.get(key) is None)
+    finally:
+        parse_cache.PARSER_VERSION = original
+    check("the old version still hits", cache.get(key) is not None)
+
+    section("RESULTS")
+    total = PASS + FAIL
+    color = GREEN if FAIL == 0 else RED
+    print(f"\n  {color}Report: {PASS}/{total} assertions passed{RESET}\n")
+    sys.exit(0 if FAIL == 0 else 1)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,145 @@
+"""
+VERO PDF Engine Verification
+============================
+Checks the single-pass PDF engine: page-range splitting, parallel ranges
+merged back in page order, the same Markdown and metadata whether a document
+is walked in one range or several, figure/table detection, and that the
+per-page table filter sends only ruled pages to pdfplumber without losing
+tables. Generates its
+PDFs with PyMuPDF in a throwaway directory, so it runs offline.
+
+Usage:
+    python tests/test_pdf_engine.py
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+import fitz  # noqa: E402
+
+from app.parsers import pdf  # noqa: E402
+
+# Professional Logging Utilities
+GREEN = "\033[32m"
+RED = "\033[31m"
+RESET = "\033[0m"
+BOLD = "\033[1m"
+DIM = "\033[2m"
+
+PASS = 0
+FAIL = 0
+
+
+def check(name: str, condition: bool, detail: str = ""):
+    global PASS, FAIL
+    if condition:
+        PASS += 1
+        print(f"  {GREEN}✓{RESET} {name}")
+    else:
+        FAIL += 1
+        print(f"  {RED}✗{RESET} {name} {DIM}({detail}){RESET}")
+
+
+def section(title: str):
+    print(f"\n{BOLD}{title.upper()}{RESET}")
+    print(f"{DIM}{'─' * 40}{RESET}")
+
+
+def make_pdf(path: Path, pages: int, words: int = 150) -> None:
+    """Numbered body text per page, ruled tables on pages 3 and 17, a figure on page 5, a lone rule on page 8."""
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 150, 120), False)
+    pix.set_rect(pix.irect, (200, 60, 60))
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        body = " ".join(f"p{i + 1}w{j}" for j in range(words))
+        lines = [body[k:k + 90] for k in range(0, len(body), 90)]
+        page.insert_text((50, 60), f"Page marker {i + 1}\n" + "\n".join(lines), fontsize=8)
+        if i == 7:
+            page.draw_line((50, 40), (500, 40), color=(0, 0, 0), width=0.5)
+        if i in (2, 16):
+            for r in range(3):
+                for c in range(2):
+                    rect = fitz.Rect(50 + c * 120, 600 + r * 18, 170 + c * 120, 618 + r * 18)
+                    page.draw_rect(rect, color=(0, 0, 0), width=0.7)
+                    page.insert_text((rect.x0 + 4, rect.y1 - 5), f"r{r}c{c}", fontsize=8)
+        if i == 4:
+            page.insert_image(fitz.Rect(400, 680, 550, 800), stream=pix.tobytes("png"))
+    doc.save(path)
+    doc.close()
+
+
+def parse(path: Path, workers: int, per_worker: int) -> dict:
+    pdf.PDF_WORKERS, pdf.PAGES_PER_WORKER = workers, per_worker
+    return asyncio.run(pdf.parse_pdf(str(path)))
+
+
+def run_tests():
+    print(f"\n{BOLD}VERO PDF ENGINE VERIFICATION{RESET}")
+    root = Path(tempfile.mkdtemp(prefix="vero-pdf-engine-"))
+
+    section("Page ranges")
+    check("short documents stay in one range", pdf._page_ranges(50, 4, 64) == [(0, 50)])
+    check("one worker means one range", pdf._page_ranges(1000, 1, 64) == [(0, 1000)])
+    ranges = pdf._page_ranges(1000, 4, 64)
+    check("long documents split across every worker", len(ranges) == 4, str(ranges))
+    check("ranges cover every page once, in order",
+          ranges[0][0] == 0 and ranges[-1][1] == 1000
+          and all(a[1] == b[0] for a, b in zip(ranges, ranges[1:])), str(ranges))
+    check("ranges are balanced, one per block of pages",
+          pdf._page_ranges(200, 8, 64) == [(0, 50), (50, 100), (100, 150), (150, 200)],
+          str(pdf._page_ranges(200, 8, 64)))
+
+    section("Single pass")
+    path = root / "doc.pdf"
+    make_pdf(path, 23)
+    pages = pdf._walk_pages(str(path), 0, 23)
+    check("every page is walked", [p.number for p in pages] == list(range(23)))
+    check("page text is collected", pages[6].text.startswith("Page marker 7"), pages[6].text[:30])
+    check("figures are sized without decoding", pages[4].figures == [(150, 120, None)], str(pages[4].figures))
+    check("word counts are collected", all(p.words > 120 for p in pages))
+    check("ruled pages are table candidates", [p.number for p in pages if p.table_candidate] == [2, 16],
+          str([(p.number, p.rulings) for p in pages if p.rulings != (0, 0)]))
+    check("a lone rule is not a table", pages[7].rulings == (1, 0), str(pages[7].rulings))
+
+    section("Parallel ranges")
+    original = (pdf.PDF_WORKERS, pdf.PAGES_PER_WORKER, pdf.TABLE_FILTER)
+    try:
+        serial = parse(path, 1, 64)
+        parallel = parse(path, 3, 5)
+        pdf.TABLE_FILTER = False
+        unfiltered = parse(path, 1, 64)
+    finally:
+        pdf.PDF_WORKERS, pdf.PAGES_PER_WORKER, pdf.TABLE_FILTER = original
+    text = parallel["text"]
+    positions = [text.find(f"## Page {i + 1}\n") for i in range(23)]
+    check("pages are merged in page order", all(p >= 0 for p in positions) and positions == sorted(positions))
+    check("parallel output matches a single range", text == serial["text"])
+    check("parallel metadata matches a single range", parallel["metadata"] == serial["metadata"],
+          f"{parallel['metadata']} vs {serial['metadata']}")
+    check("the table is extracted with its page", "**Table (page 3):**" in text)
+    check("the figure is reported with its page", "[Figure, page 5]:** Visual content (150×120px)" in text)
+    check("page count covers the whole document", parallel["metadata"]["page_count"] == 23)
+
+    section("Table filter")
+    scanned = serial["parsed_doc"].metadata["table_pages_scanned"]
+    check("only candidate pages go through pdfplumber", scanned == 2, str(scanned))
+    check("no tables are lost to the filter", serial["text"] == unfiltered["text"]
+          and serial["parsed_doc"].tables_raw == unfiltered["parsed_doc"].tables_raw)
+    check("both tables are extracted", "**Table (page 17):**" in serial["text"])
+
+    section("RESULTS")
+    total = PASS + FAIL
+    color = GREEN if FAIL == 0 else RED
+    print(f"\n  {color}Report: {PASS}/{total} assertions passed{RESET}\n")
+    sys.exit(0 if FAIL == 0 else 1)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -110,6 +110,13 @@ async def test_parse_pdf(path: str, results_dir: Path):
     check("Markdown contains structure (headings)", has_headings,
           "No headings found — pymupdf4llm should produce them")
 
+    # Check that scanning only table-candidate pages lost no tables
+    if parsed.complexity != "slide_mode":
+        from app.parsers.pdf import _extract_tables
+        every_page = _extract_tables(path, list(range(parsed.page_count)))
+        check("No tables lost to page filtering", [t for _, t in every_page] == parsed.tables_raw,
+              f"{len(parsed.tables_raw)} extracted, {len(every_page)} on a full scan")
+
     # Check for Markdown table format if tables were extracted
     if parsed.tables_raw:
         has_md_tables = "| " in parsed.markdown_text and " |" in parsed.markdown_text
@@ -0,0 +1,240 @@
+"""
+VERO Repository Archive Verification
+====================================
+Checks archive-based repository ingestion against a local HTTP stand-in for
+GitHub: the tarball of the resolved HEAD commit is read in one request, the
+README and docstrings match the file-by-file API path, the per-file size and
+file count limits hold in both (API mode with its own smaller cap),
+docstrings keep file order whether extracted inline or across worker
+processes, oversized or missing archives fail cleanly, and a local clone
+under VERO_REPO_LOCAL_ROOT gives the same text as its archive. Runs offline.
+
+Usage:
+    python tests/test_repo_archive.py
+"""
+
+import asyncio
+import io
+import json
+import sys
+import tarfile
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add backend to path
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from app.parsers import repo  # noqa: E402
+
+# Professional Logging Utilities
+GREEN = "\033[32m"
+RED = "\033[31m"
+RESET = "\033[0m"
+BOLD = "\033[1m"
+DIM = "\033[2m"
+
+PASS = 0
+FAIL = 0
+
+COMMIT = "0123456789abcdef0123456789abcdef01234567"
+REPO_URL = "https://github.com/acme/widgets"
+
+
+def check(name: str, condition: bool, detail: str = ""):
+    global PASS, FAIL
+    if condition:
+        PASS += 1
+        print(f"  {GREEN}✓{RESET} {name}")
+    else:
+        FAIL += 1
+        print(f"  {RED}✗{RESET} {name} {DIM}({detail}){RESET}")
+
+
+def section(title: str):
+    print(f"\n{BOLD}{title.upper()}{RESET}")
+    print(f"{DIM}{'─' * 40}{RESET}")
+
+
+def make_files(modules: int) -> dict[str, bytes]:
+    """A README, numbered modules in two packages, a syntax error, an oversized module and a binary."""
+    files = {
+        "README.md": b"# Widgets\n\nMakes widgets.",
+        "docs/README.md": b"Not the root README.",
+        "logo.png": b"\x89PNG\r\n\x1a\n" + bytes(range(256)),
+        "broken.py": b'"""Never parsed."""\ndef (:\n',
+        "big.py": b'"""Too large to read."""\n' + b"x = 1\n" * 30_000,
+    }
+    for i in range(modules):
+        package = "core" if i % 2 else "extras"
+        files[f"{package}/mod{i:03d}.py"] = (
+            f'"""Module {i}."""\n\n'
+            f'class Widget{i}:\n    """Widget number {i}."""\n\n'
+            f'    def spin(self):\n        """Spin widget {i}."""\n'
+        ).encode()
+    return dict(sorted(files.items()))
+
+
+def make_tarball(files: dict[str, bytes]) -> bytes:
+    """Gzipped tarball laid out like GitHub's: one top-level directory, the commit in a pax header."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz", format=tarfile.PAX_FORMAT,
+                      pax_headers={"comment": COMMIT}) as tar:
+        top = tarfile.TarInfo(f"acme-widgets-{COMMIT[:7]}")
+        top.type = tarfile.DIRTYPE
+        tar.addfile(top)
+        for path, data in files.items():
+            info = tarfile.TarInfo(f"acme-widgets-{COMMIT[:7]}/{path}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+class GitHubStandIn(BaseHTTPRequestHandler):
+    """Serves the HEAD commit, its tarball, raw files and the Trees API for acme/widgets; counts requests."""
+    files: dict[str, bytes] = {}
+    tarball = b""
+    requests: list[str] = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        GitHubStandIn.requests.append(self.path)
+        if self.path == "/repos/acme/widgets/commits/HEAD":
+            return self._send(COMMIT.encode())
+        if self.path == f"/acme/widgets/tar.gz/{COMMIT}":
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-gzip")
+            self.send_header("Content-Length", str(len(self.tarball)))
+            self.end_headers()
+            for i in range(0, len(self.tarball), 4096):
+                self.wfile.write(self.tarball[i:i + 4096])
+            return
+        if self.path == "/repos/acme/widgets/git/trees/HEAD?recursive=1":
+            tree = [{"path": p, "type": "blob", "size": len(d)} for p, d in self.files.items()]
+            return self._send(json.dumps({"tree": tree}).encode())
+        prefix = "/acme/widgets/HEAD/"
+        if self.path.startswith(prefix) and self.path[len(prefix):] in self.files:
+            return self._send(self.files[self.path[len(prefix):]])
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send(self, body: bytes):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def parse(source: str = REPO_URL, commit: str | None = None, **settings) -> dict:
+    original = {name: getattr(repo, name) for name in settings}
+    for name, value in settings.items():
+        setattr(repo, name, value)
+    GitHubStandIn.requests = []
+    try:
+        return asyncio.run(repo.parse_repo(source, commit=commit))
+    finally:
+        for name, value in original.items():
+            setattr(repo, name, value)
+
+
+def run_tests():
+    print(f"\n{BOLD}VERO REPOSITORY ARCHIVE VERIFICATION{RESET}")
+    files = make_files(40)
+    GitHubStandIn.files = files
+    GitHubStandIn.tarball = make_tarball(files)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GitHubStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    repo._ARCHIVE_BASE = repo._RAW_BASE = repo._API_BASE = base
+
+    try:
+        section("Archive mode")
+        result = parse(REPO_WORKERS=1)
+        text, meta = result["text"], result["metadata"]
+        check("the archive of the resolved commit is read in one request",
+              GitHubStandIn.requests == ["/repos/acme/widgets/commits/HEAD", f"/acme/widgets/tar.gz/{COMMIT}"],
+              str(GitHubStandIn.requests))
+        check("the root README leads the text", text.startswith("# README\n\n# Widgets\n\nMakes widgets."))
+        check("every module's docstrings are extracted",
+              all(f"Function spin: Spin widget {i}." in text for i in range(40)))
+        check("oversized files are skipped", "Too large to read" not in text and meta["python_files_skipped"] == 1,
+              str(meta))
+        check("the commit comes from the archive header", meta.get("commit") == COMMIT, str(meta))
+        check("scan counts are reported",
+              meta["repo_mode"] == "archive" and meta["python_files_scanned"] == 41, str(meta))
+        pinned = parse(commit=COMMIT, REPO_WORKERS=1)
+        check("a commit resolved by the caller is not looked up again",
+              GitHubStandIn.requests == [f"/acme/widgets/tar.gz/{COMMIT}"] and pinned["text"] == text,
+              str(GitHubStandIn.requests))
+
+        section("Same text as the API path")
+        api = parse(REPO_MODE="api")
+        check("archive and file-by-file output match", api["text"] == text)
+        check("the API path still pays one request per file", len(GitHubStandIn.requests) > 40,
+              str(len(GitHubStandIn.requests)))
+        check("the API path reports the same scan counts",
+              {k: api["metadata"][k] for k in ("python_files_scanned", "python_files_skipped")}
+              == {"python_files_scanned": 41, "python_files_skipped": 1}, str(api["metadata"]))
+        api_capped = parse(REPO_MODE="api", API_MAX_FILES=10)
+        check("the API path keeps its own, smaller file count limit",
+              repo.API_MAX_FILES < repo.MAX_FILES and api_capped["metadata"]["python_files_scanned"] == 10
+              and api_capped["text"].count("Module: Module") == 9 and len(GitHubStandIn.requests) < 20,
+              str(api_capped["metadata"]))
+
+        section("Limits and process pool")
+        capped = parse(REPO_WORKERS=1, MAX_FILES=10)
+        # broken.py is one of the ten files read
+        check("the file count limit holds", capped["metadata"]["python_files_scanned"] == 10
+              and capped["text"].count("Module: Module") == 9, str(capped["metadata"]))
+        pooled = parse(REPO_WORKERS=3, _BATCH_FILES=4)
+        check("pooled extraction keeps file order", pooled["text"] == text)
+        roomy = parse(REPO_WORKERS=1, MAX_FILE_BYTES=1024 * 1024)
+        check("the size limit is configurable", "Too large to read" in roomy["text"])
+
+        section("Failures")
+        try:
+            parse(REPO_WORKERS=1, MAX_ARCHIVE_BYTES=1024)
+            check("oversized archives are refused", False, "no error")
+        except ValueError as e:
+            check("oversized archives are refused", "exceeds" in str(e), str(e))
+        try:
+            parse(source="https://github.com/acme/missing")
+            check("missing repositories raise", False, "no error")
+        except ValueError as e:
+            check("missing repositories raise", "404" in str(e), str(e))
+
+        section("Local clone")
+        root = Path(tempfile.mkdtemp(prefix="vero-repo-"))
+        clone = root / "widgets"
+        for path, data in files.items():
+            (clone / path).parent.mkdir(parents=True, exist_ok=True)
+            (clone / path).write_bytes(data)
+        (clone / ".git").mkdir()
+        (clone / ".git" / "hook.py").write_bytes(b'"""Not part of the project."""\n')
+        local = parse(source=str(clone), LOCAL_ROOT=str(root), REPO_WORKERS=1)
+        check("a local clone gives the archive's text", local["text"] == text)
+        check("no request is made for a local clone", GitHubStandIn.requests == [])
+        check("the clone is named after its directory", local["metadata"]["repo_name"] == "widgets"
+              and local["metadata"]["repo_mode"] == "local", str(local["metadata"]))
+        try:
+            parse(source=str(clone), LOCAL_ROOT=str(clone / "core"))
+            check("paths outside VERO_REPO_LOCAL_ROOT are refused", False, "no error")
+        except ValueError as e:
+            check("paths outside VERO_REPO_LOCAL_ROOT are refused", "under" in str(e), str(e))
+    finally:
+        server.shutdown()
+
+    section("RESULTS")
+    total = PASS + FAIL
+    color = GREEN if FAIL == 0 else RED
+    print(f"\n  {color}Report: {PASS}/{total} assertions passed{RESET}\n")
+    sys.exit(0 if FAIL == 0 else 1)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,121 @@
+"""
+VERO Rerank Cost Verification
+=============================
+Checks the per-pair cost model behind latency-budgeted searches: rerank()
+reports only the pairs it sent to the cross-encoder and the time spent in
+predict, a fully cached rerank leaves the estimate untouched, a partly cached
+one counts just the misses, and time spent outside the model (waiting for a
+rerank thread) never reaches it. Uses a stand-in cross-encoder with a fixed
+cost per pair, so it runs offline.
+
+Usage:
+    python tests/test_rerank_cost.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from app import reranker  # noqa: E402
+from app.retrieval import _RerankCost  # noqa: E402
+
+# Professional Logging Utilities
+GREEN = "\033[32m"
+RED = "\033[31m"
+RESET = "\033[0m"
+BOLD = "\033[1m"
+DIM = "\033[2m"
+
+PASS = 0
+FAIL = 0
+
+PAIR_SECONDS = 0.004
+
+
+def check(name: str, condition: bool, detail: str = ""):
+    global PASS, FAIL
+    if condition:
+        PASS += 1
+        print(f"  {GREEN}✓{RESET} {name}")
+    else:
+        FAIL += 1
+        print(f"  {RED}✗{RESET} {name} {DIM}({detail}){RESET}")
+
+
+def section(title: str):
+    print(f"\n{BOLD}{title.upper()}{RESET}")
+    print(f"{DIM}{'─' * 40}{RESET}")
+
+
+class StandInCrossEncoder:
+    """Scores a pair by text length, PAIR_SECONDS per pair."""
+
+    def __init__(self):
+        self.pairs = 0
+
+    def predict(self, pairs, batch_size=32):
+        self.pairs += len(pairs)
+        time.sleep(PAIR_SECONDS * len(pairs))
+        return [len(text) / 100.0 for _, text in pairs]
+
+
+def candidates(n: int, offset: int = 0) -> list[dict]:
+    return [{"text": f"chunk {i} " + "word " * (i % 7)} for i in range(offset, offset + n)]
+
+
+def run_tests():
+    print(f"\n{BOLD}VERO RERANK COST VERIFICATION{RESET}")
+    model = StandInCrossEncoder()
+    reranker._model = model
+    reranker._score_cache.clear()
+    cost = _RerankCost(initial_ms=1.0, alpha=1.0)  # alpha=1: the estimate is the last sample
+    seen = []
+
+    def observe(pairs, seconds):
+        seen.append((pairs, seconds))
+        cost.observe(pairs, seconds)
+
+    section("Cold rerank")
+    reranker.rerank("what is a widget", candidates(20), observe=observe)
+    check("the pairs sent to the model are reported", [p for p, _ in seen] == [20] and model.pairs == 20,
+          str(seen))
+    check("the estimate follows model time per pair",
+          PAIR_SECONDS * 1000 <= cost.per_pair_ms < PAIR_SECONDS * 1000 * 3, f"{cost.per_pair_ms:.2f}ms")
+
+    section("Cached rerank")
+    before = cost.per_pair_ms
+    reranker.rerank("what is a widget", candidates(20), observe=observe)
+    check("a fully cached rerank reports nothing", len(seen) == 1 and model.pairs == 20, str(seen))
+    check("per_pair_ms is unchanged", cost.per_pair_ms == before, f"{before} -> {cost.per_pair_ms}")
+    check("the next cold query is still budgeted", cost.affordable_pairs(40) <= 40 / (PAIR_SECONDS * 1000),
+          str(cost.affordable_pairs(40)))
+
+    section("Partly cached rerank")
+    reranker.rerank("what is a widget", candidates(20) + candidates(5, offset=20), observe=observe)
+    check("only the misses are counted", seen[-1][0] == 5 and model.pairs == 25, str(seen[-1]))
+    check("the estimate is per missed pair",
+          PAIR_SECONDS * 1000 <= cost.per_pair_ms < PAIR_SECONDS * 1000 * 3, f"{cost.per_pair_ms:.2f}ms")
+
+    section("Time outside the model")
+    slow_start = time.perf_counter()
+    time.sleep(0.2)  # a wait for a rerank thread happens before rerank() runs
+    reranker.rerank("another question", candidates(5), observe=observe)
+    check("waiting is not charged to the pairs", seen[-1][1] < 0.2 <= time.perf_counter() - slow_start,
+          f"{seen[-1][1]:.3f}s")
+
+    reranker._model = None
+    reranker._score_cache.clear()
+
+    section("RESULTS")
+    total = PASS + FAIL
+    color = GREEN if FAIL == 0 else RED
+    print(f"\n  {color}Report: {PASS}/{total} assertions passed{RESET}\n")
+    sys.exit(0 if FAIL == 0 else 1)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,201 @@
+"""
+VERO Streaming Parse Verification
+=================================
+Checks the memory-bounded parse path for very large uploads: streamed PDF,
+Markdown and plain-text segments join into exactly the text and metadata of
+the regular parsers, the incremental content hash matches the one-shot hash,
+the streaming Markdown chunker produces the same chunks as chunking the
+whole document however the text is cut, and text without headings or blank
+lines is still cut once the stream buffer reaches its cap. Generates its inputs in a throwaway
+directory; no server or model is involved (tiktoken needs its cl100k_base
+encoding, downloaded once).
+
+Usage:
+    python tests/test_streaming_parse.py
+"""
+
+import asyncio
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+sys.path.insert(0, str(BACKEND / "tests"))
+
+from app.chunks import get_chunker_for_source, markdown, recursive  # noqa: E402
+from app.parsers import pdf, text  # noqa: E402
+from app.utils import ContentHasher, compute_content_hash  # noqa: E402
+from test_pdf_engine import make_pdf  # noqa: E402
+
+# Professional Logging Utilities
+GREEN = "\033[32m"
+RED = "\033[31m"
+RESET = "\033[0m"
+BOLD = "\033[1m"
+DIM = "\033[2m"
+
+PASS = 0
+FAIL = 0
+
+WORDS = "attention encoder decoder residual layer norm token embedding vector query key value".split()
+
+
+def check(name: str, condition: bool, detail: str = ""):
+    global PASS, FAIL
+    if condition:
+        PASS += 1
+        print(f"  {GREEN}✓{RESET} {name}")
+    else:
+        FAIL += 1
+        print(f"  {RED}✗{RESET} {name} {DIM}({detail}){RESET}")
+
+
+def section(title: str):
+    print(f"\n{BOLD}{title.upper()}{RESET}")
+    print(f"{DIM}{'─' * 40}{RESET}")
+
+
+def pieces(s: str, rng: random.Random, longest: int) -> list[str]:
+    """Cut s at random points."""
+    out, i = [], 0
+    while i < len(s):
+        j = i + rng.randint(1, longest)
+        out.append(s[i:j])
+        i = j
+    return out
+
+
+def markdown_doc(rng: random.Random) -> str:
+    """Headings at three levels, fenced code with a fake heading, tables, rules and long paragraphs."""
+    parts = []
+    for i in range(rng.randint(5, 40)):
+        r = rng.random()
+        if r < 0.15:
+            parts.append(f"# Chapter {i}")
+        elif r < 0.35:
+            parts.append(f"## Section {i}")
+        elif r < 0.45:
+            parts.append(f"### Part {i}")
+        elif r < 0.5:
+            parts.append("```\n# not a heading\n" + " ".join(rng.choices(WORDS, k=30)) + "\n```")
+        elif r < 0.55:
+            parts.append("| a | b |\n|---|---|\n| 1 | 2 |\n| 3 | 4 |")
+        elif r < 0.6:
+            parts.append("---")
+        else:
+            parts.append(" ".join(rng.choices(WORDS, k=rng.randint(5, 700))))
+    return "\n\n".join(parts)
+
+
+def run_tests():
+    print(f"\n{BOLD}VERO STREAMING PARSE VERIFICATION{RESET}")
+    root = Path(tempfile.mkdtemp(prefix="vero-stream-"))
+    rng = random.Random(7)
+
+    section("Incremental content hash")
+    alphabet = ["a", "b", " ", "\t", "\n", "\r\n", "\x0c", "é"]
+    samples = ["".join(rng.choices(alphabet, k=rng.randint(0, 50))) for _ in range(500)]
+    matches = 0
+    for s in samples:
+        hasher = ContentHasher()
+        for piece in pieces(s, rng, 6):
+            hasher.update(piece)
+        matches += hasher.hexdigest() == compute_content_hash(s)
+    check("matches compute_content_hash for any cut", matches == len(samples), f"{matches}/{len(samples)}")
+
+    section("Text and Markdown segments")
+    original_block = text._STREAM_BLOCK
+    text._STREAM_BLOCK = 11  # Force many blocks and paragraphs split across them
+    try:
+        same_text = same_meta = 0
+        for i in range(200):
+            body = "".join(rng.choices(["word", " ", "\n", "\n\n", "\r\n", "\n\n\n", "∑"], k=rng.randint(0, 80)))
+            for suffix in (".txt", ".md"):
+                path = root / f"t{i}{suffix}"
+                path.write_text(body, encoding="utf-8", newline="")
+                whole = asyncio.run(text.parse_text(str(path)))
+                stream = text.stream_text(str(path))
+                same_text += "".join(s.text for s in stream.segments) == whole["text"]
+                same_meta += stream.metadata == whole["metadata"]
+    finally:
+        text._STREAM_BLOCK = original_block
+    check("segments join into the parsed text", same_text == 400, f"{same_text}/400")
+    check("metadata matches the regular parser", same_meta == 400, f"{same_meta}/400")
+
+    section("PDF segments")
+    path = root / "doc.pdf"
+    make_pdf(path, 23)
+    original = pdf.PAGES_PER_WORKER
+    pdf.PAGES_PER_WORKER = 5
+    try:
+        whole = asyncio.run(pdf.parse_pdf(str(path)))
+        stream = pdf.stream_pdf(str(path))
+        check("metadata is filled only once the stream is read", stream.metadata == {})
+        segments = list(stream.segments)
+    finally:
+        pdf.PAGES_PER_WORKER = original
+    check("one segment per page plus tables and figures", len(segments) == 25,
+          str([s.label for s in segments]))
+    check("segments join into the parsed text", "".join(s.text for s in segments) == whole["text"])
+    check("metadata matches parse_pdf", stream.metadata == whole["metadata"],
+          f"{stream.metadata} vs {whole['metadata']}")
+
+    section("Markdown chunk stream")
+    chunker = get_chunker_for_source("pdf")
+    original_flush = markdown.STREAM_FLUSH_CHARS
+    same = offsets = total = 0
+    try:
+        for trial in range(40):
+            doc = markdown_doc(rng)
+            whole = chunker.chunk(doc, doc_id="d", project_id="p", doc_title="Doc")
+            markdown.STREAM_FLUSH_CHARS = rng.choice([0, 200, 5000])
+            stream = chunker.stream(doc_id="d", project_id="p", doc_title="Doc")
+            streamed = []
+            for piece in pieces(doc, rng, 900):
+                streamed += stream.feed(piece)
+            streamed += stream.close()
+            total += 1
+            same += [(c.text, c.metadata) for c in whole] == [(c.text, c.metadata) for c in streamed]
+            offsets += all(doc[c.start_char:c.end_char].strip() for c in streamed)
+    finally:
+        markdown.STREAM_FLUSH_CHARS = original_flush
+    check("streamed chunks and breadcrumbs match whole-document chunking", same == total, f"{same}/{total}")
+    check("streamed offsets point into the document", offsets == total, f"{offsets}/{total}")
+
+    section("Buffer cap without section breaks")
+    lines = "\n".join(" ".join(rng.choices(WORDS, k=rng.randint(5, 60))) for _ in range(3000))
+    one_line = " ".join(rng.choices(WORDS, k=40000))
+    cases = [("markdown, no headings", "pdf", markdown, lines), ("plain text, no blank lines", "text", recursive, lines),
+             ("plain text, one line", "text", recursive, one_line)]
+    for label, source_type, module, doc in cases:
+        original = module.STREAM_FLUSH_CHARS, module.STREAM_MAX_CHARS
+        module.STREAM_FLUSH_CHARS, module.STREAM_MAX_CHARS = 2000, 8000
+        try:
+            stream = get_chunker_for_source(source_type).stream(doc_id="d", project_id="p", doc_title="Doc")
+            streamed, peak = [], 0
+            for piece in pieces(doc, rng, 3000):
+                streamed += stream.feed(piece)
+                peak = max(peak, stream._size)
+            early = len(streamed)
+            streamed += stream.close()
+        finally:
+            module.STREAM_FLUSH_CHARS, module.STREAM_MAX_CHARS = original
+        ends = [c.end_char for c in streamed]
+        check(f"{label}: the buffer stays under the cap", early > 0 and peak < 8000 + 3000,
+              f"peak {peak} of {len(doc)}, {early} chunks before close")
+        check(f"{label}: chunks cover the document in order",
+              ends == sorted(ends) and ends[-1] >= len(doc.rstrip()) - 1
+              and all(doc[c.start_char:c.end_char].strip() for c in streamed), f"{ends[-3:]} vs {len(doc)}")
+
+    section("RESULTS")
+    total = PASS + FAIL
+    color = GREEN if FAIL == 0 else RED
+    print(f"\n  {color}Report: {PASS}/{total} assertions passed{RESET}\n")
+    sys.exit(0 if FAIL == 0 else 1)
+
+
+if __name__ == "__main__":
+    run_tests()